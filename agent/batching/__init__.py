@@ -5,6 +5,9 @@ Provides functionality to batch multiple messages within a time window
 before processing them as a single combined input.
 """
 
+from agent.batching.batch_scheduler import BatchScheduler
+from agent.batching.debounce import AdaptiveDebounce
 from agent.batching.message_batcher import MessageBatcher
+from agent.batching.speculation import SpeculativeRunner
 
-__all__ = ["MessageBatcher"]
+__all__ = ["AdaptiveDebounce", "BatchScheduler", "MessageBatcher", "SpeculativeRunner"]
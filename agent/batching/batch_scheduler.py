@@ -0,0 +1,288 @@
+"""
+Batch Scheduler - Bounded-concurrency execution of expired message batches.
+
+This module sits between the MessageBatcher and the graph invocation callback:
+1. Limits how many batches are processed concurrently (worker pool)
+2. Keeps batches of the same conversation strictly in arrival order
+3. Runs batches of different conversations in parallel
+4. Exposes a capacity signal so the stream reader can stop issuing XREADGROUP
+   while the queue is full (backpressure)
+5. Tracks queue depth and queue wait time for monitoring
+
+Without it, every expired batch timer invokes the graph immediately, so a burst
+of WhatsApp traffic fans out into as many concurrent LLM + DB calls as there
+are active conversations.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BatchJob:
+    """A batch waiting to be processed by the scheduler."""
+
+    conversation_id: str
+    messages: list[dict]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class BatchScheduler:
+    """
+    Runs batch callbacks on a fixed pool of workers with per-conversation ordering.
+
+    Each conversation has its own FIFO of pending batches. A conversation is
+    handed to at most one worker at a time, so its batches never overlap or
+    reorder, while different conversations are processed concurrently up to
+    ``max_workers``.
+
+    Example:
+        >>> scheduler = BatchScheduler(process_batch, max_workers=4, max_queued=50)
+        >>> await scheduler.start()
+        >>> batcher.set_callback(scheduler.submit_and_wait)
+        >>> await scheduler.wait_for_capacity()  # before each XREADGROUP
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, list[dict]], Coroutine],
+        max_workers: int = 4,
+        max_queued: int = 50,
+    ):
+        """
+        Initialize the BatchScheduler.
+
+        Args:
+            handler: Async function that receives (conversation_id, messages_list)
+            max_workers: Maximum number of batches processed concurrently
+            max_queued: Queue depth at which wait_for_capacity() starts blocking.
+                        Submissions above this limit are still accepted (never dropped).
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_queued < 1:
+            raise ValueError("max_queued must be >= 1")
+
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._handler = handler
+
+        # Conversation IDs ready to be picked by a worker (each appears at most once)
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        # Pending batches per conversation. A conversation is present here while
+        # it is either waiting in _ready or being processed by a worker.
+        self._pending: dict[str, deque[_BatchJob]] = {}
+        self._workers: list[asyncio.Task] = []
+        self._capacity = asyncio.Event()
+        self._capacity.set()
+
+        # Metrics
+        self._queued = 0
+        self._in_flight = 0
+        self._processed = 0
+        self._failed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+        logger.info(
+            f"BatchScheduler initialized | max_workers={max_workers} | "
+            f"max_queued={max_queued}"
+        )
+
+    async def start(self) -> None:
+        """Start the worker tasks. Safe to call more than once."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"batch-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+        logger.info(f"BatchScheduler started | workers={self.max_workers}")
+
+    async def stop(self) -> None:
+        """
+        Cancel the worker tasks.
+
+        Batches still queued are failed with CancelledError so that callers
+        awaiting submit_and_wait() do not hang (their persisted batches and
+        unacknowledged stream entries remain available for recovery).
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for jobs in self._pending.values():
+            for job in jobs:
+                if not job.future.done():
+                    job.future.cancel()
+        self._pending.clear()
+        self._queued = 0
+        self._capacity.set()
+        logger.info(f"BatchScheduler stopped | stats={self.stats()}")
+
+    def submit(self, conversation_id: str, messages: list[dict]) -> asyncio.Future:
+        """
+        Enqueue a batch for processing.
+
+        Args:
+            conversation_id: The conversation thread ID
+            messages: List of message dicts from the batch
+
+        Returns:
+            Future resolved with the handler result (or its exception)
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        job = _BatchJob(conversation_id=conversation_id, messages=messages, future=future)
+
+        jobs = self._pending.get(conversation_id)
+        if jobs is None:
+            self._pending[conversation_id] = deque([job])
+            self._ready.put_nowait(conversation_id)
+        else:
+            jobs.append(job)
+
+        self._queued += 1
+        if self._queued >= self.max_queued:
+            self._capacity.clear()
+
+        logger.debug(
+            f"Batch queued | conversation_id={conversation_id} | "
+            f"messages={len(messages)} | queue_depth={self._queued} | "
+            f"in_flight={self._in_flight}"
+        )
+        return future
+
+    async def submit_and_wait(self, conversation_id: str, messages: list[dict]) -> Any:
+        """
+        Enqueue a batch and wait until it has been processed.
+
+        Matches the MessageBatcher callback signature, so the batcher keeps
+        its "clear persisted batch only after success" semantics.
+
+        Raises:
+            Exception: Whatever the handler raised for this batch
+        """
+        return await self.submit(conversation_id, messages)
+
+    async def wait_for_capacity(self) -> None:
+        """
+        Block while the queue is at or above max_queued.
+
+        The stream consumer awaits this before each XREADGROUP so that new
+        entries stay in Redis (and in other replicas' reach) instead of piling
+        up in process memory.
+        """
+        if self._capacity.is_set():
+            return
+        logger.info(
+            f"Batch queue full, pausing stream reads | queue_depth={self._queued} | "
+            f"in_flight={self._in_flight}"
+        )
+        started = time.monotonic()
+        await self._capacity.wait()
+        logger.info(
+            f"Batch queue drained, resuming stream reads | "
+            f"paused_ms={int((time.monotonic() - started) * 1000)}"
+        )
+
+    async def wait_idle(self, conversation_ids: list[str], poll_seconds: float = 0.1) -> None:
+        """
+        Wait until the given conversations have no queued or running batches.
+
+        Args:
+            conversation_ids: Conversations to wait for
+            poll_seconds: Polling interval
+        """
+        while any(cid in self._pending for cid in conversation_ids):
+            await asyncio.sleep(poll_seconds)
+
+    @property
+    def active_conversations(self) -> list[str]:
+        """Return conversations with queued or running batches."""
+        return list(self._pending)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of batches waiting for a worker."""
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of batches currently being processed."""
+        return self._in_flight
+
+    def stats(self) -> dict[str, Any]:
+        """Return scheduler metrics for logging and health checks."""
+        started = self._processed + self._failed + self._in_flight
+        avg_wait_ms = (
+            int(self._total_wait_seconds / started * 1000) if started else 0
+        )
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "conversations": len(self._pending),
+            "processed": self._processed,
+            "failed": self._failed,
+            "avg_wait_ms": avg_wait_ms,
+            "max_wait_ms": int(self._max_wait_seconds * 1000),
+        }
+
+    async def _worker(self, worker_id: int) -> None:
+        """Pick ready conversations and process their next batch."""
+        while True:
+            conversation_id = await self._ready.get()
+            jobs = self._pending[conversation_id]
+            job = jobs.popleft()
+
+            self._queued -= 1
+            if self._queued < self.max_queued:
+                self._capacity.set()
+
+            wait_seconds = time.monotonic() - job.enqueued_at
+            self._total_wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            self._in_flight += 1
+
+            logger.info(
+                f"Batch started | conversation_id={conversation_id} | "
+                f"worker={worker_id} | wait_ms={int(wait_seconds * 1000)} | "
+                f"queue_depth={self._queued} | in_flight={self._in_flight}",
+                extra={
+                    "conversation_id": conversation_id,
+                    "queue_wait_ms": int(wait_seconds * 1000),
+                    "queue_depth": self._queued,
+                },
+            )
+
+            try:
+                result = await self._handler(conversation_id, job.messages)
+                self._processed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.cancel()
+                raise
+            except Exception as e:
+                self._failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self._in_flight -= 1
+                # Hand the conversation back if it has more batches, otherwise
+                # release it so the next submit() schedules it afresh.
+                if jobs:
+                    self._ready.put_nowait(conversation_id)
+                else:
+                    self._pending.pop(conversation_id, None)
@@ -0,0 +1,167 @@
+"""
+Adaptive Debounce - Per-message batch windows for the MessageBatcher.
+
+With a fixed window every reply waits the full MESSAGE_BATCH_WINDOW_SECONDS
+from the first message, even a lone "sí" in the CONFIRMATION state. The
+adaptive policy computes a new deadline on every message instead:
+1. Default: wait window_seconds after the *latest* message (debounce), so a
+   customer still typing extends the batch
+2. Short, complete messages ("vale", "a las 10.", "¿tenéis hueco?") shrink the
+   wait to min_window_seconds
+3. Terminal messages - a short answer while the FSM expects one (confirmation,
+   stylist or slot choice) - flush immediately
+4. A batch never waits longer than max_window_seconds since its first message
+
+Arrival gaps are recorded (between messages of a batch, and between a flush
+and the next message of the same conversation) so the windows can be tuned
+from data: many late fragments mean the windows are too short.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+
+# FSM states (BookingState values) in which the bot has asked a question that is
+# usually answered with a single token: yes/no, a stylist name or a slot number
+SHORT_ANSWER_STATES = frozenset({"confirmation", "stylist_selection", "slot_selection"})
+
+# Normalized (lowercase, no accents/punctuation) single-token answers
+SHORT_ANSWERS = frozenset({
+    "si", "no", "ok", "okey", "vale", "perfecto", "genial", "claro", "dale",
+    "confirmo", "confirmado", "correcto", "de acuerdo", "adelante", "listo",
+    "gracias", "muchas gracias", "esa", "ese", "la primera", "la segunda",
+    "el primero", "el segundo", "cualquiera", "me da igual",
+})
+
+# Messages ending like this are clearly unfinished
+_CONTINUATION_RE = re.compile(r"(,|:|\.\.\.|…|\b(y|o|pero|que|porque|para|con|de|a))\s*$")
+_COMPLETE_RE = re.compile(r"[.!?]\s*$")
+_NUMBER_RE = re.compile(r"^\d{1,2}$")
+
+# Words at or below which a message ending with . ! ? counts as short
+SHORT_MESSAGE_WORDS = 6
+# Recent gaps kept for percentiles
+GAP_HISTORY = 1000
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, strip accents, punctuation and emoji."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def is_short_answer(text: str) -> bool:
+    """Return True for single-token answers ("sí", "vale", "2", "la primera")."""
+    normalized = _normalize(text)
+    return normalized in SHORT_ANSWERS or bool(_NUMBER_RE.match(normalized))
+
+
+def looks_complete(text: str) -> bool:
+    """Return True for short messages that read as a finished thought."""
+    stripped = text.strip()
+    if not stripped or _CONTINUATION_RE.search(stripped.lower()):
+        return False
+    if is_short_answer(stripped):
+        return True
+    return bool(_COMPLETE_RE.search(stripped)) and len(stripped.split()) <= SHORT_MESSAGE_WORDS
+
+
+@dataclass(frozen=True)
+class DebounceDecision:
+    """Delay to wait after a message, and why."""
+
+    delay_seconds: float
+    reason: str  # "terminal" | "short" | "default"
+
+
+class AdaptiveDebounce:
+    """
+    Computes batch deadlines per message and collects arrival-gap metrics.
+
+    Example:
+        >>> debounce = AdaptiveDebounce(window_seconds=10, min_window_seconds=2,
+        ...                             max_window_seconds=45)
+        >>> debounce.decide("sí", expects_short_answer=True).reason
+        'terminal'
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        min_window_seconds: float,
+        max_window_seconds: float,
+    ):
+        """
+        Initialize the AdaptiveDebounce.
+
+        Args:
+            window_seconds: Wait after the latest message when nothing suggests
+                            the customer has finished
+            min_window_seconds: Wait after a short, complete message
+            max_window_seconds: Cap on a batch's total age before it is processed
+        """
+        self.window_seconds = window_seconds
+        self.min_window_seconds = min(min_window_seconds, window_seconds)
+        self.max_window_seconds = max(max_window_seconds, window_seconds)
+
+        # Metrics
+        self._gaps_ms: deque[int] = deque(maxlen=GAP_HISTORY)
+        self._late_gaps_ms: deque[int] = deque(maxlen=GAP_HISTORY)
+        self.decisions = {"terminal": 0, "short": 0, "default": 0}
+        self.capped = 0
+
+    def decide(self, text: str, expects_short_answer: bool = False) -> DebounceDecision:
+        """
+        Decide how long to wait after a message before processing the batch.
+
+        Args:
+            text: Message text
+            expects_short_answer: True if the FSM state expects a single-token answer
+        """
+        if expects_short_answer and is_short_answer(text):
+            decision = DebounceDecision(0.0, "terminal")
+        elif looks_complete(text):
+            decision = DebounceDecision(self.min_window_seconds, "short")
+        else:
+            decision = DebounceDecision(float(self.window_seconds), "default")
+        self.decisions[decision.reason] += 1
+        return decision
+
+    def deadline(self, now: float, first_arrival: float, decision: DebounceDecision) -> float:
+        """Return the batch deadline for a message arriving at ``now``."""
+        cap = first_arrival + self.max_window_seconds
+        deadline = now + decision.delay_seconds
+        if deadline > cap:
+            self.capped += 1
+            return cap
+        return deadline
+
+    def record_gap(self, gap_seconds: float) -> None:
+        """Record the gap between two messages of the same batch."""
+        self._gaps_ms.append(int(gap_seconds * 1000))
+
+    def record_late_fragment(self, since_flush_seconds: float) -> None:
+        """Record a message that arrived shortly after its conversation was flushed."""
+        self._late_gaps_ms.append(int(since_flush_seconds * 1000))
+
+    def stats(self) -> dict[str, int]:
+        """Return debounce metrics for tuning the windows."""
+        return {
+            "gaps": len(self._gaps_ms),
+            "gap_p50_ms": _percentile(self._gaps_ms, 50),
+            "gap_p90_ms": _percentile(self._gaps_ms, 90),
+            "late_fragments": len(self._late_gaps_ms),
+            "late_fragment_p50_ms": _percentile(self._late_gaps_ms, 50),
+            "capped": self.capped,
+            **{f"decisions_{reason}": count for reason, count in self.decisions.items()},
+        }
+
+
+def _percentile(values: deque[int], pct: int) -> int:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
@@ -6,25 +6,50 @@ This module implements a per-conversation message batching system that:
 2. Combines them into a single batch when the window expires
 3. Invokes a callback to process the entire batch as one input
 4. Persists batches to Redis for crash recovery (Phase 6 resilience)
+5. Optionally adapts the window per message (see agent/batching/debounce.py)
+6. Optionally starts speculative work on each partial batch while the window
+   is still open (see agent/batching/speculation.py)
 
 This reduces fragmented responses when users send multiple quick messages.
+
+Persistence layout (Redis lists, one JSON message per element):
+- batcher:pending:{conversation_id}: the open batch. Each message is appended
+  with RPUSH + EXPIRE in one pipeline, so a message costs one round-trip and
+  O(1) bytes regardless of the batch size.
+- batcher:inflight:{conversation_id}:{ts}: a batch handed to the callback. The
+  pending list is RENAMEd when the batch closes (messages of the next batch
+  never mix with it) and deleted once the callback succeeds.
+Both are read back with LRANGE by recover_pending_batches().
 """
 
 import asyncio
 import json
 import logging
-from collections import defaultdict
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
-from typing import Any, Callable, Coroutine
+from typing import Any
 
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from agent.batching.debounce import SHORT_ANSWER_STATES, AdaptiveDebounce
+from agent.batching.speculation import SpeculativeRunner
 
 logger = logging.getLogger(__name__)
 
 # Redis persistence configuration
 BATCH_KEY_PREFIX = "batcher:pending:"
+BATCH_INFLIGHT_PREFIX = "batcher:inflight:"
 BATCH_TTL_SECONDS = 300  # 5 min TTL (> max batch window of 120s)
 
+# A batch reaching this many messages is processed without waiting for its window
+MAX_BATCH_MESSAGES = 25
+
+# Upper bound on per-conversation debounce bookkeeping kept between batches
+MAX_TRACKED_CONVERSATIONS = 10000
+
 
 class MessageBatcher:
     """
@@ -35,6 +60,8 @@ class MessageBatcher:
     When timer expires, all messages are passed to the callback as a batch.
 
     Thread-safe: Uses per-conversation locks to handle concurrent messages.
+    Locks, timers and deadlines only exist while a conversation has a pending
+    batch, so memory is bounded by the number of active conversations.
 
     Example:
         >>> batcher = MessageBatcher(window_seconds=30)
@@ -44,7 +71,14 @@ class MessageBatcher:
         >>> # After 30 seconds, process_batch is called with both messages
     """
 
-    def __init__(self, window_seconds: int = 30, redis_client: Redis | None = None):
+    def __init__(
+        self,
+        window_seconds: int = 30,
+        redis_client: Redis | None = None,
+        debounce: AdaptiveDebounce | None = None,
+        max_batch_messages: int = MAX_BATCH_MESSAGES,
+        speculation: SpeculativeRunner | None = None,
+    ):
         """
         Initialize the MessageBatcher.
 
@@ -53,18 +87,48 @@ class MessageBatcher:
                            Set to 0 to disable batching (immediate processing).
             redis_client: Optional Redis client for crash recovery persistence.
                          If not provided, batches are stored in-memory only.
+            debounce: Optional adaptive policy. If provided, each message moves
+                     the batch deadline (extend / shrink / flush early) instead
+                     of a fixed window from the first message.
+            max_batch_messages: Batch size at which a batch is processed without
+                     waiting for its window (bounds a single batch's memory).
+            speculation: Optional runner restarted on every message with the
+                     batch so far, so its work overlaps the batch window.
         """
         self.window_seconds = window_seconds
-        self.batches: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.max_batch_messages = max_batch_messages
+        self.batches: dict[str, list[dict[str, Any]]] = {}
         self.timers: dict[str, asyncio.Task] = {}
-        self.locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
         self._callback: Callable[[str, list[dict]], Coroutine] | None = None
         self._redis: Redis | None = redis_client
+        self._debounce = debounce
+        self._speculation = speculation
+
+        # Batch deadlines (loop time) and timer wake-ups when a deadline moves
+        self.deadlines: dict[str, float] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        # Adaptive mode bookkeeping
+        self._first_arrival: dict[str, float] = {}
+        self._last_arrival: dict[str, float] = {}
+        self._last_flush: dict[str, float] = {}
+        self._expects_short_answer: dict[str, bool] = {}
+
+        # Messages of each open batch that reached Redis, and in-flight keys
+        # owned by running callbacks (skipped by recovery)
+        self._persisted_counts: dict[str, int] = {}
+        self._inflight_keys: set[str] = set()
 
         persistence_status = "enabled" if redis_client else "disabled"
+        mode = (
+            f"adaptive(min={debounce.min_window_seconds}s, max={debounce.max_window_seconds}s)"
+            if debounce else "fixed"
+        )
         logger.info(
             f"MessageBatcher initialized | window_seconds={window_seconds} | "
-            f"persistence={persistence_status}"
+            f"mode={mode} | persistence={persistence_status} | "
+            f"speculative={speculation is not None}"
         )
 
     def set_callback(
@@ -78,6 +142,45 @@ class MessageBatcher:
         """
         self._callback = callback
 
+    def set_reply_expectation(self, conversation_id: str, fsm_state: str | None) -> None:
+        """
+        Tell the batcher which FSM state the conversation is in after a reply.
+
+        In adaptive mode, a short answer in a state that expects one (e.g. "sí"
+        in CONFIRMATION) is processed immediately.
+
+        Args:
+            conversation_id: The conversation thread ID
+            fsm_state: BookingState value after the last graph run (or None)
+        """
+        if fsm_state in SHORT_ANSWER_STATES:
+            self._expects_short_answer.pop(conversation_id, None)
+            self._expects_short_answer[conversation_id] = True
+            _prune_oldest(self._expects_short_answer)
+        else:
+            self._expects_short_answer.pop(conversation_id, None)
+
+    @asynccontextmanager
+    async def _conversation_lock(self, conversation_id: str) -> AsyncIterator[None]:
+        """
+        Hold a conversation's lock, creating it on demand.
+
+        The lock is dropped as soon as nobody holds or waits for it, so idle
+        conversations do not keep an asyncio.Lock around forever.
+        """
+        lock = self.locks.get(conversation_id)
+        if lock is None:
+            lock = self.locks[conversation_id] = asyncio.Lock()
+        self._lock_users[conversation_id] = self._lock_users.get(conversation_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[conversation_id] -= 1
+            if not self._lock_users[conversation_id]:
+                del self._lock_users[conversation_id]
+                del self.locks[conversation_id]
+
     async def add_message(
         self, conversation_id: str, message_data: dict
     ) -> None:
@@ -85,7 +188,8 @@ class MessageBatcher:
         Add a message to the batch for this conversation.
 
         If batching is disabled (window_seconds=0), processes immediately.
-        Otherwise, adds to batch and starts/extends timer.
+        Otherwise, adds to batch and starts/extends timer. A batch reaching
+        max_batch_messages is processed right away.
 
         Args:
             conversation_id: Unique identifier for the conversation
@@ -97,32 +201,155 @@ class MessageBatcher:
                 await self._callback(conversation_id, [message_data])
             return
 
-        async with self.locks[conversation_id]:
+        async with self._conversation_lock(conversation_id):
             # Add message to batch with timestamp
-            self.batches[conversation_id].append({
+            message = {
                 **message_data,
                 "received_at": datetime.now(UTC).isoformat(),
-            })
+            }
+            batch = self.batches.setdefault(conversation_id, [])
+            batch.append(message)
 
-            batch_size = len(self.batches[conversation_id])
+            batch_size = len(batch)
             logger.info(
                 f"Message added to batch | conversation_id={conversation_id} | "
                 f"batch_size={batch_size} | window={self.window_seconds}s"
             )
 
-            # Persist batch to Redis for crash recovery
-            await self._persist_batch(conversation_id, self.batches[conversation_id])
+            # Append the message to the persisted batch for crash recovery
+            if await self._persist_message(conversation_id, message):
+                self._persisted_counts[conversation_id] = (
+                    self._persisted_counts.get(conversation_id, 0) + 1
+                )
 
-            # Start timer if this is the first message in batch
+            now = asyncio.get_running_loop().time()
+            if self._debounce:
+                self.deadlines[conversation_id] = self._adaptive_deadline(
+                    conversation_id, message_data, now
+                )
+            else:
+                self.deadlines.setdefault(conversation_id, now + self.window_seconds)
+
+            if batch_size >= self.max_batch_messages:
+                logger.info(
+                    f"Batch size limit reached | conversation_id={conversation_id} | "
+                    f"batch_size={batch_size}"
+                )
+                self.deadlines[conversation_id] = now
+
+            # Redo the speculative work for the grown batch while we wait
+            if self._speculation:
+                self._speculation.start(conversation_id, batch)
+
+            # Start timer if this is the first message in batch, otherwise wake
+            # it up so it picks up the new deadline
             if conversation_id not in self.timers:
+                self._wakeups[conversation_id] = asyncio.Event()
                 timer = asyncio.create_task(
                     self._wait_and_process(conversation_id)
                 )
                 self.timers[conversation_id] = timer
                 logger.debug(
                     f"Timer started | conversation_id={conversation_id} | "
-                    f"expires_in={self.window_seconds}s"
+                    f"expires_in={self.deadlines[conversation_id] - now:.1f}s"
                 )
+            else:
+                self._wakeups[conversation_id].set()
+
+    def _adaptive_deadline(
+        self, conversation_id: str, message_data: dict, now: float
+    ) -> float:
+        """Record arrival gaps and compute the batch deadline after a message."""
+        last = self._last_arrival.get(conversation_id)
+        if last is not None:
+            self._debounce.record_gap(now - last)
+        else:
+            flushed_at = self._last_flush.pop(conversation_id, None)
+            if flushed_at is not None and now - flushed_at < self._debounce.max_window_seconds:
+                # The customer was still typing when the batch was processed
+                self._debounce.record_late_fragment(now - flushed_at)
+                logger.info(
+                    f"Late fragment after flush | conversation_id={conversation_id} | "
+                    f"since_flush_ms={int((now - flushed_at) * 1000)}",
+                    extra={
+                        "conversation_id": conversation_id,
+                        "since_flush_ms": int((now - flushed_at) * 1000),
+                    },
+                )
+
+        first = self._first_arrival.setdefault(conversation_id, now)
+        self._last_arrival[conversation_id] = now
+
+        decision = self._debounce.decide(
+            message_data.get("message_text") or "",
+            expects_short_answer=self._expects_short_answer.get(conversation_id, False),
+        )
+        deadline = self._debounce.deadline(now, first, decision)
+        logger.debug(
+            f"Batch deadline updated | conversation_id={conversation_id} | "
+            f"reason={decision.reason} | expires_in={deadline - now:.1f}s",
+            extra={
+                "conversation_id": conversation_id,
+                "debounce_reason": decision.reason,
+                "arrival_gap_ms": int((now - last) * 1000) if last is not None else None,
+            },
+        )
+        return deadline
+
+    def _end_batch(self, conversation_id: str) -> None:
+        """Drop the timer bookkeeping of a batch that is about to be processed."""
+        self.timers.pop(conversation_id, None)
+        self.deadlines.pop(conversation_id, None)
+        self._wakeups.pop(conversation_id, None)
+        self._first_arrival.pop(conversation_id, None)
+        if self._last_arrival.pop(conversation_id, None) is not None:
+            self._last_flush[conversation_id] = asyncio.get_running_loop().time()
+            _prune_oldest(self._last_flush)
+
+    async def _take_batch(self, conversation_id: str) -> tuple[list[dict], str | None]:
+        """
+        Close a conversation's batch.
+
+        Removes the batch from memory and moves its persisted copy to an
+        in-flight key, so the next batch starts a fresh pending list.
+
+        Returns:
+            Tuple of (messages, in-flight Redis key or None)
+        """
+        async with self._conversation_lock(conversation_id):
+            batch = self.batches.pop(conversation_id, [])
+            persisted = self._persisted_counts.pop(conversation_id, 0)
+            self._end_batch(conversation_id)
+            inflight_key = None
+            if batch and persisted:
+                inflight_key = await self._move_to_inflight(conversation_id)
+        return batch, inflight_key
+
+    async def _process_batch(
+        self, conversation_id: str, batch: list[dict], inflight_key: str | None
+    ) -> None:
+        """
+        Invoke the callback and delete the in-flight copy on success.
+
+        On error the in-flight key is kept and recovered on next startup.
+        """
+        try:
+            await self._callback(conversation_id, batch)
+        except Exception as e:
+            logger.error(
+                f"Error processing batch | conversation_id={conversation_id} | "
+                f"error={str(e)}",
+                exc_info=True,
+            )
+            # NOTE: We do NOT clear persisted batch on error
+            # It will be recovered on next startup
+            return
+        finally:
+            if inflight_key:
+                self._inflight_keys.discard(inflight_key)
+
+        if inflight_key:
+            await self._delete_persisted(inflight_key)
 
     async def _wait_and_process(self, conversation_id: str) -> None:
         """
@@ -133,31 +360,41 @@ class MessageBatcher:
         Args:
             conversation_id: Conversation whose batch to process
         """
+        loop = asyncio.get_running_loop()
         try:
-            await asyncio.sleep(self.window_seconds)
+            # Sleep until the deadline; add_message() may move it (and wakes us)
+            while True:
+                remaining = self.deadlines.get(conversation_id, 0) - loop.time()
+                if remaining <= 0:
+                    break
+                wakeup = self._wakeups.get(conversation_id)
+                if wakeup is None:
+                    await asyncio.sleep(remaining)
+                    continue
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=remaining)
+                except TimeoutError:
+                    pass
 
-            async with self.locks[conversation_id]:
-                # Extract and clear batch
-                batch = self.batches.pop(conversation_id, [])
-                self.timers.pop(conversation_id, None)
+            first_arrival = self._first_arrival.get(conversation_id)
+            batch, inflight_key = await self._take_batch(conversation_id)
 
-                if batch and self._callback:
-                    logger.info(
-                        f"Batch window expired | conversation_id={conversation_id} | "
-                        f"processing {len(batch)} messages"
-                    )
-                    try:
-                        await self._callback(conversation_id, batch)
-                        # Clear persisted batch after successful processing
-                        await self._clear_persisted_batch(conversation_id)
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing batch | conversation_id={conversation_id} | "
-                            f"error={str(e)}",
-                            exc_info=True,
-                        )
-                        # NOTE: We do NOT clear persisted batch on error
-                        # It will be recovered on next startup
+            # The callback runs outside the lock so new messages for this
+            # conversation can start the next batch instead of blocking the
+            # stream reader. Ordering between consecutive batches of the same
+            # conversation is guaranteed by the BatchScheduler.
+            if batch and self._callback:
+                waited_ms = (
+                    int((loop.time() - first_arrival) * 1000) if first_arrival is not None else None
+                )
+                logger.info(
+                    f"Batch window expired | conversation_id={conversation_id} | "
+                    f"processing {len(batch)} messages"
+                    + (f" | waited_ms={waited_ms}" if waited_ms is not None else ""),
+                    extra={"conversation_id": conversation_id, "batch_wait_ms": waited_ms},
+                )
+                await self._process_batch(conversation_id, batch, inflight_key)
 
         except asyncio.CancelledError:
             logger.debug(
@@ -165,6 +402,30 @@ class MessageBatcher:
             )
             raise
 
+    async def flush(self, conversation_id: str) -> None:
+        """
+        Process a conversation's pending batch immediately.
+
+        Used when this replica hands a conversation's partition over to another
+        replica: the in-memory batch must be processed here before the lease
+        is released.
+
+        Args:
+            conversation_id: Conversation whose batch to process
+        """
+        timer = self.timers.pop(conversation_id, None)
+        if timer:
+            timer.cancel()
+
+        batch, inflight_key = await self._take_batch(conversation_id)
+
+        if batch and self._callback:
+            logger.info(
+                f"Flushing batch early | conversation_id={conversation_id} | "
+                f"messages={len(batch)}"
+            )
+            await self._process_batch(conversation_id, batch, inflight_key)
+
     async def flush_all(self) -> None:
         """
         Flush all pending batches immediately.
@@ -182,24 +443,28 @@ class MessageBatcher:
             logger.debug(f"Timer cancelled during flush | conversation_id={conversation_id}")
 
         # Process remaining batches
-        for conversation_id, batch in list(self.batches.items()):
+        for conversation_id in list(self.batches):
+            batch, inflight_key = await self._take_batch(conversation_id)
             if batch and self._callback:
                 logger.info(
                     f"Flushing batch on shutdown | conversation_id={conversation_id} | "
                     f"messages={len(batch)}"
                 )
-                try:
-                    await self._callback(conversation_id, batch)
-                except Exception as e:
-                    logger.error(
-                        f"Error flushing batch | conversation_id={conversation_id} | "
-                        f"error={str(e)}",
-                        exc_info=True,
-                    )
+                await self._process_batch(conversation_id, batch, inflight_key)
 
         self.batches.clear()
         self.timers.clear()
+        self.deadlines.clear()
+        self._wakeups.clear()
+        self._first_arrival.clear()
+        self._last_arrival.clear()
+        self._persisted_counts.clear()
         logger.info("All batches flushed")
+        if self._debounce:
+            logger.info(f"Adaptive batching stats | {self.debounce_stats()}")
+        if self._speculation:
+            self._speculation.cancel_all()
+            logger.info(f"Speculative prefetch stats | {self._speculation.stats()}")
 
     @property
     def pending_count(self) -> int:
@@ -210,68 +475,132 @@ class MessageBatcher:
         """Return the current batch size for a conversation."""
         return len(self.batches.get(conversation_id, []))
 
+    def debounce_stats(self) -> dict[str, int]:
+        """Return adaptive debounce metrics (empty in fixed-window mode)."""
+        return self._debounce.stats() if self._debounce else {}
+
     # =========================================================================
     # REDIS PERSISTENCE METHODS (Phase 6 - Crash Recovery)
     # =========================================================================
 
-    async def _persist_batch(self, conversation_id: str, messages: list[dict]) -> None:
+    async def _persist_message(self, conversation_id: str, message: dict) -> bool:
         """
-        Persist batch to Redis for crash recovery.
+        Append a message to the persisted batch for crash recovery.
+
+        RPUSH + EXPIRE are sent in one pipeline (one round-trip per message).
 
         Args:
             conversation_id: Conversation identifier
-            messages: List of message dicts to persist
+            message: Message dict to persist
+
+        Returns:
+            True if the message was persisted
         """
         if not self._redis:
-            return  # No Redis client, skip persistence
+            return False  # No Redis client, skip persistence
 
         key = f"{BATCH_KEY_PREFIX}{conversation_id}"
         try:
-            await self._redis.set(
-                key,
-                json.dumps(messages),
-                ex=BATCH_TTL_SECONDS,
-            )
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.rpush(key, json.dumps(message))
+            pipe.expire(key, BATCH_TTL_SECONDS)
+            await pipe.execute()
             logger.debug(
-                f"Batch persisted to Redis | conversation_id={conversation_id} | "
-                f"messages={len(messages)}"
+                f"Message persisted to Redis | conversation_id={conversation_id}"
             )
+            return True
         except Exception as e:
             # Log but don't fail - persistence is best-effort
             logger.warning(
                 f"Failed to persist batch to Redis | conversation_id={conversation_id} | "
                 f"error={str(e)}"
             )
+            return False
 
-    async def _clear_persisted_batch(self, conversation_id: str) -> None:
+    async def _move_to_inflight(self, conversation_id: str) -> str | None:
         """
-        Clear persisted batch after successful processing.
+        Rename a conversation's pending list to a new in-flight key (TTL is kept).
 
         Args:
             conversation_id: Conversation identifier
+
+        Returns:
+            The in-flight key, or None if the pending list could not be moved
         """
-        if not self._redis:
-            return  # No Redis client, skip
+        inflight_key = f"{BATCH_INFLIGHT_PREFIX}{conversation_id}:{time.time_ns()}"
+        try:
+            await self._redis.rename(f"{BATCH_KEY_PREFIX}{conversation_id}", inflight_key)
+        except Exception as e:
+            # Expired pending list or Redis unavailable - nothing to clean up later
+            logger.warning(
+                f"Failed to mark persisted batch in-flight | "
+                f"conversation_id={conversation_id} | error={str(e)}"
+            )
+            return None
+        self._inflight_keys.add(inflight_key)
+        return inflight_key
 
-        key = f"{BATCH_KEY_PREFIX}{conversation_id}"
+    async def _delete_persisted(self, key: str) -> None:
+        """
+        Delete a persisted batch after successful processing.
+
+        Args:
+            key: Redis key of the persisted batch
+        """
         try:
             await self._redis.delete(key)
-            logger.debug(
-                f"Persisted batch cleared | conversation_id={conversation_id}"
-            )
+            logger.debug(f"Persisted batch cleared | key={key}")
         except Exception as e:
             # Log but don't fail
             logger.warning(
-                f"Failed to clear persisted batch | conversation_id={conversation_id} | "
-                f"error={str(e)}"
+                f"Failed to clear persisted batch | key={key} | error={str(e)}"
             )
 
-    async def recover_pending_batches(self) -> int:
+    async def _read_persisted(self, key: str) -> list[dict]:
+        """Read a persisted batch (list, or JSON string written by older versions)."""
+        try:
+            items = await self._redis.lrange(key, 0, -1)
+        except ResponseError:
+            messages_json = await self._redis.get(key)
+            return json.loads(messages_json) if messages_json else []
+        return [json.loads(item) for item in items]
+
+    async def _claim_recovered(self, conversation_id: str, key: str) -> list[dict]:
+        """
+        Read and remove a persisted batch found by recovery.
+
+        If this process already collects a new batch for the conversation, its
+        messages are at the tail of the pending list: only the older head is
+        claimed (LTRIM), the tail stays with the open batch.
+        """
+        async with self._conversation_lock(conversation_id):
+            live = self._persisted_counts.get(conversation_id, 0)
+            if not live or not key.startswith(BATCH_KEY_PREFIX):
+                messages = await self._read_persisted(key)
+                await self._redis.delete(key)
+                return messages
+
+            items = await self._redis.lrange(key, 0, -1)
+            older = len(items) - live
+            if older <= 0:
+                return []
+            await self._redis.ltrim(key, older, -1)
+            return [json.loads(item) for item in items[:older]]
+
+    async def recover_pending_batches(
+        self, conversation_filter: Callable[[str], bool] | None = None
+    ) -> int:
         """
         Recover pending batches from Redis on startup.
 
-        Scans for any batches that were persisted before a crash and
-        immediately processes them.
+        Scans for any batches that were persisted before a crash (open batches
+        and batches whose processing did not complete) and immediately
+        processes them, one combined batch per conversation.
+
+        Args:
+            conversation_filter: Optional predicate restricting recovery to the
+                conversations this replica owns (partitioned consumers). Batches
+                of other conversations are left untouched.
 
         Returns:
             Number of batches recovered and processed
@@ -286,58 +615,61 @@ class MessageBatcher:
 
         recovered = 0
         try:
-            # Use SCAN instead of KEYS for non-blocking iteration
-            cursor = 0
-            while True:
-                cursor, keys = await self._redis.scan(
-                    cursor=cursor,
-                    match=f"{BATCH_KEY_PREFIX}*",
-                    count=100,
-                )
-
-                for key in keys:
-                    try:
-                        # Extract conversation_id from key
+            # conversation_id -> persisted keys, in-flight keys first
+            keys_by_conversation: dict[str, list[str]] = {}
+            for prefix in (BATCH_INFLIGHT_PREFIX, BATCH_KEY_PREFIX):
+                # Use SCAN instead of KEYS for non-blocking iteration
+                cursor = 0
+                while True:
+                    cursor, keys = await self._redis.scan(
+                        cursor=cursor,
+                        match=f"{prefix}*",
+                        count=100,
+                    )
+                    for key in keys:
                         key_str = key.decode() if isinstance(key, bytes) else key
-                        conversation_id = key_str.replace(BATCH_KEY_PREFIX, "")
-
-                        # Get and parse messages
-                        messages_json = await self._redis.get(key)
-                        if messages_json:
-                            messages_str = (
-                                messages_json.decode()
-                                if isinstance(messages_json, bytes)
-                                else messages_json
-                            )
-                            messages = json.loads(messages_str)
-
-                            logger.info(
-                                f"Recovering batch | conversation_id={conversation_id} | "
-                                f"messages={len(messages)}"
-                            )
-
-                            # Process the recovered batch immediately
-                            try:
-                                await self._callback(conversation_id, messages)
-                                recovered += 1
-                            except Exception as e:
-                                logger.error(
-                                    f"Error processing recovered batch | "
-                                    f"conversation_id={conversation_id} | error={str(e)}",
-                                    exc_info=True,
-                                )
-
-                            # Clear the persisted batch after processing
-                            await self._redis.delete(key)
+                        if key_str in self._inflight_keys:
+                            continue  # Being processed by this process
+                        conversation_id = key_str[len(prefix):]
+                        if prefix == BATCH_INFLIGHT_PREFIX:
+                            conversation_id = conversation_id.rsplit(":", 1)[0]
+                        if conversation_filter and not conversation_filter(conversation_id):
+                            continue
+                        keys_by_conversation.setdefault(conversation_id, []).append(key_str)
+                    if cursor == 0:
+                        break
+
+            for conversation_id, keys in keys_by_conversation.items():
+                # Oldest in-flight batch first, open batch last
+                keys.sort(key=lambda k: (k.startswith(BATCH_KEY_PREFIX), _key_timestamp(k)))
+                try:
+                    messages: list[dict] = []
+                    for key in keys:
+                        messages.extend(await self._claim_recovered(conversation_id, key))
+                    if not messages:
+                        continue
+
+                    logger.info(
+                        f"Recovering batch | conversation_id={conversation_id} | "
+                        f"messages={len(messages)}"
+                    )
 
+                    # Process the recovered batch immediately
+                    try:
+                        await self._callback(conversation_id, messages)
+                        recovered += 1
                     except Exception as e:
                         logger.error(
-                            f"Error recovering single batch | key={key} | error={str(e)}",
+                            f"Error processing recovered batch | "
+                            f"conversation_id={conversation_id} | error={str(e)}",
                             exc_info=True,
                         )
 
-                if cursor == 0:
-                    break
+                except Exception as e:
+                    logger.error(
+                        f"Error recovering single batch | keys={keys} | error={str(e)}",
+                        exc_info=True,
+                    )
 
             if recovered > 0:
                 logger.info(f"Batch recovery complete | recovered={recovered}")
@@ -351,3 +683,17 @@ class MessageBatcher:
             )
 
         return recovered
+
+
+def _key_timestamp(key: str) -> int:
+    """Return the timestamp suffix of an in-flight key (0 for pending keys)."""
+    if not key.startswith(BATCH_INFLIGHT_PREFIX):
+        return 0
+    suffix = key.rsplit(":", 1)[-1]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _prune_oldest(entries: dict[str, Any], limit: int = MAX_TRACKED_CONVERSATIONS) -> None:
+    """Drop the oldest insertions of a dict used as a bounded FIFO."""
+    while len(entries) > limit:
+        del entries[next(iter(entries))]
@@ -0,0 +1,204 @@
+"""
+Speculative Turn Prefetch - Start a turn's slow lookups while its batch is open.
+
+MessageBatcher holds every batch for its window before the graph runs, and
+only then does the graph look up the customer, load the checkpoint and call
+the intent LLM. In speculative mode the batcher hands each new partial batch
+to a SpeculativeRunner, which starts that work in the background:
+1. A new message cancels the running speculation and restarts it on the
+   grown batch (the combined text changed)
+2. When the batch is processed, take() returns the result if it was computed
+   for exactly the combined text being processed (awaiting it if still running)
+3. Nodes reuse a PrefetchedTurn only if the checkpoint it was based on is
+   still current (a previous batch of the conversation may have finished in
+   between); otherwise they do the work themselves
+
+The prefetch itself is injected (see agent/main.py), so this module does not
+depend on the graph.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Key of the PrefetchedTurn in the graph config's "configurable" dict
+PREFETCHED_TURN_KEY = "prefetched_turn"
+
+
+def combine_batch_text(messages: list[dict]) -> str:
+    """Combine the texts of a batch into the single user message the graph sees."""
+    return "\n\n".join(
+        msg.get("message_text", "") for msg in messages if msg.get("message_text")
+    )
+
+
+@dataclass
+class PrefetchedTurn:
+    """
+    Work done ahead of a graph run for one combined batch text.
+
+    Attributes:
+        message: Combined batch text the work was done for
+        fsm_state: Checkpointed FSM state the intent was extracted in
+        last_message: Last checkpointed message before this turn (or None)
+        customer: Result of check_customer_exists() (or None if not looked up)
+        intent: Extracted Intent (or None if extraction was not possible)
+    """
+
+    message: str
+    fsm_state: dict[str, Any] | None
+    last_message: dict[str, Any] | None
+    customer: tuple[bool, Any] | None = None
+    intent: Any | None = None
+
+    def matches(
+        self,
+        message: str,
+        fsm_state: dict[str, Any] | None,
+        history: list[dict[str, Any]],
+    ) -> bool:
+        """
+        Check the prefetch was computed for this turn and the current checkpoint.
+
+        Args:
+            message: Combined user message being processed
+            fsm_state: Current checkpointed FSM state
+            history: Conversation messages before this turn
+        """
+        last_message = history[-1] if history else None
+        return (
+            self.message == message
+            and (self.fsm_state or None) == (fsm_state or None)
+            and _same_message(self.last_message, last_message)
+        )
+
+
+def _same_message(a: dict[str, Any] | None, b: dict[str, Any] | None) -> bool:
+    """Compare two history messages by role and content (timestamps may differ)."""
+    if a is None or b is None:
+        return a is b
+    return a.get("role") == b.get("role") and a.get("content") == b.get("content")
+
+
+def get_prefetched_turn(config: dict[str, Any] | None) -> PrefetchedTurn | None:
+    """Return the PrefetchedTurn passed in a graph config, if any."""
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get(PREFETCHED_TURN_KEY)
+
+
+class SpeculativeRunner:
+    """
+    Runs one background prefetch per open batch, restarted as the batch grows.
+
+    Example:
+        >>> runner = SpeculativeRunner(prefetch_turn)
+        >>> batcher = MessageBatcher(window_seconds=30, speculation=runner)
+        >>> # In the batch callback:
+        >>> prefetched = await runner.take(conversation_id, combine_batch_text(messages))
+    """
+
+    def __init__(self, prefetch: Callable[[str, list[dict]], Coroutine]):
+        """
+        Initialize the SpeculativeRunner.
+
+        Args:
+            prefetch: Async function (conversation_id, messages) -> result,
+                     run in the background for each partial batch
+        """
+        self._prefetch = prefetch
+        self._pending: dict[str, tuple[str, asyncio.Task]] = {}
+        self._stats = {
+            "started": 0,
+            "superseded": 0,
+            "hits": 0,
+            "misses": 0,
+            "failed": 0,
+        }
+
+    def start(self, conversation_id: str, messages: list[dict]) -> None:
+        """
+        Start (or restart) the prefetch for a conversation's open batch.
+
+        Args:
+            conversation_id: Conversation whose batch changed
+            messages: Messages of the batch so far
+        """
+        text = combine_batch_text(messages)
+        previous = self._pending.pop(conversation_id, None)
+        if previous is not None:
+            previous[1].cancel()
+            self._stats["superseded"] += 1
+        if not text:
+            return
+
+        task = asyncio.create_task(self._prefetch(conversation_id, list(messages)))
+        task.add_done_callback(_retrieve_exception)
+        self._pending[conversation_id] = (text, task)
+        self._stats["started"] += 1
+
+    async def take(self, conversation_id: str, text: str) -> Any | None:
+        """
+        Claim the prefetch of a batch that is about to be processed.
+
+        Args:
+            conversation_id: Conversation being processed
+            text: Combined text of the batch being processed
+
+        Returns:
+            Prefetch result, or None if there is none for exactly this text
+            or it failed
+        """
+        entry = self._pending.pop(conversation_id, None)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        key, task = entry
+        if key != text:
+            task.cancel()
+            self._stats["misses"] += 1
+            return None
+
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if task.cancelled() or task.exception() is not None:
+            self._stats["failed"] += 1
+            if not task.cancelled():
+                logger.warning(
+                    f"Speculative prefetch failed | conversation_id={conversation_id} | "
+                    f"error={task.exception()}"
+                )
+            return None
+
+        self._stats["hits"] += 1
+        return task.result()
+
+    def cancel(self, conversation_id: str) -> None:
+        """Cancel a conversation's prefetch (e.g. its batch was dropped)."""
+        entry = self._pending.pop(conversation_id, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def cancel_all(self) -> None:
+        """Cancel every running prefetch (shutdown)."""
+        for conversation_id in list(self._pending):
+            self.cancel(conversation_id)
+
+    def stats(self) -> dict[str, int]:
+        """Return prefetch counters (started, superseded, hits, misses, failed)."""
+        return {**self._stats, "running": len(self._pending)}
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a superseded task's exception as retrieved (avoids asyncio warnings)."""
+    if not task.cancelled():
+        task.exception()
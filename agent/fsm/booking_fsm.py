@@ -125,6 +125,87 @@ class BookingFSM:
         ],
     }
 
+    # Jinja2 response templates of the _action_* builders. Kept static (data goes
+    # in FSMAction.template_vars) so they can be precompiled at startup, see
+    # shared.template_cache.
+    RESPONSE_TEMPLATES: ClassVar[dict[str, str]] = {
+        "greeting": (
+            "¡Hola! Soy Maite, tu asistente virtual de la Peluquería Atrévete. "
+            "¿En qué puedo ayudarte hoy? Puedo ayudarte a reservar una cita, "
+            "consultar nuestros servicios, horarios, o cualquier duda que tengas."
+        ),
+        "service_catalog": (
+            "¡Perfecto! Estos son algunos de nuestros servicios:\n\n"
+            "{% for service in services %}"
+            "{{ loop.index }}. {{ service.name }}"
+            "{% if service.duration_minutes %} ({{ service.duration_minutes }} min){% endif %}\n"
+            "{% endfor %}\n\n"
+            "¿Cuál te gustaría? Puedes decirme el número o el nombre del servicio."
+        ),
+        "services_selected": (
+            "Perfecto, tienes seleccionados: {{ services|join(', ') }}.\n\n"
+            "¿Quieres agregar otro servicio o continuamos con estos?"
+        ),
+        "stylist_list": (
+            "Nuestros estilistas disponibles son:\n\n"
+            "{% for stylist in stylists %}"
+            "{{ loop.index }}. {{ stylist.name }}\n"
+            "{% endfor %}\n"
+            "¿Con quién te gustaría la cita? Si no tienes preferencia, "
+            "puedo buscar disponibilidad con cualquiera de ellos."
+        ),
+        "pending_stylist_change": (
+            "El hueco más próximo es el {{ slot_date }} a las {{ slot_time }}, "
+            "pero sería con {{ pending_stylist_name }} en lugar de {{ current_stylist_name }}.\n\n"
+            "¿Te parece bien?"
+        ),
+        "slot_list": (
+            "Aquí están los horarios disponibles:\n\n"
+            "{% if soonest_any %}"
+            "1. ⚡ {{ soonest_any.day_name }} {{ soonest_any.date }} a las {{ soonest_any.time }} "
+            "(con {{ soonest_any.stylist_name }}) - PRÓXIMO DISPONIBLE\n"
+            "{% endif %}"
+            "{% for slot in selected_stylist_slots %}"
+            "{{ loop.index + 1 }}. {{ slot.day_name }} {{ slot.date }} a las {{ slot.time }} "
+            "(con {{ slot.stylist }})\n"
+            "{% endfor %}\n\n"
+            "{% if soonest_any and soonest_any.is_different_stylist %}"
+            "ℹ️ La opción 1 es con otro estilista. Si la eliges, te pediré confirmación.\n\n"
+            "{% endif %}"
+            "¿Cuál prefieres? Puedes decirme el número.\n\n"
+            "Si prefieres buscar otro día que te venga mejor, solo dímelo."
+        ),
+        "customer_name": "¿A qué nombre y apellidos agendo la reserva?",
+        "customer_notes": (
+            "Perfecto, {{ first_name }}. "
+            "¿Tienes alguna preferencia o nota especial para tu cita? "
+            "(Por ejemplo, alergias, preferencias de estilo, etc.). "
+            "Si no, podemos continuar."
+        ),
+        "customer_data_complete": "Perfecto, tengo todos tus datos. Vamos a confirmar la cita.",
+        "confirmation_summary": (
+            "Perfecto, aquí está el resumen de tu cita:\n\n"
+            "📅 Servicios: {{ services }}\n"
+            "💇 Estilista: {{ stylist_name }}\n"
+            "🕐 Fecha y hora: {{ date_time }}\n"
+            "👤 Nombre: {{ customer_name }}\n"
+            "📝 Notas: {{ notes }}\n\n"
+            "¿Confirmas la reserva?"
+        ),
+        "booked": (
+            "✅ ¡Listo! Tu cita ha sido confirmada.\n\n"
+            "📅 Fecha: {{ friendly_date }}\n"
+            "💇 Estilista: {{ stylist_name }}\n"
+            "✨ Servicios: {{ service_names }}\n\n"
+            "📍 Dirección: {{ salon_address }}\n\n"
+            "📲 Añade la cita a tu calendario:\n"
+            "{{ calendar_link }}\n\n"
+            "Te esperamos en la Peluquería Atrévete. "
+            "Si necesitas modificar o cancelar, no dudes en escribirnos.\n\n"
+            "¿Hay algo más en lo que pueda ayudarte?"
+        ),
+    }
+
     def __init__(self, conversation_id: str) -> None:
         """
         Initialize BookingFSM for a conversation.
@@ -1409,11 +1490,7 @@ class BookingFSM:
         """
         return FSMAction(
             action_type=ActionType.GENERATE_RESPONSE,
-            response_template=(
-                "¡Hola! Soy Maite, tu asistente virtual de la Peluquería Atrévete. "
-                "¿En qué puedo ayudarte hoy? Puedo ayudarte a reservar una cita, "
-                "consultar nuestros servicios, horarios, o cualquier duda que tengas."
-            ),
+            response_template=self.RESPONSE_TEMPLATES["greeting"],
             allow_llm_creativity=True,
         )
 
@@ -1444,14 +1521,7 @@ class BookingFSM:
                         required=True,
                     )
                 ],
-                response_template=(
-                    "¡Perfecto! Estos son algunos de nuestros servicios:\n\n"
-                    "{% for service in services %}"
-                    "{{ loop.index }}. {{ service.name }}"
-                    "{% if service.duration_minutes %} ({{ service.duration_minutes }} min){% endif %}\n"
-                    "{% endfor %}\n\n"
-                    "¿Cuál te gustaría? Puedes decirme el número o el nombre del servicio."
-                ),
+                response_template=self.RESPONSE_TEMPLATES["service_catalog"],
                 template_vars={"services": []},  # Will be populated by tool result
                 allow_llm_creativity=True,
             )
@@ -1459,10 +1529,7 @@ class BookingFSM:
             # Services selected - confirm or ask for more
             return FSMAction(
                 action_type=ActionType.GENERATE_RESPONSE,
-                response_template=(
-                    "Perfecto, tienes seleccionados: {{ services|join(', ') }}.\n\n"
-                    "¿Quieres agregar otro servicio o continuamos con estos?"
-                ),
+                response_template=self.RESPONSE_TEMPLATES["services_selected"],
                 template_vars={"services": services},
                 allow_llm_creativity=True,
             )
@@ -1489,14 +1556,7 @@ class BookingFSM:
                     required=True,
                 )
             ],
-            response_template=(
-                "Nuestros estilistas disponibles son:\n\n"
-                "{% for stylist in stylists %}"
-                "{{ loop.index }}. {{ stylist.name }}\n"
-                "{% endfor %}\n"
-                "¿Con quién te gustaría la cita? Si no tienes preferencia, "
-                "puedo buscar disponibilidad con cualquiera de ellos."
-            ),
+            response_template=self.RESPONSE_TEMPLATES["stylist_list"],
             allow_llm_creativity=True,
         )
 
@@ -1529,11 +1589,13 @@ class BookingFSM:
 
             return FSMAction(
                 action_type=ActionType.GENERATE_RESPONSE,
-                response_template=(
-                    f"El hueco más próximo es el {slot_date} a las {slot_time}, "
-                    f"pero sería con {pending_stylist_name} en lugar de {current_stylist_name}.\n\n"
-                    "¿Te parece bien?"
-                ),
+                response_template=self.RESPONSE_TEMPLATES["pending_stylist_change"],
+                template_vars={
+                    "slot_date": slot_date,
+                    "slot_time": slot_time,
+                    "pending_stylist_name": pending_stylist_name,
+                    "current_stylist_name": current_stylist_name,
+                },
                 allow_llm_creativity=True,
             )
 
@@ -1563,22 +1625,7 @@ class BookingFSM:
             ],
             # v4.3: Template shows soonest_any first, then selected stylist slots
             # Added message at end about searching other dates
-            response_template=(
-                "Aquí están los horarios disponibles:\n\n"
-                "{% if soonest_any %}"
-                "1. ⚡ {{ soonest_any.day_name }} {{ soonest_any.date }} a las {{ soonest_any.time }} "
-                "(con {{ soonest_any.stylist_name }}) - PRÓXIMO DISPONIBLE\n"
-                "{% endif %}"
-                "{% for slot in selected_stylist_slots %}"
-                "{{ loop.index + 1 }}. {{ slot.day_name }} {{ slot.date }} a las {{ slot.time }} "
-                "(con {{ slot.stylist }})\n"
-                "{% endfor %}\n\n"
-                "{% if soonest_any and soonest_any.is_different_stylist %}"
-                "ℹ️ La opción 1 es con otro estilista. Si la eliges, te pediré confirmación.\n\n"
-                "{% endif %}"
-                "¿Cuál prefieres? Puedes decirme el número.\n\n"
-                "Si prefieres buscar otro día que te venga mejor, solo dímelo."
-            ),
+            response_template=self.RESPONSE_TEMPLATES["slot_list"],
             template_vars={
                 "soonest_any": None,  # Will be populated by tool result
                 "selected_stylist_slots": [],  # Will be populated by tool result
@@ -1605,19 +1652,14 @@ class BookingFSM:
             # Phase 1: Collect name and surname for booking
             return FSMAction(
                 action_type=ActionType.GENERATE_RESPONSE,
-                response_template="¿A qué nombre y apellidos agendo la reserva?",
+                response_template=self.RESPONSE_TEMPLATES["customer_name"],
                 allow_llm_creativity=True,
             )
         elif not notes_asked:
             # Phase 2: Ask for notes
             return FSMAction(
                 action_type=ActionType.GENERATE_RESPONSE,
-                response_template=(
-                    "Perfecto, {{ first_name }}. "
-                    "¿Tienes alguna preferencia o nota especial para tu cita? "
-                    "(Por ejemplo, alergias, preferencias de estilo, etc.). "
-                    "Si no, podemos continuar."
-                ),
+                response_template=self.RESPONSE_TEMPLATES["customer_notes"],
                 template_vars={"first_name": first_name},
                 allow_llm_creativity=True,
             )
@@ -1626,7 +1668,7 @@ class BookingFSM:
             # This shouldn't be reached, but provide fallback
             return FSMAction(
                 action_type=ActionType.GENERATE_RESPONSE,
-                response_template="Perfecto, tengo todos tus datos. Vamos a confirmar la cita.",
+                response_template=self.RESPONSE_TEMPLATES["customer_data_complete"],
                 allow_llm_creativity=True,
             )
 
@@ -1673,15 +1715,7 @@ class BookingFSM:
 
         return FSMAction(
             action_type=ActionType.GENERATE_RESPONSE,
-            response_template=(
-                "Perfecto, aquí está el resumen de tu cita:\n\n"
-                "📅 Servicios: {{ services }}\n"
-                "💇 Estilista: {{ stylist_name }}\n"
-                "🕐 Fecha y hora: {{ date_time }}\n"
-                "👤 Nombre: {{ customer_name }}\n"
-                "📝 Notas: {{ notes }}\n\n"
-                "¿Confirmas la reserva?"
-            ),
+            response_template=self.RESPONSE_TEMPLATES["confirmation_summary"],
             template_vars=summary_data,
             allow_llm_creativity=True,
         )
@@ -1725,20 +1759,12 @@ class BookingFSM:
                         "conversation_id": str(conversation_id) if conversation_id else None,
                     },
                     required=True,
+                    # No timeout: cancelling would interrupt the DB transaction
+                    # or the Google Calendar sync halfway through
+                    timeout_seconds=None,
                 )
             ],
-            response_template=(
-                "✅ ¡Listo! Tu cita ha sido confirmada.\n\n"
-                "📅 Fecha: {{ friendly_date }}\n"
-                "💇 Estilista: {{ stylist_name }}\n"
-                "✨ Servicios: {{ service_names }}\n\n"
-                "📍 Dirección: {{ salon_address }}\n\n"
-                "📲 Añade la cita a tu calendario:\n"
-                "{{ calendar_link }}\n\n"
-                "Te esperamos en la Peluquería Atrévete. "
-                "Si necesitas modificar o cancelar, no dudes en escribirnos.\n\n"
-                "¿Hay algo más en lo que pueda ayudarte?"
-            ),
+            response_template=self.RESPONSE_TEMPLATES["booked"],
             template_vars={},  # Will be populated by flattened tool result
             allow_llm_creativity=True,
         )
@@ -0,0 +1,393 @@
+"""
+Fast-path Intent Classifier - Deterministic NLU for unambiguous messages.
+
+Runs before the LLM in extract_intent(). A large share of turns are short
+replies whose meaning is fixed by the FSM state: "1" after a numbered list,
+"sí" on the booking summary, "eso es todo" after choosing services, "cancelar"
+mid-booking. Those are classified here with rules and lexicons (the same
+knowledge already encoded in INTENT_SYNONYMS and the selection helpers of the
+confirmation/cancellation services) and never reach OpenRouter.
+
+Design rules:
+- Whole-message matches only: a message is classified when, after
+  normalization, it consists entirely of known words/phrases. Anything with
+  extra content goes to the LLM.
+- State-aware: a rule only fires in the states where its meaning is certain
+  (e.g. "sí" is CONFIRM_BOOKING in CONFIRMATION but ambiguous in IDLE).
+- Entities are produced in the same shape as _parse_llm_response() (slot dict,
+  stylist_id), so the FSM cannot tell which path classified the message.
+- When unsure, return None and let the LLM decide.
+
+Hit-rate metrics are kept per process (get_fast_path_stats()).
+"""
+
+import logging
+import re
+import unicodedata
+from collections import Counter
+from typing import Any
+
+from agent.fsm.intent_extractor import (
+    INTENT_SYNONYMS,
+    _load_stylist_cache,
+    get_stylist_id_by_name,
+)
+from agent.fsm.models import BookingState, Intent, IntentType
+from agent.services.cancellation_service import detect_number_selection
+
+logger = logging.getLogger(__name__)
+
+# Confidence reported for rule-based classifications
+FAST_PATH_CONFIDENCE = 0.98
+
+# Words that carry no intent and are dropped before matching
+FILLER_PHRASES: tuple[str, ...] = (
+    "muchas gracias", "por favor", "gracias", "porfa", "porfavor", "pues",
+    "entonces", "bueno",
+)
+
+# Multi-word expressions matched as a single token (joined with "_")
+_COMPOUND_PHRASES: tuple[str, ...] = (
+    "de acuerdo", "esta bien", "me parece bien", "por supuesto", "claro que si",
+    "mejor no", "no quiero", "eso es todo", "nada mas", "solo eso", "ya esta",
+    "muchas gracias", "buenos dias", "buenas tardes", "buenas noches",
+    "hasta luego", "hasta pronto",
+)
+
+AFFIRMATIVE_WORDS: frozenset[str] = frozenset({
+    "si", "vale", "ok", "okay", "okey", "dale", "perfecto", "confirmo", "confirmado",
+    "confirmar", "correcto", "claro", "adelante", "procede", "venga", "exacto", "genial",
+    "de_acuerdo", "esta_bien", "me_parece_bien", "por_supuesto", "claro_que_si",
+})
+
+NEGATIVE_WORDS: frozenset[str] = frozenset({"no", "nop", "mejor_no", "no_quiero"})
+
+# Explicit cancellation of the booking in progress (any booking state)
+CANCEL_WORDS: frozenset[str] = frozenset({
+    "cancelar", "cancela", "cancelalo", "cancelala", "cancelo", "cancelar reserva",
+    "cancela la reserva", "cancelar la reserva", "dejalo", "dejarlo", "olvidalo",
+})
+
+# "Done choosing services": the confirm_services synonyms plus common variants
+CONFIRM_SERVICES_PHRASES: frozenset[str] = frozenset(
+    {key for key, value in INTENT_SYNONYMS.items() if value == "confirm_services"}
+    | {"eso es todo", "nada mas", "solo eso", "ya esta", "no nada mas", "no eso es todo"}
+)
+
+GREETING_WORDS: frozenset[str] = frozenset({
+    "hola", "holi", "buenas", "hey", "saludos", "buenos_dias", "buenas_tardes",
+    "buenas_noches",
+})
+
+# Thanks and farewells, answered like greetings once a booking is done
+FAREWELL_WORDS: frozenset[str] = frozenset({
+    "adios", "hasta_luego", "hasta_pronto", "chao", "ciao", "gracias", "muchas_gracias",
+})
+
+# Explicit requests for a human (matched anywhere in the message)
+ESCALATION_PHRASES: tuple[str, ...] = (
+    "hablar con una persona", "hablar con un humano", "hablar con alguien",
+    "hablar con un empleado", "hablar con una empleada", "persona real",
+    "agente humano", "atencion humana",
+)
+
+# Masculine ordinals for stylist/slot lists (detect_number_selection covers
+# the feminine forms used for appointments)
+_ORDINALS: dict[str, int] = {
+    "el primero": 1, "primero": 1, "el segundo": 2, "segundo": 2, "el tercero": 3,
+    "tercero": 3, "el cuarto": 4, "cuarto": 4, "el quinto": 5, "quinto": 5,
+}
+
+_NUMBER_RE = re.compile(r"^(?:(?:el|la|opcion|numero|num|n)\s+)*(\d{1,2})$")
+_TIME_RE = re.compile(r"^(?:a\s+)?(?:las\s+|la\s+)?(\d{1,2})[:.h](\d{2})(?:\s*h)?$")
+_LIST_ITEM_RE = re.compile(r"^\s*(\d{1,2})[.)]\s+(.+?)\s*$", re.MULTILINE)
+_REPEATED_CHAR_RE = re.compile(r"(\w)\1{2,}")
+
+_BOOKING_STATES = frozenset({
+    BookingState.SERVICE_SELECTION,
+    BookingState.STYLIST_SELECTION,
+    BookingState.SLOT_SELECTION,
+    BookingState.CUSTOMER_DATA,
+    BookingState.CONFIRMATION,
+})
+
+# Process-wide hit-rate metrics
+_attempts = 0
+_hits: Counter = Counter()
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a message for lexicon matching.
+
+    Lowercases, strips accents, emojis and punctuation, and collapses
+    stretched letters ("siii" → "si", "holaaaa" → "hola").
+    """
+    text = unicodedata.normalize("NFKD", message.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w\s:]", " ", text)
+    text = _REPEATED_CHAR_RE.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def _strip_fillers(text: str) -> str:
+    for filler in FILLER_PHRASES:
+        text = re.sub(rf"\b{filler}\b", " ", text)
+    return " ".join(text.split())
+
+
+def _tokens(text: str) -> list[str]:
+    """Split into tokens, keeping known multi-word expressions together."""
+    for phrase in _COMPOUND_PHRASES:
+        text = re.sub(rf"\b{phrase}\b", phrase.replace(" ", "_"), text)
+    return text.replace(":", " ").split()
+
+
+def _all_in(tokens: list[str], vocabulary: frozenset[str]) -> bool:
+    return bool(tokens) and all(token in vocabulary for token in tokens)
+
+
+def _is_affirmative(text: str) -> bool:
+    tokens = _tokens(_strip_fillers(text))
+    return _all_in(tokens, AFFIRMATIVE_WORDS)
+
+
+def _is_negative(text: str) -> bool:
+    tokens = _tokens(_strip_fillers(text))
+    return _all_in(tokens, NEGATIVE_WORDS)
+
+
+def _is_cancel(text: str) -> bool:
+    return _strip_fillers(text) in CANCEL_WORDS
+
+
+def _parse_selection_number(text: str) -> int | None:
+    """Parse "2", "el 2", "opción 2", "la segunda", "el segundo"."""
+    text = _strip_fillers(text)
+    match = _NUMBER_RE.match(text)
+    if match:
+        return int(match.group(1))
+    if text in _ORDINALS:
+        return _ORDINALS[text]
+    # "dos", "la segunda" (longer messages such as "2 por la tarde" go to the LLM)
+    words = text.split()
+    if len(words) == 1 or (len(words) == 2 and words[0] == "la"):
+        return detect_number_selection(text)
+    return None
+
+
+def _last_assistant_message(conversation_history: list[dict[str, Any]]) -> str:
+    for msg in reversed(conversation_history):
+        if msg.get("role") == "assistant":
+            return msg.get("content", "") or ""
+    return ""
+
+
+def _numbered_items(text: str) -> dict[int, str]:
+    """Extract "N. Item" lines from an assistant message (templates number lists this way)."""
+    items: dict[int, str] = {}
+    for number, label in _LIST_ITEM_RE.findall(text):
+        # Drop decorations: "Pilar (especialista en color)" → "Pilar"
+        items[int(number)] = re.split(r"\s[(\-–]", label.strip("*_ "), maxsplit=1)[0].strip()
+    return items
+
+
+def _slot_entity(shown_slot: dict[str, Any]) -> dict[str, Any]:
+    """Build the slot entity the FSM expects from an entry of slots_shown."""
+    slot: dict[str, Any] = {
+        "start_time": shown_slot["full_datetime"],
+        "duration_minutes": 0,  # Synchronized by FSM when entering CUSTOMER_DATA
+    }
+    if shown_slot.get("stylist_id"):
+        slot["stylist_id"] = shown_slot["stylist_id"]
+        slot["stylist_name"] = shown_slot.get("stylist_name") or shown_slot.get("stylist")
+    if shown_slot.get("is_soonest_any"):
+        slot["is_soonest_any"] = True
+    return slot
+
+
+def _slot_for_option(slots_shown: list[dict[str, Any]], number: int) -> dict[str, Any] | None:
+    """
+    Map a displayed option number to its slots_shown entry.
+
+    The slot template always numbers the selected stylist's slots from 2;
+    option 1 is the "soonest with anyone" slot and only exists when shown.
+    """
+    offset = 1 if slots_shown and slots_shown[0].get("is_soonest_any") else 2
+    index = number - offset
+    if 0 <= index < len(slots_shown):
+        return slots_shown[index]
+    return None
+
+
+def _make_intent(
+    intent_type: IntentType, message: str, entities: dict[str, Any] | None = None
+) -> Intent:
+    return Intent(
+        type=intent_type,
+        entities=entities or {},
+        confidence=FAST_PATH_CONFIDENCE,
+        raw_message=message,
+    )
+
+
+async def _classify_stylist_selection(
+    text: str, message: str, conversation_history: list[dict[str, Any]]
+) -> Intent | None:
+    number = _parse_selection_number(text)
+    if number is not None:
+        stylist_name = _numbered_items(_last_assistant_message(conversation_history)).get(number)
+        if not stylist_name:
+            return None
+        stylist_id = await get_stylist_id_by_name(stylist_name)
+        if not stylist_id:
+            return None
+        return _make_intent(
+            IntentType.SELECT_STYLIST,
+            message,
+            {"selection_number": number, "stylist_name": stylist_name, "stylist_id": stylist_id},
+        )
+
+    # Exact stylist name ("Pilar", "con Pilar"); partial matches go to the LLM
+    name = _strip_fillers(text)
+    name = name[4:] if name.startswith("con ") else name
+    stylist_id = (await _load_stylist_cache()).get(name)
+    if stylist_id:
+        return _make_intent(
+            IntentType.SELECT_STYLIST,
+            message,
+            {"stylist_name": name.title(), "stylist_id": stylist_id},
+        )
+    return None
+
+
+def _classify_slot_selection(
+    text: str, message: str, collected_data: dict[str, Any]
+) -> Intent | None:
+    if collected_data.get("pending_stylist_change"):
+        if _is_affirmative(text):
+            return _make_intent(IntentType.CONFIRM_STYLIST_CHANGE, message)
+        return None
+
+    slots_shown = collected_data.get("slots_shown") or []
+    if not slots_shown:
+        return None
+
+    number = _parse_selection_number(text)
+    if number is not None:
+        shown_slot = _slot_for_option(slots_shown, number)
+        if shown_slot and shown_slot.get("full_datetime"):
+            return _make_intent(
+                IntentType.SELECT_SLOT,
+                message,
+                {"selection_number": number, "slot": _slot_entity(shown_slot)},
+            )
+        return None
+
+    match = _TIME_RE.match(_strip_fillers(text))
+    if match:
+        slot_time = f"{int(match.group(1)):02d}:{match.group(2)}"
+        matching = [s for s in slots_shown if s.get("time") == slot_time and s.get("full_datetime")]
+        # Same hour shown twice (e.g. on two days) is ambiguous
+        if len(matching) == 1:
+            return _make_intent(
+                IntentType.SELECT_SLOT, message, {"slot": _slot_entity(matching[0])}
+            )
+    return None
+
+
+async def classify_fast_path(
+    message: str,
+    current_state: BookingState,
+    collected_data: dict[str, Any],
+    conversation_history: list[dict[str, Any]],
+) -> Intent | None:
+    """
+    Classify a message without the LLM when its meaning is unambiguous.
+
+    Args:
+        message: User's raw message text
+        current_state: Current FSM state
+        collected_data: Data accumulated so far in the booking flow
+        conversation_history: Recent conversation messages (numbered lists)
+
+    Returns:
+        High-confidence Intent, or None if the LLM must decide
+    """
+    global _attempts
+
+    _attempts += 1
+    intent = await _classify(message, current_state, collected_data, conversation_history)
+    if intent is not None:
+        _hits[intent.type.value] += 1
+        logger.info(
+            f"Fast-path intent | state={current_state.value} | type={intent.type.value} "
+            f"| entities={list(intent.entities.keys())} "
+            f"| hit_rate={get_fast_path_stats()['hit_rate']:.2f}"
+        )
+    return intent
+
+
+async def _classify(
+    message: str,
+    current_state: BookingState,
+    collected_data: dict[str, Any],
+    conversation_history: list[dict[str, Any]],
+) -> Intent | None:
+    text = normalize_message(message)
+    if not text or len(text) > 80:
+        return None
+
+    if any(phrase in text for phrase in ESCALATION_PHRASES) and "no" not in text.split():
+        return _make_intent(IntentType.ESCALATE, message)
+
+    if current_state in _BOOKING_STATES and _is_cancel(text):
+        return _make_intent(IntentType.CANCEL_BOOKING, message)
+
+    if current_state == BookingState.CONFIRMATION:
+        if _is_affirmative(text):
+            return _make_intent(IntentType.CONFIRM_BOOKING, message)
+        if _is_negative(text):
+            return _make_intent(IntentType.CANCEL_BOOKING, message)
+        return None
+
+    if current_state == BookingState.SERVICE_SELECTION:
+        if collected_data.get("services") and _strip_fillers(text) in CONFIRM_SERVICES_PHRASES:
+            return _make_intent(IntentType.CONFIRM_SERVICES, message)
+        # Numbers may refer to a service or a stylist list here: LLM decides
+        return None
+
+    if current_state == BookingState.STYLIST_SELECTION:
+        return await _classify_stylist_selection(text, message, conversation_history)
+
+    if current_state == BookingState.SLOT_SELECTION:
+        return _classify_slot_selection(text, message, collected_data)
+
+    if current_state in (BookingState.IDLE, BookingState.BOOKED):
+        tokens = _tokens(text)
+        vocabulary = GREETING_WORDS
+        if current_state == BookingState.BOOKED:
+            vocabulary = GREETING_WORDS | FAREWELL_WORDS
+        if _all_in(tokens, vocabulary):
+            return _make_intent(IntentType.GREETING, message)
+
+    # CUSTOMER_DATA sub-phases and IDLE confirmations depend on the last bot question
+    return None
+
+
+def get_fast_path_stats() -> dict[str, Any]:
+    """Return fast-path metrics for logging and health checks."""
+    hits = sum(_hits.values())
+    return {
+        "attempts": _attempts,
+        "hits": hits,
+        "hit_rate": hits / _attempts if _attempts else 0.0,
+        "hits_by_intent": dict(_hits),
+    }
+
+
+def reset_fast_path_stats() -> None:
+    """Reset fast-path metrics (tests)."""
+    global _attempts
+    _attempts = 0
+    _hits.clear()
@@ -7,8 +7,10 @@ decision-making power from the LLM.
 
 Key components:
 - FSMAction: Prescriptive action specification (tools + response template)
-- ToolCall: Single tool call specification with args
+- ToolCall: Single tool call specification with args, dependencies and timeout
 - ActionType: Types of actions FSM can prescribe
+- execution_waves(): Groups tool calls into waves of independent calls that
+  the handler runs concurrently
 
 Usage:
     action = FSMAction(
@@ -23,6 +25,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+# Default per-tool timeout for prescribed tool calls
+DEFAULT_TOOL_TIMEOUT_SECONDS = 30.0
+
 
 class ActionType(str, Enum):
     """Types of actions FSM can prescribe."""
@@ -49,6 +54,11 @@ class ToolCall:
         name: Tool name (e.g., "search_services", "find_next_available")
         args: Tool arguments dict (built from FSM collected_data)
         required: If True, fail fast on error; if False, log and continue
+        depends_on: Names of earlier tool calls that must finish first.
+                    Calls without dependencies on each other run concurrently.
+        timeout_seconds: Maximum execution time (a timeout is a tool failure).
+                         None runs the tool to completion: use it for writes
+                         that must not be cancelled halfway (e.g. book)
 
     Example:
         >>> ToolCall(
@@ -61,6 +71,44 @@ class ToolCall:
     name: str
     args: dict[str, Any]
     required: bool = True
+    depends_on: tuple[str, ...] = ()
+    timeout_seconds: float | None = DEFAULT_TOOL_TIMEOUT_SECONDS
+
+
+def execution_waves(tool_calls: list[ToolCall]) -> list[list[ToolCall]]:
+    """
+    Group tool calls into waves that can each run concurrently.
+
+    A call goes in the wave after the latest wave of its dependencies. Order
+    within a wave follows the prescribed order.
+
+    Args:
+        tool_calls: Tool calls in prescribed order
+
+    Returns:
+        List of waves (lists of tool calls), to be run one after another
+
+    Raises:
+        ValueError: If a call depends on a tool that is not prescribed before it
+    """
+    waves: list[list[ToolCall]] = []
+    wave_of: dict[str, int] = {}
+
+    for tool_call in tool_calls:
+        unknown = [name for name in tool_call.depends_on if name not in wave_of]
+        if unknown:
+            raise ValueError(
+                f"Tool call '{tool_call.name}' depends on {unknown}, "
+                f"which are not prescribed before it"
+            )
+
+        wave = max((wave_of[name] + 1 for name in tool_call.depends_on), default=0)
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(tool_call)
+        wave_of[tool_call.name] = max(wave_of.get(tool_call.name, 0), wave)
+
+    return waves
 
 
 @dataclass
@@ -141,6 +189,9 @@ class FSMAction:
                 f"(only {ActionType.CALL_TOOLS_SEQUENCE} allows tools)"
             )
 
+        # Validate dependencies point to earlier tool calls
+        execution_waves(self.tool_calls)
+
     def to_dict(self) -> dict[str, Any]:
         """
         Serialize FSMAction to dict for logging/debugging.
@@ -151,7 +202,13 @@ class FSMAction:
         return {
             "action_type": self.action_type.value,
             "tool_calls": [
-                {"name": tc.name, "args": tc.args, "required": tc.required}
+                {
+                    "name": tc.name,
+                    "args": tc.args,
+                    "required": tc.required,
+                    "depends_on": list(tc.depends_on),
+                    "timeout_seconds": tc.timeout_seconds,
+                }
                 for tc in self.tool_calls
             ],
             "response_template": self.response_template,
@@ -173,7 +230,13 @@ class FSMAction:
         return cls(
             action_type=ActionType(data["action_type"]),
             tool_calls=[
-                ToolCall(name=tc["name"], args=tc["args"], required=tc.get("required", True))
+                ToolCall(
+                    name=tc["name"],
+                    args=tc["args"],
+                    required=tc.get("required", True),
+                    depends_on=tuple(tc.get("depends_on", ())),
+                    timeout_seconds=tc.get("timeout_seconds", DEFAULT_TOOL_TIMEOUT_SECONDS),
+                )
                 for tc in data.get("tool_calls", [])
             ],
             response_template=data.get("response_template"),
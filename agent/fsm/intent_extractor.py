@@ -9,6 +9,8 @@ Key responsibilities:
 - Provide state-aware disambiguation (e.g., "1" means different things in different states)
 - Extract relevant entities (service names, numbers, customer data)
 - Return structured Intent objects for FSM validation
+- Optionally draft the reply in the same call (single-call NLU mode, enabled
+  per FSM state via NLU_SINGLE_CALL_STATES); get_nlu_stats() reports both modes
 
 Architecture (ADR-006):
     LLM (NLU)      → Interpreta INTENCIÓN + Genera LENGUAJE
@@ -34,6 +36,8 @@ from agent.fsm.models import BookingState, Intent, IntentType
 from database.connection import get_async_session
 from database.models import Stylist
 from shared.config import get_settings
+from shared.llm_clients import LLMPurpose
+from shared.llm_hedging import get_hedged_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +58,29 @@ MADRID_TZ = ZoneInfo("Europe/Madrid")
 # Confidence threshold below which we return UNKNOWN
 MIN_CONFIDENCE_THRESHOLD = 0.7
 
+# Single-call NLU mode: the extraction call also drafts the reply
+NLU_MODE_INTENT = "intent"
+NLU_MODE_INTENT_AND_REPLY = "intent_and_reply"
+
+DRAFT_REPLY_INSTRUCTIONS = """
+
+MODO RESPUESTA ÚNICA:
+Además de la intención, redacta la respuesta que Maite enviaría al usuario, siguiendo
+las instrucciones del mensaje de sistema. Añade al JSON el campo:
+    "draft_reply": "texto de la respuesta" o null
+
+- Redacta draft_reply SOLO para greeting, faq o unknown.
+- En esta llamada NO tienes herramientas: si responder requiere consultar servicios,
+  precios o citas, actualizar datos del cliente, o escalar a una persona, usa null.
+- Para cualquier otra intención usa null (la respuesta la genera el flujo de reservas).
+- NO inventes información que no esté en el contexto."""
+
+# Intents whose reply may be the single-call draft (no FSM transition, no tools)
+DRAFT_REPLY_INTENTS = {IntentType.GREETING, IntentType.FAQ, IntentType.UNKNOWN}
+
+# Per-mode latency/token metrics (process-wide)
+_nlu_stats: dict[str, dict[str, float]] = {}
+
 
 def _normalize_start_time_timezone(start_time: str) -> str:
     """
@@ -289,23 +316,11 @@ def _get_llm_client() -> ChatOpenAI:
     """
     Get LLM client for intent extraction.
 
-    Uses same OpenRouter configuration as conversational_agent but with lower temperature
-    for more deterministic intent classification.
+    Long-lived registry client (shared connection pool) with lower temperature
+    for more deterministic intent classification, hedged with the backup model
+    when LLM_HEDGE_MODEL is set.
     """
-    settings = get_settings()
-
-    return ChatOpenAI(
-        model=settings.LLM_MODEL,
-        api_key=settings.OPENROUTER_API_KEY,
-        base_url="https://openrouter.ai/api/v1",
-        temperature=0.1,  # Low temperature for deterministic classification
-        request_timeout=15.0,  # 15s timeout for intent extraction (simple task)
-        max_retries=2,  # Retry 2x on transient failures
-        default_headers={
-            "HTTP-Referer": settings.SITE_URL,
-            "X-Title": settings.SITE_NAME,
-        },
-    )
+    return get_hedged_llm_client(LLMPurpose.INTENT)
 
 
 def _build_state_context(
@@ -514,6 +529,7 @@ def _build_extraction_prompt(
     current_state: BookingState,
     collected_data: dict[str, Any],
     conversation_history: list[dict[str, Any]],
+    with_draft_reply: bool = False,
 ) -> str:
     """
     Build the complete prompt for intent extraction.
@@ -522,6 +538,10 @@ def _build_extraction_prompt(
     1. Be state-aware for disambiguation
     2. Include recent conversation context
     3. Output structured JSON for reliable parsing
+    4. Start with the static instructions, so consecutive calls share a
+       cacheable prefix (state, history and message come last)
+
+    With with_draft_reply, the JSON also carries a draft reply (single-call mode).
     """
     state_context = _build_state_context(current_state, collected_data)
 
@@ -542,15 +562,11 @@ def _build_extraction_prompt(
             recent_parts.append(f"{role}: {content}")
         recent_context = "\n".join(recent_parts)
 
-    return f"""Eres un analizador de intenciones para un bot de reservas de peluquería.
-Tu ÚNICA tarea es identificar la intención del usuario y extraer entidades relevantes.
-
-{state_context}
+    draft_reply_instructions = DRAFT_REPLY_INSTRUCTIONS if with_draft_reply else ""
 
-CONTEXTO RECIENTE DE LA CONVERSACIÓN:
-{recent_context if recent_context else "Primera interacción"}
-
-MENSAJE DEL USUARIO: "{message}"
+    # Static instructions first, turn-specific context last (prompt caching)
+    prompt = f"""Eres un analizador de intenciones para un bot de reservas de peluquería.
+Tu ÚNICA tarea es identificar la intención del usuario y extraer entidades relevantes.
 
 INSTRUCCIONES:
 1. Analiza el mensaje considerando el ESTADO ACTUAL
@@ -648,9 +664,19 @@ EXTRACCIÓN DE service_query (SIEMPRE rellenar cuando intent=start_booking o int
   * "Quiero hacerme las uñas" → service_query: "uñas manicura"
   * "Quiero depilarme las cejas" → service_query: "depilación cejas"
 - Si no hay servicio específico mencionado, dejar vacío: service_query: ""
+{draft_reply_instructions}
+
+{state_context}
+
+CONTEXTO RECIENTE DE LA CONVERSACIÓN:
+{recent_context if recent_context else "Primera interacción"}
+
+MENSAJE DEL USUARIO: "{message}"
 
 Responde SOLO con el JSON, sin explicaciones adicionales."""
 
+    return prompt
+
 
 async def _parse_llm_response(response_text: str, raw_message: str) -> Intent:
     """
@@ -861,6 +887,11 @@ async def _parse_llm_response(response_text: str, raw_message: str) -> Intent:
             service_query = service_query.strip()
             logger.info(f"Extracted service_query: '{service_query}'")
 
+        # Draft reply (single-call mode only)
+        draft_reply = data.get("draft_reply")
+        if not isinstance(draft_reply, str) or not draft_reply.strip():
+            draft_reply = None
+
         # If confidence below threshold, return UNKNOWN
         if confidence < MIN_CONFIDENCE_THRESHOLD:
             logger.info(
@@ -881,6 +912,7 @@ async def _parse_llm_response(response_text: str, raw_message: str) -> Intent:
             confidence=confidence,
             raw_message=raw_message,
             service_query=service_query or None,
+            draft_reply=draft_reply,
         )
 
     except (json.JSONDecodeError, KeyError, TypeError) as e:
@@ -898,10 +930,15 @@ async def extract_intent(
     current_state: BookingState,
     collected_data: dict[str, Any],
     conversation_history: list[dict[str, Any]],
+    reply_system_prompt: str | None = None,
 ) -> Intent:
     """
     Extract user intent from message using LLM with state-aware disambiguation.
 
+    Messages whose meaning is fixed by the FSM state are first classified by
+    the deterministic fast path (see fast_intent_classifier); only the rest
+    reach the LLM.
+
     The LLM receives context about the current FSM state to correctly interpret
     ambiguous messages (e.g., "1" in SERVICE_SELECTION vs "1" in SLOT_SELECTION).
 
@@ -910,6 +947,8 @@ async def extract_intent(
         current_state: Current FSM state for disambiguation
         collected_data: Data accumulated so far in the booking flow
         conversation_history: Recent conversation messages for context
+        reply_system_prompt: Enables single-call mode: the same LLM call, with
+            this system prompt, also drafts the reply (Intent.draft_reply)
 
     Returns:
         Intent object with type, entities, confidence, and raw_message.
@@ -933,34 +972,75 @@ async def extract_intent(
         f"Extracting intent | state={current_state.value} | message={message[:50]}..."
     )
 
+    # Unambiguous messages ("1", "sí", "cancelar") are classified without the LLM
+    if get_settings().INTENT_FAST_PATH_ENABLED:
+        # Imported here: the fast-path classifier builds on this module
+        from agent.fsm.fast_intent_classifier import classify_fast_path
+
+        try:
+            fast_intent = await classify_fast_path(
+                message, current_state, collected_data, conversation_history
+            )
+        except Exception as e:
+            logger.warning(f"Fast-path intent classification failed, using LLM: {e}")
+            fast_intent = None
+
+        if fast_intent is not None:
+            return fast_intent
+
+    with_draft_reply = reply_system_prompt is not None
+    mode = NLU_MODE_INTENT_AND_REPLY if with_draft_reply else NLU_MODE_INTENT
+
     try:
         # Build prompt
         prompt = _build_extraction_prompt(
-            message, current_state, collected_data, conversation_history
+            message,
+            current_state,
+            collected_data,
+            conversation_history,
+            with_draft_reply=with_draft_reply,
         )
 
         # Get LLM client
         llm = _get_llm_client()
 
         # Invoke LLM
+        if with_draft_reply:
+            system_content = (
+                f"{reply_system_prompt}\n\n"
+                "En este turno actúas también como analizador de intenciones. "
+                "Responde SOLO en JSON."
+            )
+        else:
+            system_content = "Eres un analizador de intenciones. Responde SOLO en JSON."
         response = await llm.ainvoke(
             [
-                SystemMessage(
-                    content="Eres un analizador de intenciones. Responde SOLO en JSON."
-                ),
+                SystemMessage(content=system_content),
                 HumanMessage(content=prompt),
             ]
         )
 
         # Parse response (async to support dynamic stylist lookup)
         intent = await _parse_llm_response(response.content, message)
+        if not with_draft_reply:
+            intent.draft_reply = None
 
         # Log latency and result
         latency_ms = (time.time() - start_time) * 1000
+        usage = getattr(response, "usage_metadata", None) or {}
+        _record_nlu_call(mode, latency_ms, usage)
 
         logger.info(
             f"Intent extracted | type={intent.type.value} | confidence={intent.confidence:.2f} "
-            f"| latency={latency_ms:.0f}ms | entities={list(intent.entities.keys())}"
+            f"| latency={latency_ms:.0f}ms | entities={list(intent.entities.keys())} "
+            f"| mode={mode} | draft_reply={intent.draft_reply is not None}",
+            extra={
+                "nlu_mode": mode,
+                "latency_ms": round(latency_ms),
+                "input_tokens": usage.get("input_tokens"),
+                "output_tokens": usage.get("output_tokens"),
+                "cached_tokens": (usage.get("input_token_details") or {}).get("cache_read"),
+            },
         )
 
         return intent
@@ -968,6 +1048,7 @@ async def extract_intent(
     except Exception as e:
         # Fallback to UNKNOWN on any error - never raise exceptions
         latency_ms = (time.time() - start_time) * 1000
+        _record_nlu_call(mode, latency_ms, {}, failed=True)
 
         logger.error(
             f"Intent extraction failed | error={str(e)} | latency={latency_ms:.0f}ms",
@@ -980,3 +1061,56 @@ async def extract_intent(
             confidence=0.0,
             raw_message=message,
         )
+
+
+def _mode_stats(mode: str) -> dict[str, float]:
+    stats = _nlu_stats.get(mode)
+    if stats is None:
+        stats = _nlu_stats[mode] = {
+            "calls": 0, "failures": 0, "latency_ms": 0.0, "input_tokens": 0, "output_tokens": 0,
+        }
+        if mode == NLU_MODE_INTENT_AND_REPLY:
+            stats.update(drafts_used=0, drafts_discarded=0)
+    return stats
+
+
+def _record_nlu_call(
+    mode: str, latency_ms: float, usage: dict[str, Any], failed: bool = False
+) -> None:
+    """Accumulate latency and token usage of one NLU call."""
+    stats = _mode_stats(mode)
+    stats["calls"] += 1
+    stats["failures"] += int(failed)
+    stats["latency_ms"] += latency_ms
+    stats["input_tokens"] += usage.get("input_tokens") or 0
+    stats["output_tokens"] += usage.get("output_tokens") or 0
+
+
+def record_draft_reply_outcome(used: bool) -> None:
+    """Count single-call drafts sent to the user vs discarded (FSM/tools took over)."""
+    stats = _mode_stats(NLU_MODE_INTENT_AND_REPLY)
+    stats["drafts_used" if used else "drafts_discarded"] += 1
+
+
+def get_nlu_stats() -> dict[str, dict[str, float]]:
+    """
+    Return per-mode NLU metrics (calls, average latency and tokens, drafts).
+
+    Returns:
+        Dict keyed by mode ("intent", "intent_and_reply")
+    """
+    summary: dict[str, dict[str, float]] = {}
+    for mode, stats in _nlu_stats.items():
+        calls = stats["calls"] or 1
+        summary[mode] = {
+            **stats,
+            "avg_latency_ms": stats["latency_ms"] / calls,
+            "avg_input_tokens": stats["input_tokens"] / calls,
+            "avg_output_tokens": stats["output_tokens"] / calls,
+        }
+    return summary
+
+
+def reset_nlu_stats() -> None:
+    """Reset NLU metrics (tests)."""
+    _nlu_stats.clear()
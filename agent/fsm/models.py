@@ -133,6 +133,9 @@ class Intent:
         tool_name: Name of the tool to call (if requires_tool is True)
         service_query: Cleaned service keywords extracted by LLM for search
                       (e.g., "mechas" from "Holaaa quiero hacerme las mechas")
+        draft_reply: Reply drafted in the same LLM call as the intent
+                     (single-call NLU mode); only used if the turn needs no
+                     tools and no FSM transition
     """
 
     type: IntentType
@@ -142,6 +145,7 @@ class Intent:
     requires_tool: bool = False
     tool_name: str | None = None
     service_query: str | None = None
+    draft_reply: str | None = None
 
 
 @dataclass
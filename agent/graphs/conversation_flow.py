@@ -18,16 +18,17 @@ import re
 from typing import Any
 from uuid import UUID
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from sqlalchemy import select
 
+from agent.batching.speculation import get_prefetched_turn
 from agent.nodes.conversational_agent import conversational_agent
-from agent.nodes.summarization import summarize_conversation
 from agent.prompts import load_maite_system_prompt
 from agent.state.schemas import ConversationState
-from agent.state.helpers import add_message, should_summarize
+from agent.state.helpers import add_message
 from database.connection import get_async_session
 from database.models import Customer
 
@@ -96,7 +97,9 @@ async def check_customer_exists(phone: str) -> tuple[bool, Customer | None]:
             return (False, None)
 
 
-async def process_incoming_message(state: ConversationState) -> dict[str, Any]:
+async def process_incoming_message(
+    state: ConversationState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
     """
     Process incoming user message and add it to conversation history.
 
@@ -108,6 +111,8 @@ async def process_incoming_message(state: ConversationState) -> dict[str, Any]:
 
     Args:
         state: Current conversation state (with checkpoint loaded by LangGraph)
+        config: Graph config; may carry a PrefetchedTurn (speculative batching)
+                whose customer lookup is reused if the checkpoint is unchanged
 
     Returns:
         Updated state with:
@@ -155,7 +160,16 @@ async def process_incoming_message(state: ConversationState) -> dict[str, Any]:
 
     if customer_phone:
         try:
-            customer_exists, customer = await check_customer_exists(customer_phone)
+            prefetched = get_prefetched_turn(config)
+            if (
+                prefetched is not None
+                and prefetched.customer is not None
+                and prefetched.matches(user_message, state.get("fsm_state"), existing_messages)
+            ):
+                # Looked up while the batch window was open
+                customer_exists, customer = prefetched.customer
+            else:
+                customer_exists, customer = await check_customer_exists(customer_phone)
 
             if customer_exists and customer:
                 # RETURNING CUSTOMER - skip name confirmation, load their data
@@ -225,7 +239,10 @@ def create_conversation_graph(
     - Exit: END (wait for next user message)
 
     **Routing:**
-    - Entry → (check summarization) → conversational_agent → END
+    - Entry → conversational_agent → END
+
+    Summarization is not part of the turn: it runs in the background after the
+    reply is published (agent/workers/conversation_summarizer.py).
 
     No booking nodes, no transactional flow. Claude + tools handle all logic:
     - query_info: FAQs, business hours, services, policies (includes consultation info)
@@ -257,47 +274,16 @@ def create_conversation_graph(
     # ========================================================================
     graph.add_node("process_incoming_message", process_incoming_message)
     graph.add_node("conversational_agent", conversational_agent)
-    graph.add_node("summarize", summarize_conversation)
 
     # ========================================================================
     # Entry Point Routing
     # ========================================================================
-    def route_entry(state: ConversationState) -> str:
-        """
-        Route from process_incoming_message to next node.
-
-        Simple logic:
-        1. Check if summarization needed → summarize
-        2. Otherwise → conversational_agent
-
-        No transactional state checks, no booking phases. Just conversation.
-        """
-        # Check if summarization is needed before continuing
-        if should_summarize(state):
-            logger.info(
-                "Message limit reached, summarizing conversation",
-                extra={
-                    "conversation_id": state.get("conversation_id"),
-                    "message_count": len(state.get("messages", []))
-                }
-            )
-            return "summarize"
-
-        # Default: Route to conversational agent
-        return "conversational_agent"
-
     # Set process_incoming_message as entry point
     graph.set_entry_point("process_incoming_message")
 
-    # Route from process_incoming_message
-    graph.add_conditional_edges(
-        "process_incoming_message",
-        route_entry,
-        {
-            "conversational_agent": "conversational_agent",
-            "summarize": "summarize",
-        }
-    )
+    # Straight to the agent: summarization runs off-turn after the reply is
+    # published, so the customer never waits for it
+    graph.add_edge("process_incoming_message", "conversational_agent")
 
     # ========================================================================
     # Conversational Agent Routing
@@ -333,21 +319,6 @@ def create_conversation_graph(
         }
     )
 
-    # ========================================================================
-    # Summarization Routing
-    # ========================================================================
-    def route_after_summarization(state: ConversationState) -> str:
-        """Route after summarization completes, continuing to conversational agent."""
-        return "conversational_agent"
-
-    graph.add_conditional_edges(
-        "summarize",
-        route_after_summarization,
-        {
-            "conversational_agent": "conversational_agent",
-        }
-    )
-
     # ========================================================================
     # Compile Graph
     # ========================================================================
@@ -7,27 +7,75 @@ import json
 import logging
 import os
 import signal
+import socket
 from datetime import UTC, datetime
 
+from agent.batching.batch_scheduler import BatchScheduler
+from agent.batching.debounce import AdaptiveDebounce
 from agent.batching.message_batcher import MessageBatcher
-from agent.graphs.conversation_flow import MAITE_SYSTEM_PROMPT, create_conversation_graph
+from agent.batching.speculation import (
+    PREFETCHED_TURN_KEY,
+    PrefetchedTurn,
+    SpeculativeRunner,
+    combine_batch_text,
+)
+from agent.fsm import BookingFSM
+from agent.fsm.intent_extractor import extract_intent
+from agent.graphs.conversation_flow import (
+    MAITE_SYSTEM_PROMPT,
+    check_customer_exists,
+    create_conversation_graph,
+)
+from agent.prompts import PROMPTS_DIR
+from agent.services.availability_index import (
+    close_availability_index,
+    get_availability_index_stats,
+    start_availability_index,
+)
 from agent.state.checkpointer import get_redis_checkpointer, initialize_redis_indexes
 from agent.state.helpers import add_message
 from agent.utils.monitoring import get_langfuse_handler
+from agent.workers.conversation_summarizer import ConversationSummarizer
+from agent.workers.incoming_reclaimer import (
+    CLAIM_INTERVAL_SECONDS as INCOMING_CLAIM_INTERVAL_SECONDS,
+    CLAIM_MIN_IDLE_MS as INCOMING_CLAIM_MIN_IDLE_MS,
+    IncomingReclaimer,
+    dead_letter_batch,
+)
+from agent.workers.outgoing_sender import OutgoingSender
+from shared.chatwoot_client import close_chatwoot_http_client
 from shared.config import get_settings
+from shared.llm_clients import close_llm_clients
+from shared.llm_hedging import get_hedge_stats
 from shared.logging_config import configure_logging
+from shared.salon_calendar import get_salon_calendar_stats
 from shared.startup_validator import StartupValidationError, validate_startup_config
+from shared.template_cache import (
+    get_template_cache_stats,
+    precompile_templates,
+    preload_prompt_files,
+)
 from shared.redis_client import (
     get_redis_client,
     publish_to_channel,
     # Redis Streams functions
+    add_to_stream,
     create_consumer_group,
-    read_from_stream,
+    read_from_streams,
     acknowledge_message,
     move_to_dead_letter,
     INCOMING_STREAM,
+    OUTGOING_STREAM,
     CONSUMER_GROUP,
 )
+from shared.stream_partitions import (
+    LEASE_RENEW_INTERVAL_SECONDS,
+    LEASE_TTL_MS,
+    PartitionLeaseManager,
+    all_incoming_streams,
+    partition_for,
+    partition_stream,
+)
 
 # Configure structured JSON logging
 configure_logging()
@@ -39,6 +87,27 @@ shutdown_event = asyncio.Event()
 # Global batcher instance (initialized in subscribe_to_incoming_messages)
 batcher: MessageBatcher | None = None
 
+# Global scheduler instance (initialized in subscribe_to_incoming_messages)
+scheduler: BatchScheduler | None = None
+
+
+def get_consumer_name() -> str:
+    """Unique stream consumer name (hostname disambiguates containers, where PID is 1)."""
+    return f"agent-{socket.gethostname()}-{os.getpid()}"
+
+
+async def publish_outgoing_message(payload: dict) -> None:
+    """
+    Hand an AI reply over to the outgoing sender.
+
+    Uses OUTGOING_STREAM (persistent, acked after the Chatwoot POST) when Redis
+    Streams are enabled, otherwise the legacy 'outgoing_messages' channel.
+    """
+    if get_settings().USE_REDIS_STREAMS:
+        await add_to_stream(OUTGOING_STREAM, payload)
+    else:
+        await publish_to_channel("outgoing_messages", payload)
+
 
 async def subscribe_to_incoming_messages():
     """
@@ -62,7 +131,7 @@ async def subscribe_to_incoming_messages():
             "message": "AI response text"
         }
     """
-    global batcher
+    global batcher, scheduler
 
     # =========================================================================
     # STARTUP VALIDATION (Fase 4 - Config Validation)
@@ -96,12 +165,94 @@ async def subscribe_to_incoming_messages():
     graph = create_conversation_graph(checkpointer=checkpointer)
     logger.info("Conversation graph created successfully")
 
+    # Summaries are computed after the reply is published, not on the turn path
+    summarizer = ConversationSummarizer(graph)
+
+    # Read prompt files and compile every response template once, so no
+    # template work is left on the per-message path
+    preload_prompt_files(PROMPTS_DIR)
+    precompiled = precompile_templates(BookingFSM.RESPONSE_TEMPLATES.values())
+    logger.info(f"Response templates precompiled | templates={precompiled}")
+
     # Initialize message batcher with configurable window and Redis for crash recovery
     batch_window = settings.MESSAGE_BATCH_WINDOW_SECONDS
-    batcher = MessageBatcher(window_seconds=batch_window, redis_client=client)
+    debounce = (
+        AdaptiveDebounce(
+            window_seconds=batch_window,
+            min_window_seconds=settings.MESSAGE_BATCH_MIN_WINDOW_SECONDS,
+            max_window_seconds=settings.MESSAGE_BATCH_MAX_WINDOW_SECONDS,
+        )
+        if settings.MESSAGE_BATCH_ADAPTIVE and batch_window > 0
+        else None
+    )
+
+    async def prefetch_turn(conversation_id: str, messages: list[dict]) -> PrefetchedTurn:
+        """
+        Do the slow start of a turn for a partial batch (speculative batching).
+
+        Looks up the customer, loads the checkpoint and extracts the intent of
+        the batch so far. The nodes reuse the result only if the batch did not
+        change afterwards and the checkpoint is still the same.
+
+        Args:
+            conversation_id: The conversation thread ID
+            messages: Messages of the open batch so far
+
+        Returns:
+            PrefetchedTurn for the combined text of these messages
+        """
+        combined_text = combine_batch_text(messages)
+        customer_phone = messages[-1].get("customer_phone")
+
+        customer_task = (
+            asyncio.create_task(check_customer_exists(customer_phone))
+            if customer_phone else None
+        )
+        try:
+            snapshot = await graph.aget_state({"configurable": {"thread_id": conversation_id}})
+            values = snapshot.values or {}
+            history = values.get("messages") or []
+            fsm_state = values.get("fsm_state")
+
+            fsm = (
+                BookingFSM.from_dict(conversation_id, fsm_state)
+                if fsm_state else BookingFSM(conversation_id)
+            )
+            intent = await extract_intent(
+                message=combined_text,
+                current_state=fsm.state,
+                collected_data=fsm.collected_data,
+                conversation_history=[*history, {"role": "user", "content": combined_text}],
+            )
+            customer = await customer_task if customer_task else None
+        except BaseException:
+            if customer_task:
+                customer_task.cancel()
+            raise
+
+        return PrefetchedTurn(
+            message=combined_text,
+            fsm_state=fsm_state,
+            last_message=history[-1] if history else None,
+            customer=customer,
+            intent=intent,
+        )
+
+    speculation = (
+        SpeculativeRunner(prefetch_turn)
+        if settings.MESSAGE_BATCH_SPECULATIVE and batch_window > 0
+        else None
+    )
+    batcher = MessageBatcher(
+        window_seconds=batch_window,
+        redis_client=client,
+        debounce=debounce,
+        speculation=speculation,
+    )
     logger.info(
         f"Message batcher initialized | window_seconds={batch_window} | "
         f"batching={'enabled' if batch_window > 0 else 'disabled'} | "
+        f"adaptive={debounce is not None} | speculative={speculation is not None} | "
         f"redis_persistence=enabled"
     )
 
@@ -117,10 +268,12 @@ async def subscribe_to_incoming_messages():
             messages: List of message dicts from the batch
         """
         # Combine all message texts with double newline separator
-        combined_text = "\n\n".join([
-            msg.get("message_text", "") for msg in messages
-            if msg.get("message_text")
-        ])
+        combined_text = combine_batch_text(messages)
+
+        # Speculative batching: claim the work started while the window was open
+        prefetched = (
+            await speculation.take(conversation_id, combined_text) if speculation else None
+        )
 
         # Use metadata from last message (most recent)
         last_msg = messages[-1]
@@ -180,6 +333,8 @@ async def subscribe_to_incoming_messages():
             "configurable": {"thread_id": conversation_id},
             "callbacks": [langfuse_handler] if langfuse_handler else [],
         }
+        if prefetched is not None:
+            config["configurable"][PREFETCHED_TURN_KEY] = prefetched
         logger.info(
             f"Invoking graph for thread_id={conversation_id}",
             extra={"conversation_id": conversation_id},
@@ -189,7 +344,10 @@ async def subscribe_to_incoming_messages():
             # ================================================================
             # GRAPH INVOCATION WITH CHECKPOINT FLUSH (ADR-010)
             # ================================================================
-            result = await graph.ainvoke(state, config=config)
+            # The conversation lock makes the background summarizer's
+            # compare-and-set of the checkpoint atomic with respect to turns
+            async with summarizer.conversation_lock(conversation_id):
+                result = await graph.ainvoke(state, config=config)
 
             # ================================================================
             # CHECKPOINT PERSISTENCE (ADR-011: Single Source of Truth)
@@ -232,8 +390,7 @@ async def subscribe_to_incoming_messages():
 
             # Send fallback error message to user
             fallback_message = "Lo siento, tuve un problema técnico. ¿Puedes intentarlo de nuevo? 💕"
-            await publish_to_channel(
-                "outgoing_messages",
+            await publish_outgoing_message(
                 {
                     "conversation_id": conversation_id,
                     "customer_phone": customer_phone,
@@ -241,8 +398,21 @@ async def subscribe_to_incoming_messages():
                 },
             )
             logger.info(f"Sent fallback message for conversation_id={conversation_id}")
+
+            # The customer was asked to try again: replaying the entries would
+            # only repeat the fallback, so take them out of the PEL for good
+            if settings.USE_REDIS_STREAMS:
+                await dead_letter_batch(
+                    messages,
+                    f"Graph invocation failed: {type(graph_error).__name__}: {graph_error}",
+                )
             return
 
+        # Let the batcher know whether the next reply is expected to be a
+        # single token (adaptive batching processes those immediately)
+        fsm_state = result.get("fsm_state") or {}
+        batcher.set_reply_expectation(conversation_id, fsm_state.get("state"))
+
         # Extract AI response from result state
         last_message = result["messages"][-1]
 
@@ -296,27 +466,31 @@ async def subscribe_to_incoming_messages():
             extra={"conversation_id": conversation_id}
         )
 
-        # Publish to outgoing_messages channel
-        await publish_to_channel("outgoing_messages", outgoing_payload)
+        # Publish to outgoing stream (or legacy outgoing_messages channel)
+        await publish_outgoing_message(outgoing_payload)
 
         logger.info(
-            f"Message published to outgoing_messages: conversation_id={conversation_id}",
+            f"Message published to outgoing delivery: conversation_id={conversation_id}",
             extra={"conversation_id": conversation_id},
         )
 
+        # Summarize off-turn (if due); the next turn reads it from the checkpoint
+        summarizer.schedule(conversation_id, result)
+
         # ================================================================
         # ACK STREAM MESSAGES (Redis Streams only)
         # ================================================================
         # After successful processing, acknowledge all stream messages in the batch
         # This removes them from the pending list (they won't be redelivered)
         if settings.USE_REDIS_STREAMS:
-            stream_msg_ids = [
-                msg.get("_stream_msg_id") for msg in messages
+            stream_msgs = [
+                (msg.get("_stream", INCOMING_STREAM), msg.get("_stream_msg_id"))
+                for msg in messages
                 if msg.get("_stream_msg_id")
             ]
-            for stream_msg_id in stream_msg_ids:
+            for stream, stream_msg_id in stream_msgs:
                 try:
-                    await acknowledge_message(INCOMING_STREAM, CONSUMER_GROUP, stream_msg_id)
+                    await acknowledge_message(stream, CONSUMER_GROUP, stream_msg_id)
                     logger.debug(
                         f"ACK stream message {stream_msg_id} | conversation_id={conversation_id}"
                     )
@@ -326,16 +500,34 @@ async def subscribe_to_incoming_messages():
                         extra={"conversation_id": conversation_id},
                     )
 
-    # Set the callback for when batches expire
-    batcher.set_callback(process_batch)
-
     # =========================================================================
-    # BATCH RECOVERY (Phase 6 - Crash Recovery)
+    # BATCH SCHEDULING (bounded concurrency + per-conversation ordering)
     # =========================================================================
-    # Recover any pending batches from a previous crash
-    recovered_count = await batcher.recover_pending_batches()
-    if recovered_count > 0:
-        logger.info(f"Recovered {recovered_count} pending message batches from Redis")
+    # Expired batches go through the scheduler instead of invoking the graph
+    # directly, so a traffic burst cannot fan out into unbounded concurrent
+    # LLM + DB calls. The batcher awaits completion, keeping its
+    # "clear persisted batch only after success" semantics.
+    scheduler = BatchScheduler(
+        process_batch,
+        max_workers=settings.AGENT_MAX_CONCURRENT_BATCHES,
+        max_queued=settings.AGENT_MAX_QUEUED_BATCHES,
+    )
+    await scheduler.start()
+
+    # Stream entries this process holds (batched, queued or being processed).
+    # The IncomingReclaimer never takes these over.
+    held_entries: set[str] = set()
+
+    async def submit_batch(conversation_id: str, messages: list[dict]) -> None:
+        entry_ids = [msg["_stream_msg_id"] for msg in messages if msg.get("_stream_msg_id")]
+        held_entries.update(entry_ids)
+        try:
+            await scheduler.submit_and_wait(conversation_id, messages)
+        finally:
+            held_entries.difference_update(entry_ids)
+
+    # Set the callback for when batches expire
+    batcher.set_callback(submit_batch)
 
     # ========================================================================
     # MESSAGE SUBSCRIPTION (Redis Streams or Pub/Sub based on config)
@@ -345,85 +537,201 @@ async def subscribe_to_incoming_messages():
         # ====================================================================
         # REDIS STREAMS MODE: Persistent with acknowledgment
         # ====================================================================
-        consumer_name = f"agent-{os.getpid()}"
+        consumer_name = get_consumer_name()
+        leases = PartitionLeaseManager(consumer_name, redis_client=client)
+        incoming_streams = all_incoming_streams(leases.num_partitions)
 
         logger.info(
-            f"Initializing Redis Streams consumer | stream={INCOMING_STREAM} | "
+            f"Initializing Redis Streams consumer | streams={incoming_streams} | "
             f"group={CONSUMER_GROUP} | consumer={consumer_name}"
         )
 
-        # Create consumer group if it doesn't exist
-        await create_consumer_group(INCOMING_STREAM, CONSUMER_GROUP)
+        # Create consumer groups if they don't exist
+        for stream in incoming_streams:
+            await create_consumer_group(stream, CONSUMER_GROUP)
+
+        # Held while reading + batching so ownership never changes mid-read
+        partition_lock = asyncio.Lock()
+
+        async def enqueue_stream_message(stream: str, stream_msg_id: str, data: dict) -> None:
+            """Add a stream entry (read or reclaimed) to its conversation's batch."""
+            conversation_id = data.get("conversation_id")
+            customer_phone = data.get("customer_phone")
+            message_text = data.get("message_text")
+
+            logger.info(
+                f"Stream message received: conversation_id={conversation_id}, "
+                f"phone={customer_phone}, stream_msg_id={stream_msg_id}",
+                extra={
+                    "conversation_id": conversation_id,
+                    "customer_phone": customer_phone,
+                    "stream_msg_id": stream_msg_id,
+                },
+            )
+
+            # Log full incoming message for debugging
+            logger.debug(
+                f"Full incoming message: '{message_text}'",
+                extra={
+                    "conversation_id": conversation_id,
+                    "message_length": len(message_text) if message_text else 0,
+                }
+            )
+
+            # Add stream + stream_msg_id to message data for ACK after processing
+            data["_stream"] = stream
+            data["_stream_msg_id"] = stream_msg_id
+            held_entries.add(stream_msg_id)
+
+            # Add message to batcher (will be processed after window expires)
+            try:
+                await batcher.add_message(
+                    conversation_id=conversation_id,
+                    message_data=data,
+                )
+            except Exception:
+                held_entries.discard(stream_msg_id)
+                raise
+
+        # Entries of a batch are pending for up to the batch's maximum age plus
+        # the graph run, so only entries idle longer than that are abandoned
+        max_batch_age = (
+            settings.MESSAGE_BATCH_MAX_WINDOW_SECONDS if debounce else batch_window
+        )
+        reclaimer = IncomingReclaimer(
+            consumer_name,
+            redeliver=enqueue_stream_message,
+            is_local=held_entries.__contains__,
+            claim_min_idle_ms=INCOMING_CLAIM_MIN_IDLE_MS + max_batch_age * 1000,
+        )
+
+        async def drain_partitions(revoked: set[int]) -> None:
+            """Finish batches of revoked partitions here, then hand them over."""
+            def in_revoked(cid: str) -> bool:
+                return partition_for(cid, leases.num_partitions) in revoked
+
+            try:
+                for cid in [cid for cid in list(batcher.batches) if in_revoked(cid)]:
+                    await batcher.flush(cid)
+                await scheduler.wait_idle(
+                    [cid for cid in scheduler.active_conversations if in_revoked(cid)]
+                )
+            finally:
+                await leases.release(revoked)
+
+        async def recover_partitions(acquired: set[int]) -> None:
+            # =================================================================
+            # BATCH RECOVERY (Phase 6 - Crash Recovery)
+            # =================================================================
+            # Recover batches persisted by a previous owner of these partitions
+            # (this process before a restart, or a crashed replica)
+            recovered_count = await batcher.recover_pending_batches(
+                conversation_filter=lambda cid: partition_for(
+                    cid, leases.num_partitions
+                ) in acquired
+            )
+            if recovered_count > 0:
+                logger.info(f"Recovered {recovered_count} pending message batches from Redis")
+
+            # Entries left pending by the previous owner: it drained before
+            # releasing the lease (or stopped renewing it), so anything it has
+            # held for longer than a lease TTL is abandoned
+            async with partition_lock:
+                streams = [
+                    partition_stream(p, leases.num_partitions)
+                    for p in sorted(acquired & leases.owned)
+                ]
+                await reclaimer.reclaim(streams, min_idle_ms=LEASE_TTL_MS)
+
+        async def rebalance_partitions() -> None:
+            """Acquire / renew / hand over partition leases."""
+            async with partition_lock:
+                acquired, revoked = await leases.rebalance()
+
+            # Both run in the background so lease renewal is never delayed
+            # by graph invocations
+            if revoked:
+                asyncio.create_task(drain_partitions(revoked))
+            if acquired:
+                asyncio.create_task(recover_partitions(acquired))
+
+        async def lease_keeper() -> None:
+            while True:
+                await asyncio.sleep(LEASE_RENEW_INTERVAL_SECONDS)
+                try:
+                    await rebalance_partitions()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error rebalancing partitions: {e}", exc_info=True)
+
+        async def reclaim_keeper() -> None:
+            """Periodically reclaim abandoned entries and report the PEL."""
+            while True:
+                await asyncio.sleep(INCOMING_CLAIM_INTERVAL_SECONDS)
+                try:
+                    async with partition_lock:
+                        streams = leases.owned_streams
+                        await reclaimer.reclaim(streams)
+                    await reclaimer.pel_stats(streams)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error reclaiming pending messages: {e}", exc_info=True)
+
+        await rebalance_partitions()
+        lease_task = asyncio.create_task(lease_keeper())
+        reclaim_task = asyncio.create_task(reclaim_keeper())
 
         logger.info(
-            f"Redis Streams consumer ready | stream={INCOMING_STREAM} | "
+            f"Redis Streams consumer ready | owned_streams={leases.owned_streams} | "
             f"consumer={consumer_name}"
         )
 
         try:
             while not shutdown_event.is_set():
                 try:
-                    # Read messages from stream (blocks for 5 seconds if no messages)
-                    messages = await read_from_stream(
-                        INCOMING_STREAM,
-                        CONSUMER_GROUP,
-                        consumer_name,
-                        count=10,  # Process up to 10 messages at a time
-                        block_ms=5000,  # 5 second block
-                    )
-
-                    for stream_msg_id, data in messages:
-                        try:
-                            conversation_id = data.get("conversation_id")
-                            customer_phone = data.get("customer_phone")
-                            message_text = data.get("message_text")
-                            customer_name = data.get("customer_name")
-
-                            logger.info(
-                                f"Stream message received: conversation_id={conversation_id}, "
-                                f"phone={customer_phone}, stream_msg_id={stream_msg_id}",
-                                extra={
-                                    "conversation_id": conversation_id,
-                                    "customer_phone": customer_phone,
-                                    "stream_msg_id": stream_msg_id,
-                                },
-                            )
-
-                            # Log full incoming message for debugging
-                            logger.debug(
-                                f"Full incoming message: '{message_text}'",
-                                extra={
-                                    "conversation_id": conversation_id,
-                                    "message_length": len(message_text) if message_text else 0,
-                                }
-                            )
-
-                            # Add stream_msg_id to message data for ACK after processing
-                            data["_stream_msg_id"] = stream_msg_id
-
-                            # Add message to batcher (will be processed after window expires)
-                            await batcher.add_message(
-                                conversation_id=conversation_id,
-                                message_data=data,
-                            )
-
-                        except Exception as e:
-                            logger.error(
-                                f"Error processing stream message {stream_msg_id}: {e}",
-                                exc_info=True,
-                            )
-                            # Move to dead letter queue for later inspection
+                    # Backpressure: leave entries in the stream while the
+                    # scheduler queue is full instead of buffering them here
+                    await scheduler.wait_for_capacity()
+
+                    if not leases.owned:
+                        # Standby: another replica owns every partition
+                        await asyncio.sleep(LEASE_RENEW_INTERVAL_SECONDS)
+                        continue
+
+                    async with partition_lock:
+                        # Read messages from owned partition streams
+                        # (blocks for 5 seconds if no messages)
+                        messages = await read_from_streams(
+                            leases.owned_streams,
+                            CONSUMER_GROUP,
+                            consumer_name,
+                            count=10,  # Process up to 10 messages at a time
+                            block_ms=5000,  # 5 second block
+                        )
+
+                        for stream, stream_msg_id, data in messages:
                             try:
-                                await move_to_dead_letter(
-                                    INCOMING_STREAM,
-                                    CONSUMER_GROUP,
-                                    stream_msg_id,
-                                    data,
-                                    str(e),
+                                await enqueue_stream_message(stream, stream_msg_id, data)
+
+                            except Exception as e:
+                                logger.error(
+                                    f"Error processing stream message {stream_msg_id}: {e}",
+                                    exc_info=True,
                                 )
-                            except Exception as dlq_error:
-                                logger.error(f"Failed to move to DLQ: {dlq_error}")
-                            continue
+                                # Move to dead letter queue for later inspection
+                                try:
+                                    await move_to_dead_letter(
+                                        stream,
+                                        CONSUMER_GROUP,
+                                        stream_msg_id,
+                                        data,
+                                        str(e),
+                                    )
+                                except Exception as dlq_error:
+                                    logger.error(f"Failed to move to DLQ: {dlq_error}")
+                                continue
 
                 except asyncio.CancelledError:
                     raise
@@ -434,9 +742,17 @@ async def subscribe_to_incoming_messages():
 
         except asyncio.CancelledError:
             logger.info("Stream consumer cancelled")
+            lease_task.cancel()
+            reclaim_task.cancel()
+            logger.info(f"Incoming reclaimer stopped | stats={reclaimer.stats()}")
             if batcher:
                 logger.info("Flushing pending batches before shutdown...")
                 await batcher.flush_all()
+            if scheduler:
+                await scheduler.stop()
+            await summarizer.close()
+            logger.info(f"Conversation summarizer stopped | stats={summarizer.stats()}")
+            await leases.release_all()
             raise
 
         except Exception as e:
@@ -447,6 +763,12 @@ async def subscribe_to_incoming_messages():
         # ====================================================================
         # LEGACY PUB/SUB MODE: Fire-and-forget (backward compatibility)
         # ====================================================================
+        # BATCH RECOVERY (Phase 6 - Crash Recovery): recover any pending
+        # batches from a previous crash
+        recovered_count = await batcher.recover_pending_batches()
+        if recovered_count > 0:
+            logger.info(f"Recovered {recovered_count} pending message batches from Redis")
+
         logger.info("Subscribing to 'incoming_messages' channel (pub/sub mode)...")
 
         pubsub = client.pubsub()
@@ -513,6 +835,10 @@ async def subscribe_to_incoming_messages():
             if batcher:
                 logger.info("Flushing pending batches before shutdown...")
                 await batcher.flush_all()
+            if scheduler:
+                await scheduler.stop()
+            await summarizer.close()
+            logger.info(f"Conversation summarizer stopped | stats={summarizer.stats()}")
             await pubsub.unsubscribe("incoming_messages")
             await pubsub.close()
             raise
@@ -524,10 +850,12 @@ async def subscribe_to_incoming_messages():
 
 async def subscribe_to_outgoing_messages():
     """
-    Subscribe to outgoing_messages Redis channel and send via Chatwoot.
+    Consume outgoing replies and send them via Chatwoot.
 
-    This worker listens for messages published by the conversation graph,
-    and sends them to customers via the Chatwoot API.
+    With Redis Streams enabled, replies are read from OUTGOING_STREAM by an
+    OutgoingSender (acked after a successful send, ordered per conversation,
+    concurrent across conversations). Otherwise this worker listens on the
+    legacy outgoing_messages pub/sub channel and sends one message at a time.
 
     Message format (outgoing_messages):
         {
@@ -539,8 +867,22 @@ async def subscribe_to_outgoing_messages():
     from agent.tools.notification_tools import ChatwootClient
 
     client = get_redis_client()
+    settings = get_settings()
     chatwoot = ChatwootClient()
 
+    if settings.USE_REDIS_STREAMS:
+        sender = OutgoingSender(
+            chatwoot,
+            get_consumer_name(),
+            max_concurrency=settings.OUTGOING_SENDER_CONCURRENCY,
+        )
+        try:
+            await sender.run(shutdown_event)
+        except asyncio.CancelledError:
+            logger.info("Outgoing stream sender cancelled")
+            raise
+        return
+
     logger.info("Subscribing to 'outgoing_messages' channel...")
 
     # Subscribe to channel
@@ -649,6 +991,9 @@ async def main():
         # Windows doesn't support add_signal_handler, fallback to basic handling
         logger.warning("Signal handlers not supported on this platform")
 
+    # Slot searches are served from memory once the LISTEN connection is up
+    start_availability_index()
+
     # Start both workers concurrently
     incoming_task = asyncio.create_task(subscribe_to_incoming_messages())
     outgoing_task = asyncio.create_task(subscribe_to_outgoing_messages())
@@ -666,6 +1011,13 @@ async def main():
             await asyncio.gather(incoming_task, outgoing_task, return_exceptions=True)
         except asyncio.CancelledError:
             pass
+        await close_chatwoot_http_client()
+        await close_llm_clients()
+        logger.info(f"Availability index stats | {get_availability_index_stats()}")
+        await close_availability_index()
+        logger.info(f"Salon calendar stats | {get_salon_calendar_stats()}")
+        logger.info(f"LLM hedging stats | {get_hedge_stats()}")
+        logger.info(f"Template cache stats | {get_template_cache_stats()}")
         logger.info("Agent service stopped")
 
 
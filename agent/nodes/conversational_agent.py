@@ -18,7 +18,8 @@ Architecture (v5.0 - ADR-013):
 Flow:
 1. Load FSM state from checkpoint
 2. Check for auto-escalation (error_count >= threshold)
-3. Extract intent using LLM (state-aware disambiguation)
+3. Extract intent using LLM (state-aware disambiguation; in single-call mode
+   the same call drafts the reply for greetings/FAQs)
 4. Validate transition with FSM
 5. Route via IntentRouter (NEW - replaces LLM tool binding)
 6. Persist FSM state
@@ -38,16 +39,23 @@ import logging
 from typing import Any
 
 import pybreaker
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableConfig
 
+from agent.batching.speculation import get_prefetched_turn
 from agent.fsm import BookingFSM, BookingState
 from shared.circuit_breaker import call_with_breaker, openrouter_breaker
-from agent.fsm.intent_extractor import extract_intent
+from agent.fsm.intent_extractor import (
+    DRAFT_REPLY_INTENTS,
+    extract_intent,
+    record_draft_reply_outcome,
+)
 from agent.fsm.models import Intent, IntentType
 from agent.routing import IntentRouter
 from agent.state.helpers import add_message
 from agent.state.schemas import ConversationState
 from shared.config import get_settings
+from shared.llm_clients import LLMPurpose
+from shared.llm_hedging import get_hedged_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +63,9 @@ logger = logging.getLogger(__name__)
 AUTO_ESCALATION_THRESHOLD = 3
 
 
-async def conversational_agent(state: ConversationState) -> dict[str, Any]:
+async def conversational_agent(
+    state: ConversationState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
     """
     Main conversational agent node (v5.0 prescriptive architecture).
 
@@ -68,11 +78,12 @@ async def conversational_agent(state: ConversationState) -> dict[str, Any]:
 
     Args:
         state: Current conversation state
+        config: Graph config; may carry a PrefetchedTurn (speculative batching)
+                whose intent is reused if the checkpoint is unchanged
 
     Returns:
         Updated state with assistant response
     """
-    settings = get_settings()
     conversation_id = state.get("conversation_id", "unknown")
     messages = state.get("messages", [])
 
@@ -164,13 +175,23 @@ async def conversational_agent(state: ConversationState) -> dict[str, Any]:
     # STEP 2: Extract intent (LLM NLU only - no tool decisions)
     # ============================================================================
 
+    # Speculative batching: intent extracted while the batch window was open
+    intent = _prefetched_intent(config, state, user_message)
+
+    # Single-call mode (per FSM state): the extraction call also drafts the reply
+    reply_system_prompt = None
+    if intent is None and _single_call_enabled(fsm, state):
+        reply_system_prompt = await _build_draft_reply_prompt(state, fsm)
+
     try:
-        intent = await extract_intent(
-            message=user_message,
-            current_state=fsm.state,
-            collected_data=fsm.collected_data,
-            conversation_history=messages,
-        )
+        if intent is None:
+            intent = await extract_intent(
+                message=user_message,
+                current_state=fsm.state,
+                collected_data=fsm.collected_data,
+                conversation_history=messages,
+                reply_system_prompt=reply_system_prompt,
+            )
 
         logger.info(
             f"Intent extracted | conversation_id={conversation_id} | "
@@ -228,15 +249,8 @@ async def conversational_agent(state: ConversationState) -> dict[str, Any]:
             f"original_intent={intent.type.value}"
         )
 
-        # Create LLM client for NonBookingHandler
-        llm = ChatOpenAI(
-            model=settings.LLM_MODEL,
-            base_url="https://openrouter.ai/api/v1",
-            api_key=settings.OPENROUTER_API_KEY,
-            temperature=0.3,
-            request_timeout=30.0,
-            max_retries=2,
-        )
+        # Shared LLM client for NonBookingHandler
+        llm = get_hedged_llm_client(LLMPurpose.RESPONSE)
 
         # Import handler here to avoid circular imports
         from agent.routing.non_booking_handler import NonBookingHandler
@@ -275,6 +289,10 @@ async def conversational_agent(state: ConversationState) -> dict[str, Any]:
 
     is_booking_intent = intent.type in IntentRouter.BOOKING_INTENTS
 
+    # Single-call draft: only kept for intents that skip the FSM and need no tools.
+    # Booking intents are validated by the FSM and phrased by BookingHandler.
+    draft_reply = _take_draft_reply(intent, state)
+
     if is_booking_intent:
         # Only validate FSM transition for booking intents
         try:
@@ -348,28 +366,25 @@ async def conversational_agent(state: ConversationState) -> dict[str, Any]:
     # This replaces the old LLM tool binding with FSM-prescribed actions
 
     try:
-        # Create LLM client for response generation
-        llm = ChatOpenAI(
-            model=settings.LLM_MODEL,
-            base_url="https://openrouter.ai/api/v1",
-            api_key=settings.OPENROUTER_API_KEY,
-            temperature=0.3,  # Creative but controlled
-            request_timeout=30.0,  # 30s timeout for conversation
-            max_retries=2,  # Retry 2x on transient failures
-        )
+        # Shared LLM client for response generation (long-lived, pooled connections)
+        llm = get_hedged_llm_client(LLMPurpose.RESPONSE)
 
         # Route to appropriate handler (wrapped with circuit breaker)
         # BookingHandler: FSM prescribes tools (prescriptive)
         # NonBookingHandler: LLM decides from safe tools (conversational)
         # Circuit breaker protects against OpenRouter outages
-        response_text, state_updates = await call_with_breaker(
-            openrouter_breaker,
-            IntentRouter.route,
-            intent=intent,
-            fsm=fsm,
-            state=state,
-            llm=llm,
-        )
+        if draft_reply is not None:
+            # Reply already drafted by the extraction call - no second LLM call
+            response_text, state_updates = draft_reply, None
+        else:
+            response_text, state_updates = await call_with_breaker(
+                openrouter_breaker,
+                IntentRouter.route,
+                intent=intent,
+                fsm=fsm,
+                state=state,
+                llm=llm,
+            )
 
         # Apply state updates from handler (e.g., pending_decline state)
         if state_updates:
@@ -488,6 +503,100 @@ async def conversational_agent(state: ConversationState) -> dict[str, Any]:
 # ==============================================================================
 
 
+def _prefetched_intent(
+    config: RunnableConfig | None, state: ConversationState, user_message: str
+) -> Intent | None:
+    """
+    Return the speculatively extracted intent if it is still valid for this turn.
+
+    Valid only if it was extracted for this exact message, in the current FSM
+    state and after the same last message (no other batch finished since).
+    """
+    prefetched = get_prefetched_turn(config)
+    if prefetched is None or prefetched.intent is None:
+        return None
+
+    conversation_id = state.get("conversation_id", "unknown")
+    if not prefetched.matches(
+        user_message, state.get("fsm_state"), state.get("messages", [])[:-1]
+    ):
+        logger.info(f"Speculative intent is stale, extracting again | conversation_id={conversation_id}")
+        return None
+
+    logger.info(
+        f"Using speculative intent | conversation_id={conversation_id} | "
+        f"type={prefetched.intent.type.value}"
+    )
+    return prefetched.intent
+
+
+def _single_call_enabled(fsm: BookingFSM, state: ConversationState) -> bool:
+    """
+    Check whether single-call NLU mode applies to this turn.
+
+    Enabled per FSM state (NLU_SINGLE_CALL_STATES). Turns with a pending name
+    confirmation or decline are handled by dedicated flows and never use drafts.
+    """
+    enabled_states = {
+        s.strip() for s in get_settings().NLU_SINGLE_CALL_STATES.split(",") if s.strip()
+    }
+    if fsm.state.value not in enabled_states:
+        return False
+
+    return not (
+        state.get("name_confirmation_pending")
+        or state.get("pending_decline_appointment_id")
+    )
+
+
+async def _build_draft_reply_prompt(
+    state: ConversationState, fsm: BookingFSM
+) -> str | None:
+    """
+    Build the Maite system prompt used to draft the reply in single-call mode.
+
+    Returns:
+        System prompt text, or None to fall back to intent-only extraction
+    """
+    from agent.prompts.dynamic_context import load_dynamic_context
+    from agent.routing.non_booking_handler import NonBookingHandler
+
+    try:
+        dynamic_context = await load_dynamic_context()
+        # Only the prompt builder is used - no LLM needed
+        return NonBookingHandler(state, None, fsm).build_system_prompt(dynamic_context)
+    except Exception as e:
+        logger.warning(f"Could not build draft reply prompt, using intent-only NLU: {e}")
+        return None
+
+
+def _take_draft_reply(intent: Intent, state: ConversationState) -> str | None:
+    """
+    Decide whether the single-call draft reply can be sent as-is.
+
+    The draft is discarded for intents that go through the FSM or a dedicated
+    handler; those replies are generated after validation.
+
+    Returns:
+        Draft reply text, or None if the turn must be routed normally
+    """
+    if intent.draft_reply is None:
+        return None
+
+    used = intent.type in DRAFT_REPLY_INTENTS and not state.get(
+        "pending_decline_appointment_id"
+    )
+    record_draft_reply_outcome(used)
+
+    logger.info(
+        f"Single-call draft {'used' if used else 'discarded'} | "
+        f"conversation_id={state.get('conversation_id', 'unknown')} | "
+        f"intent={intent.type.value}"
+    )
+
+    return intent.draft_reply if used else None
+
+
 def _generate_transition_error_message(fsm: BookingFSM, intent, result) -> str:
     """
     Generate helpful error message when FSM transition fails.
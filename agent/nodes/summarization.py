@@ -1,18 +1,25 @@
 """
-Summarization node for conversation context management.
+Summarization for conversation context management.
 
 This module implements conversation summarization to compress older messages
-and maintain manageable context size for Claude API calls. Summarization is
-triggered automatically after every 10 messages beyond the first 10.
+and maintain manageable context size for LLM calls. Summaries are incremental:
+only messages added since the last summary (summarized_message_count) are sent
+to the LLM and the result is appended to the existing summary.
+
+In production summarization runs off-turn, after the reply was published (see
+agent/workers/conversation_summarizer.py and summary_due()).
+summarize_conversation() is the equivalent in-graph node (should_summarize()
+trigger, every 10 messages beyond the first 10).
 """
 
 import logging
 from pathlib import Path
-
-from langchain_openai import ChatOpenAI
+from typing import Any
 
 from agent.state.schemas import ConversationState
-from agent.state.helpers import should_summarize, check_token_overflow
+from agent.state.helpers import check_token_overflow, messages_since_summary, should_summarize
+from shared.llm_clients import LLMPurpose, get_llm_client
+from shared.template_cache import read_prompt_file
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +28,100 @@ PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 SUMMARIZATION_PROMPT_PATH = PROMPTS_DIR / "summarization_prompt.md"
 
 
+async def build_summary_update(state: ConversationState) -> dict[str, Any]:
+    """
+    Summarize the messages added since the last summary.
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        State update with conversation_summary and summarized_message_count
+        (plus trimmed messages / escalation flags on token overflow).
+        Empty dict if there is nothing new to summarize.
+
+    Raises:
+        Exception: LLM call failed (callers decide how to degrade)
+    """
+    new_messages = messages_since_summary(state)
+    if not new_messages:
+        return {}
+
+    # Load summarization prompt template (read once per process)
+    prompt_template = read_prompt_file(SUMMARIZATION_PROMPT_PATH)
+
+    # Format only the new messages as "role: content" strings
+    formatted_messages = "\n".join(
+        f"{msg['role']}: {msg['content']}"
+        for msg in new_messages
+    )
+    prompt_text = prompt_template.replace(
+        "{messages_to_summarize}",
+        formatted_messages
+    )
+
+    # Call LLM via OpenRouter to generate summary
+    # Note: Langfuse callbacks passed in graph config are automatically
+    # inherited by this LLM invocation (LangChain callback propagation)
+    llm = get_llm_client(LLMPurpose.SUMMARY)
+
+    response = await llm.ainvoke([{"role": "user", "content": prompt_text}])
+    new_summary_text = response.content.strip()
+
+    # Combine with existing summary if present
+    existing_summary = state.get("conversation_summary")
+    if existing_summary:
+        combined_summary = f"{existing_summary}\n\n{new_summary_text}"
+    else:
+        combined_summary = new_summary_text
+
+    conversation_id = state.get("conversation_id", "unknown")
+    total_messages = state.get("total_message_count") or len(state.get("messages", []))
+    update: dict[str, Any] = {
+        "conversation_summary": combined_summary,
+        "summarized_message_count": total_messages,
+    }
+
+    # Check for token overflow
+    overflow_check = check_token_overflow({
+        **state,
+        "conversation_summary": combined_summary
+    })
+
+    if overflow_check["overflow"]:
+        action = overflow_check.get("action")
+
+        if action == "aggressive_summarize":
+            # Reduce recent messages from 10 to 5
+            logger.warning(
+                f"Applying aggressive summarization for conversation {conversation_id}"
+            )
+            update["messages"] = state.get("messages", [])[-5:]
+        elif action == "escalate":
+            # Conversation too complex, flag for human takeover
+            logger.error(
+                f"Token overflow unresolved for conversation {conversation_id}, "
+                f"flagging for escalation"
+            )
+            update["escalated"] = True
+            update["escalation_reason"] = "token_overflow"
+
+    logger.info(
+        f"Summarized conversation {conversation_id}, "
+        f"total messages: {total_messages}, "
+        f"new messages summarized: {len(new_messages)}, "
+        f"summary length: {len(combined_summary)} chars"
+    )
+
+    return update
+
+
 async def summarize_conversation(state: ConversationState) -> dict:
     """
     Summarize conversation to compress older messages and reduce token usage.
 
-    This node is conditionally invoked after message addition to compress the
-    conversation history. It uses Claude to generate concise summaries of messages
-    beyond the recent 10-message window.
+    Graph-node form of build_summary_update(): triggered by should_summarize()
+    and degrading to the unchanged state on failure.
 
     Args:
         state: Current conversation state
@@ -38,13 +132,14 @@ async def summarize_conversation(state: ConversationState) -> dict:
 
     Summarization Strategy:
         - Triggered every 10 messages after first 10 (at 20, 30, 40, etc.)
-        - Compresses messages into 2-3 sentence Spanish summary
+        - Compresses messages added since the last summary into a 2-3 sentence
+          Spanish summary
         - Combines with existing summary for multi-batch conversations
         - Stores result in conversation_summary field
         - Graceful degradation on API failure
 
     Token Overflow Protection:
-        - If >70% of Claude's 200k context → aggressive summarization
+        - If >70% of the 200k context → aggressive summarization
         - If still overflowing → escalate to human
 
     Example State Flow:
@@ -52,108 +147,11 @@ async def summarize_conversation(state: ConversationState) -> dict:
         Output: {conversation_summary: "Cliente quiere corte...", ...}
     """
     try:
-        # Step 1: Check if summarization is needed
         if not should_summarize(state):
             return state  # Skip summarization, return unchanged
 
-        # Step 2: Load summarization prompt template
-        with open(SUMMARIZATION_PROMPT_PATH, "r", encoding="utf-8") as f:
-            prompt_template = f.read()
-
-        # Step 3: Format messages for summarization
-        # Note: Recent 10 messages are in state["messages"]
-        # Older messages have been removed by FIFO windowing, but we can
-        # summarize what we have in the current window if no summary exists yet
-        messages = state.get("messages", [])
-        existing_summary = state.get("conversation_summary")
-
-        # Format messages as "role: content" strings
-        formatted_messages = "\n".join(
-            f"{msg['role']}: {msg['content']}"
-            for msg in messages
-        )
-
-        # Step 4: Replace placeholder in prompt template
-        prompt_text = prompt_template.replace(
-            "{messages_to_summarize}",
-            formatted_messages
-        )
-
-        # Step 5: Call LLM via OpenRouter to generate summary
-        # Note: Langfuse callbacks passed in graph config are automatically
-        # inherited by this LLM invocation (LangChain callback propagation)
-        from shared.config import get_settings
-        settings = get_settings()
-
-        llm = ChatOpenAI(
-            model=settings.LLM_MODEL,
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url="https://openrouter.ai/api/v1",
-            temperature=0.3,  # Deterministic summaries
-            max_tokens=300,   # 2-3 sentences ~100-200 tokens
-            request_timeout=20.0,  # 20s timeout for summarization
-            max_retries=2,  # Retry 2x on transient failures
-            default_headers={
-                "HTTP-Referer": settings.SITE_URL,
-                "X-Title": settings.SITE_NAME,
-            }
-        )
-
-        response = await llm.ainvoke([{"role": "user", "content": prompt_text}])
-        new_summary_text = response.content.strip()
-
-        # Step 6: Combine with existing summary if present
-        if existing_summary:
-            combined_summary = f"{existing_summary}\n\n{new_summary_text}"
-        else:
-            combined_summary = new_summary_text
-
-        # Step 7: Check for token overflow
-        overflow_check = check_token_overflow({
-            **state,
-            "conversation_summary": combined_summary
-        })
-
-        if overflow_check["overflow"]:
-            action = overflow_check.get("action")
-            conversation_id = state.get("conversation_id", "unknown")
-
-            if action == "aggressive_summarize":
-                # Reduce recent messages from 10 to 5
-                logger.warning(
-                    f"Applying aggressive summarization for conversation {conversation_id}"
-                )
-                # Keep only last 5 messages
-                messages = messages[-5:]
-            elif action == "escalate":
-                # Conversation too complex, flag for human takeover
-                logger.error(
-                    f"Token overflow unresolved for conversation {conversation_id}, "
-                    f"flagging for escalation"
-                )
-                return {
-                    **state,
-                    "conversation_summary": combined_summary,
-                    "messages": messages,
-                    "escalated": True,
-                    "escalation_reason": "token_overflow"
-                }
-
-        # Step 8: Log summarization event
-        conversation_id = state.get("conversation_id", "unknown")
-        total_messages = state.get("total_message_count", 0)
-        logger.info(
-            f"Summarized conversation {conversation_id}, "
-            f"total messages: {total_messages}, "
-            f"summary length: {len(combined_summary)} chars"
-        )
-
-        # Step 9: Return updated state with summary
-        return {
-            **state,
-            "conversation_summary": combined_summary,
-            "messages": messages  # May be reduced if aggressive summarization applied
-        }
+        update = await build_summary_update(state)
+        return {**state, **update}
 
     except Exception as e:
         # Graceful degradation: log error and return unchanged state
@@ -12,7 +12,6 @@ import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from jinja2 import Template
 from database.connection import get_async_session
 from database.models import Stylist, ServiceCategory
 from sqlalchemy import select
@@ -20,11 +19,17 @@ from sqlalchemy import select
 # Import shared cache (safe for both API and Agent)
 from shared.stylist_cache import get_cache, clear_stylist_context_cache
 
+# Compiled templates and prompt files are cached for the process lifetime
+from shared.template_cache import get_template, read_prompt_file
+
 # Import dynamic context loader
 from agent.prompts.dynamic_context import load_dynamic_context, clear_dynamic_context_cache
 
 logger = logging.getLogger(__name__)
 
+# Directory of the prompt markdown files (preloaded at startup, see agent/main.py)
+PROMPTS_DIR = Path(__file__).parent
+
 # Global cache for stylist context with TTL (10 minutes)
 # This reduces database queries and improves OpenRouter cache hit rate
 # Cache data is stored in shared module, lock is local to agent
@@ -42,15 +47,14 @@ def load_maite_system_prompt() -> str:
     Raises:
         No exceptions raised - returns fallback prompt on errors.
     """
-    prompt_path = Path(__file__).parent / "maite_system_prompt.md"
+    prompt_path = PROMPTS_DIR / "maite_system_prompt.md"
     fallback_prompt = (
         "Eres Maite, asistente virtual de Atrevete Peluqueria. "
         "Se amable, usa herramientas, y escala cuando sea necesario."
     )
 
     try:
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            prompt = f.read()
+        prompt = read_prompt_file(prompt_path)
 
         if len(prompt) < 100:
             logger.error(
@@ -253,12 +257,27 @@ def _detect_booking_state(state: dict) -> str:
     return "GENERAL"
 
 
+def _build_turn_context(dynamic_context: dict, booking_state: str) -> str:
+    """
+    Build the prompt segment that changes every turn (current time, booking state).
+
+    Kept out of core.md and the step files so that everything before it can be
+    served from the provider's prompt cache.
+    """
+    return (
+        "## Contexto Actual\n"
+        f"- **Fecha y hora actual:** {dynamic_context.get('current_datetime', '')}\n"
+        f"- **Estado de la reserva:** {booking_state}"
+    )
+
+
 async def load_contextual_prompt(state: dict) -> str:
     """
     Load modular prompts based on conversation state with dynamic variable injection.
 
     This function reduces prompt size from 27KB to ~7-10KB by loading only relevant sections
-    based on the exact booking state. Optimized for OpenRouter's automatic caching (GPT-4.1-mini).
+    based on the exact booking state. Optimized for OpenRouter's automatic caching (GPT-4.1-mini):
+    segments are ordered from most to least stable (core → step → current time and state).
 
     v4.0: Added async support and Jinja2 templating for dynamic variables from database.
 
@@ -277,15 +296,16 @@ async def load_contextual_prompt(state: dict) -> str:
         - step3_5_confirmation.md: BOOKING_CONFIRMATION state - Wait for user confirmation
         - step4_booking.md: BOOKING_EXECUTION state - Execute book()
         - step5_post_booking.md: POST_BOOKING state - Confirmations, modifications
+        - Contexto Actual: Always last - current datetime and booking state
 
     Dynamic Variables Injected:
         - minimum_booking_days_advance: From system_settings table
         - salon_address: From config
         - business_hours: From business_hours table
         - upcoming_holidays: From holidays table (next 30 days)
-        - current_datetime: Current datetime in Europe/Madrid
+        - current_datetime: Current datetime in Europe/Madrid (in the final "Contexto Actual" segment)
     """
-    prompt_dir = Path(__file__).parent
+    prompt_dir = PROMPTS_DIR
     prompt_parts = []
 
     # 1. Load dynamic context from database (cached for 5 minutes)
@@ -294,8 +314,7 @@ async def load_contextual_prompt(state: dict) -> str:
     # 2. Always load core prompt (rules, identity, error handling)
     try:
         core_path = prompt_dir / "core.md"
-        with open(core_path, "r", encoding="utf-8") as f:
-            core_template = f.read()
+        core_template = read_prompt_file(core_path)
         logger.debug("Loaded core.md")
     except Exception as e:
         logger.error(f"Error loading core.md: {e}")
@@ -304,7 +323,7 @@ async def load_contextual_prompt(state: dict) -> str:
 
     # 3. Render core template with dynamic variables
     try:
-        rendered_core = Template(core_template).render(**dynamic_context)
+        rendered_core = get_template(core_template).render(**dynamic_context)
         prompt_parts.append(rendered_core)
     except Exception as e:
         logger.warning(f"Error rendering core.md template: {e}, using raw content")
@@ -330,8 +349,7 @@ async def load_contextual_prompt(state: dict) -> str:
     step_template = None
     try:
         step_path = prompt_dir / step_file
-        with open(step_path, "r", encoding="utf-8") as f:
-            step_template = f.read()
+        step_template = read_prompt_file(step_path)
         logger.debug(f"Loaded {step_file} for state={booking_state}")
     except FileNotFoundError:
         logger.warning(
@@ -341,8 +359,7 @@ async def load_contextual_prompt(state: dict) -> str:
         # Fallback to general.md if specific step file missing
         try:
             general_path = prompt_dir / "general.md"
-            with open(general_path, "r", encoding="utf-8") as f:
-                step_template = f.read()
+            step_template = read_prompt_file(general_path)
         except Exception:
             # If even general.md fails, continue with core only
             logger.error("Could not load general.md fallback")
@@ -352,13 +369,17 @@ async def load_contextual_prompt(state: dict) -> str:
     # 7. Render step template with dynamic variables
     if step_template:
         try:
-            rendered_step = Template(step_template).render(**dynamic_context)
+            rendered_step = get_template(step_template).render(**dynamic_context)
             prompt_parts.append(rendered_step)
         except Exception as e:
             logger.warning(f"Error rendering {step_file} template: {e}, using raw content")
             prompt_parts.append(step_template)
 
-    # 8. Assemble final prompt
+    # 8. Append the per-turn context last: core and step prompts form a
+    # prefix that stays identical between turns (provider prompt caching)
+    prompt_parts.append(_build_turn_context(dynamic_context, booking_state))
+
+    # 9. Assemble final prompt
     final_prompt = "\n\n---\n\n".join(prompt_parts)
 
     logger.info(
@@ -371,6 +392,7 @@ async def load_contextual_prompt(state: dict) -> str:
 
 
 __all__ = [
+    "PROMPTS_DIR",
     "load_maite_system_prompt",
     "load_stylist_context",
     "load_contextual_prompt",
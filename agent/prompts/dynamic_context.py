@@ -8,9 +8,13 @@ Variables loaded:
 - minimum_booking_days_advance: From system_settings table
 - cancellation_window_hours: From system_settings table (default 48)
 - salon_address: From config (SALON_ADDRESS)
-- business_hours: From business_hours table
-- upcoming_holidays: From holidays table (next 30 days)
+- business_hours: From the salon calendar snapshot (business_hours table)
+- upcoming_holidays: From the salon calendar snapshot (next 30 days)
 - current_datetime: Current datetime in Europe/Madrid timezone
+
+business_hours and upcoming_holidays are read from the snapshot on every call
+instead of being kept in this module's cache, so an admin edit reaches the
+prompt at the same time as slot search (shared/salon_calendar.py).
 """
 
 import asyncio
@@ -22,8 +26,9 @@ import pytz
 from sqlalchemy import select
 
 from database.connection import get_async_session
-from database.models import BusinessHours, Holiday, SystemSetting
+from database.models import SystemSetting
 from shared.config import get_settings
+from shared.salon_calendar import get_salon_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -90,9 +95,10 @@ async def load_dynamic_context(force_refresh: bool = False) -> dict[str, Any]:
             and _DYNAMIC_CONTEXT_CACHE["expires_at"] > now
         ):
             logger.debug("Using cached dynamic context (cache hit)")
-            # Update current_datetime even on cache hit
+            # Update current_datetime and the calendar even on cache hit
             cached = _DYNAMIC_CONTEXT_CACHE["data"].copy()
             cached["current_datetime"] = _format_current_datetime()
+            cached.update(await _load_calendar_context())
             return cached
 
         logger.info("Cache miss - loading dynamic context from database")
@@ -107,18 +113,17 @@ async def load_dynamic_context(force_refresh: bool = False) -> dict[str, Any]:
             logger.info(
                 f"Dynamic context cached (TTL: {CACHE_TTL_MINUTES} min, "
                 f"min_days={context['minimum_booking_days_advance']}, "
-                f"cancel_window_h={context['cancellation_window_hours']}, "
-                f"holidays={len(context['upcoming_holidays'])})"
+                f"cancel_window_h={context['cancellation_window_hours']})"
             )
-            return context
+            return {**context, **await _load_calendar_context()}
 
         except Exception as e:
             logger.error(f"Error loading dynamic context: {e}", exc_info=True)
-            return _get_fallback_context()
+            return {**_get_fallback_context(), **await _load_calendar_context()}
 
 
 async def _load_context_from_db() -> dict[str, Any]:
-    """Load all dynamic context values from database."""
+    """Load the cached context values (system settings) from database."""
     settings = get_settings()
 
     context = {
@@ -158,50 +163,47 @@ async def _load_context_from_db() -> dict[str, Any]:
             else:
                 context["cancellation_window_hours"] = setting.value
 
-        # 3. Load business hours
-        stmt = select(BusinessHours).order_by(BusinessHours.day_of_week)
-        result = await session.execute(stmt)
-        hours = result.scalars().all()
+    return context
 
-        for hour in hours:
-            day_info = {
-                "day_name": DAY_NAMES_ES.get(hour.day_of_week, f"Día {hour.day_of_week}"),
-                "is_closed": hour.is_closed,
-            }
 
-            if hour.is_closed:
-                day_info["start"] = None
-                day_info["end"] = None
-            else:
-                # Format times as HH:MM
-                start_hour = hour.start_hour or 0
-                start_minute = hour.start_minute or 0
-                end_hour = hour.end_hour or 0
-                end_minute = hour.end_minute or 0
-
-                day_info["start"] = f"{start_hour:02d}:{start_minute:02d}"
-                day_info["end"] = f"{end_hour:02d}:{end_minute:02d}"
-
-            context["business_hours"].append(day_info)
-
-        # 4. Load upcoming holidays (next 30 days)
-        today = date.today()
-        thirty_days_later = today + timedelta(days=30)
-
-        stmt = (
-            select(Holiday)
-            .where(Holiday.date >= today)
-            .where(Holiday.date <= thirty_days_later)
-            .order_by(Holiday.date)
-        )
-        result = await session.execute(stmt)
-        holidays = result.scalars().all()
+async def _load_calendar_context() -> dict[str, Any]:
+    """
+    Business hours and upcoming holidays (next 30 days) from the salon calendar.
 
-        for holiday in holidays:
-            context["upcoming_holidays"].append({
-                "date": _format_date_spanish(holiday.date),
-                "name": holiday.name,
-            })
+    Returns empty lists if the calendar cannot be loaded (like the fallback context).
+    """
+    context: dict[str, Any] = {"business_hours": [], "upcoming_holidays": []}
+    try:
+        calendar = await get_salon_calendar()
+    except Exception as e:
+        logger.error(f"Error loading salon calendar for dynamic context: {e}", exc_info=True)
+        return context
+
+    for day_of_week, hours in sorted(calendar.days.items()):
+        day_info = {
+            "day_name": DAY_NAMES_ES.get(day_of_week, f"Día {day_of_week}"),
+            "is_closed": hours.is_closed,
+        }
+
+        if hours.is_closed:
+            day_info["start"] = None
+            day_info["end"] = None
+        else:
+            # Format times as HH:MM
+            start_hour = hours.start_hour or 0
+            end_hour = hours.end_hour or 0
+            day_info["start"] = f"{start_hour:02d}:{hours.start_minute:02d}"
+            day_info["end"] = f"{end_hour:02d}:{hours.end_minute:02d}"
+
+        context["business_hours"].append(day_info)
+
+    # The snapshot covers HORIZON_DAYS (60) from the day it was loaded
+    today = date.today()
+    for holiday_date, name in calendar.holidays_between(today, today + timedelta(days=31)):
+        context["upcoming_holidays"].append({
+            "date": _format_date_spanish(holiday_date),
+            "name": name,
+        })
 
     return context
 
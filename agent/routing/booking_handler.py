@@ -15,19 +15,23 @@ Flow:
 4. Return personalized natural language response
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
 from typing import Any
 
-from jinja2 import Template
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from agent.fsm import BookingFSM
 from agent.fsm.booking_fsm import BookingState
-from agent.fsm.models import ActionType, FSMAction, Intent
+from agent.fsm.fsm_action import execution_waves
+from agent.fsm.models import ActionType, FSMAction, Intent, ToolCall
 from agent.state.schemas import ConversationState
+from shared.llm_clients import LLMPurpose
+from shared.llm_hedging import get_hedged_llm_client
+from shared.template_cache import get_template
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +49,7 @@ class ResponseFormatter:
         template_str: str,
         template_vars: dict[str, Any],
         allow_creativity: bool,
-        llm: ChatOpenAI,
+        llm: ChatOpenAI | None = None,
     ) -> str:
         """
         Render Jinja2 template and optionally enhance with LLM creativity.
@@ -54,7 +58,7 @@ class ResponseFormatter:
             template_str: Jinja2 template string (with {% %} and {{ }} syntax)
             template_vars: Variables to inject into template
             allow_creativity: If True, LLM can rephrase; if False, use template exactly
-            llm: LLM client for creative enhancement
+            llm: LLM client for creative enhancement (default: shared formatter client)
 
         Returns:
             Final response text (template-rendered or LLM-enhanced)
@@ -65,8 +69,8 @@ class ResponseFormatter:
             >>> await format_with_template(template, vars, allow_creativity=True, llm)
             "¡Perfecto! 🌸 Estos son nuestros servicios:\\n- Corte\\n- Tinte"
         """
-        # Render base template
-        jinja_template = Template(template_str)
+        # Render base template (compiled once per template, see shared.template_cache)
+        jinja_template = get_template(template_str)
         base_response = jinja_template.render(**template_vars)
 
         if not allow_creativity:
@@ -103,6 +107,9 @@ Respuesta natural:"""
             HumanMessage(content=prompt),
         ]
 
+        if llm is None:
+            llm = get_hedged_llm_client(LLMPurpose.FORMATTER)
+
         response = await llm.ainvoke(messages)
         return response.content
 
@@ -171,7 +178,6 @@ class BookingHandler:
                     template_str=action.response_template,
                     template_vars=template_vars,
                     allow_creativity=action.allow_llm_creativity,
-                    llm=self.llm,
                 )
             except Exception as e:
                 # Template rendering error (syntax error, missing vars, LLM failure)
@@ -196,6 +202,15 @@ class BookingHandler:
         """
         Execute prescribed tools and return results.
 
+        Tool calls that do not depend on each other (ToolCall.depends_on) run
+        concurrently, wave by wave (see execution_waves). Results are merged in
+        prescribed order, so flattening matches sequential execution.
+
+        Failure semantics per tool (including timeouts and tools skipped
+        because a dependency failed):
+        - required=True: the error is raised once its wave has finished
+        - required=False: stored as {"error": ...} and execution continues
+
         Args:
             tool_calls: List of ToolCall specifications from FSMAction
 
@@ -229,130 +244,180 @@ class BookingHandler:
         }
 
         results = {}
-
-        for tool_call in tool_calls:
-            try:
-                # Get tool implementation
-                tool = tool_map.get(tool_call.name)
-                if not tool:
-                    error_msg = f"Tool not found: {tool_call.name}"
-                    logger.error(error_msg)
+        failed: set[str] = set()
+
+        for wave in execution_waves(tool_calls):
+            outcomes = await asyncio.gather(
+                *(self._invoke_tool(tool_call, tool_map, failed) for tool_call in wave),
+                return_exceptions=True,
+            )
+
+            for tool_call, outcome in zip(wave, outcomes, strict=True):
+                try:
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                    self._merge_tool_result(results, tool_call, outcome)
+
+                except Exception as e:
+                    failed.add(tool_call.name)
+                    logger.error(
+                        f"Tool execution failed | name={tool_call.name} | error={str(e)}",
+                        exc_info=True,
+                    )
                     if tool_call.required:
-                        raise ValueError(error_msg)
-                    results[tool_call.name] = {"error": error_msg}
-                    continue
+                        # Required tool failed - re-raise to fail fast
+                        raise
+                    else:
+                        # Optional tool failed - log and continue
+                        results[tool_call.name] = {"error": str(e)}
 
-                # Execute tool
-                logger.info(
-                    f"Executing FSM-prescribed tool | name={tool_call.name} | "
-                    f"args={json.dumps(tool_call.args, default=str, ensure_ascii=False)}"
-                )
-                result = await tool.ainvoke(tool_call.args)
-
-                # Store full result under tool name
-                results[tool_call.name] = result
-
-                # FLATTEN: Extract nested keys for direct template access
-                # This allows templates to use {% for service in services %}
-                # instead of {% for service in search_services.services %}
-                if isinstance(result, dict):
-                    for key, value in result.items():
-                        # Don't overwrite existing keys (preserves tool-specific data)
-                        if key not in results:
-                            results[key] = value
-                            logger.debug(
-                                f"Flattened key '{key}' from tool '{tool_call.name}'"
-                            )
-
-                    # Special handling for find_next_available:
-                    # v4.2: Returns {"soonest_any": {...}, "selected_stylist_slots": [...], ...}
-                    # We need to extract both for the template
-                    if tool_call.name == "find_next_available":
-                        # Format dates in Spanish for better UX
-                        month_names = [
-                            "enero", "febrero", "marzo", "abril", "mayo", "junio",
-                            "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
-                        ]
-
-                        def format_slot_date(slot: dict) -> None:
-                            """Convert date from YYYY-MM-DD to Spanish format."""
-                            if "date" in slot and isinstance(slot["date"], str):
-                                try:
-                                    date_obj = datetime.strptime(slot["date"], "%Y-%m-%d")
-                                    slot["date"] = f"{date_obj.day} de {month_names[date_obj.month - 1]}"
-                                except ValueError:
-                                    pass  # Keep original format if parsing fails
-
-                        # v4.2: Handle soonest_any slot
-                        soonest_any = result.get("soonest_any")
-                        if soonest_any:
-                            format_slot_date(soonest_any)
-                            results["soonest_any"] = soonest_any
-
-                        # v4.2: Handle selected_stylist_slots
-                        selected_stylist_slots = result.get("selected_stylist_slots", [])
-                        for slot in selected_stylist_slots:
-                            format_slot_date(slot)
-                        results["selected_stylist_slots"] = selected_stylist_slots
-
-                        # Legacy: Also flatten all slots for backwards compatibility
-                        all_slots = []
-                        available_stylists = result.get("available_stylists", [])
-                        for stylist_data in available_stylists:
-                            stylist_slots = stylist_data.get("slots", [])
-                            for slot in stylist_slots:
-                                format_slot_date(slot)
-                            all_slots.extend(stylist_slots)
-                        results["slots"] = all_slots
-
-                        # Build combined slots_shown list for slot resolution
-                        # Includes soonest_any (if exists) + selected_stylist_slots
-                        slots_shown = []
-                        if soonest_any:
-                            # Add soonest_any as option 1
-                            slots_shown.append(soonest_any)
-                        slots_shown.extend(selected_stylist_slots)
-
-                        # Store slots_shown in FSM for later resolution of slot_time
-                        # When user says "a las 10:30", we need to match against these slots
-                        self.fsm._collected_data["slots_shown"] = slots_shown
-
-                        logger.info(
-                            f"v4.2: soonest_any={soonest_any is not None}, "
-                            f"selected_stylist_slots={len(selected_stylist_slots)}, "
-                            f"slots_shown={len(slots_shown)} (stored in FSM)"
-                        )
+        return results
 
-                logger.info(
-                    f"Tool executed | name={tool_call.name} | "
-                    f"success={not result.get('error')} | "
-                    f"result_keys={list(result.keys()) if isinstance(result, dict) else 'non-dict'} | "
-                    f"flattened_keys={[k for k in results.keys() if k != tool_call.name]}"
-                )
+    async def _invoke_tool(
+        self, tool_call: ToolCall, tool_map: dict[str, Any], failed: set[str]
+    ) -> Any:
+        """
+        Run one prescribed tool with its timeout.
+
+        Args:
+            tool_call: ToolCall specification
+            tool_map: Tool name -> tool implementation
+            failed: Names of tools that already failed (dependencies)
+
+        Returns:
+            Raw tool result
+
+        Raises:
+            ValueError: Tool not found
+            RuntimeError: A dependency failed (tool skipped)
+            TimeoutError: Tool exceeded tool_call.timeout_seconds (None: no limit)
+        """
+        failed_dependencies = [name for name in tool_call.depends_on if name in failed]
+        if failed_dependencies:
+            raise RuntimeError(f"Skipped, dependencies failed: {failed_dependencies}")
+
+        # Get tool implementation
+        tool = tool_map.get(tool_call.name)
+        if not tool:
+            raise ValueError(f"Tool not found: {tool_call.name}")
 
-                # Reset FSM to IDLE after successful booking
-                # This allows users to start a new booking naturally
-                if tool_call.name == "book" and not result.get("error"):
-                    customer_id = self.fsm.collected_data.get("customer_id")
-                    self.fsm._state = BookingState.IDLE
-                    self.fsm._collected_data = {"customer_id": customer_id} if customer_id else {}
-                    logger.info(
-                        f"FSM reset to IDLE after successful booking | customer_id={customer_id}"
+        # Execute tool
+        logger.info(
+            f"Executing FSM-prescribed tool | name={tool_call.name} | "
+            f"args={json.dumps(tool_call.args, default=str, ensure_ascii=False)}"
+        )
+        if tool_call.timeout_seconds is None:
+            return await tool.ainvoke(tool_call.args)
+        try:
+            return await asyncio.wait_for(
+                tool.ainvoke(tool_call.args), timeout=tool_call.timeout_seconds
+            )
+        except TimeoutError:
+            raise TimeoutError(
+                f"Tool {tool_call.name} timed out after {tool_call.timeout_seconds}s"
+            ) from None
+
+    def _merge_tool_result(
+        self, results: dict[str, Any], tool_call: ToolCall, result: Any
+    ) -> None:
+        """
+        Store a tool result (full + flattened keys) and apply its FSM side effects.
+
+        Args:
+            results: Accumulated tool results (updated in place)
+            tool_call: ToolCall that produced the result
+            result: Raw tool result
+        """
+        # Store full result under tool name
+        results[tool_call.name] = result
+
+        # FLATTEN: Extract nested keys for direct template access
+        # This allows templates to use {% for service in services %}
+        # instead of {% for service in search_services.services %}
+        if isinstance(result, dict):
+            for key, value in result.items():
+                # Don't overwrite existing keys (preserves tool-specific data)
+                if key not in results:
+                    results[key] = value
+                    logger.debug(
+                        f"Flattened key '{key}' from tool '{tool_call.name}'"
                     )
 
-            except Exception as e:
-                logger.error(
-                    f"Tool execution failed | name={tool_call.name} | error={str(e)}",
-                    exc_info=True,
+            # Special handling for find_next_available:
+            # v4.2: Returns {"soonest_any": {...}, "selected_stylist_slots": [...], ...}
+            # We need to extract both for the template
+            if tool_call.name == "find_next_available":
+                # Format dates in Spanish for better UX
+                month_names = [
+                    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+                    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
+                ]
+
+                def format_slot_date(slot: dict) -> None:
+                    """Convert date from YYYY-MM-DD to Spanish format."""
+                    if "date" in slot and isinstance(slot["date"], str):
+                        try:
+                            date_obj = datetime.strptime(slot["date"], "%Y-%m-%d")
+                            slot["date"] = f"{date_obj.day} de {month_names[date_obj.month - 1]}"
+                        except ValueError:
+                            pass  # Keep original format if parsing fails
+
+                # v4.2: Handle soonest_any slot
+                soonest_any = result.get("soonest_any")
+                if soonest_any:
+                    format_slot_date(soonest_any)
+                    results["soonest_any"] = soonest_any
+
+                # v4.2: Handle selected_stylist_slots
+                selected_stylist_slots = result.get("selected_stylist_slots", [])
+                for slot in selected_stylist_slots:
+                    format_slot_date(slot)
+                results["selected_stylist_slots"] = selected_stylist_slots
+
+                # Legacy: Also flatten all slots for backwards compatibility
+                all_slots = []
+                available_stylists = result.get("available_stylists", [])
+                for stylist_data in available_stylists:
+                    stylist_slots = stylist_data.get("slots", [])
+                    for slot in stylist_slots:
+                        format_slot_date(slot)
+                    all_slots.extend(stylist_slots)
+                results["slots"] = all_slots
+
+                # Build combined slots_shown list for slot resolution
+                # Includes soonest_any (if exists) + selected_stylist_slots
+                slots_shown = []
+                if soonest_any:
+                    # Add soonest_any as option 1
+                    slots_shown.append(soonest_any)
+                slots_shown.extend(selected_stylist_slots)
+
+                # Store slots_shown in FSM for later resolution of slot_time
+                # When user says "a las 10:30", we need to match against these slots
+                self.fsm._collected_data["slots_shown"] = slots_shown
+
+                logger.info(
+                    f"v4.2: soonest_any={soonest_any is not None}, "
+                    f"selected_stylist_slots={len(selected_stylist_slots)}, "
+                    f"slots_shown={len(slots_shown)} (stored in FSM)"
                 )
-                if tool_call.required:
-                    # Required tool failed - re-raise to fail fast
-                    raise
-                else:
-                    # Optional tool failed - log and continue
-                    results[tool_call.name] = {"error": str(e)}
 
-        return results
+        logger.info(
+            f"Tool executed | name={tool_call.name} | "
+            f"success={not result.get('error')} | "
+            f"result_keys={list(result.keys()) if isinstance(result, dict) else 'non-dict'} | "
+            f"flattened_keys={[k for k in results.keys() if k != tool_call.name]}"
+        )
+
+        # Reset FSM to IDLE after successful booking
+        # This allows users to start a new booking naturally
+        if tool_call.name == "book" and not result.get("error"):
+            customer_id = self.fsm.collected_data.get("customer_id")
+            self.fsm._state = BookingState.IDLE
+            self.fsm._collected_data = {"customer_id": customer_id} if customer_id else {}
+            logger.info(
+                f"FSM reset to IDLE after successful booking | customer_id={customer_id}"
+            )
 
     async def _generate_fallback_response(self, tool_results: dict[str, Any]) -> str:
         """
@@ -18,12 +18,14 @@ No booking tools available → no hallucination risk
 v4.3: Added dynamic context injection (minimum_booking_days_advance, etc.)
 """
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING, Any
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_openai import ChatOpenAI
 
+from agent.fsm.fsm_action import DEFAULT_TOOL_TIMEOUT_SECONDS
 from agent.fsm.models import Intent, IntentType
 from agent.prompts.dynamic_context import load_dynamic_context
 
@@ -33,6 +35,17 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Per-tool execution timeouts (a timeout is reported to the LLM as a tool
+# error). Write tools get None and run to completion, like book on the booking
+# path: cancelling them could interrupt a DB write or the Chatwoot escalation
+# halfway while the LLM is told they failed.
+TOOL_TIMEOUT_SECONDS: dict[str, float | None] = {
+    "query_info": DEFAULT_TOOL_TIMEOUT_SECONDS,
+    "search_services": DEFAULT_TOOL_TIMEOUT_SECONDS,
+    "manage_customer": None,
+    "escalate_to_human": None,
+}
+
 
 class NonBookingHandler:
     """
@@ -135,12 +148,10 @@ class NonBookingHandler:
         # Invoke LLM with safe tools
         response = await llm_with_tools.ainvoke(messages)
 
-        # Execute tool calls if any
+        # Execute tool calls if any (independent calls run concurrently)
         if response.tool_calls:
             messages.append(response)
-            for tool_call in response.tool_calls:
-                result = await self._execute_tool(tool_call)
-                messages.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
+            messages.extend(await self._execute_tool_calls(response.tool_calls))
 
             # Get final response after tool execution
             final_response = await llm_with_tools.ainvoke(messages)
@@ -159,6 +170,52 @@ class NonBookingHandler:
         Returns:
             List of LangChain messages (SystemMessage, HumanMessage, AIMessage)
         """
+        messages = [SystemMessage(content=self.build_system_prompt(dynamic_context))]
+
+        # Summary of older messages (written off-turn by the conversation
+        # summarizer); after the system prompt so its cached prefix is kept
+        summary = self.state.get("conversation_summary")
+        if summary:
+            messages.append(
+                SystemMessage(content=f"Resumen de la conversación anterior:\n{summary}")
+            )
+
+        # Add recent conversation history (last 5 messages for context)
+        conversation_messages = self.state.get("messages", [])
+        recent_messages = conversation_messages[-5:] if len(conversation_messages) > 5 else conversation_messages
+
+        for msg in recent_messages:
+            role = msg.get("role")
+            content = msg.get("content", "")
+
+            if role == "user":
+                messages.append(HumanMessage(content=content))
+            elif role == "assistant":
+                messages.append(AIMessage(content=content))
+
+        # Add current user message
+        messages.append(HumanMessage(content=intent.raw_message))
+
+        return messages
+
+    def build_system_prompt(self, dynamic_context: dict[str, Any] | None = None) -> str:
+        """
+        Build the Maite system prompt (persona, business and customer context).
+
+        Also used by the single-call NLU mode, so drafted replies follow the
+        same rules as replies generated here.
+
+        Segments go from most to least stable, so the provider can cache the
+        longest possible prefix: persona and rules (never change), business
+        context (changes with settings/holidays), customer data (per
+        conversation), then current time and booking state (every turn).
+
+        Args:
+            dynamic_context: Dynamic context from database (minimum_booking_days, etc.)
+
+        Returns:
+            System prompt text
+        """
         # Default dynamic context if not provided
         if dynamic_context is None:
             dynamic_context = {}
@@ -202,7 +259,6 @@ cuando esté listo.
 
         business_context = f"""
 CONTEXTO DEL NEGOCIO:
-- Fecha y hora actual: {current_datetime}
 - Dirección del salón: {salon_address}
 - Regla de reserva: Se requieren {min_days} días de antelación mínimo
 - Ventana de cancelación: {cancellation_hours} horas de antelación para cancelar citas
@@ -261,12 +317,14 @@ El usuario ya ha interactuado antes. Nombre: {customer_first_name or "Cliente"}
 Saluda de forma natural: "¡Hola de nuevo, {customer_first_name or 'amigo'}! 😊 ¿En qué puedo ayudarte?"
 """
 
-        # System message with role and context
-        system_prompt = f"""Eres Maite, asistente virtual amigable de la Peluquería Atrévete.
-
-{business_context}
+        # Current time and booking state change every turn: keep them last
+        turn_context = f"""
+CONTEXTO ACTUAL:
+- Fecha y hora actual: {current_datetime}
+{fsm_context}"""
 
-{first_interaction_context}
+        # System message: stable segments first (see docstring)
+        system_prompt = f"""Eres Maite, asistente virtual amigable de la Peluquería Atrévete.
 
 RESPONSABILIDADES:
 - Responder preguntas sobre servicios, horarios, políticas (usa query_info)
@@ -280,27 +338,35 @@ IMPORTANTE:
 - Mantén un tono profesional pero cercano
 - Responde siempre en español
 
-{fsm_context}"""
+{business_context}
 
-        messages = [SystemMessage(content=system_prompt)]
+{first_interaction_context}
 
-        # Add recent conversation history (last 5 messages for context)
-        conversation_messages = self.state.get("messages", [])
-        recent_messages = conversation_messages[-5:] if len(conversation_messages) > 5 else conversation_messages
+{turn_context}"""
 
-        for msg in recent_messages:
-            role = msg.get("role")
-            content = msg.get("content", "")
+        return system_prompt
 
-            if role == "user":
-                messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                messages.append(AIMessage(content=content))
+    async def _execute_tool_calls(self, tool_calls: list[dict]) -> list[ToolMessage]:
+        """
+        Execute the tool calls of one LLM response concurrently.
 
-        # Add current user message
-        messages.append(HumanMessage(content=intent.raw_message))
+        Tool calls emitted together by the LLM do not depend on each other.
+        Each call already turns its errors into an {"error": ...} result, so one
+        failing tool does not affect the others.
 
-        return messages
+        Args:
+            tool_calls: Tool call dicts from the LLM response
+
+        Returns:
+            ToolMessages in the order of tool_calls
+        """
+        results = await asyncio.gather(
+            *(self._execute_tool(tool_call) for tool_call in tool_calls)
+        )
+        return [
+            ToolMessage(content=result, tool_call_id=tool_call["id"])
+            for tool_call, result in zip(tool_calls, results, strict=True)
+        ]
 
     async def _execute_tool(self, tool_call: dict) -> str:
         """
@@ -358,8 +424,15 @@ IMPORTANTE:
                     f"customer_phone={tool_args['_customer_phone']}"
                 )
 
-            # Execute tool
-            result = await tool.ainvoke(tool_args)
+            # Execute tool with its timeout (see TOOL_TIMEOUT_SECONDS)
+            timeout = TOOL_TIMEOUT_SECONDS.get(tool_name, DEFAULT_TOOL_TIMEOUT_SECONDS)
+            if timeout is None:
+                result = await tool.ainvoke(tool_args)
+            else:
+                try:
+                    result = await asyncio.wait_for(tool.ainvoke(tool_args), timeout=timeout)
+                except TimeoutError:
+                    raise TimeoutError(f"Tool {tool_name} timed out after {timeout}s") from None
 
             logger.info(
                 f"Safe tool executed | name={tool_name} | "
@@ -818,9 +891,7 @@ IMPORTANTE:
 
         if response.tool_calls:
             messages.append(response)
-            for tool_call in response.tool_calls:
-                result = await self._execute_tool(tool_call)
-                messages.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
+            messages.extend(await self._execute_tool_calls(response.tool_calls))
 
             final_response = await llm_with_tools.ainvoke(messages)
             return (final_response.content, None)
@@ -1153,9 +1224,7 @@ INSTRUCCIONES:
 
         if response.tool_calls:
             messages.append(response)
-            for tool_call in response.tool_calls:
-                result = await self._execute_tool(tool_call)
-                messages.append(ToolMessage(content=result, tool_call_id=tool_call["id"]))
+            messages.extend(await self._execute_tool_calls(response.tool_calls))
 
             final_response = await llm_with_tools.ainvoke(messages)
             return final_response.content
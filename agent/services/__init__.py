@@ -5,6 +5,7 @@ Provides business logic services for the agent layer.
 
 Services:
 - availability_service: DB-first availability checking
+- availability_index: In-memory availability index (agent process, LISTEN/NOTIFY)
 - gcal_push_service: Fire-and-forget Google Calendar push
 - escalation_service: Human handoff workflow (Chatwoot + notifications)
 """
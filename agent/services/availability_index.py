@@ -0,0 +1,458 @@
+"""
+In-memory availability index for the agent process.
+
+get_available_slots() used to run 4 queries per stylist and day (holiday,
+closed day, business hours, busy periods). The index keeps, per stylist, the
+busy periods of the next HORIZON_DAYS days sorted by start (bisect lookups);
+holidays and business hours come from the salon calendar snapshot
+(shared/salon_calendar.py), so repeated slot searches do not touch PostgreSQL.
+
+Invalidation is change-driven: database triggers (migration m3n4o5p6q7r8)
+NOTIFY the 'availability_changes' channel on every write to appointments,
+blocking_events, holidays or business_hours, whichever process makes it. The
+index LISTENs on a dedicated asyncpg connection and drops the affected
+stylists (or invalidates the salon calendar); they are reloaded on their next
+lookup.
+
+The index only answers while the LISTEN connection is up. Otherwise, and for
+dates outside the horizon or when a load fails, get_day() returns None and
+the caller queries the database as before. Booking still validates the slot
+against the database (check_slot_availability), so a stale read can only
+cost a suggestion, never a double booking.
+
+Usage:
+    # agent/main.py
+    start_availability_index()
+    ...
+    await close_availability_index()
+
+    # availability_service.get_available_slots()
+    index = get_availability_index()
+    day = await index.get_day(stylist_id, check_date) if index else None
+"""
+
+import asyncio
+import json
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.engine import make_url
+
+from agent.services.availability_service import MADRID_TZ, business_day_bounds, fetch_busy_periods
+from database.connection import get_async_session
+from shared.config import get_settings
+from shared.salon_calendar import SalonCalendar, get_salon_calendar, invalidate_salon_calendar
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "availability_changes"
+
+# Days ahead (from today) served from memory; later dates go to the database
+HORIZON_DAYS = 45
+# Safety net: entries are reloaded after this age even without notifications
+MAX_AGE_SECONDS = 900
+RECONNECT_SECONDS = 5
+HEALTHCHECK_SECONDS = 30
+
+_CALENDAR_TABLES = ("holidays", "business_hours")
+
+
+@dataclass
+class DayAvailability:
+    """What get_available_slots() needs to know about a stylist's day."""
+
+    holiday_name: str | None
+    # {"start": hour, "end": hour}, None if the salon is closed that weekday
+    business_hours: dict[str, int] | None
+    busy_periods: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class _Entry:
+    """Cached data loaded on `day` (entries never outlive the day they were loaded)."""
+
+    day: date
+    loaded_at: float
+
+
+@dataclass
+class _StylistIntervals(_Entry):
+    """Busy periods of a stylist within [today, today + HORIZON_DAYS), sorted by start."""
+
+    periods: list[dict[str, Any]]
+    starts: list[datetime] = field(init=False)
+    max_length: timedelta = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.starts = [period["start"] for period in self.periods]
+        self.max_length = max(
+            (period["end"] - period["start"] for period in self.periods),
+            default=timedelta(0),
+        )
+
+    def overlapping(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Return the periods overlapping [start, end), sorted by start."""
+        # No period is longer than max_length, so none starting before
+        # start - max_length can reach start
+        low = bisect_left(self.starts, start - self.max_length)
+        high = bisect_left(self.starts, end)
+        return [period for period in self.periods[low:high] if period["end"] > start]
+
+
+class AvailabilityIndex:
+    """
+    Per-stylist busy periods, invalidated by LISTEN/NOTIFY.
+
+    Loads are lazy (first lookup of a stylist) and shared by concurrent
+    lookups. A notification received while a load is running discards its
+    result, so data read before a change is never cached after it.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        horizon_days: int = HORIZON_DAYS,
+        max_age_seconds: float = MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the index (call start() to begin listening).
+
+        Args:
+            dsn: libpq-style PostgreSQL DSN for the LISTEN connection
+            horizon_days: Days ahead served from memory
+            max_age_seconds: Maximum entry age before a reload
+        """
+        self._dsn = dsn
+        self.horizon_days = horizon_days
+        self.max_age_seconds = max_age_seconds
+
+        self._entries: dict[UUID, _Entry] = {}
+        self._loading: dict[UUID, asyncio.Task] = {}
+        # Bumped on invalidation: a load started on an older generation is not cached
+        self._generations: dict[UUID, int] = {}
+        self._epoch = 0
+
+        self._listening = False
+        self._listener_task: asyncio.Task | None = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "load_errors": 0,
+            "stale_loads": 0,
+            "notifications": 0,
+            "reconnects": 0,
+        }
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    async def get_day(self, stylist_id: UUID, check_date: date) -> DayAvailability | None:
+        """
+        Get the holiday, business hours and busy periods of a stylist's day.
+
+        Args:
+            stylist_id: UUID of the stylist
+            check_date: Date to look up
+
+        Returns:
+            DayAvailability, or None if the index cannot answer (not listening,
+            date outside the horizon, load error): query the database instead
+        """
+        today = datetime.now(MADRID_TZ).date()
+        if not self._listening or not (
+            today <= check_date < today + timedelta(days=self.horizon_days)
+        ):
+            self._stats["bypassed"] += 1
+            return None
+
+        try:
+            calendar = await get_salon_calendar()
+            if not calendar.covers(check_date):
+                self._stats["bypassed"] += 1
+                return None
+            holiday_name = calendar.holiday_name(check_date)
+            business_hours = calendar.hours_for_weekday(check_date.weekday())
+            if holiday_name or business_hours is None:
+                return DayAvailability(holiday_name, business_hours)
+
+            intervals = await self._get(
+                stylist_id, today, partial(self._load_stylist, stylist_id)
+            )
+        except Exception as e:
+            self._stats["load_errors"] += 1
+            logger.warning(
+                f"Availability index load failed, using database | "
+                f"stylist_id={stylist_id} | date={check_date} | error={e}"
+            )
+            return None
+
+        day_start, day_end = business_day_bounds(check_date, business_hours)
+        return DayAvailability(None, business_hours, intervals.overlapping(day_start, day_end))
+
+    async def get_range(
+        self,
+        stylist_ids: list[UUID],
+        start_date: date,
+        end_date: date,
+    ) -> tuple[SalonCalendar, dict[UUID, list[dict[str, Any]]]] | None:
+        """
+        Get the salon calendar and the busy periods of several stylists.
+
+        Args:
+            stylist_ids: UUIDs of the stylists
+            start_date: First date (inclusive)
+            end_date: Last date (exclusive)
+
+        Returns:
+            (calendar, busy periods by stylist overlapping the range), or None
+            if the index cannot answer: query the database instead
+        """
+        today = datetime.now(MADRID_TZ).date()
+        if not self._listening or not (
+            today <= start_date and end_date <= today + timedelta(days=self.horizon_days)
+        ):
+            self._stats["bypassed"] += 1
+            return None
+
+        try:
+            calendar = await get_salon_calendar()
+            if not calendar.covers(start_date, end_date):
+                self._stats["bypassed"] += 1
+                return None
+            entries = await asyncio.gather(*(
+                self._get(stylist_id, today, partial(self._load_stylist, stylist_id))
+                for stylist_id in stylist_ids
+            ))
+        except Exception as e:
+            self._stats["load_errors"] += 1
+            logger.warning(
+                f"Availability index load failed, using database | "
+                f"stylists={len(stylist_ids)} | range={start_date}..{end_date} | error={e}"
+            )
+            return None
+
+        range_start = datetime(start_date.year, start_date.month, start_date.day, tzinfo=MADRID_TZ)
+        range_end = datetime(end_date.year, end_date.month, end_date.day, tzinfo=MADRID_TZ)
+        return calendar, {
+            stylist_id: entry.overlapping(range_start, range_end)
+            for stylist_id, entry in zip(stylist_ids, entries, strict=True)
+        }
+
+    async def _get(
+        self,
+        key: UUID,
+        today: date,
+        loader: Callable[[date], Awaitable[_Entry]],
+    ) -> Any:
+        """Return a fresh entry, loading it (once for concurrent callers) if needed."""
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and entry.day == today
+            and time.monotonic() - entry.loaded_at < self.max_age_seconds
+        ):
+            self._stats["hits"] += 1
+            return entry
+
+        self._stats["misses"] += 1
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, today, loader))
+            self._loading[key] = task
+            task.add_done_callback(partial(self._load_done, key))
+        # A cancelled caller must not cancel the load other callers wait for
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: UUID,
+        today: date,
+        loader: Callable[[date], Awaitable[_Entry]],
+    ) -> _Entry:
+        generation, epoch = self._generations.get(key, 0), self._epoch
+        entry = await loader(today)
+        if generation == self._generations.get(key, 0) and epoch == self._epoch:
+            self._entries[key] = entry
+        else:
+            # Changed while loading: serve this result once, reload next time
+            self._stats["stale_loads"] += 1
+        return entry
+
+    def _load_done(self, key: UUID, task: asyncio.Task) -> None:
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved by waiters; avoid "never retrieved" warnings
+
+    async def _load_stylist(self, stylist_id: UUID, today: date) -> _StylistIntervals:
+        window_start = datetime(today.year, today.month, today.day, tzinfo=MADRID_TZ)
+        last_day = today + timedelta(days=self.horizon_days)
+        window_end = datetime(last_day.year, last_day.month, last_day.day, tzinfo=MADRID_TZ)
+
+        async with get_async_session() as session:
+            periods = await fetch_busy_periods(session, stylist_id, window_start, window_end)
+
+        logger.debug(
+            f"Availability index loaded stylist | stylist_id={stylist_id} | periods={len(periods)}"
+        )
+        return _StylistIntervals(day=today, loaded_at=time.monotonic(), periods=periods)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, key: UUID) -> None:
+        """Drop a stylist's busy periods."""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._entries.pop(key, None)
+        # Lookups from now on start a new load instead of joining the stale one
+        self._loading.pop(key, None)
+
+    def reset(self) -> None:
+        """Drop everything (reconnect, unparseable notification)."""
+        self._epoch += 1
+        self._entries.clear()
+        self._loading.clear()
+        invalidate_salon_calendar()
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """asyncpg listener for NOTIFY_CHANNEL (payload built by the DB trigger)."""
+        self._stats["notifications"] += 1
+        try:
+            data = json.loads(payload)
+            table = data.get("table")
+            stylist_ids = [UUID(stylist_id) for stylist_id in data.get("stylist_ids") or []]
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(
+                f"Invalid availability notification, resetting index | "
+                f"payload={payload!r} | error={e}"
+            )
+            self.reset()
+            return
+
+        if table in _CALENDAR_TABLES:
+            invalidate_salon_calendar()
+        elif stylist_ids:
+            for stylist_id in stylist_ids:
+                self.invalidate(stylist_id)
+        else:
+            self.reset()
+
+    # ------------------------------------------------------------------
+    # LISTEN connection
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the LISTEN loop (lookups bypass the index until it connects)."""
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_forever())
+
+    async def close(self) -> None:
+        """Stop listening and drop all entries."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self.reset()
+
+    async def _listen_forever(self) -> None:
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _connection, lost=lost: lost.set())
+                await connection.add_listener(NOTIFY_CHANNEL, self._on_notification)
+
+                # Changes made while we were not listening were missed
+                self.reset()
+                self._listening = True
+                logger.info(f"Availability index listening on '{NOTIFY_CHANNEL}'")
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), HEALTHCHECK_SECONDS)
+                    except TimeoutError:
+                        await asyncio.wait_for(connection.fetchval("SELECT 1"), HEALTHCHECK_SECONDS)
+                logger.warning("Availability index LISTEN connection lost")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Availability index LISTEN connection failed: {e}")
+            finally:
+                self._listening = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+            self._stats["reconnects"] += 1
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "listening": self._listening,
+            "stylists": len(self._entries),
+        }
+
+
+# ============================================================================
+# Process-wide index
+# ============================================================================
+
+_index: AvailabilityIndex | None = None
+
+
+def _listen_dsn(database_url: str) -> str:
+    """asyncpg DSN for a SQLAlchemy URL ('postgresql+asyncpg://' -> 'postgresql://')."""
+    url = make_url(database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def start_availability_index() -> AvailabilityIndex | None:
+    """Create and start the process-wide index (no-op if disabled in settings)."""
+    global _index
+    settings = get_settings()
+    if not settings.AVAILABILITY_INDEX_ENABLED:
+        logger.info("Availability index disabled (AVAILABILITY_INDEX_ENABLED=false)")
+        return None
+    if _index is None:
+        _index = AvailabilityIndex(_listen_dsn(settings.DATABASE_URL))
+        _index.start()
+    return _index
+
+
+def get_availability_index() -> AvailabilityIndex | None:
+    """Return the running index, or None (API process, disabled, not started)."""
+    return _index
+
+
+async def close_availability_index() -> None:
+    """Stop the process-wide index."""
+    global _index
+    if _index is not None:
+        await _index.close()
+        _index = None
+
+
+def get_availability_index_stats() -> dict[str, Any]:
+    """Return lookup/invalidation counters of the process-wide index."""
+    return _index.stats() if _index is not None else {"listening": False}
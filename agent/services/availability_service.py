@@ -43,8 +43,16 @@ from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.connection import get_async_session
-from database.models import Appointment, AppointmentStatus, BlockingEvent, Holiday, Service, Stylist
+from database.models import (
+    Appointment,
+    AppointmentStatus,
+    BlockingEvent,
+    Holiday,
+    Service,
+    Stylist,
+)
 from shared.business_hours_validator import get_business_hours_for_day, is_date_closed
+from shared.salon_calendar import get_salon_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +63,8 @@ async def is_holiday(target_date: date | datetime) -> Optional[str]:
     """
     Check if a date is a salon holiday.
 
-    Queries the holidays table for salon-wide closures.
+    Reads the cached salon calendar (shared/salon_calendar.py); dates outside
+    its horizon query the holidays table.
 
     Args:
         target_date: Date or datetime to check
@@ -76,18 +85,20 @@ async def is_holiday(target_date: date | datetime) -> Optional[str]:
         check_date = target_date
 
     try:
-        async with get_async_session() as session:
-            result = await session.execute(
-                select(Holiday.name).where(Holiday.date == check_date)
-            )
-            row = result.first()
-
-            if row:
-                holiday_name = row[0]
-                logger.info(f"Holiday found on {check_date}: {holiday_name}")
-                return holiday_name
+        calendar = await get_salon_calendar()
+        if calendar.covers(check_date):
+            holiday_name = calendar.holiday_name(check_date)
+        else:
+            async with get_async_session() as session:
+                result = await session.execute(
+                    select(Holiday.name).where(Holiday.date == check_date)
+                )
+                row = result.first()
+                holiday_name = row[0] if row else None
 
-            return None
+        if holiday_name:
+            logger.info(f"Holiday found on {check_date}: {holiday_name}")
+        return holiday_name
 
     except Exception as e:
         logger.error(f"Error checking holiday for {check_date}: {e}", exc_info=True)
@@ -125,65 +136,12 @@ async def get_busy_periods(
     """
     busy_periods = []
 
-    async def _fetch(sess: AsyncSession) -> list[dict[str, Any]]:
-        periods = []
-
-        # Query appointments (PENDING or CONFIRMED only)
-        appt_result = await sess.execute(
-            select(Appointment).where(
-                and_(
-                    Appointment.stylist_id == stylist_id,
-                    Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
-                    # Overlap check: appointment overlaps with the time range
-                    Appointment.start_time < end_time,
-                    Appointment.start_time + Appointment.duration_minutes * timedelta(minutes=1) > start_time,
-                )
-            )
-        )
-        appointments = appt_result.scalars().all()
-
-        for appt in appointments:
-            appt_end = appt.start_time + timedelta(minutes=appt.duration_minutes)
-            periods.append({
-                "start": appt.start_time,
-                "end": appt_end,
-                "type": "appointment",
-                "title": f"Cita: {appt.first_name}",
-                "status": appt.status.value,
-            })
-
-        # Query blocking events
-        block_result = await sess.execute(
-            select(BlockingEvent).where(
-                and_(
-                    BlockingEvent.stylist_id == stylist_id,
-                    # Overlap check
-                    BlockingEvent.start_time < end_time,
-                    BlockingEvent.end_time > start_time,
-                )
-            )
-        )
-        blocking_events = block_result.scalars().all()
-
-        for block in blocking_events:
-            periods.append({
-                "start": block.start_time,
-                "end": block.end_time,
-                "type": "blocking_event",
-                "title": block.title,
-                "event_type": block.event_type.value,
-            })
-
-        # Sort by start time
-        periods.sort(key=lambda p: p["start"])
-        return periods
-
     try:
         if session:
-            busy_periods = await _fetch(session)
+            busy_periods = await fetch_busy_periods(session, stylist_id, start_time, end_time)
         else:
             async with get_async_session() as sess:
-                busy_periods = await _fetch(sess)
+                busy_periods = await fetch_busy_periods(sess, stylist_id, start_time, end_time)
 
         logger.debug(
             f"Found {len(busy_periods)} busy periods for stylist {stylist_id} "
@@ -196,6 +154,70 @@ async def get_busy_periods(
         return []
 
 
+async def fetch_busy_periods(
+    session: AsyncSession,
+    stylist_id: UUID,
+    start_time: datetime,
+    end_time: datetime,
+) -> list[dict[str, Any]]:
+    """
+    Query the busy periods of a stylist (see get_busy_periods).
+
+    Unlike get_busy_periods(), database errors propagate, so callers that
+    cache the result never mistake a failed query for a free calendar.
+
+    Returns:
+        Busy periods sorted by start time
+    """
+    periods = []
+
+    # Query appointments (PENDING or CONFIRMED only)
+    appt_result = await session.execute(
+        select(Appointment).where(
+            and_(
+                Appointment.stylist_id == stylist_id,
+                Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
+                Appointment.overlapping(start_time, end_time),
+            )
+        )
+    )
+    appointments = appt_result.scalars().all()
+
+    for appt in appointments:
+        appt_end = appt.start_time + timedelta(minutes=appt.duration_minutes)
+        periods.append({
+            "start": appt.start_time,
+            "end": appt_end,
+            "type": "appointment",
+            "title": f"Cita: {appt.first_name}",
+            "status": appt.status.value,
+        })
+
+    # Query blocking events
+    block_result = await session.execute(
+        select(BlockingEvent).where(
+            and_(
+                BlockingEvent.stylist_id == stylist_id,
+                BlockingEvent.overlapping(start_time, end_time),
+            )
+        )
+    )
+    blocking_events = block_result.scalars().all()
+
+    for block in blocking_events:
+        periods.append({
+            "start": block.start_time,
+            "end": block.end_time,
+            "type": "blocking_event",
+            "title": block.title,
+            "event_type": block.event_type.value,
+        })
+
+    # Sort by start time
+    periods.sort(key=lambda p: p["start"])
+    return periods
+
+
 async def check_slot_availability(
     stylist_id: UUID,
     start_time: datetime,
@@ -354,8 +376,6 @@ async def get_available_slots(
         >>> len(slots)
         8  # Depends on busy periods
     """
-    available_slots = []
-
     # Use service duration as interval to avoid showing overlapping slots
     # e.g., for 70-min service, don't show 10:00 AND 10:30
     if slot_interval_minutes is None:
@@ -368,85 +388,62 @@ async def get_available_slots(
         check_date = target_date
 
     try:
+        # In-memory index (agent process): no DB round-trip once the stylist
+        # is loaded. None if it is not running or cannot answer for this date.
+        from agent.services.availability_index import get_availability_index
+
+        index = get_availability_index()
+        day = await index.get_day(stylist_id, check_date) if index else None
+
+        if day is not None:
+            holiday_name = day.holiday_name
+            closed = day.business_hours is None
+        else:
+            holiday_name = await is_holiday(check_date)
+            closed = not holiday_name and await is_date_closed(check_date)
+
         # Check if it's a holiday
-        holiday_name = await is_holiday(check_date)
         if holiday_name:
             logger.info(f"No slots available on {check_date}: holiday ({holiday_name})")
             return []
 
         # Check if day is closed
-        if await is_date_closed(check_date):
+        if closed:
             logger.info(f"No slots available on {check_date}: salon closed")
             return []
 
         # Get business hours
-        day_of_week = check_date.weekday()
-        business_hours = await get_business_hours_for_day(day_of_week)
+        if day is not None:
+            business_hours = day.business_hours
+        else:
+            business_hours = await get_business_hours_for_day(check_date.weekday())
 
         if not business_hours:
             logger.info(f"No business hours found for {check_date}")
             return []
 
-        # Generate candidate slots
-        start_hour = business_hours["start"]
-        end_hour = business_hours["end"]
-
-        # Create timezone-aware datetimes for the day boundaries
-        day_start = datetime(
-            check_date.year, check_date.month, check_date.day,
-            start_hour, 0, 0, tzinfo=MADRID_TZ
-        )
-        day_end = datetime(
-            check_date.year, check_date.month, check_date.day,
-            end_hour, 0, 0, tzinfo=MADRID_TZ
-        )
+        day_start, day_end = business_day_bounds(check_date, business_hours)
 
         # Get all busy periods for the day
-        busy_periods = await get_busy_periods(stylist_id, day_start, day_end)
-
-        # Calculate adjacent times (slots that start right after existing appointments)
-        adjacent_times = set()
-        if pack_slots and busy_periods:
-            for period in busy_periods:
-                # Add end time of each busy period as a preferred slot start
-                adjacent_times.add(period["end"])
-
-        # Generate slots
-        current_slot = day_start
-        while current_slot + timedelta(minutes=service_duration_minutes) <= day_end:
-            slot_end = current_slot + timedelta(minutes=service_duration_minutes)
-
-            # Check if slot conflicts with any busy period
-            is_available = True
-            for period in busy_periods:
-                if period["start"] < slot_end and period["end"] > current_slot:
-                    is_available = False
-                    break
-
-            if is_available:
-                # Calculate adjacent priority (0 = adjacent to appointment, higher = less priority)
-                adjacent_priority = 1  # Default: not adjacent
-                if current_slot in adjacent_times:
-                    adjacent_priority = 0  # Highest priority: starts right after appointment
-
-                available_slots.append({
-                    "time": current_slot.strftime("%H:%M"),
-                    "end_time": slot_end.strftime("%H:%M"),
-                    "full_datetime": current_slot.isoformat(),
-                    "stylist_id": str(stylist_id),
-                    "adjacent_priority": adjacent_priority,
-                })
-
-            # Move to next slot
-            current_slot += timedelta(minutes=slot_interval_minutes)
-
-        # Sort by adjacent priority (adjacent slots first) then by time
-        if pack_slots:
-            available_slots.sort(key=lambda s: (s["adjacent_priority"], s["time"]))
+        if day is not None:
+            busy_periods = day.busy_periods
+        else:
+            busy_periods = await get_busy_periods(stylist_id, day_start, day_end)
+
+        available_slots = build_slots(
+            stylist_id,
+            day_start,
+            day_end,
+            busy_periods,
+            service_duration_minutes,
+            slot_interval_minutes,
+            pack_slots,
+        )
 
         logger.info(
             f"Found {len(available_slots)} available slots for stylist {stylist_id} "
-            f"on {check_date} (interval={slot_interval_minutes}min, pack={pack_slots})"
+            f"on {check_date} (interval={slot_interval_minutes}min, pack={pack_slots}, "
+            f"indexed={day is not None})"
         )
         return available_slots
 
@@ -455,6 +452,90 @@ async def get_available_slots(
         return []
 
 
+def business_day_bounds(
+    check_date: date, business_hours: dict[str, int]
+) -> tuple[datetime, datetime]:
+    """Return the timezone-aware opening and closing datetimes of a date."""
+    day_start = datetime(
+        check_date.year, check_date.month, check_date.day,
+        business_hours["start"], 0, 0, tzinfo=MADRID_TZ
+    )
+    day_end = datetime(
+        check_date.year, check_date.month, check_date.day,
+        business_hours["end"], 0, 0, tzinfo=MADRID_TZ
+    )
+    return day_start, day_end
+
+
+def build_slots(
+    stylist_id: UUID,
+    day_start: datetime,
+    day_end: datetime,
+    busy_periods: list[dict[str, Any]],
+    service_duration_minutes: int,
+    slot_interval_minutes: int,
+    pack_slots: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Generate the free slots of a business day (see get_available_slots).
+
+    Args:
+        stylist_id: UUID of the stylist
+        day_start: Opening time of the day (timezone-aware)
+        day_end: Closing time of the day (timezone-aware)
+        busy_periods: Busy periods overlapping the day
+        service_duration_minutes: Duration of the service in minutes
+        slot_interval_minutes: Interval between slot start times
+        pack_slots: Prioritize slots adjacent to existing appointments
+
+    Returns:
+        Available slots in the get_available_slots() format
+    """
+    available_slots = []
+
+    # Calculate adjacent times (slots that start right after existing appointments)
+    adjacent_times = set()
+    if pack_slots and busy_periods:
+        for period in busy_periods:
+            # Add end time of each busy period as a preferred slot start
+            adjacent_times.add(period["end"])
+
+    # Generate slots
+    current_slot = day_start
+    while current_slot + timedelta(minutes=service_duration_minutes) <= day_end:
+        slot_end = current_slot + timedelta(minutes=service_duration_minutes)
+
+        # Check if slot conflicts with any busy period
+        is_available = True
+        for period in busy_periods:
+            if period["start"] < slot_end and period["end"] > current_slot:
+                is_available = False
+                break
+
+        if is_available:
+            # Calculate adjacent priority (0 = adjacent to appointment, higher = less priority)
+            adjacent_priority = 1  # Default: not adjacent
+            if current_slot in adjacent_times:
+                adjacent_priority = 0  # Highest priority: starts right after appointment
+
+            available_slots.append({
+                "time": current_slot.strftime("%H:%M"),
+                "end_time": slot_end.strftime("%H:%M"),
+                "full_datetime": current_slot.isoformat(),
+                "stylist_id": str(stylist_id),
+                "adjacent_priority": adjacent_priority,
+            })
+
+        # Move to next slot
+        current_slot += timedelta(minutes=slot_interval_minutes)
+
+    # Sort by adjacent priority (adjacent slots first) then by time
+    if pack_slots:
+        available_slots.sort(key=lambda s: (s["adjacent_priority"], s["time"]))
+
+    return available_slots
+
+
 async def get_soonest_slot_any_stylist(
     category: "ServiceCategory",
     service_duration_minutes: int,
@@ -493,6 +574,7 @@ async def get_soonest_slot_any_stylist(
         >>> slot
         {"time": "10:00", "stylist_name": "Ana", ...}
     """
+    from agent.services.slot_search import search_free_slots
     from agent.tools.calendar_tools import get_stylists_by_category
     from agent.validators.transaction_validators import MINIMUM_DAYS
 
@@ -511,53 +593,35 @@ async def get_soonest_slot_any_stylist(
 
         # Start from 3-day minimum
         now = datetime.now(MADRID_TZ)
-        search_start = now + timedelta(days=MINIMUM_DAYS)
-
-        # Try first search_days, then extend to 14 if nothing found
-        for max_days in [search_days, 14]:
-            for day_offset in range(max_days):
-                current_date = search_start + timedelta(days=day_offset)
-
-                # Skip holidays
-                holiday_name = await is_holiday(current_date)
-                if holiday_name:
-                    continue
-
-                # Skip closed days
-                if await is_date_closed(current_date):
-                    continue
-
-                # Check all stylists for this date
-                for stylist in stylists:
-                    slots = await get_available_slots(
-                        stylist_id=stylist.id,
-                        target_date=current_date,
-                        service_duration_minutes=service_duration_minutes,
-                        pack_slots=True,  # Prefer packed slots
-                    )
+        search_start = (now + timedelta(days=MINIMUM_DAYS)).date()
+
+        # Search search_days, extended to 14 if shorter: one load covers both,
+        # and the first slot found is the soonest either way
+        max_days = max(search_days, 14)
+        async for found in search_free_slots(
+            stylists,
+            search_start,
+            max_days,
+            service_duration_minutes,
+            pack_slots=True,  # Prefer packed slots
+        ):
+            # Days in order, each stylist's slots already sorted by priority
+            first_slot = found.slot
+            logger.info(
+                f"Soonest slot found: {first_slot['time']} on {found.date} "
+                f"with {found.stylist.name}"
+            )
+            return {
+                "time": first_slot["time"],
+                "end_time": first_slot["end_time"],
+                "date": found.date.strftime("%Y-%m-%d"),
+                "day_name": day_names_es[found.date.weekday()],
+                "full_datetime": first_slot["full_datetime"],
+                "stylist_id": str(found.stylist.id),
+                "stylist_name": found.stylist.name,
+            }
 
-                    if slots:
-                        # Return the first available slot (already sorted by priority)
-                        first_slot = slots[0]
-                        logger.info(
-                            f"Soonest slot found: {first_slot['time']} on {current_date.date()} "
-                            f"with {stylist.name}"
-                        )
-                        return {
-                            "time": first_slot["time"],
-                            "end_time": first_slot["end_time"],
-                            "date": current_date.strftime("%Y-%m-%d"),
-                            "day_name": day_names_es[current_date.weekday()],
-                            "full_datetime": first_slot["full_datetime"],
-                            "stylist_id": str(stylist.id),
-                            "stylist_name": stylist.name,
-                        }
-
-            # If we searched 7 days and found nothing, try 14
-            if max_days == search_days:
-                logger.info(f"No slots found in {search_days} days, extending search to 14 days")
-
-        logger.warning(f"No slots found within 14 days for category {category}")
+        logger.warning(f"No slots found within {max_days} days for category {category}")
         return None
 
     except Exception as e:
@@ -625,9 +689,7 @@ async def get_calendar_events_for_range(
 
     try:
         async with get_async_session() as session:
-            # Fetch appointments - simplified query to avoid timezone issues
-            # The datetime arithmetic in SQL causes "can't subtract offset-naive and offset-aware datetimes"
-            # So we fetch a broader range and filter in Python
+            # Fetch appointments overlapping the range
             appt_result = await session.execute(
                 select(Appointment).where(
                     and_(
@@ -636,18 +698,11 @@ async def get_calendar_events_for_range(
                             AppointmentStatus.PENDING,
                             AppointmentStatus.CONFIRMED,
                         ]),
-                        Appointment.start_time < end_time,
-                        Appointment.start_time >= start_time - timedelta(hours=24),  # Buffer for duration
+                        Appointment.overlapping(start_time, end_time),
                     )
                 )
             )
-            all_appointments = appt_result.scalars().all()
-
-            # Filter in Python for exact overlap check (appointment ends after our start time)
-            appointments = [
-                appt for appt in all_appointments
-                if appt.start_time + timedelta(minutes=appt.duration_minutes) > start_time
-            ]
+            appointments = appt_result.scalars().all()
 
             for appt in appointments:
                 appt_end = appt.start_time + timedelta(minutes=appt.duration_minutes)
@@ -706,8 +761,7 @@ async def get_calendar_events_for_range(
                 select(BlockingEvent).where(
                     and_(
                         BlockingEvent.stylist_id.in_(stylist_ids),
-                        BlockingEvent.start_time < end_time,
-                        BlockingEvent.end_time > start_time,
+                        BlockingEvent.overlapping(start_time, end_time),
                     )
                 )
             )
@@ -748,31 +802,42 @@ async def get_calendar_events_for_range(
                     },
                 })
 
-            # Fetch holidays (salon-wide closures)
+            # Fetch holidays (salon-wide closures): from the salon calendar
+            # snapshot, or the database for ranges it does not cover (past
+            # weeks, far future)
             start_date = start_time.date()
             end_date = end_time.date()
 
-            holiday_result = await session.execute(
-                select(Holiday).where(
-                    and_(
-                        Holiday.date >= start_date,
-                        Holiday.date <= end_date,
+            calendar = await get_salon_calendar()
+            if calendar.covers(start_date, end_date + timedelta(days=1)):
+                holidays = [
+                    (calendar.holiday_ids.get(day), day, name)
+                    for day, name in calendar.holidays_between(
+                        start_date, end_date + timedelta(days=1)
+                    )
+                ]
+            else:
+                holiday_result = await session.execute(
+                    select(Holiday.id, Holiday.date, Holiday.name).where(
+                        and_(
+                            Holiday.date >= start_date,
+                            Holiday.date <= end_date,
+                        )
                     )
                 )
-            )
-            holidays = holiday_result.scalars().all()
+                holidays = [tuple(row) for row in holiday_result.all()]
 
-            for holiday in holidays:
+            for holiday_id, holiday_date, holiday_name in holidays:
                 events.append({
-                    "id": f"holiday-{holiday.id}",
-                    "title": f"FESTIVO: {holiday.name}",
-                    "start": holiday.date.isoformat(),
-                    "end": holiday.date.isoformat(),
+                    "id": f"holiday-{holiday_id}",
+                    "title": f"FESTIVO: {holiday_name}",
+                    "start": holiday_date.isoformat(),
+                    "end": holiday_date.isoformat(),
                     "allDay": True,
                     "backgroundColor": "#991B1B",  # Dark red
                     "borderColor": "#7F1D1D",
                     "extendedProps": {
-                        "holiday_id": str(holiday.id),
+                        "holiday_id": str(holiday_id),
                         "type": "holiday",
                     },
                 })
@@ -27,9 +27,9 @@ from database.models import (
     BlockingEvent,
     Appointment,
     AppointmentStatus,
-    BusinessHours,
     Stylist,
 )
+from shared.salon_calendar import get_salon_calendar
 
 MADRID_TZ = ZoneInfo("Europe/Madrid")
 
@@ -176,32 +176,10 @@ async def get_business_hours_summary() -> dict[int, dict | None]:
     Returns:
         Dict mapping day_of_week (0=Monday, 6=Sunday) to:
         - {"open": "HH:MM", "close": "HH:MM"} if open
-        - None if closed
+        - None if closed (or not configured)
     """
-    async for session in get_async_session():
-        result = await session.execute(
-            select(BusinessHours).order_by(BusinessHours.day_of_week)
-        )
-        hours_list = result.scalars().all()
-        break
-
-    # Build summary dict
-    summary: dict[int, dict | None] = {}
-    for h in hours_list:
-        if h.is_closed:
-            summary[h.day_of_week] = None
-        else:
-            summary[h.day_of_week] = {
-                "open": f"{h.start_hour:02d}:{h.start_minute:02d}",
-                "close": f"{h.end_hour:02d}:{h.end_minute:02d}",
-            }
-
-    # Fill in missing days as None (closed)
-    for dow in range(7):
-        if dow not in summary:
-            summary[dow] = None
-
-    return summary
+    calendar = await get_salon_calendar()
+    return calendar.summary()
 
 
 async def get_remaining_week_days(
@@ -318,9 +296,7 @@ async def _check_conflicts_internal(
                         AppointmentStatus.PENDING,
                         AppointmentStatus.CONFIRMED
                     ]),
-                    Appointment.start_time < end_dt,
-                    # Calculate end time: start_time + duration_minutes
-                    Appointment.start_time + (Appointment.duration_minutes * timedelta(minutes=1)) > start_dt,
+                    Appointment.overlapping(start_dt, end_dt),
                 )
             )
         )
@@ -341,8 +317,7 @@ async def _check_conflicts_internal(
             select(BlockingEvent).where(
                 and_(
                     BlockingEvent.stylist_id == stylist_id,
-                    BlockingEvent.start_time < end_dt,
-                    BlockingEvent.end_time > start_dt,
+                    BlockingEvent.overlapping(start_dt, end_dt),
                 )
             )
         )
@@ -0,0 +1,157 @@
+"""
+Bitset slot computation for wide availability searches (admin panel).
+
+Each stylist-day is an occupancy vector of fixed-resolution buckets (5
+minutes by default), stored as the bits of a Python int (1 = free). All
+stylist-days are packed, one row each, into a single int, so finding every
+start with `duration + buffer` free time is a sliding-window AND over the
+whole search at once:
+
+    starts = free & (free >> 1) & ... & (free >> (k - 1))
+
+computed in O(log k) shifts by doubling the window. Python ints operate on
+64-bit words, so each shift processes 64 buckets per machine operation. Rows
+are separated by at least one busy bucket, so windows never cross days.
+
+The result is the same slots as build_slots() (availability_service), whose
+per-slot loop checks every busy period for every candidate start.
+"""
+
+from datetime import date, datetime, timedelta
+from math import ceil, gcd
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from agent.services.availability_service import MADRID_TZ, business_day_bounds
+
+GRID_RESOLUTION_MINUTES = 5
+
+
+class StylistDay(NamedTuple):
+    """One row of the grid: a stylist's open day and its busy periods."""
+
+    stylist_id: UUID
+    date: date
+    # {"start": hour, "end": hour}
+    business_hours: dict[str, int]
+    busy_periods: list[dict[str, Any]]
+
+
+def _wall_minutes(moment: datetime, day_start: datetime) -> float:
+    """Minutes from day_start to moment on the Madrid wall clock."""
+    local = moment.astimezone(MADRID_TZ).replace(tzinfo=None)
+    return (local - day_start.replace(tzinfo=None)).total_seconds() / 60
+
+
+def _resolution(rows: list[tuple[datetime, int, StylistDay]], *minutes: int) -> int:
+    """
+    Largest bucket size (<= GRID_RESOLUTION_MINUTES) aligned with every
+    duration, interval and busy period boundary, so bucketing is exact.
+    """
+    resolution = GRID_RESOLUTION_MINUTES
+    for value in minutes:
+        resolution = gcd(resolution, value)
+    for day_start, _, row in rows:
+        for period in row.busy_periods:
+            for moment in (period["start"], period["end"]):
+                offset = _wall_minutes(moment, day_start)
+                if offset != int(offset):
+                    return 1  # Sub-minute boundary: 1-minute buckets, rounded outwards
+                resolution = gcd(resolution, int(offset))
+    return resolution
+
+
+def _window_starts(free: int, window: int) -> int:
+    """Bits i such that bits i .. i + window - 1 are all set."""
+    starts, span = free, 1
+    while span < window:
+        shift = min(span, window - span)
+        starts &= starts >> shift
+        span += shift
+    return starts
+
+
+def compute_slot_grid(
+    rows: list[StylistDay],
+    service_duration_minutes: int,
+    slot_interval_minutes: int,
+    buffer_minutes: int = 0,
+    pack_slots: bool = True,
+) -> list[list[dict[str, Any]]]:
+    """
+    Compute the free slots of many stylist-days at once.
+
+    Args:
+        rows: Stylist-days to compute (open days only)
+        service_duration_minutes: Duration of the service in minutes
+        slot_interval_minutes: Interval between slot start times
+        buffer_minutes: Free time required after the service (e.g. cleanup);
+            included in the free window, not in the slot's end_time
+        pack_slots: Prioritize slots adjacent to existing appointments
+
+    Returns:
+        Slots of each row, in the order of `rows`, in the format of
+        get_available_slots()
+    """
+    if not rows:
+        return []
+
+    bounded = []
+    for row in rows:
+        day_start, day_end = business_day_bounds(row.date, row.business_hours)
+        bounded.append((day_start, int((day_end - day_start).total_seconds() // 60), row))
+
+    resolution = _resolution(
+        bounded, service_duration_minutes + buffer_minutes, slot_interval_minutes
+    )
+    window = ceil((service_duration_minutes + buffer_minutes) / resolution)
+    step = max(1, slot_interval_minutes // resolution)
+    # Room for the longest day plus one always-busy separator bucket
+    width = max(minutes // resolution for _, minutes, _ in bounded) + 1
+
+    # Occupancy vectors of all rows, packed into one int
+    grid = 0
+    for index, (day_start, minutes, row) in enumerate(bounded):
+        buckets = minutes // resolution
+        free = (1 << buckets) - 1
+        for period in row.busy_periods:
+            first = max(0, int(_wall_minutes(period["start"], day_start) // resolution))
+            last = min(buckets, ceil(_wall_minutes(period["end"], day_start) / resolution))
+            if first < last:
+                free &= ~(((1 << (last - first)) - 1) << first)
+        grid |= free << (index * width)
+
+    starts = _window_starts(grid, window)
+
+    row_mask = (1 << width) - 1
+    candidate_mask = sum(1 << bucket for bucket in range(0, width, step))
+    service = timedelta(minutes=service_duration_minutes)
+
+    results = []
+    for index, (day_start, _, row) in enumerate(bounded):
+        hits = (starts >> (index * width)) & row_mask & candidate_mask
+        adjacent_times = (
+            {period["end"] for period in row.busy_periods} if pack_slots else set()
+        )
+
+        slots = []
+        while hits:
+            lowest = hits & -hits
+            bucket = lowest.bit_length() - 1
+            hits ^= lowest
+
+            slot_start = day_start + timedelta(minutes=bucket * resolution)
+            slot_end = slot_start + service
+            slots.append({
+                "time": slot_start.strftime("%H:%M"),
+                "end_time": slot_end.strftime("%H:%M"),
+                "full_datetime": slot_start.isoformat(),
+                "stylist_id": str(row.stylist_id),
+                "adjacent_priority": 0 if slot_start in adjacent_times else 1,
+            })
+
+        if pack_slots:
+            slots.sort(key=lambda s: (s["adjacent_priority"], s["time"]))
+        results.append(slots)
+
+    return results
@@ -0,0 +1,215 @@
+"""
+Multi-stylist, multi-day slot search.
+
+find_next_available and get_soonest_slot_any_stylist used to call
+get_available_slots() for every stylist and day, re-checking holidays and
+closed days each time: up to 4 queries x stylists x days, sequentially.
+
+search_free_slots() loads the whole range up front and then computes slots in
+memory:
+- busy periods of all stylists: one UNION ALL query (appointments + blocking
+  events), or the in-memory availability index when it can answer
+- salon calendar (holidays + business hours): the cached snapshot of
+  shared/salon_calendar.py, or two small queries past its horizon
+
+Slots are streamed day by day, each stylist's slots in get_available_slots()
+order (packed first), and the generator stops as soon as every stylist has
+max_slots_per_stylist slots.
+
+Usage:
+    async for found in search_free_slots(stylists, start_date, 10, 90, max_slots_per_stylist=3):
+        print(found.date, found.stylist.name, found.slot["time"])
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from datetime import date, datetime, timedelta
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import and_, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agent.services.availability_service import MADRID_TZ, build_slots, business_day_bounds
+from database.connection import get_async_session
+from database.models import Appointment, AppointmentStatus, BlockingEvent, Stylist
+from shared.salon_calendar import SalonCalendar, get_salon_calendar, load_salon_calendar
+
+logger = logging.getLogger(__name__)
+
+
+class FoundSlot(NamedTuple):
+    """A free slot yielded by search_free_slots()."""
+
+    date: date
+    stylist: Stylist
+    # get_available_slots() format (time, end_time, full_datetime, ...)
+    slot: dict[str, Any]
+
+
+async def fetch_busy_periods_by_stylist(
+    session: AsyncSession,
+    stylist_ids: list[UUID],
+    start_time: datetime,
+    end_time: datetime,
+) -> dict[UUID, list[dict[str, Any]]]:
+    """
+    Query the busy periods of several stylists in a single round-trip.
+
+    Same rows as fetch_busy_periods() (PENDING/CONFIRMED appointments and
+    blocking events overlapping the range), without the display fields.
+
+    Returns:
+        Busy periods by stylist, sorted by start time
+    """
+    appointment_end = Appointment.start_time + Appointment.duration_minutes * timedelta(minutes=1)
+    appointments = select(
+        Appointment.stylist_id.label("stylist_id"),
+        Appointment.start_time.label("start"),
+        appointment_end.label("end"),
+        literal("appointment").label("type"),
+    ).where(
+        and_(
+            Appointment.stylist_id.in_(stylist_ids),
+            Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
+            Appointment.overlapping(start_time, end_time),
+        )
+    )
+    blocking_events = select(
+        BlockingEvent.stylist_id.label("stylist_id"),
+        BlockingEvent.start_time.label("start"),
+        BlockingEvent.end_time.label("end"),
+        literal("blocking_event").label("type"),
+    ).where(
+        and_(
+            BlockingEvent.stylist_id.in_(stylist_ids),
+            BlockingEvent.overlapping(start_time, end_time),
+        )
+    )
+
+    result = await session.execute(union_all(appointments, blocking_events))
+
+    periods: dict[UUID, list[dict[str, Any]]] = {stylist_id: [] for stylist_id in stylist_ids}
+    for row in result:
+        periods[row.stylist_id].append({"start": row.start, "end": row.end, "type": row.type})
+    for stylist_periods in periods.values():
+        stylist_periods.sort(key=lambda p: p["start"])
+    return periods
+
+
+async def load_search_range(
+    stylist_ids: list[UUID],
+    start_date: date,
+    end_date: date,
+) -> tuple[SalonCalendar, dict[UUID, list[dict[str, Any]]]]:
+    """
+    Load the salon calendar and busy periods of [start_date, end_date).
+
+    Served by the availability index when it can answer, otherwise by the
+    database. Database errors propagate.
+    """
+    from agent.services.availability_index import get_availability_index
+
+    index = get_availability_index()
+    if index is not None:
+        loaded = await index.get_range(stylist_ids, start_date, end_date)
+        if loaded is not None:
+            return loaded
+
+    calendar = await get_salon_calendar()
+    range_start = datetime(start_date.year, start_date.month, start_date.day, tzinfo=MADRID_TZ)
+    range_end = datetime(end_date.year, end_date.month, end_date.day, tzinfo=MADRID_TZ)
+    async with get_async_session() as session:
+        if not calendar.covers(start_date, end_date):
+            calendar = await load_salon_calendar(session, start_date, end_date)
+        busy = await fetch_busy_periods_by_stylist(session, stylist_ids, range_start, range_end)
+    return calendar, busy
+
+
+def periods_by_day(periods: list[dict[str, Any]]) -> dict[date, list[dict[str, Any]]]:
+    """Bucket busy periods by every local date they touch (keeps start order)."""
+    by_day: dict[date, list[dict[str, Any]]] = defaultdict(list)
+    for period in periods:
+        day = period["start"].astimezone(MADRID_TZ).date()
+        last_day = period["end"].astimezone(MADRID_TZ).date()
+        while day <= last_day:
+            by_day[day].append(period)
+            day += timedelta(days=1)
+    return by_day
+
+
+async def search_free_slots(
+    stylists: list[Stylist],
+    start_date: date,
+    days: int,
+    service_duration_minutes: int,
+    slot_interval_minutes: int | None = None,
+    pack_slots: bool = True,
+    max_slots_per_stylist: int | None = None,
+    slot_filter: Callable[[dict[str, Any]], bool] | None = None,
+) -> AsyncIterator[FoundSlot]:
+    """
+    Stream the free slots of several stylists over several days.
+
+    Args:
+        stylists: Stylists to search (also the order within a day)
+        start_date: First date to search
+        days: Number of days to search
+        service_duration_minutes: Duration of the service in minutes
+        slot_interval_minutes: Interval between slot start times
+            (default: service duration, as in get_available_slots())
+        pack_slots: Prioritize slots adjacent to existing appointments
+        max_slots_per_stylist: Stop yielding a stylist's slots after this many
+            (the search ends once every stylist has reached it)
+        slot_filter: Optional predicate; rejected slots do not count
+
+    Yields:
+        FoundSlot in date order; within a date, stylist by stylist
+    """
+    if not stylists or days <= 0:
+        return
+    if slot_interval_minutes is None:
+        slot_interval_minutes = service_duration_minutes
+
+    end_date = start_date + timedelta(days=days)
+    calendar, busy = await load_search_range(
+        [stylist.id for stylist in stylists], start_date, end_date
+    )
+    busy_by_day = {
+        stylist_id: periods_by_day(periods) for stylist_id, periods in busy.items()
+    }
+
+    found: dict[UUID, int] = {stylist.id: 0 for stylist in stylists}
+    pending = list(stylists)
+
+    for offset in range(days):
+        current_date = start_date + timedelta(days=offset)
+        business_hours = calendar.business_hours(current_date)
+        if business_hours is None:
+            continue
+        day_start, day_end = business_day_bounds(current_date, business_hours)
+
+        for stylist in pending:
+            slots = build_slots(
+                stylist.id,
+                day_start,
+                day_end,
+                busy_by_day[stylist.id].get(current_date, []),
+                service_duration_minutes,
+                slot_interval_minutes,
+                pack_slots,
+            )
+            for slot in slots:
+                if slot_filter and not slot_filter(slot):
+                    continue
+                yield FoundSlot(current_date, stylist, slot)
+                found[stylist.id] += 1
+                if max_slots_per_stylist and found[stylist.id] >= max_slots_per_stylist:
+                    break
+
+        if max_slots_per_stylist:
+            pending = [s for s in pending if found[s.id] < max_slots_per_stylist]
+            if not pending:
+                logger.debug(f"Slot search complete after {offset + 1} days")
+                return
@@ -21,6 +21,11 @@ MAX_MESSAGES = 10
 # Maximum character length for a single message (prevents token overflow)
 MAX_MESSAGE_LENGTH = 2000
 
+# Unsummarized messages that trigger a background summary (see summary_due).
+# Below MAX_MESSAGES, so a summary postponed by one turn (e.g. a conflicting
+# checkpoint write) still finds all its messages in the window.
+SUMMARY_INTERVAL = 8
+
 
 def add_message(
     state: ConversationState,
@@ -118,8 +123,9 @@ def should_summarize(state: ConversationState) -> bool:
     occurs after every 10 messages beyond the first 10 messages to compress
     older messages and maintain manageable context size.
 
-    IMPORTANT: This function is called from route_entry() AFTER the user message
-    is added but BEFORE the assistant response is added. Since each interaction
+    IMPORTANT: This is the in-graph trigger (summarize_conversation node): it is
+    evaluated AFTER the user message is added but BEFORE the assistant response
+    is added. The background summarizer uses summary_due() instead. Since each interaction
     adds 2 messages (user + assistant), we trigger when count is 19, 29, 39...
     (odd numbers) so that after the assistant response, the count will be 20, 30, 40...
 
@@ -165,6 +171,64 @@ def should_summarize(state: ConversationState) -> bool:
     return should_trigger
 
 
+def summary_due(state: ConversationState) -> bool:
+    """
+    Determine if a completed turn should be summarized in the background.
+
+    Unlike should_summarize() (evaluated mid-turn, before the assistant reply),
+    this runs on the state after the turn. It fires once SUMMARY_INTERVAL
+    messages were added since the last summary, so every message is
+    summarized before FIFO windowing drops it.
+
+    Args:
+        state: Conversation state after the turn (checkpoint values)
+
+    Returns:
+        True if there are enough unsummarized messages, False otherwise
+
+    Example:
+        >>> summary_due({"total_message_count": 8})
+        True
+        >>> summary_due({"total_message_count": 12, "summarized_message_count": 8})
+        False
+    """
+    total_message_count = state.get("total_message_count") or 0
+    summarized_message_count = state.get("summarized_message_count") or 0
+
+    return total_message_count - summarized_message_count >= SUMMARY_INTERVAL
+
+
+def messages_since_summary(state: ConversationState) -> list[dict]:
+    """
+    Return the windowed messages added after the last summary.
+
+    Message positions are derived from total_message_count: the window holds
+    the last len(messages) of total_message_count messages, and
+    summarized_message_count is the position of the last summarized one.
+
+    Args:
+        state: Current conversation state
+
+    Returns:
+        Messages not covered by conversation_summary yet (oldest first)
+    """
+    messages = state.get("messages") or []
+    total_message_count = state.get("total_message_count") or len(messages)
+    summarized_message_count = state.get("summarized_message_count") or 0
+
+    first_position = total_message_count - len(messages) + 1
+    already_summarized = max(0, summarized_message_count - first_position + 1)
+
+    if first_position > summarized_message_count + 1:
+        conversation_id = state.get("conversation_id", "unknown")
+        logger.warning(
+            f"Messages {summarized_message_count + 1}-{first_position - 1} left the window "
+            f"before being summarized for conversation {conversation_id}"
+        )
+
+    return messages[already_summarized:]
+
+
 def estimate_token_count(state: ConversationState) -> int:
     """
     Estimate the total token count for the current conversation context.
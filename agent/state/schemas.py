@@ -37,7 +37,7 @@ class ConversationState(TypedDict, total=False):
     CUSTOMER_DATA, BOOKING_CONFIRMATION, BOOKING_EXECUTION, POST_BOOKING)
     for focused prompt loading.
 
-    Fields (31 total):
+    Fields (32 total):
         # Core Metadata (5 fields)
         conversation_id: LangGraph thread_id for checkpointing
         customer_phone: E.164 phone (e.g., +34612345678)
@@ -47,9 +47,10 @@ class ConversationState(TypedDict, total=False):
         metadata: Flexible dict for custom data
         user_message: Incoming message to process
 
-        # Message Management (2 fields)
+        # Message Management (3 fields)
         conversation_summary: Summary for context window management
         total_message_count: Total messages (including summarized)
+        summarized_message_count: Messages covered by conversation_summary
 
         # Escalation Tracking (3 fields)
         escalation_triggered: Whether escalated to human
@@ -108,10 +109,11 @@ class ConversationState(TypedDict, total=False):
     user_message: str | None
 
     # ============================================================================
-    # Message Management (2 fields)
+    # Message Management (3 fields)
     # ============================================================================
     conversation_summary: str | None
     total_message_count: int
+    summarized_message_count: int
 
     # ============================================================================
     # Escalation Tracking (3 fields)
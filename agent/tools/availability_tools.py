@@ -31,6 +31,7 @@ from agent.services.availability_service import (
     get_stylist_by_id,
     is_holiday,
 )
+from agent.services.slot_search import search_free_slots
 from agent.tools.calendar_tools import (
     generate_time_slots_async,
     get_stylists_by_category,
@@ -39,7 +40,7 @@ from agent.utils import parse_natural_date, MADRID_TZ
 from agent.validators import validate_3_day_rule
 from agent.validators.transaction_validators import MINIMUM_DAYS
 from database.models import ServiceCategory
-from shared.business_hours_validator import get_next_open_date, is_date_closed
+from shared.business_hours_validator import get_next_open_date
 
 logger = logging.getLogger(__name__)
 
@@ -522,73 +523,45 @@ async def find_next_available(
                     f"with {soonest_any['stylist_name']} (different={soonest_any['is_different_stylist']})"
                 )
 
-        # Collect ALL slots from selected stylist(s) across multiple dates (DB-first)
+        # Collect slots from selected stylist(s) across multiple dates (DB-first).
+        # The range is loaded once; the search stops when every stylist has
+        # MAX_SLOTS_PER_STYLIST slots.
         all_slots_by_stylist = {stylist.id: [] for stylist in stylists}
-        dates_searched = 0
         MAX_SLOTS_PER_STYLIST = 3  # v4.2: Return 3 slots per stylist for options 2-4
 
-        # Iterate through days
-        for day_offset in range(max_days_to_search):
-            current_date = search_start + timedelta(days=day_offset)
-            dates_searched += 1
-
-            # Check if we have enough slots for all stylists (3 per stylist for v4.2)
-            if all(len(slots) >= MAX_SLOTS_PER_STYLIST for slots in all_slots_by_stylist.values()):
-                logger.info(f"Found {MAX_SLOTS_PER_STYLIST} slots for all stylists, stopping search")
-                break
-
-            # Skip closed days using database-driven validation
-            if await is_date_closed(current_date):
-                logger.info(
-                    f"Skipping closed day: {current_date.date()} "
-                    f"({day_names_es[current_date.weekday()]})"
-                )
-                continue
-
-            # Check for holidays using DB-first service (queries holidays table)
-            holiday_name = await is_holiday(current_date)
-            if holiday_name:
-                logger.info(f"Skipping holiday: {current_date.date()} ({holiday_name})")
-                continue
-
-            # Query availability for each stylist on this date using DB-first service
-            for stylist in stylists:
-                # Skip if we already have enough slots for this stylist
-                if len(all_slots_by_stylist[stylist.id]) >= MAX_SLOTS_PER_STYLIST:
-                    continue
-
-                # Get available slots from DB (queries appointments + blocking_events)
-                # v4.2: Use effective_duration for proper spacing (no overlapping options)
-                available_slots = await get_available_slots(
-                    stylist_id=stylist.id,
-                    target_date=current_date,
-                    service_duration_minutes=effective_duration,
-                    # slot_interval_minutes defaults to service duration for proper spacing
-                    pack_slots=True,  # Prioritize slots adjacent to appointments
-                )
-
-                # Convert to output format and add to results (slots already have correct string format)
-                for slot in available_slots:
-                    # Stop if we already have enough slots for this stylist
-                    if len(all_slots_by_stylist[stylist.id]) >= MAX_SLOTS_PER_STYLIST:
-                        break
-
-                    slot_data = {
-                        "time": slot["time"],  # Already "HH:MM" string
-                        "end_time": slot["end_time"],  # Already "HH:MM" string
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "day_name": day_names_es[current_date.weekday()],
-                        "stylist": stylist.name,
-                        "stylist_id": str(stylist.id),
-                        "full_datetime": slot["full_datetime"],  # Already ISO string
-                    }
-
-                    # Filter by time_range if specified
-                    if time_range:
-                        if not _slot_matches_time_range(slot_data, time_range):
-                            continue
+        slot_filter = (
+            (lambda slot: _slot_matches_time_range(slot, time_range)) if time_range else None
+        )
 
-                    all_slots_by_stylist[stylist.id].append(slot_data)
+        last_date = None
+        async for found in search_free_slots(
+            stylists,
+            search_start.date(),
+            max_days_to_search,
+            effective_duration,
+            # slot_interval_minutes defaults to service duration for proper spacing
+            pack_slots=True,  # Prioritize slots adjacent to appointments
+            max_slots_per_stylist=MAX_SLOTS_PER_STYLIST,
+            slot_filter=slot_filter,
+        ):
+            last_date = found.date
+            all_slots_by_stylist[found.stylist.id].append({
+                "time": found.slot["time"],  # Already "HH:MM" string
+                "end_time": found.slot["end_time"],  # Already "HH:MM" string
+                "date": found.date.strftime("%Y-%m-%d"),
+                "day_name": day_names_es[found.date.weekday()],
+                "stylist": found.stylist.name,
+                "stylist_id": str(found.stylist.id),
+                "full_datetime": found.slot["full_datetime"],  # Already ISO string
+            })
+
+        if last_date and all(
+            len(slots) >= MAX_SLOTS_PER_STYLIST for slots in all_slots_by_stylist.values()
+        ):
+            logger.info(f"Found {MAX_SLOTS_PER_STYLIST} slots for all stylists, stopping search")
+            dates_searched = (last_date - search_start.date()).days + 1
+        else:
+            dates_searched = max_days_to_search
 
         # Format results by stylist (group slots by stylist, v4.2: 3 slots for selected stylist)
         available_stylists = []
@@ -34,8 +34,9 @@ from tenacity import (
 from zoneinfo import ZoneInfo
 
 from database.connection import get_async_session
-from database.models import BusinessHours, ServiceCategory, Stylist
+from database.models import ServiceCategory, Stylist
 from shared.config import get_settings
+from shared.salon_calendar import get_salon_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -257,7 +258,8 @@ async def get_stylist_by_id(stylist_id: UUID) -> Stylist | None:
 
 async def get_business_hours_from_db(day_of_week: int) -> dict[str, int] | None:
     """
-    Get business hours for a specific day from the database.
+    Get business hours for a specific day from the database (via the cached
+    salon calendar).
 
     Args:
         day_of_week: Day of week (0=Monday, 6=Sunday)
@@ -273,34 +275,28 @@ async def get_business_hours_from_db(day_of_week: int) -> dict[str, int] | None:
         >>> # Returns: None
     """
     try:
-        async with get_async_session() as session:
-            result = await session.execute(
-                select(BusinessHours).where(BusinessHours.day_of_week == day_of_week)
-            )
-            business_hours = result.scalar_one_or_none()
+        calendar = await get_salon_calendar()
+        business_hours = calendar.days.get(day_of_week)
 
-            if business_hours is None:
-                logger.warning(
-                    f"No business hours found in database for day_of_week={day_of_week}, "
-                    f"using fallback"
-                )
-                return None
+        if business_hours is None:
+            logger.warning(
+                f"No business hours found in database for day_of_week={day_of_week}, "
+                f"using fallback"
+            )
+            return None
 
-            if business_hours.is_closed:
-                logger.debug(f"Day {day_of_week} is closed (from database)")
-                return None
+        if business_hours.is_closed:
+            logger.debug(f"Day {day_of_week} is closed (from database)")
+            return None
 
-            if business_hours.start_hour is None or business_hours.end_hour is None:
-                logger.warning(
-                    f"Business hours for day_of_week={day_of_week} has NULL hours but is_closed=False, "
-                    f"using fallback"
-                )
-                return None
+        if business_hours.start_hour is None or business_hours.end_hour is None:
+            logger.warning(
+                f"Business hours for day_of_week={day_of_week} has NULL hours but is_closed=False, "
+                f"using fallback"
+            )
+            return None
 
-            return {
-                "start": business_hours.start_hour,
-                "end": business_hours.end_hour,
-            }
+        return calendar.hours_for_weekday(day_of_week)
 
     except Exception as e:
         logger.error(
@@ -18,7 +18,8 @@ from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import select
 
 from database.connection import get_async_session
-from database.models import BusinessHours, Policy, Service, ServiceCategory, Stylist
+from database.models import Policy, Service, ServiceCategory, Stylist
+from shared.salon_calendar import get_salon_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -301,60 +302,56 @@ async def _get_faqs(filters: dict[str, Any] | None, max_results: int = 10) -> di
 
 async def _get_business_hours() -> dict[str, Any]:
     """
-    Get salon business hours from database.
+    Get salon business hours from the salon calendar snapshot.
 
     Internal function called by query_info(type="hours").
     """
-    async with get_async_session() as session:
-        # Query all days ordered by day_of_week
-        query = select(BusinessHours).order_by(BusinessHours.day_of_week)
-        result = await session.execute(query)
-        hours = list(result.scalars().all())
-
-        if not hours:
-            logger.warning("No business hours found in database")
-            return {
-                "schedule": [],
-                "formatted": "No hay horarios configurados",
-                "error": "No business hours configured",
-            }
-
-        # Build schedule data
-        schedule = []
-        for day_hours in hours:
-            day_name = DAY_NAMES.get(day_hours.day_of_week, f"Day {day_hours.day_of_week}")
-
-            if day_hours.is_closed:
-                schedule.append({
-                    "day": day_name,
-                    "day_of_week": day_hours.day_of_week,
-                    "is_closed": True,
-                    "hours": "Cerrado",
-                })
-            else:
-                start_time = f"{day_hours.start_hour:02d}:{day_hours.start_minute:02d}"
-                end_time = f"{day_hours.end_hour:02d}:{day_hours.end_minute:02d}"
-                schedule.append({
-                    "day": day_name,
-                    "day_of_week": day_hours.day_of_week,
-                    "is_closed": False,
-                    "hours": f"{start_time}-{end_time}",
-                    "start_hour": day_hours.start_hour,
-                    "start_minute": day_hours.start_minute,
-                    "end_hour": day_hours.end_hour,
-                    "end_minute": day_hours.end_minute,
-                })
-
-        # Format human-readable summary
-        formatted = _format_schedule_summary(schedule)
-
-        logger.info("Retrieved business hours")
+    calendar = await get_salon_calendar()
 
+    if not calendar.days:
+        logger.warning("No business hours found in database")
         return {
-            "schedule": schedule,
-            "formatted": formatted,
+            "schedule": [],
+            "formatted": "No hay horarios configurados",
+            "error": "No business hours configured",
         }
 
+    # Build schedule data (ordered by day_of_week)
+    schedule = []
+    for day_of_week, day_hours in sorted(calendar.days.items()):
+        day_name = DAY_NAMES.get(day_of_week, f"Day {day_of_week}")
+
+        if day_hours.is_closed:
+            schedule.append({
+                "day": day_name,
+                "day_of_week": day_of_week,
+                "is_closed": True,
+                "hours": "Cerrado",
+            })
+        else:
+            start_time = f"{day_hours.start_hour:02d}:{day_hours.start_minute:02d}"
+            end_time = f"{day_hours.end_hour:02d}:{day_hours.end_minute:02d}"
+            schedule.append({
+                "day": day_name,
+                "day_of_week": day_of_week,
+                "is_closed": False,
+                "hours": f"{start_time}-{end_time}",
+                "start_hour": day_hours.start_hour,
+                "start_minute": day_hours.start_minute,
+                "end_hour": day_hours.end_hour,
+                "end_minute": day_hours.end_minute,
+            })
+
+    # Format human-readable summary
+    formatted = _format_schedule_summary(schedule)
+
+    logger.info("Retrieved business hours")
+
+    return {
+        "schedule": schedule,
+        "formatted": formatted,
+    }
+
 
 def _format_schedule_summary(schedule: list[dict]) -> str:
     """
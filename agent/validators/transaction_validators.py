@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import func, or_, select, text
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.connection import get_async_session
@@ -165,18 +165,12 @@ async def validate_slot_availability(
     end_time = start_time + timedelta(minutes=duration_minutes)
 
     # Query for overlapping appointments with row lock
-    # Note: We calculate appointment end_time dynamically since it's not a column
-    # Formula: start_time + (duration_minutes || ' minutes')::interval
+    # (time_range && [start_time, end_time), served by the GiST index)
     stmt = (
         select(Appointment)
         .where(Appointment.stylist_id == stylist_id)
         .where(Appointment.status.in_([AppointmentStatus.PENDING.value, AppointmentStatus.CONFIRMED.value]))
-        # Check for overlap: existing appointment overlaps with [start_time, end_time]
-        # Appointment starts before our end_time
-        .where(Appointment.start_time < end_time)
-        # Appointment ends after our start_time (calculated dynamically)
-        # Note: Use bindparams() for proper SQLAlchemy 2.0 text() comparison
-        .where(text("start_time + (duration_minutes || ' minutes')::interval > :start_time").bindparams(start_time=start_time))
+        .where(Appointment.overlapping(start_time, end_time))
         .with_for_update()  # Row lock to prevent concurrent bookings
     )
 
@@ -195,7 +189,7 @@ async def validate_slot_availability(
                 "stylist_id": str(stylist_id),
                 "conflicting_appointment_id": str(conflict.id),
                 "conflict_start": conflict.start_time.isoformat(),
-                "conflict_end": conflict.end_time.isoformat()
+                "conflict_end": conflict.time_range.upper.isoformat()
             }
         )
 
@@ -0,0 +1,403 @@
+"""
+Audio Transcription Worker - Transcribes WhatsApp voice notes off the webhook path.
+
+The Chatwoot webhook only detects voice notes and appends a job to AUDIO_STREAM,
+so it returns immediately (a long voice note no longer holds the request open
+and triggers Chatwoot retries). This worker:
+1. Reads audio jobs through the shared consumer group
+2. Downloads and transcribes them with Groq Whisper entirely in memory
+   (ffmpeg only runs for formats Whisper rejects), at most
+   AUDIO_TRANSCRIPTION_CONCURRENCY at a time
+3. Injects the transcript (or a fallback text asking for a text message) into
+   the conversation's incoming stream, where MessageBatcher picks it up like
+   any other message
+4. Acknowledges the job only after the transcript was injected; jobs left
+   pending by a crashed worker are reclaimed (XAUTOCLAIM) and moved to the dead
+   letter stream after too many attempts
+
+Run with: python -m agent.workers.audio_transcription_worker
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any
+
+import aiohttp
+from groq import APIError, RateLimitError
+
+from shared.audio_conversion import prepare_for_transcription
+from shared.audio_transcription import get_transcription_service
+from shared.config import get_settings
+from shared.redis_client import (
+    AUDIO_STREAM,
+    CONSUMER_GROUP,
+    acknowledge_message,
+    add_to_stream,
+    claim_stale_messages,
+    create_consumer_group,
+    move_to_dead_letter,
+    publish_to_channel,
+    read_from_stream,
+)
+from shared.stream_partitions import get_incoming_stream
+
+logger = logging.getLogger(__name__)
+
+# Jobs pending longer than this are considered abandoned and reclaimed.
+# Must exceed the worst-case download + conversion + transcription time.
+CLAIM_MIN_IDLE_MS = 180_000
+CLAIM_INTERVAL_SECONDS = 30
+# Attempts before a job is moved to the dead letter stream
+MAX_DELIVERIES = 3
+
+# Transcriptions below this confidence ask the customer to resend or write
+MIN_TRANSCRIPTION_CONFIDENCE = 0.7
+DOWNLOAD_TIMEOUT_SECONDS = 30
+
+# Fallback texts injected instead of a transcript
+LOW_CONFIDENCE_MESSAGE = "[AUDIO_LOW_CONFIDENCE] Lo siento, no pude entender bien el audio. ¿Puedes enviarlo de nuevo o escribir tu mensaje en texto? 😊"
+RATE_LIMIT_MESSAGE = "[AUDIO_RATE_LIMIT] Por favor, escribe tu mensaje en texto. Estamos experimentando alta demanda de transcripciones."
+API_ERROR_MESSAGE = "[AUDIO_API_ERROR] Lo siento, no pude procesar el audio. ¿Puedes escribir tu mensaje en texto?"
+ERROR_MESSAGE = "[AUDIO_ERROR] Lo siento, hubo un problema con el audio. ¿Puedes escribir tu mensaje?"
+
+
+async def transcribe_voice_note(audio_url: str, conversation_id: str) -> tuple[str, bool]:
+    """
+    Download and transcribe a voice note without touching the disk.
+
+    Errors are not raised: the customer gets a fallback text asking for a
+    written message instead.
+
+    Args:
+        audio_url: Chatwoot attachment URL
+        conversation_id: Conversation ID (for logging)
+
+    Returns:
+        Tuple of (message_text, is_audio_transcription)
+    """
+    try:
+        # 1. Download audio from Chatwoot
+        logger.debug(f"Downloading audio from: {audio_url}")
+        timeout = aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(audio_url) as response:
+                if response.status != 200:
+                    raise Exception(f"Failed to download audio: HTTP {response.status}")
+                audio_data = await response.read()
+
+        logger.debug(
+            "Audio downloaded",
+            extra={
+                "conversation_id": conversation_id,
+                "file_size_mb": len(audio_data) / (1024 * 1024),
+            }
+        )
+
+        # 2. Convert in memory only if Whisper cannot take the format as-is
+        # (WhatsApp OGG Opus is uploaded unchanged)
+        filename, payload = await prepare_for_transcription(audio_data, audio_url)
+
+        # 3. Transcribe audio to text using Groq Whisper with confidence scoring
+        transcription_service = get_transcription_service()
+        message_text, confidence = await transcription_service.transcribe_bytes(
+            payload, filename
+        )
+
+        if confidence < MIN_TRANSCRIPTION_CONFIDENCE:
+            logger.warning(
+                f"Low confidence transcription: {confidence:.2f}",
+                extra={
+                    "conversation_id": conversation_id,
+                    "confidence_score": confidence,
+                    "transcription_preview": message_text[:100],
+                }
+            )
+            return LOW_CONFIDENCE_MESSAGE, False
+
+        logger.info(
+            f"Audio transcribed successfully: {len(message_text)} characters, confidence: {confidence:.2f}",
+            extra={
+                "conversation_id": conversation_id,
+                "transcription_length": len(message_text),
+                "transcription_preview": message_text[:100],
+                "confidence_score": confidence,
+            }
+        )
+        return message_text, True
+
+    except RateLimitError:
+        logger.error(
+            f"Groq rate limit exceeded for conversation {conversation_id}",
+            extra={"conversation_id": conversation_id},
+            exc_info=True,
+        )
+        return RATE_LIMIT_MESSAGE, False
+
+    except APIError as e:
+        logger.error(
+            f"Groq API error during transcription: {e}",
+            extra={"conversation_id": conversation_id},
+            exc_info=True,
+        )
+        return API_ERROR_MESSAGE, False
+
+    except Exception as e:
+        logger.error(
+            f"Unexpected error processing audio: {e}",
+            extra={"conversation_id": conversation_id},
+            exc_info=True,
+        )
+        return ERROR_MESSAGE, False
+
+
+async def publish_incoming_message(message: dict[str, Any]) -> None:
+    """Inject a message for the agent, exactly like the webhook does for text messages."""
+    if get_settings().USE_REDIS_STREAMS:
+        # Routed to the conversation's partition so one agent replica sees all of it
+        stream = get_incoming_stream(message["conversation_id"])
+        await add_to_stream(stream, message)
+    else:
+        await publish_to_channel("incoming_messages", message)
+
+
+class AudioTranscriptionWorker:
+    """
+    Consumes AUDIO_STREAM and injects transcripts into the incoming stream.
+
+    Example:
+        >>> worker = AudioTranscriptionWorker("audio-host-1", max_concurrency=4)
+        >>> await worker.run(shutdown_event)
+    """
+
+    def __init__(
+        self,
+        consumer_name: str,
+        max_concurrency: int = 4,
+        claim_min_idle_ms: int = CLAIM_MIN_IDLE_MS,
+        max_deliveries: int = MAX_DELIVERIES,
+    ):
+        """
+        Initialize the AudioTranscriptionWorker.
+
+        Args:
+            consumer_name: Unique consumer identifier within CONSUMER_GROUP
+            max_concurrency: Maximum number of voice notes processed at once
+            claim_min_idle_ms: Idle time after which pending jobs are reclaimed
+            max_deliveries: Attempts before moving a job to the DLQ
+        """
+        self.consumer_name = consumer_name
+        self.max_concurrency = max_concurrency
+        self.claim_min_idle_ms = claim_min_idle_ms
+        self.max_deliveries = max_deliveries
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Job ID -> processing task (never dispatched twice)
+        self._tasks: dict[str, asyncio.Task] = {}
+
+        # Metrics
+        self.transcribed = 0
+        self.fallbacks = 0
+        self.failed = 0
+        self.dead_lettered = 0
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Read, dispatch and reclaim until shutdown_event is set."""
+        await create_consumer_group(AUDIO_STREAM, CONSUMER_GROUP)
+        logger.info(
+            f"Audio transcription worker ready | stream={AUDIO_STREAM} | "
+            f"consumer={self.consumer_name} | max_concurrency={self.max_concurrency}"
+        )
+
+        # Reclaim immediately: jobs left pending by a previous run
+        await self.reclaim()
+        last_claim = time.monotonic()
+
+        try:
+            while not shutdown_event.is_set():
+                try:
+                    # Only read what can start right away; the rest stays in the stream
+                    free = self.max_concurrency - len(self._tasks)
+                    if free <= 0:
+                        await asyncio.wait(
+                            list(self._tasks.values()), return_when=asyncio.FIRST_COMPLETED
+                        )
+                        continue
+
+                    jobs = await read_from_stream(
+                        AUDIO_STREAM,
+                        CONSUMER_GROUP,
+                        self.consumer_name,
+                        count=free,
+                        block_ms=5000,
+                    )
+                    for stream_msg_id, job in jobs:
+                        self.dispatch(stream_msg_id, job)
+
+                    if time.monotonic() - last_claim >= CLAIM_INTERVAL_SECONDS:
+                        await self.reclaim()
+                        last_claim = time.monotonic()
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error reading from audio stream: {e}", exc_info=True)
+                    await asyncio.sleep(1)
+
+        finally:
+            await self._drain()
+
+    def dispatch(self, stream_msg_id: str, job: dict[str, Any]) -> None:
+        """Start processing a job unless it is already being processed."""
+        if stream_msg_id in self._tasks:
+            return
+        task = asyncio.create_task(self._process(stream_msg_id, job))
+        self._tasks[stream_msg_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(stream_msg_id, None))
+
+    async def reclaim(self) -> int:
+        """
+        Take over jobs abandoned by crashed workers.
+
+        Returns:
+            Number of jobs re-dispatched
+        """
+        claimed = await claim_stale_messages(
+            AUDIO_STREAM,
+            CONSUMER_GROUP,
+            self.consumer_name,
+            min_idle_ms=self.claim_min_idle_ms,
+        )
+
+        redispatched = 0
+        for stream_msg_id, job, deliveries in claimed:
+            if stream_msg_id in self._tasks:
+                continue
+            if deliveries > self.max_deliveries:
+                await self._dead_letter(
+                    stream_msg_id, job, f"Exceeded {self.max_deliveries} transcription attempts"
+                )
+                continue
+            self.dispatch(stream_msg_id, job)
+            redispatched += 1
+
+        if redispatched:
+            logger.info(f"Re-dispatched {redispatched} reclaimed audio jobs")
+        return redispatched
+
+    def stats(self) -> dict[str, int]:
+        """Return worker metrics for logging and health checks."""
+        return {
+            "in_flight": len(self._tasks),
+            "transcribed": self.transcribed,
+            "fallbacks": self.fallbacks,
+            "failed": self.failed,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    async def _process(self, stream_msg_id: str, job: dict[str, Any]) -> None:
+        """Transcribe one job, inject the result and ACK it."""
+        conversation_id = job.get("conversation_id")
+        audio_url = job.get("audio_url")
+
+        if job.get("_parse_error") or not conversation_id or not audio_url:
+            await self._dead_letter(stream_msg_id, job, "Invalid audio job payload")
+            return
+
+        async with self._semaphore:
+            started = time.monotonic()
+            message_text, is_transcription = await transcribe_voice_note(
+                audio_url, str(conversation_id)
+            )
+
+        message = {
+            key: value for key, value in job.items() if key != "message_id"
+        }
+        message["message_text"] = message_text
+        message["is_audio_transcription"] = is_transcription
+
+        try:
+            await publish_incoming_message(message)
+        except Exception as e:
+            # Stays pending: reclaimed and transcribed again later
+            self.failed += 1
+            logger.error(
+                f"Failed to inject transcript for audio job {stream_msg_id}: {e}",
+                extra={"conversation_id": conversation_id},
+                exc_info=True,
+            )
+            return
+
+        if is_transcription:
+            self.transcribed += 1
+        else:
+            self.fallbacks += 1
+        logger.info(
+            f"Audio job processed: conversation_id={conversation_id}, "
+            f"transcribed={is_transcription}, duration_ms={int((time.monotonic() - started) * 1000)}",
+            extra={
+                "conversation_id": conversation_id,
+                "stream_msg_id": stream_msg_id,
+                "chatwoot_message_id": job.get("message_id"),
+            },
+        )
+
+        try:
+            await acknowledge_message(AUDIO_STREAM, CONSUMER_GROUP, stream_msg_id)
+        except Exception as ack_error:
+            # Injected but not acked: a later reclaim would transcribe it again,
+            # which is preferable to losing the voice note
+            logger.warning(f"Failed to ACK audio job {stream_msg_id}: {ack_error}")
+
+    async def _dead_letter(self, stream_msg_id: str, job: dict[str, Any], error: str) -> None:
+        """Move an unprocessable job to the dead letter stream."""
+        self.dead_lettered += 1
+        try:
+            await move_to_dead_letter(AUDIO_STREAM, CONSUMER_GROUP, stream_msg_id, job, error)
+        except Exception as dlq_error:
+            logger.error(f"Failed to move audio job to DLQ: {dlq_error}")
+
+    async def _drain(self) -> None:
+        """Let in-flight jobs finish on shutdown (unread jobs stay in the stream)."""
+        tasks = list(self._tasks.values())
+        if tasks:
+            logger.info(f"Waiting for {len(tasks)} audio jobs to finish...")
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Audio transcription worker stopped | stats={self.stats()}")
+
+
+async def async_main() -> None:
+    """Run the worker until SIGTERM/SIGINT."""
+    shutdown_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, shutdown_event.set)
+
+    worker = AudioTranscriptionWorker(
+        f"audio-{socket.gethostname()}-{os.getpid()}",
+        max_concurrency=get_settings().AUDIO_TRANSCRIPTION_CONCURRENCY,
+    )
+    await worker.run(shutdown_event)
+
+
+def run_audio_transcription_worker() -> None:
+    """
+    Synchronous entry point that sets up logging, then runs the async main function.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ],
+    )
+
+    asyncio.run(async_main())
+
+
+if __name__ == "__main__":
+    run_audio_transcription_worker()
@@ -39,7 +39,7 @@ from database.models import (
     Service,
     Stylist,
 )
-from shared.chatwoot_client import ChatwootClient
+from shared.chatwoot_client import ChatwootClient, close_chatwoot_http_client
 from shared.config import get_settings
 from shared.settings_service import get_settings_service
 from agent.services.gcal_push_service import (
@@ -834,48 +834,52 @@ async def async_main() -> None:
     reminder_minutes = 30 if reminder_interval == "30min" else 60
 
     # Main loop - check every minute
-    while not shutdown_requested:
-        now = datetime.now(MADRID_TZ)
-        current_time = now.strftime("%H:%M")
-        current_date = now.strftime("%Y-%m-%d")
-
-        # Check if we should run daily jobs (confirmation + auto-cancel)
-        # Run if: correct time AND haven't run today
-        if current_time == confirmation_time and last_daily_run != current_date:
-            logger.info(f"Running daily jobs at {current_time}")
-            try:
-                await send_confirmations()
-            except Exception as e:
-                logger.error(f"Error in send_confirmations: {e}", exc_info=True)
-
-            try:
-                await process_auto_cancellations()
-            except Exception as e:
-                logger.error(f"Error in process_auto_cancellations: {e}", exc_info=True)
-
-            last_daily_run = current_date
-
-        # Check if we should run reminders
-        # Run if: enough time has passed since last run
-        should_run_reminders = False
-        if last_reminder_run is None:
-            # First run - run immediately
-            should_run_reminders = True
-        else:
-            minutes_since_last = (now - last_reminder_run).total_seconds() / 60
-            if minutes_since_last >= reminder_minutes:
-                should_run_reminders = True
+    try:
+        while not shutdown_requested:
+            now = datetime.now(MADRID_TZ)
+            current_time = now.strftime("%H:%M")
+            current_date = now.strftime("%Y-%m-%d")
+
+            # Check if we should run daily jobs (confirmation + auto-cancel)
+            # Run if: correct time AND haven't run today
+            if current_time == confirmation_time and last_daily_run != current_date:
+                logger.info(f"Running daily jobs at {current_time}")
+                try:
+                    await send_confirmations()
+                except Exception as e:
+                    logger.error(f"Error in send_confirmations: {e}", exc_info=True)
 
-        if should_run_reminders:
-            logger.info(f"Running send_reminders at {now.strftime('%H:%M:%S')}")
-            try:
-                await send_reminders()
-            except Exception as e:
-                logger.error(f"Error in send_reminders: {e}", exc_info=True)
-            last_reminder_run = now
+                try:
+                    await process_auto_cancellations()
+                except Exception as e:
+                    logger.error(f"Error in process_auto_cancellations: {e}", exc_info=True)
 
-        # Sleep for 1 minute before checking again
-        await asyncio.sleep(60)
+                last_daily_run = current_date
+
+            # Check if we should run reminders
+            # Run if: enough time has passed since last run
+            should_run_reminders = False
+            if last_reminder_run is None:
+                # First run - run immediately
+                should_run_reminders = True
+            else:
+                minutes_since_last = (now - last_reminder_run).total_seconds() / 60
+                if minutes_since_last >= reminder_minutes:
+                    should_run_reminders = True
+
+            if should_run_reminders:
+                logger.info(f"Running send_reminders at {now.strftime('%H:%M:%S')}")
+                try:
+                    await send_reminders()
+                except Exception as e:
+                    logger.error(f"Error in send_reminders: {e}", exc_info=True)
+                last_reminder_run = now
+
+            # Sleep for 1 minute before checking again
+            await asyncio.sleep(60)
+    finally:
+        # Release pooled Chatwoot connections before the event loop closes
+        await close_chatwoot_http_client()
 
     logger.info("Confirmation worker shutting down gracefully...")
 
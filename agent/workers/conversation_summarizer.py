@@ -0,0 +1,168 @@
+"""
+Conversation Summarizer - Off-turn summarization of long conversations.
+
+Summarizing used to be a graph node on the turn path, so the customer waited
+for the summary LLM call before the reply was even generated. The summarizer
+runs it after the reply was published instead:
+1. process_batch schedules it with the state the turn ended with; nothing runs
+   unless summary_due() (enough messages since the last summary)
+2. It loads the thread's checkpoint and summarizes only the messages added
+   since the last summary (build_summary_update)
+3. It writes the result back with a compare-and-set on the checkpoint version:
+   under the conversation lock (also held by process_batch around the graph
+   run) the latest checkpoint_id must still be the one it summarized
+4. On a conflict (a turn finished meanwhile) it starts over from the new
+   checkpoint, up to max_attempts; otherwise the next turn reschedules it
+
+The next turn then reads the new conversation_summary from the checkpoint.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from agent.nodes.summarization import build_summary_update
+from agent.state.helpers import summary_due
+
+logger = logging.getLogger(__name__)
+
+# Summarize + compare-and-set attempts per scheduled run
+MAX_ATTEMPTS = 2
+
+
+class ConversationSummarizer:
+    """
+    Summarizes conversations in the background and writes back via compare-and-set.
+
+    Example:
+        >>> summarizer = ConversationSummarizer(graph)
+        >>> async with summarizer.conversation_lock(conversation_id):
+        ...     result = await graph.ainvoke(state, config=config)
+        >>> # after publishing the reply:
+        >>> summarizer.schedule(conversation_id, result)
+    """
+
+    def __init__(self, graph: Any, max_attempts: int = MAX_ATTEMPTS):
+        """
+        Initialize the ConversationSummarizer.
+
+        Args:
+            graph: Compiled conversation graph (with checkpointer)
+            max_attempts: Summarize + compare-and-set attempts per run
+        """
+        self.graph = graph
+        self.max_attempts = max_attempts
+
+        self._tasks: dict[str, asyncio.Task] = {}
+        # Per-conversation locks, kept only while someone holds or waits on them
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self._stats = {
+            "scheduled": 0,
+            "written": 0,
+            "conflicts": 0,
+            "failed": 0,
+        }
+
+    @asynccontextmanager
+    async def conversation_lock(self, conversation_id: str) -> AsyncIterator[None]:
+        """
+        Hold the lock serializing checkpoint writes of a conversation.
+
+        process_batch holds it around the graph run, so no turn can write a
+        checkpoint between the summarizer's version check and its update.
+        """
+        lock = self._locks.setdefault(conversation_id, asyncio.Lock())
+        self._lock_users[conversation_id] = self._lock_users.get(conversation_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[conversation_id] -= 1
+            if not self._lock_users[conversation_id]:
+                del self._lock_users[conversation_id]
+                del self._locks[conversation_id]
+
+    def schedule(self, conversation_id: str, state: dict[str, Any]) -> None:
+        """
+        Summarize a conversation in the background if it is due.
+
+        Args:
+            conversation_id: Conversation (graph thread_id)
+            state: State the turn ended with (graph result)
+        """
+        if not summary_due(state):
+            return
+
+        running = self._tasks.get(conversation_id)
+        if running is not None and not running.done():
+            return
+
+        task = asyncio.create_task(self._summarize(conversation_id))
+        self._tasks[conversation_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(conversation_id, None))
+        self._stats["scheduled"] += 1
+
+    async def _summarize(self, conversation_id: str) -> None:
+        """Summarize a conversation and compare-and-set the result into its checkpoint."""
+        config = {"configurable": {"thread_id": conversation_id}}
+
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                snapshot = await self.graph.aget_state(config)
+                values = snapshot.values or {}
+                if not summary_due(values):
+                    return
+
+                update = await build_summary_update(values)
+                if not update:
+                    return
+
+                async with self.conversation_lock(conversation_id):
+                    latest = await self.graph.aget_state(config)
+                    if _checkpoint_id(latest) != _checkpoint_id(snapshot):
+                        self._stats["conflicts"] += 1
+                        logger.info(
+                            f"Summary discarded, checkpoint changed | "
+                            f"conversation_id={conversation_id} | attempt={attempt}"
+                        )
+                        continue
+
+                    await self.graph.aupdate_state(
+                        config, update, as_node="conversational_agent"
+                    )
+
+                self._stats["written"] += 1
+                logger.info(
+                    f"Summary written | conversation_id={conversation_id} | "
+                    f"summarized_message_count={update['summarized_message_count']}"
+                )
+                return
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(
+                f"Background summarization failed | conversation_id={conversation_id} | "
+                f"error={e}",
+                exc_info=True,
+            )
+
+    async def close(self) -> None:
+        """Cancel running summaries (shutdown); the next turn reschedules them."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        """Return counters (scheduled, written, conflicts, failed, running)."""
+        return {**self._stats, "running": len(self._tasks)}
+
+
+def _checkpoint_id(snapshot: Any) -> str | None:
+    """Return the checkpoint version of a StateSnapshot."""
+    return ((snapshot.config or {}).get("configurable") or {}).get("checkpoint_id")
@@ -0,0 +1,237 @@
+"""
+Incoming Reclaimer - Recovery of orphaned entries in the incoming streams.
+
+Incoming entries are acknowledged by process_batch only after the graph ran
+and the reply was handed to the outgoing stream. An entry read by a replica
+that crashed before that (or whose batch failed) stays in the consumer group's
+pending entries list (PEL) and is never delivered again. The reclaimer:
+1. Periodically claims (XAUTOCLAIM) entries of the owned partition streams that
+   have been idle longer than claim_min_idle_ms into this consumer
+2. Feeds them back into the batcher like freshly read entries
+3. Moves entries over max_deliveries delivery attempts (poison messages) to
+   DEAD_LETTER_STREAM
+4. Reports PEL size and age per stream
+
+Entries still held by this process (in an open batch or being processed) are
+never redelivered or dead-lettered. Entries of a batch whose turn failed after
+the customer got the fallback reply are dead-lettered by process_batch
+(dead_letter_batch) instead of being left for the reclaimer to replay.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from shared.redis_client import (
+    CONSUMER_GROUP,
+    INCOMING_STREAM,
+    claim_stale_messages,
+    get_pending_summary,
+    move_to_dead_letter,
+)
+
+logger = logging.getLogger(__name__)
+
+# Entries pending longer than this are considered abandoned and reclaimed.
+# Must exceed the batch window plus the worst-case graph run.
+CLAIM_MIN_IDLE_MS = 120_000
+CLAIM_INTERVAL_SECONDS = 30
+CLAIM_BATCH_SIZE = 50
+# Claim rounds per stream and pass (bounds one pass after a large crash)
+MAX_CLAIM_ROUNDS = 20
+# Delivery attempts before an entry is moved to the dead letter stream
+MAX_DELIVERIES = 5
+
+
+class IncomingReclaimer:
+    """
+    Reclaims abandoned incoming stream entries for this consumer.
+
+    Example:
+        >>> reclaimer = IncomingReclaimer("agent-host-1", redeliver=enqueue, is_local=held.__contains__)
+        >>> await reclaimer.reclaim(leases.owned_streams)
+    """
+
+    def __init__(
+        self,
+        consumer_name: str,
+        redeliver: Callable[[str, str, dict[str, Any]], Awaitable[None]],
+        is_local: Callable[[str], bool],
+        claim_min_idle_ms: int = CLAIM_MIN_IDLE_MS,
+        max_deliveries: int = MAX_DELIVERIES,
+    ):
+        """
+        Initialize the IncomingReclaimer.
+
+        Args:
+            consumer_name: Unique consumer identifier within CONSUMER_GROUP
+            redeliver: Async function receiving (stream, stream_msg_id, data)
+                       for each reclaimed entry (normally: add it to the batcher)
+            is_local: Returns True for entry IDs this process still holds
+            claim_min_idle_ms: Idle time after which pending entries are reclaimed
+            max_deliveries: Delivery attempts before moving an entry to the DLQ
+        """
+        self.consumer_name = consumer_name
+        self.redeliver = redeliver
+        self.is_local = is_local
+        self.claim_min_idle_ms = claim_min_idle_ms
+        self.max_deliveries = max_deliveries
+
+        # Metrics
+        self.claimed = 0
+        self.redelivered = 0
+        self.dead_lettered = 0
+
+    async def reclaim(self, streams: list[str], min_idle_ms: int | None = None) -> int:
+        """
+        Take over entries abandoned in the given streams.
+
+        Args:
+            streams: Incoming partition streams owned by this consumer
+            min_idle_ms: Override of claim_min_idle_ms (e.g. right after a
+                         partition lease was taken over from another replica)
+
+        Returns:
+            Number of entries redelivered
+        """
+        if min_idle_ms is None:
+            min_idle_ms = self.claim_min_idle_ms
+
+        redelivered = 0
+        for stream in streams:
+            # Claimed entries are no longer idle, so each round returns the next ones
+            for _ in range(MAX_CLAIM_ROUNDS):
+                claimed = await claim_stale_messages(
+                    stream,
+                    CONSUMER_GROUP,
+                    self.consumer_name,
+                    min_idle_ms=min_idle_ms,
+                    count=CLAIM_BATCH_SIZE,
+                )
+                for stream_msg_id, data, deliveries in claimed:
+                    if self.is_local(stream_msg_id):
+                        continue
+                    self.claimed += 1
+                    if data.get("_parse_error") or not data.get("conversation_id"):
+                        await self._dead_letter(stream, stream_msg_id, data, "Invalid incoming payload")
+                    elif deliveries > self.max_deliveries:
+                        await self._dead_letter(
+                            stream,
+                            stream_msg_id,
+                            data,
+                            f"Exceeded {self.max_deliveries} delivery attempts",
+                        )
+                    elif await self._redeliver(stream, stream_msg_id, data, deliveries):
+                        redelivered += 1
+                if len(claimed) < CLAIM_BATCH_SIZE:
+                    break
+
+        if redelivered:
+            logger.info(
+                f"Redelivered {redelivered} reclaimed incoming messages | "
+                f"min_idle_ms={min_idle_ms}"
+            )
+        return redelivered
+
+    async def pel_stats(self, streams: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Return the pending entries list summary of each stream and log it.
+
+        Args:
+            streams: Incoming partition streams to report on
+
+        Returns:
+            {stream: {"pending": n, "oldest_age_ms": ms, "consumers": {...}}}
+        """
+        result = {}
+        for stream in streams:
+            summary = await get_pending_summary(stream, CONSUMER_GROUP)
+            result[stream] = summary
+            if summary["pending"]:
+                logger.info(
+                    f"Incoming PEL | stream={stream} | pending={summary['pending']} | "
+                    f"oldest_age_ms={summary['oldest_age_ms']}",
+                    extra={
+                        "stream": stream,
+                        "pel_pending": summary["pending"],
+                        "pel_oldest_age_ms": summary["oldest_age_ms"],
+                        "pel_consumers": summary["consumers"],
+                    },
+                )
+        return result
+
+    def stats(self) -> dict[str, int]:
+        """Return reclaimer metrics for logging and health checks."""
+        return {
+            "claimed": self.claimed,
+            "redelivered": self.redelivered,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    async def _redeliver(
+        self, stream: str, stream_msg_id: str, data: dict[str, Any], deliveries: int
+    ) -> bool:
+        """Hand a reclaimed entry back to the batcher."""
+        logger.info(
+            f"Redelivering reclaimed message {stream_msg_id} | "
+            f"conversation_id={data.get('conversation_id')} | deliveries={deliveries}",
+            extra={
+                "conversation_id": data.get("conversation_id"),
+                "stream_msg_id": stream_msg_id,
+                "delivery_count": deliveries,
+            },
+        )
+        try:
+            await self.redeliver(stream, stream_msg_id, data)
+        except Exception as e:
+            # Stays pending: claimed again on the next pass
+            logger.error(
+                f"Error redelivering reclaimed message {stream_msg_id}: {e}",
+                exc_info=True,
+            )
+            return False
+        self.redelivered += 1
+        return True
+
+    async def _dead_letter(
+        self, stream: str, stream_msg_id: str, data: dict[str, Any], error: str
+    ) -> None:
+        """Move an unprocessable entry to the dead letter stream."""
+        self.dead_lettered += 1
+        try:
+            await move_to_dead_letter(stream, CONSUMER_GROUP, stream_msg_id, data, error)
+        except Exception as dlq_error:
+            logger.error(f"Failed to move incoming message to DLQ: {dlq_error}")
+
+
+async def dead_letter_batch(messages: list[dict[str, Any]], error: str) -> int:
+    """
+    Move the stream entries of a batch that must not be replayed to the DLQ.
+
+    Used once the customer got the fallback reply for a failed turn: left
+    pending, the entries would be reclaimed and replayed, sending the fallback
+    again on every delivery attempt.
+
+    Args:
+        messages: Batch messages (entries carry _stream and _stream_msg_id)
+        error: Error description stored with each dead-lettered entry
+
+    Returns:
+        Number of entries moved to the dead letter stream
+    """
+    moved = 0
+    for msg in messages:
+        stream_msg_id = msg.get("_stream_msg_id")
+        if not stream_msg_id:
+            continue
+        data = {k: v for k, v in msg.items() if k not in ("_stream", "_stream_msg_id")}
+        try:
+            await move_to_dead_letter(
+                msg.get("_stream", INCOMING_STREAM), CONSUMER_GROUP, stream_msg_id, data, error
+            )
+            moved += 1
+        except Exception as dlq_error:
+            # Stays pending: the reclaimer retries it (and dead-letters it
+            # after max_deliveries)
+            logger.error(f"Failed to move incoming message {stream_msg_id} to DLQ: {dlq_error}")
+    return moved
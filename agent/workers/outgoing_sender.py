@@ -0,0 +1,321 @@
+"""
+Outgoing Sender - Reliable delivery of agent replies over OUTGOING_STREAM.
+
+Replies produced by process_batch are appended to the outgoing Redis Stream and
+delivered to Chatwoot by this sender:
+1. Entries are read through the shared consumer group (one delivery per group)
+2. Each conversation has its own FIFO, so replies keep their order
+3. Conversations are sent concurrently, bounded by a semaphore, so a slow or
+   retrying Chatwoot call only delays that customer's replies
+4. Entries are acknowledged only after a successful Chatwoot POST; a failed
+   send is retried in place with backoff, and the conversation's later replies
+   wait behind it, until it goes through or is moved to the dead letter stream
+5. Entries left pending by a crashed sender are reclaimed (XAUTOCLAIM) and
+   moved to the dead letter stream after too many delivery attempts
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from shared.chatwoot_client import ChatwootClient
+from shared.redis_client import (
+    CONSUMER_GROUP,
+    OUTGOING_STREAM,
+    acknowledge_message,
+    claim_stale_messages,
+    create_consumer_group,
+    move_to_dead_letter,
+    read_from_stream,
+    retain_pending_message,
+)
+
+logger = logging.getLogger(__name__)
+
+# Entries pending longer than this are considered abandoned and reclaimed.
+# Must exceed the worst-case send time (3 tenacity attempts with 10s timeouts).
+CLAIM_MIN_IDLE_MS = 120_000
+CLAIM_INTERVAL_SECONDS = 30
+# Delivery attempts before an entry is moved to the dead letter stream
+MAX_DELIVERIES = 5
+# Backoff between in-place retries of a failed send (doubles, capped well
+# below CLAIM_MIN_IDLE_MS so the retried entry never looks abandoned)
+RETRY_BASE_SECONDS = 15.0
+RETRY_MAX_SECONDS = 60.0
+
+
+class OutgoingSender:
+    """
+    Consumes OUTGOING_STREAM and sends replies via Chatwoot.
+
+    Example:
+        >>> sender = OutgoingSender(ChatwootClient(), "agent-host-1", max_concurrency=8)
+        >>> await sender.run(shutdown_event)
+    """
+
+    def __init__(
+        self,
+        chatwoot: ChatwootClient,
+        consumer_name: str,
+        max_concurrency: int = 8,
+        claim_min_idle_ms: int = CLAIM_MIN_IDLE_MS,
+        max_deliveries: int = MAX_DELIVERIES,
+        retry_base_seconds: float = RETRY_BASE_SECONDS,
+    ):
+        """
+        Initialize the OutgoingSender.
+
+        Args:
+            chatwoot: Chatwoot client used to send messages
+            consumer_name: Unique consumer identifier within CONSUMER_GROUP
+            max_concurrency: Maximum number of Chatwoot sends in flight
+            claim_min_idle_ms: Idle time after which pending entries are reclaimed
+            max_deliveries: Delivery attempts before moving an entry to the DLQ
+            retry_base_seconds: First backoff delay before retrying a failed send
+        """
+        self.chatwoot = chatwoot
+        self.consumer_name = consumer_name
+        self.max_concurrency = max_concurrency
+        self.claim_min_idle_ms = claim_min_idle_ms
+        self.max_deliveries = max_deliveries
+        self.retry_base_seconds = retry_base_seconds
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Per-conversation FIFO of (stream_msg_id, payload) and its drain task
+        self._queues: dict[str, deque[tuple[str, dict[str, Any]]]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        # Entry IDs dispatched but not yet acked/failed (never re-dispatched)
+        self._in_flight: set[str] = set()
+        # Set on shutdown: retry backoffs stop waiting (entries stay pending)
+        self._stopping = asyncio.Event()
+
+        # Metrics
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Read, dispatch and reclaim until shutdown_event is set."""
+        await create_consumer_group(OUTGOING_STREAM, CONSUMER_GROUP)
+        logger.info(
+            f"Outgoing sender ready | stream={OUTGOING_STREAM} | "
+            f"consumer={self.consumer_name} | max_concurrency={self.max_concurrency}"
+        )
+
+        # Reclaim immediately: entries left pending by a previous run
+        await self.reclaim()
+        last_claim = time.monotonic()
+
+        try:
+            while not shutdown_event.is_set():
+                try:
+                    messages = await read_from_stream(
+                        OUTGOING_STREAM,
+                        CONSUMER_GROUP,
+                        self.consumer_name,
+                        count=50,
+                        block_ms=5000,
+                    )
+                    for stream_msg_id, payload in messages:
+                        self.dispatch(stream_msg_id, payload)
+
+                    if time.monotonic() - last_claim >= CLAIM_INTERVAL_SECONDS:
+                        await self.reclaim()
+                        last_claim = time.monotonic()
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error reading from outgoing stream: {e}", exc_info=True)
+                    await asyncio.sleep(1)
+
+        finally:
+            await self._drain()
+
+    def dispatch(self, stream_msg_id: str, payload: dict[str, Any]) -> None:
+        """Queue an entry on its conversation's FIFO and make sure it is drained."""
+        if stream_msg_id in self._in_flight:
+            return
+        self._in_flight.add(stream_msg_id)
+
+        conversation_id = str(payload.get("conversation_id"))
+        self._queues.setdefault(conversation_id, deque()).append((stream_msg_id, payload))
+
+        if conversation_id not in self._tasks:
+            self._tasks[conversation_id] = asyncio.create_task(
+                self._drain_conversation(conversation_id)
+            )
+
+    async def reclaim(self) -> int:
+        """
+        Take over entries abandoned by crashed senders.
+
+        Returns:
+            Number of entries re-dispatched
+        """
+        claimed = await claim_stale_messages(
+            OUTGOING_STREAM,
+            CONSUMER_GROUP,
+            self.consumer_name,
+            min_idle_ms=self.claim_min_idle_ms,
+        )
+
+        redispatched = 0
+        for stream_msg_id, payload, deliveries in claimed:
+            if stream_msg_id in self._in_flight:
+                continue
+            if deliveries > self.max_deliveries:
+                await self._dead_letter(
+                    stream_msg_id, payload, f"Exceeded {self.max_deliveries} delivery attempts"
+                )
+                continue
+            self.dispatch(stream_msg_id, payload)
+            redispatched += 1
+
+        if redispatched:
+            logger.info(f"Re-dispatched {redispatched} reclaimed outgoing messages")
+        return redispatched
+
+    def stats(self) -> dict[str, int]:
+        """Return sender metrics for logging and health checks."""
+        return {
+            "conversations": len(self._queues),
+            "in_flight": len(self._in_flight),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    async def _drain_conversation(self, conversation_id: str) -> None:
+        """
+        Send a conversation's queued replies one at a time, in order.
+
+        A failed send is retried in place: replies dispatched meanwhile queue
+        up behind it, so none overtakes it. After max_deliveries attempts the
+        reply is moved to the dead letter stream and the queue moves on. On
+        shutdown the remaining entries stay pending for the next run.
+        """
+        queue = self._queues[conversation_id]
+        try:
+            while queue:
+                stream_msg_id, payload = queue[0]
+                attempts = 0
+                while True:
+                    async with self._semaphore:
+                        success = await self._send(stream_msg_id, payload)
+                    if success:
+                        break
+
+                    attempts += 1
+                    if attempts >= self.max_deliveries:
+                        await self._dead_letter(
+                            stream_msg_id, payload, f"Send failed {attempts} times"
+                        )
+                        break
+                    # Still ours: keep other senders from reclaiming it meanwhile
+                    await retain_pending_message(
+                        OUTGOING_STREAM, CONSUMER_GROUP, self.consumer_name, stream_msg_id
+                    )
+                    if not await self._backoff(attempts):
+                        return  # Shutting down
+                    self.retried += 1
+
+                queue.popleft()
+                self._in_flight.discard(stream_msg_id)
+        finally:
+            for msg_id, _ in queue:
+                self._in_flight.discard(msg_id)
+            self._queues.pop(conversation_id, None)
+            self._tasks.pop(conversation_id, None)
+
+    async def _backoff(self, attempts: int) -> bool:
+        """Wait before retry number `attempts`; False if shutdown started."""
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except TimeoutError:
+            return True
+        return False
+
+    async def _send(self, stream_msg_id: str, payload: dict[str, Any]) -> bool:
+        """Send one reply via Chatwoot and ACK it on success."""
+        customer_phone = payload.get("customer_phone")
+        message_text = payload.get("message")
+        conversation_id = payload.get("conversation_id")
+
+        if payload.get("_parse_error") or not message_text:
+            await self._dead_letter(stream_msg_id, payload, "Invalid outgoing payload")
+            return True
+
+        logger.info(
+            f"Outgoing message received: conversation_id={conversation_id}, phone={customer_phone}",
+            extra={
+                "conversation_id": conversation_id,
+                "customer_phone": customer_phone,
+                "stream_msg_id": stream_msg_id,
+            },
+        )
+
+        try:
+            success = await self.chatwoot.send_message(
+                customer_phone, message_text, conversation_id=conversation_id
+            )
+        except Exception as e:
+            logger.error(
+                f"Error sending outgoing message {stream_msg_id}: {e}",
+                extra={"conversation_id": conversation_id},
+                exc_info=True,
+            )
+            success = False
+
+        if not success:
+            self.failed += 1
+            logger.error(
+                f"Message sent to {customer_phone}: success=False (will retry)",
+                extra={
+                    "conversation_id": conversation_id,
+                    "customer_phone": customer_phone,
+                    "stream_msg_id": stream_msg_id,
+                },
+            )
+            return False
+
+        self.sent += 1
+        logger.info(
+            f"Message sent to {customer_phone}: success=True",
+            extra={
+                "conversation_id": conversation_id,
+                "customer_phone": customer_phone,
+            },
+        )
+
+        try:
+            await acknowledge_message(OUTGOING_STREAM, CONSUMER_GROUP, stream_msg_id)
+        except Exception as ack_error:
+            # Sent but not acked: a later reclaim would resend it, which is
+            # preferable to losing a reply
+            logger.warning(f"Failed to ACK outgoing message {stream_msg_id}: {ack_error}")
+        return True
+
+    async def _dead_letter(self, stream_msg_id: str, payload: dict[str, Any], error: str) -> None:
+        """Move an undeliverable entry to the dead letter stream."""
+        self.dead_lettered += 1
+        try:
+            await move_to_dead_letter(
+                OUTGOING_STREAM, CONSUMER_GROUP, stream_msg_id, payload, error
+            )
+        except Exception as dlq_error:
+            logger.error(f"Failed to move outgoing message to DLQ: {dlq_error}")
+
+    async def _drain(self) -> None:
+        """Let in-flight sends finish on shutdown (unsent entries stay pending)."""
+        self._stopping.set()
+        tasks = list(self._tasks.values())
+        if tasks:
+            logger.info(f"Waiting for {len(tasks)} outgoing conversations to finish...")
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Outgoing sender stopped | stats={self.stats()}")
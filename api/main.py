@@ -12,6 +12,7 @@ from pydantic import ValidationError
 from api.middleware.rate_limiting import RateLimitMiddleware
 from api.routes import admin, chatwoot, conversations, system
 from api.routes import settings as settings_routes
+from shared.chatwoot_client import close_chatwoot_http_client, get_chatwoot_pool_stats
 from shared.config import get_settings
 from shared.logging_config import configure_logging
 from shared.startup_validator import StartupValidationError, validate_startup_config
@@ -84,6 +85,12 @@ async def startup_config_validation():
         raise  # FastAPI will fail to start
 
 
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Close the shared Chatwoot HTTP client (pooled keep-alive connections)."""
+    await close_chatwoot_http_client()
+
+
 # Exception handler for validation errors
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request: Request, exc: ValidationError) -> JSONResponse:
@@ -135,6 +142,8 @@ async def health_check() -> JSONResponse:
     - Redis connectivity (PING command)
     - PostgreSQL connectivity (SELECT 1 query)
 
+    Also reports Chatwoot HTTP pool usage (informational, never degrades status).
+
     Returns:
         200 OK if all systems healthy
         503 Service Unavailable if degraded
@@ -171,6 +180,8 @@ async def health_check() -> JSONResponse:
         health_status["status"] = "degraded"
         status_code = 503
 
+    health_status["chatwoot_pool"] = get_chatwoot_pool_stats()
+
     return JSONResponse(status_code=status_code, content=health_status)
 
 
@@ -49,6 +49,7 @@ from database.models import (
     Stylist,
 )
 from shared.config import get_settings
+from shared.salon_calendar import invalidate_salon_calendar
 from agent.services.recurrence_service import (
     expand_recurrence,
     check_conflicts_for_dates,
@@ -2509,10 +2510,10 @@ async def search_availability(
             ]
         }
     """
-    from agent.services.availability_service import get_available_slots, is_holiday
+    from agent.services.slot_grid import StylistDay, compute_slot_grid
+    from agent.services.slot_search import load_search_range, periods_by_day
     from database.models import ServiceCategory
     from datetime import date as date_type, timedelta
-    from shared.business_hours_validator import is_date_closed
 
     # Parse dates
     try:
@@ -2598,32 +2599,46 @@ async def search_availability(
                 "message": "No hay estilistas disponibles para estos servicios",
             }
 
-        # Iterate over each day in range
-        days_result = []
-        current_date = start
-        while current_date <= end:
-            # Check if holiday
-            holiday_name = await is_holiday(current_date)
+        # Load holidays, business hours and busy periods of the whole range
+        # at once, then compute every open stylist-day in one grid pass
+        dates = [start + timedelta(days=offset) for offset in range(days_diff + 1)]
+        calendar, busy = await load_search_range(
+            [stylist.id for stylist in compatible_stylists], start, end + timedelta(days=1)
+        )
+        busy_by_day = {
+            stylist_id: periods_by_day(periods) for stylist_id, periods in busy.items()
+        }
+
+        rows = [
+            StylistDay(
+                stylist.id,
+                current_date,
+                calendar.business_hours(current_date),
+                busy_by_day[stylist.id].get(current_date, []),
+            )
+            for current_date in dates
+            if calendar.business_hours(current_date)
+            for stylist in compatible_stylists
+        ]
+        slots_by_row = iter(compute_slot_grid(
+            rows,
+            service_duration_minutes=total_duration,
+            slot_interval_minutes=15,
+        ))
 
-            # Check if salon is closed
-            is_closed = await is_date_closed(current_date)
+        days_result = []
+        for current_date in dates:
+            holiday_name = calendar.holiday_name(current_date)
+            is_closed = calendar.is_day_closed(current_date.weekday())
 
             day_stylists = []
-            if not holiday_name and not is_closed:
-                # Get availability for each stylist
+            if calendar.business_hours(current_date):
                 for stylist in compatible_stylists:
-                    slots = await get_available_slots(
-                        stylist_id=stylist.id,
-                        target_date=current_date,
-                        service_duration_minutes=total_duration,
-                        slot_interval_minutes=15,
-                    )
-
                     day_stylists.append({
                         "id": str(stylist.id),
                         "name": stylist.name,
                         "category": stylist.category.value,
-                        "slots": slots,
+                        "slots": next(slots_by_row),
                     })
 
             days_result.append({
@@ -2634,8 +2649,6 @@ async def search_availability(
                 "stylists": day_stylists,
             })
 
-            current_date += timedelta(days=1)
-
         return {
             "start_date": request.start_date,
             "end_date": request.end_date,
@@ -2714,6 +2727,7 @@ async def update_business_hours(
             hours.end_minute = request.end_minute
 
         await session.commit()
+        invalidate_salon_calendar()
         await session.refresh(hours)
 
         return {
@@ -3956,6 +3970,7 @@ async def create_holiday(
 
         session.add(holiday)
         await session.commit()
+        invalidate_salon_calendar()
         await session.refresh(holiday)
 
         return {
@@ -3983,6 +3998,7 @@ async def delete_holiday(
 
         await session.delete(holiday)
         await session.commit()
+        invalidate_salon_calendar()
 
 
 # =============================================================================
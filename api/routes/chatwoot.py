@@ -1,30 +1,25 @@
 """Chatwoot webhook route handler."""
 
-import aiohttp
 import hmac
 import logging
-import os
-import tempfile
-from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
-from groq import RateLimitError, APIError
 
 from shared.chatwoot_client import ChatwootClient
+from shared.chatwoot_contact_cache import get_chatwoot_contact_cache
 from api.models.chatwoot_webhook import (
     ChatwootMessageEvent,
     ChatwootWebhookPayload,
 )
-from shared.audio_conversion import convert_ogg_to_wav
-from shared.audio_transcription import get_transcription_service
 from shared.config import get_settings
 from shared.redis_client import (
+    AUDIO_STREAM,
     publish_to_channel,
     add_to_stream,
     get_redis_client,
-    INCOMING_STREAM,
 )
+from shared.stream_partitions import get_incoming_stream
 
 logger = logging.getLogger(__name__)
 
@@ -206,7 +201,6 @@ async def receive_chatwoot_webhook(
 
     # Initialize message text and audio tracking fields
     message_text = last_message.content or ""
-    is_audio_transcription = False
     audio_url = None
 
     # Check if message has audio attachments (attachments are in message.attachments)
@@ -253,120 +247,34 @@ async def receive_chatwoot_webhook(
                 }
             )
 
-            # Download and transcribe audio
-            ogg_path = None
-            wav_path = None
-
-            try:
-                # 1. Download audio from Chatwoot
-                logger.debug(f"Downloading audio from: {audio_url}")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(audio_url) as response:
-                        if response.status != 200:
-                            raise Exception(f"Failed to download audio: HTTP {response.status}")
-                        audio_data = await response.read()
-
-                # 2. Save to temporary OGG file
-                with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as temp_ogg:
-                    temp_ogg.write(audio_data)
-                    ogg_path = Path(temp_ogg.name)
-
-                logger.debug(
-                    f"Audio downloaded: {ogg_path.name}",
-                    extra={
-                        "conversation_id": str(payload.conversation.id),
-                        "file_size_mb": len(audio_data) / (1024 * 1024),
-                    }
-                )
-
-                # 3. Convert OGG → WAV for optimal compatibility
-                wav_path = await convert_ogg_to_wav(ogg_path)
-
-                # 4. Transcribe audio to text using Groq Whisper with confidence scoring
-                transcription_service = get_transcription_service()
-                message_text, confidence = await transcription_service.transcribe_audio(wav_path)
-
-                # Check confidence threshold (< 0.7 indicates potential transcription error)
-                if confidence < 0.7:
-                    logger.warning(
-                        f"Low confidence transcription: {confidence:.2f}",
-                        extra={
-                            "conversation_id": str(payload.conversation.id),
-                            "confidence_score": confidence,
-                            "transcription_preview": message_text[:100],
-                        }
-                    )
-                    # Ask user to resend audio or send text instead
-                    message_text = "[AUDIO_LOW_CONFIDENCE] Lo siento, no pude entender bien el audio. ¿Puedes enviarlo de nuevo o escribir tu mensaje en texto? 😊"
-                    is_audio_transcription = False
-                else:
-                    is_audio_transcription = True
-                    logger.info(
-                        f"Audio transcribed successfully: {len(message_text)} characters, confidence: {confidence:.2f}",
-                        extra={
-                            "conversation_id": str(payload.conversation.id),
-                            "transcription_length": len(message_text),
-                            "transcription_preview": message_text[:100],
-                            "confidence_score": confidence,
-                        }
-                    )
-
-            except RateLimitError:
-                logger.error(
-                    f"Groq rate limit exceeded for conversation {payload.conversation.id}",
-                    extra={"conversation_id": str(payload.conversation.id)},
-                    exc_info=True,
-                )
-                # Fallback: Ask user to send text instead
-                message_text = "[AUDIO_RATE_LIMIT] Por favor, escribe tu mensaje en texto. Estamos experimentando alta demanda de transcripciones."
-                is_audio_transcription = False
-
-            except APIError as e:
-                logger.error(
-                    f"Groq API error during transcription: {e}",
-                    extra={"conversation_id": str(payload.conversation.id)},
-                    exc_info=True,
-                )
-                # Fallback: Ask user to send text instead
-                message_text = "[AUDIO_API_ERROR] Lo siento, no pude procesar el audio. ¿Puedes escribir tu mensaje en texto?"
-                is_audio_transcription = False
-
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error processing audio: {e}",
-                    extra={"conversation_id": str(payload.conversation.id)},
-                    exc_info=True,
-                )
-                # Fallback: Ask user to send text instead
-                message_text = "[AUDIO_ERROR] Lo siento, hubo un problema con el audio. ¿Puedes escribir tu mensaje?"
-                is_audio_transcription = False
-
-            finally:
-                # Cleanup temporary files
-                if ogg_path and ogg_path.exists():
-                    try:
-                        os.unlink(ogg_path)
-                        logger.debug(f"Cleaned up: {ogg_path.name}")
-                    except Exception as e:
-                        logger.warning(f"Failed to cleanup OGG file: {e}")
-
-                if wav_path and wav_path.exists():
-                    try:
-                        os.unlink(wav_path)
-                        logger.debug(f"Cleaned up: {wav_path.name}")
-                    except Exception as e:
-                        logger.warning(f"Failed to cleanup WAV file: {e}")
-
     # Create message event for Redis
     message_event = ChatwootMessageEvent(
         conversation_id=str(payload.conversation.id),
         customer_phone=payload.sender.phone_number,  # Will be normalized to E.164
         message_text=message_text,
         customer_name=payload.sender.name,
-        is_audio_transcription=is_audio_transcription,
         audio_url=audio_url,
     )
 
+    if audio_url:
+        # Download, conversion and transcription happen in the audio
+        # transcription worker, which injects the transcript into the incoming
+        # stream. The webhook returns right away instead of waiting for Whisper.
+        job_id = await add_to_stream(
+            AUDIO_STREAM,
+            {**message_event.model_dump(), "message_id": last_message.id},
+        )
+        logger.info(
+            f"Audio transcription queued: conversation_id={message_event.conversation_id}, "
+            f"job_id={job_id}",
+            extra={
+                "conversation_id": message_event.conversation_id,
+                "audio_url": audio_url,
+            },
+        )
+        await _remember_contact(payload, message_event)
+        return JSONResponse(status_code=200, content={"status": "audio_queued"})
+
     logger.info(
         f"Parsed message event: conversation_id={message_event.conversation_id}, "
         f"phone={message_event.customer_phone}, name={message_event.customer_name}, "
@@ -385,14 +293,16 @@ async def receive_chatwoot_webhook(
 
     # Publish to Redis (using Streams or Pub/Sub based on config)
     if settings.USE_REDIS_STREAMS:
-        # Redis Streams: Persistent with acknowledgment
+        # Redis Streams: Persistent with acknowledgment.
+        # Routed to the conversation's partition so one agent replica sees all of it.
+        stream = get_incoming_stream(message_event.conversation_id)
         stream_msg_id = await add_to_stream(
-            INCOMING_STREAM,
+            stream,
             message_event.model_dump(),
         )
         logger.info(
             f"Chatwoot message added to stream: conversation_id={message_event.conversation_id}, "
-            f"phone={message_event.customer_phone}, stream_msg_id={stream_msg_id}"
+            f"phone={message_event.customer_phone}, stream={stream}, stream_msg_id={stream_msg_id}"
         )
     else:
         # Legacy Pub/Sub: Fire-and-forget
@@ -411,4 +321,20 @@ async def receive_chatwoot_webhook(
         extra={"conversation_id": message_event.conversation_id}
     )
 
+    await _remember_contact(payload, message_event)
+
     return JSONResponse(status_code=200, content={"status": "received"})
+
+
+async def _remember_contact(
+    payload: ChatwootWebhookPayload, message_event: ChatwootMessageEvent
+) -> None:
+    """
+    Prime the contact cache: later sends to this phone without a conversation_id
+    (confirmations, reminders) reuse this conversation instead of looking it up.
+    """
+    await get_chatwoot_contact_cache().remember(
+        message_event.customer_phone,
+        contact_id=getattr(payload.sender, "id", None),
+        conversation_id=payload.conversation.id,
+    )
@@ -0,0 +1,106 @@
+"""add availability change notifications
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-16
+
+Publishes a NOTIFY on the 'availability_changes' channel whenever data that
+affects slot availability changes, whichever process writes it (agent, admin
+API, workers, manual SQL):
+- appointments: insert/delete, or update of stylist, start, duration or status
+- blocking_events: insert/delete, or update of stylist, start or end
+- holidays, business_hours: any change (statement level)
+
+Payload (JSON): {"table": ..., "stylist_ids": [...]} (stylist_ids only for
+appointments and blocking_events). Consumed by the agent's in-memory
+availability index (agent/services/availability_index.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'm3n4o5p6q7r8'
+down_revision: Union[str, None] = 'l2m3n4o5p6q7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_availability_change()
+        RETURNS trigger AS $$
+        DECLARE
+            payload jsonb := jsonb_build_object('table', TG_TABLE_NAME);
+        BEGIN
+            IF TG_LEVEL = 'ROW' THEN
+                payload := payload || jsonb_build_object(
+                    'stylist_ids',
+                    (
+                        SELECT jsonb_agg(DISTINCT stylist_id)
+                        FROM unnest(ARRAY[
+                            CASE WHEN TG_OP <> 'INSERT' THEN OLD.stylist_id END,
+                            CASE WHEN TG_OP <> 'DELETE' THEN NEW.stylist_id END
+                        ]) AS stylist_id
+                        WHERE stylist_id IS NOT NULL
+                    )
+                );
+            END IF;
+            PERFORM pg_notify('availability_changes', payload::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Appointments
+    op.execute("""
+        CREATE TRIGGER notify_appointments_availability
+        AFTER INSERT OR DELETE ON appointments
+        FOR EACH ROW
+        EXECUTE FUNCTION notify_availability_change();
+    """)
+    op.execute("""
+        CREATE TRIGGER notify_appointments_availability_update
+        AFTER UPDATE OF stylist_id, start_time, duration_minutes, status ON appointments
+        FOR EACH ROW
+        EXECUTE FUNCTION notify_availability_change();
+    """)
+
+    # Blocking events
+    op.execute("""
+        CREATE TRIGGER notify_blocking_events_availability
+        AFTER INSERT OR DELETE ON blocking_events
+        FOR EACH ROW
+        EXECUTE FUNCTION notify_availability_change();
+    """)
+    op.execute("""
+        CREATE TRIGGER notify_blocking_events_availability_update
+        AFTER UPDATE OF stylist_id, start_time, end_time ON blocking_events
+        FOR EACH ROW
+        EXECUTE FUNCTION notify_availability_change();
+    """)
+
+    # Salon-wide calendar
+    op.execute("""
+        CREATE TRIGGER notify_holidays_availability
+        AFTER INSERT OR UPDATE OR DELETE ON holidays
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION notify_availability_change();
+    """)
+    op.execute("""
+        CREATE TRIGGER notify_business_hours_availability
+        AFTER INSERT OR UPDATE OR DELETE ON business_hours
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION notify_availability_change();
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS notify_business_hours_availability ON business_hours')
+    op.execute('DROP TRIGGER IF EXISTS notify_holidays_availability ON holidays')
+    op.execute('DROP TRIGGER IF EXISTS notify_blocking_events_availability_update ON blocking_events')
+    op.execute('DROP TRIGGER IF EXISTS notify_blocking_events_availability ON blocking_events')
+    op.execute('DROP TRIGGER IF EXISTS notify_appointments_availability_update ON appointments')
+    op.execute('DROP TRIGGER IF EXISTS notify_appointments_availability ON appointments')
+    op.execute('DROP FUNCTION IF EXISTS notify_availability_change()')
@@ -0,0 +1,71 @@
+"""add time ranges to appointments and blocking events
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-16
+
+Overlap checks used to compare start_time with an end computed per row
+(start_time + duration_minutes * interval '1 minute'), which no index can
+serve, so every check scanned the stylist's whole appointment history.
+
+Adds a stored, generated `time_range` tstzrange ([start, end)) to
+appointments and blocking_events, with GiST indexes on
+(stylist_id, time_range) (btree_gist provides the uuid operator class).
+Overlap queries become `stylist_id = :id AND time_range && tstzrange(...)`.
+
+timestamptz + interval is only STABLE (day/month units depend on TimeZone),
+so the appointment range goes through an IMMUTABLE wrapper: adding minutes
+does not depend on the time zone.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'n4o5p6q7r8s9'
+down_revision: Union[str, None] = 'm3n4o5p6q7r8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION appointment_time_range(start_time timestamptz, duration_minutes integer)
+        RETURNS tstzrange AS $$
+            SELECT tstzrange(start_time, start_time + duration_minutes * interval '1 minute', '[)')
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+    """)
+
+    # Appointments
+    op.execute("""
+        ALTER TABLE appointments
+        ADD COLUMN time_range tstzrange
+        GENERATED ALWAYS AS (appointment_time_range(start_time, duration_minutes)) STORED
+    """)
+    op.execute("""
+        CREATE INDEX idx_appointments_stylist_time_range
+        ON appointments USING gist (stylist_id, time_range)
+    """)
+
+    # Blocking events
+    op.execute("""
+        ALTER TABLE blocking_events
+        ADD COLUMN time_range tstzrange
+        GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED
+    """)
+    op.execute("""
+        CREATE INDEX idx_blocking_events_stylist_time_range
+        ON blocking_events USING gist (stylist_id, time_range)
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS idx_blocking_events_stylist_time_range')
+    op.execute('ALTER TABLE blocking_events DROP COLUMN IF EXISTS time_range')
+    op.execute('DROP INDEX IF EXISTS idx_appointments_stylist_time_range')
+    op.execute('ALTER TABLE appointments DROP COLUMN IF EXISTS time_range')
+    op.execute('DROP FUNCTION IF EXISTS appointment_time_range(timestamptz, integer)')
+    # btree_gist is left installed (other objects may depend on it)
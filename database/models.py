@@ -27,19 +27,23 @@ from sqlalchemy import (
     TIMESTAMP,
     Boolean,
     CheckConstraint,
+    ColumnElement,
+    Computed,
+    DDL,
     ForeignKey,
     Index,
     Integer,
     Numeric,
     String,
     Text,
+    event,
     text,
     func,
 )
 from sqlalchemy import (
     Enum as SQLEnum,
 )
-from sqlalchemy.dialects.postgresql import JSONB, ENUM as PG_ENUM
+from sqlalchemy.dialects.postgresql import JSONB, ENUM as PG_ENUM, TSTZRANGE, Range
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -54,6 +58,25 @@ class Base(DeclarativeBase):
     pass
 
 
+# Database objects the time_range columns and their GiST indexes depend on.
+# Created by migration n4o5p6q7r8s9; repeated for Base.metadata.create_all().
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION appointment_time_range(start_time timestamptz, duration_minutes integer)
+        RETURNS tstzrange AS $$
+            SELECT tstzrange(start_time, start_time + duration_minutes * interval '1 minute', '[)')
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """).execute_if(dialect="postgresql"),
+)
+
+
 # ============================================================================
 # Enums
 # ============================================================================
@@ -388,6 +411,12 @@ class Appointment(Base):
         TIMESTAMP(timezone=True), nullable=False, index=True
     )
     duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    # [start_time, start_time + duration_minutes), maintained by PostgreSQL
+    # (GiST-indexed for overlap queries, see overlapping())
+    time_range: Mapped[Range[datetime] | None] = mapped_column(
+        TSTZRANGE,
+        Computed("appointment_time_range(start_time, duration_minutes)", persisted=True),
+    )
 
     # Status tracking
     # Note: values_callable ensures SQLAlchemy uses enum .value ("pending")
@@ -481,8 +510,20 @@ class Appointment(Base):
             "reminder_sent",
             "status",
         ),
+        # GiST index for overlap queries (btree_gist for stylist_id)
+        Index(
+            "idx_appointments_stylist_time_range",
+            "stylist_id",
+            "time_range",
+            postgresql_using="gist",
+        ),
     )
 
+    @classmethod
+    def overlapping(cls, start_time: datetime, end_time: datetime) -> ColumnElement[bool]:
+        """SQL condition: the appointment overlaps [start_time, end_time)."""
+        return cls.time_range.overlaps(func.tstzrange(start_time, end_time, "[)"))
+
     def __repr__(self) -> str:
         return f"<Appointment(id={self.id}, customer_id={self.customer_id}, status='{self.status.value}')>"
 
@@ -827,6 +868,11 @@ class BlockingEvent(Base):
     end_time: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False
     )
+    # [start_time, end_time), maintained by PostgreSQL (see overlapping())
+    time_range: Mapped[Range[datetime] | None] = mapped_column(
+        TSTZRANGE,
+        Computed("tstzrange(start_time, end_time, '[)')", persisted=True),
+    )
 
     # Event type
     event_type: Mapped[BlockingEventType] = mapped_column(
@@ -891,8 +937,20 @@ class BlockingEvent(Base):
         ),
         # Index for querying instances by series
         Index("idx_blocking_events_series", "recurring_series_id"),
+        # GiST index for overlap queries (btree_gist for stylist_id)
+        Index(
+            "idx_blocking_events_stylist_time_range",
+            "stylist_id",
+            "time_range",
+            postgresql_using="gist",
+        ),
     )
 
+    @classmethod
+    def overlapping(cls, start_time: datetime, end_time: datetime) -> ColumnElement[bool]:
+        """SQL condition: the event overlaps [start_time, end_time)."""
+        return cls.time_range.overlaps(func.tstzrange(start_time, end_time, "[)"))
+
     def __repr__(self) -> str:
         series_info = f", series={self.recurring_series_id}" if self.recurring_series_id else ""
         return f"<BlockingEvent(id={self.id}, stylist_id={self.stylist_id}, title='{self.title}', type='{self.event_type.value}'{series_info})>"
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the conversation graph.
+
+Runs scripted conversations through create_conversation_graph() and reports
+turn latency (p50/p95/p99), throughput and checkpoint overhead. External APIs
+are replaced so the numbers only depend on our code:
+- LLM: recorded once, then replayed from a cassette (shared/llm_replay.py)
+- Chatwoot: answered in-process by an httpx.MockTransport
+- Google Calendar: in-memory fake of the events() API
+
+PostgreSQL and Redis are still used (docker compose up -d postgres redis, or
+the CI services).
+
+The clock is pinned to --now (freezegun, ticking from that instant) for both
+record and replay: prompts list free slots, weekdays and the holidays of the
+next 30 days, so a cassette only matches when both runs see the same date.
+Pass the same --now to replay a cassette recorded with a custom one.
+
+Usage:
+    # 1. Record the LLM responses once (calls OpenRouter)
+    LLM_REPLAY_MODE=record python scripts/benchmark_graph.py
+
+    # 2. Replay offline with synthetic LLM latency
+    LLM_REPLAY_MODE=replay LLM_REPLAY_LATENCY_MS=800 LLM_REPLAY_JITTER_MS=300 \\
+        python scripts/benchmark_graph.py --repeat 20 --concurrency 10 --output bench.json
+
+    # 3. CI: fail if p95 or throughput regressed more than 20% vs a baseline
+    LLM_REPLAY_MODE=replay python scripts/benchmark_graph.py \\
+        --baseline bench_baseline.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import agent.tools.calendar_tools as calendar_tools  # noqa: E402
+import shared.chatwoot_client as chatwoot_client  # noqa: E402
+from agent.graphs.conversation_flow import create_conversation_graph  # noqa: E402
+from shared.config import get_settings  # noqa: E402
+from shared.llm_clients import close_llm_clients  # noqa: E402
+from shared.llm_replay import get_replay_stats  # noqa: E402
+
+logger = logging.getLogger("benchmark_graph")
+
+# Pinned clock for record and replay (a Wednesday morning, salon open)
+DEFAULT_NOW = datetime(2026, 3, 11, 10, 0, tzinfo=ZoneInfo("Europe/Madrid"))
+
+# Scripted conversations (one list of customer messages each)
+SCENARIOS: dict[str, list[str]] = {
+    "faq": [
+        "Hola",
+        "¿Qué horario tenéis?",
+        "¿Dónde estáis?",
+        "Gracias",
+    ],
+    "services": [
+        "Buenas, ¿cuánto cuesta un corte de pelo?",
+        "¿Y las mechas?",
+        "Vale, gracias",
+    ],
+    "booking_start": [
+        "Hola, quiero una cita",
+        "Corte de caballero",
+        "Con cualquier estilista",
+    ],
+}
+
+
+# ============================================================================
+# External API fakes
+# ============================================================================
+
+
+class _FakeRequest:
+    """Result of a fake events() call (googleapiclient HttpRequest interface)."""
+
+    def __init__(self, result: Any):
+        self._result = result
+
+    def execute(self) -> Any:
+        return self._result
+
+
+class _FakeEvents:
+    """In-memory Google Calendar events() resource."""
+
+    def __init__(self):
+        self.events: dict[str, dict[str, Any]] = {}
+
+    def list(self, **kwargs: Any) -> _FakeRequest:
+        calendar_id = kwargs.get("calendarId")
+        items = [e for e in self.events.values() if e["calendarId"] == calendar_id]
+        return _FakeRequest({"items": items})
+
+    def list_next(self, previous_request: Any, previous_response: Any) -> None:
+        return None
+
+    def get(self, calendarId: str, eventId: str) -> _FakeRequest:
+        return _FakeRequest(self.events.get(eventId, {"id": eventId}))
+
+    def insert(self, calendarId: str, body: dict[str, Any], **kwargs: Any) -> _FakeRequest:
+        event = {**body, "id": uuid.uuid4().hex, "calendarId": calendarId}
+        self.events[event["id"]] = event
+        return _FakeRequest(event)
+
+    def patch(self, calendarId: str, eventId: str, body: dict[str, Any], **kwargs: Any) -> _FakeRequest:
+        event = self.events.setdefault(eventId, {"id": eventId, "calendarId": calendarId})
+        event.update(body)
+        return _FakeRequest(event)
+
+    def update(self, calendarId: str, eventId: str, body: dict[str, Any], **kwargs: Any) -> _FakeRequest:
+        return self.patch(calendarId, eventId, body)
+
+    def delete(self, calendarId: str, eventId: str, **kwargs: Any) -> _FakeRequest:
+        self.events.pop(eventId, None)
+        return _FakeRequest(None)
+
+
+class FakeCalendarTools:
+    """Stand-in for calendar_tools.CalendarTools (no credentials, no network)."""
+
+    def __init__(self):
+        self._events = _FakeEvents()
+
+    def get_service(self) -> "FakeCalendarTools":
+        return self
+
+    def events(self) -> _FakeEvents:
+        return self._events
+
+
+def _chatwoot_handler(request: httpx.Request) -> httpx.Response:
+    """Answer every Chatwoot API call with a minimal successful payload."""
+    if request.method == "GET" and "/contacts/search" in request.url.path:
+        return httpx.Response(200, json={"payload": [{"id": 1}]})
+    return httpx.Response(200, json={"id": 1, "payload": {"contact": {"id": 1}}})
+
+
+def install_fakes() -> None:
+    """Replace the Google Calendar and Chatwoot clients with in-process fakes."""
+    calendar_tools._calendar_client = FakeCalendarTools()
+    chatwoot_client._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(_chatwoot_handler)
+    )
+
+
+# ============================================================================
+# Checkpoint timing
+# ============================================================================
+
+
+def instrument_checkpointer(checkpointer: Any, timings: list[float]) -> None:
+    """Record the duration (ms) of every checkpoint read and write."""
+    for name in ("aget_tuple", "aput", "aput_writes"):
+        method = getattr(checkpointer, name)
+
+        async def timed(*args: Any, _method: Any = method, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await _method(*args, **kwargs)
+            finally:
+                timings.append((time.perf_counter() - started) * 1000)
+
+        setattr(checkpointer, name, timed)
+
+
+async def build_checkpointer(kind: str) -> Any:
+    if kind == "none":
+        return None
+    if kind == "memory":
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+
+    from agent.state.checkpointer import get_redis_checkpointer, initialize_redis_indexes
+
+    checkpointer = get_redis_checkpointer()
+    await initialize_redis_indexes(checkpointer)
+    return checkpointer
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+async def run_conversation(
+    graph: Any, name: str, messages: list[str], index: int, latencies: list[float]
+) -> int:
+    """Run one scripted conversation; returns the number of failed turns."""
+    conversation_id = f"bench-{name}-{index}-{uuid.uuid4().hex[:8]}"
+    config = {"configurable": {"thread_id": conversation_id}}
+    failures = 0
+
+    for text in messages:
+        state = {
+            "conversation_id": conversation_id,
+            "customer_phone": f"+3460000{index:04d}",
+            "customer_name": "Benchmark",
+            "user_message": text,
+            "updated_at": datetime.now(UTC),
+        }
+        started = time.perf_counter()
+        try:
+            await graph.ainvoke(state, config=config)
+        except Exception as e:
+            failures += 1
+            logger.warning(f"Turn failed | conversation_id={conversation_id} | error={e}")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return failures
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    install_fakes()
+    checkpoint_timings: list[float] = []
+    checkpointer = await build_checkpointer(args.checkpointer)
+    if checkpointer is not None:
+        instrument_checkpointer(checkpointer, checkpoint_timings)
+    graph = create_conversation_graph(checkpointer=checkpointer)
+
+    runs = [
+        (name, messages, index)
+        for index in range(args.repeat)
+        for name, messages in SCENARIOS.items()
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+
+    async def bounded(name: str, messages: list[str], index: int) -> int:
+        async with semaphore:
+            return await run_conversation(graph, name, messages, index, latencies)
+
+    started = time.perf_counter()
+    failures = await asyncio.gather(*(bounded(*run) for run in runs))
+    elapsed = time.perf_counter() - started
+
+    await close_llm_clients()
+
+    turns = len(latencies)
+    return {
+        "settings": {
+            "checkpointer": args.checkpointer,
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "now": args.now.isoformat(),
+            "replay_mode": get_settings().LLM_REPLAY_MODE,
+            "replay_latency_ms": get_settings().LLM_REPLAY_LATENCY_MS,
+            "replay_jitter_ms": get_settings().LLM_REPLAY_JITTER_MS,
+        },
+        "turns": turns,
+        "failed_turns": sum(failures),
+        "throughput_turns_per_s": turns / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies, default=0.0),
+            "mean": statistics.fmean(latencies) if latencies else 0.0,
+        },
+        "checkpoint_ms": {
+            "operations": len(checkpoint_timings),
+            "total": sum(checkpoint_timings),
+            "per_turn": sum(checkpoint_timings) / turns if turns else 0.0,
+            "p95": percentile(checkpoint_timings, 0.95),
+        },
+        "llm_replay": get_replay_stats(),
+    }
+
+
+def check_regression(result: dict[str, Any], baseline: dict[str, Any], max_regression: float) -> list[str]:
+    """Return the metrics that got worse than the baseline by more than max_regression."""
+    problems = []
+    p95, base_p95 = result["latency_ms"]["p95"], baseline["latency_ms"]["p95"]
+    if base_p95 and p95 > base_p95 * (1 + max_regression):
+        problems.append(f"p95 latency {p95:.0f} ms > baseline {base_p95:.0f} ms")
+
+    throughput = result["throughput_turns_per_s"]
+    base_throughput = baseline["throughput_turns_per_s"]
+    if base_throughput and throughput < base_throughput * (1 - max_regression):
+        problems.append(
+            f"throughput {throughput:.2f} turns/s < baseline {base_throughput:.2f} turns/s"
+        )
+
+    if result["failed_turns"] > baseline.get("failed_turns", 0):
+        problems.append(f"{result['failed_turns']} failed turns")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkpointer", choices=("redis", "memory", "none"), default="redis")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs of every scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="Conversations in flight")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument(
+        "--now",
+        type=datetime.fromisoformat,
+        default=DEFAULT_NOW,
+        help=f"Pinned clock for record and replay (default {DEFAULT_NOW.isoformat()})",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    if get_settings().LLM_REPLAY_MODE == "off":
+        print("Set LLM_REPLAY_MODE=record (first run) or LLM_REPLAY_MODE=replay.")
+        return 2
+
+    try:
+        from freezegun import freeze_time
+    except ImportError:
+        print("freezegun is required to pin the clock: pip install freezegun", file=sys.stderr)
+        return 2
+
+    with freeze_time(args.now, tick=True, real_asyncio=True):
+        result = asyncio.run(run_benchmark(args))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    if result["llm_replay"]["misses"]:
+        print(
+            f"{result['llm_replay']['misses']} LLM requests were not in the cassette; "
+            f"re-record with LLM_REPLAY_MODE=record",
+            file=sys.stderr,
+        )
+        return 1
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        problems = check_regression(result, baseline, args.max_regression)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
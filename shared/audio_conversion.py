@@ -5,16 +5,164 @@ This module provides audio format conversion to optimize compatibility
 and transcription performance with Groq Whisper API.
 
 Key conversions:
-- OGG Opus (WhatsApp format) → WAV 16kHz mono (optimal for speech recognition)
+- In-memory pipeline (prepare_for_transcription): voice notes in a format
+  Whisper accepts (WhatsApp OGG Opus, mp3, m4a, ...) are sent as-is; anything
+  else is piped through ffmpeg (stdin → stdout, no temp files) to FLAC 16kHz mono
+- OGG Opus (WhatsApp format) → WAV 16kHz mono on disk (convert_ogg_to_wav, legacy)
+
+At most AUDIO_FFMPEG_MAX_PROCESSES ffmpeg processes run at once per process.
 """
 
+import asyncio
 import logging
 from pathlib import Path
 
-from pydub import AudioSegment
+from shared.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Container formats accepted by Groq Whisper, by file extension
+WHISPER_FORMATS = frozenset({"flac", "mp3", "mp4", "mpeg", "mpga", "m4a", "ogg", "opus", "wav", "webm"})
+
+# Seconds before a stuck ffmpeg process is killed
+FFMPEG_TIMEOUT_SECONDS = 60
+
+# Speech recognition target: 16kHz mono (Whisper standard). FLAC keeps it
+# lossless and, unlike WAV, can be streamed to a pipe with a valid header.
+TRANSCRIPTION_SAMPLE_RATE = 16000
+TRANSCRIPTION_FORMAT = "flac"
+
+_ffmpeg_semaphore: asyncio.Semaphore | None = None
+
+
+class AudioConversionError(Exception):
+    """Raised when ffmpeg cannot decode or convert an audio payload."""
+
+
+def _get_ffmpeg_semaphore() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent ffmpeg processes."""
+    global _ffmpeg_semaphore
+    if _ffmpeg_semaphore is None:
+        _ffmpeg_semaphore = asyncio.Semaphore(get_settings().AUDIO_FFMPEG_MAX_PROCESSES)
+    return _ffmpeg_semaphore
+
+
+def detect_audio_format(audio: bytes | memoryview) -> str | None:
+    """
+    Detect the container format of an audio payload from its magic bytes.
+
+    Returns:
+        File extension ("ogg", "mp3", "wav", "flac", "webm", "m4a") or None
+    """
+    head = bytes(audio[:12])
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head.startswith(b"ID3") or head[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "mp3"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if head[4:8] == b"ftyp":
+        return "m4a"
+    return None
+
+
+async def convert_audio_bytes(
+    audio: bytes | memoryview,
+    output_format: str = TRANSCRIPTION_FORMAT,
+    sample_rate: int = TRANSCRIPTION_SAMPLE_RATE,
+) -> bytes:
+    """
+    Convert an audio payload in memory by piping it through ffmpeg.
+
+    The payload is written to ffmpeg's stdin and the converted audio is read
+    from its stdout; nothing touches the disk.
+
+    Args:
+        audio: Encoded audio (any format ffmpeg can decode)
+        output_format: ffmpeg output format (e.g. "flac", "ogg")
+        sample_rate: Output sample rate in Hz (output is always mono)
+
+    Returns:
+        bytes: Converted audio
+
+    Raises:
+        AudioConversionError: If ffmpeg fails, times out or is not installed
+    """
+    async with _get_ffmpeg_semaphore():
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-ac", "1", "-ar", str(sample_rate),
+                "-f", output_format, "pipe:1",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            raise AudioConversionError("ffmpeg is not installed") from e
+
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(input=audio), timeout=FFMPEG_TIMEOUT_SECONDS
+            )
+        except TimeoutError as e:
+            process.kill()
+            await process.wait()
+            raise AudioConversionError(
+                f"ffmpeg timed out after {FFMPEG_TIMEOUT_SECONDS}s"
+            ) from e
+
+    if process.returncode != 0 or not stdout:
+        raise AudioConversionError(
+            f"ffmpeg exited with code {process.returncode}: "
+            f"{stderr.decode(errors='replace').strip()[:500]}"
+        )
+
+    logger.info(
+        f"Audio converted in memory: {len(audio)} → {len(stdout)} bytes ({output_format})",
+        extra={
+            "input_size_mb": len(audio) / (1024 * 1024),
+            "output_size_mb": len(stdout) / (1024 * 1024),
+            "output_format": output_format,
+        },
+    )
+    return stdout
+
+
+async def prepare_for_transcription(
+    audio: bytes, filename_hint: str | None = None
+) -> tuple[str, bytes]:
+    """
+    Return an audio payload Whisper accepts, converting only when needed.
+
+    Args:
+        audio: Downloaded audio
+        filename_hint: Original file name or URL (used if magic bytes are unknown)
+
+    Returns:
+        Tuple of (file name for the upload, audio payload). The payload is
+        the input object itself (no copy) when no conversion was needed.
+
+    Raises:
+        AudioConversionError: If a conversion was needed and failed
+    """
+    audio_format = detect_audio_format(audio)
+    if audio_format is None and filename_hint:
+        suffix = Path(filename_hint.split("?", 1)[0]).suffix.lstrip(".").lower()
+        audio_format = suffix or None
+
+    if audio_format in WHISPER_FORMATS and not get_settings().AUDIO_ALWAYS_CONVERT:
+        logger.debug(f"Audio format accepted by Whisper, skipping conversion: {audio_format}")
+        return f"audio.{audio_format}", audio
+
+    converted = await convert_audio_bytes(audio)
+    return f"audio.{TRANSCRIPTION_FORMAT}", converted
+
 
 async def convert_ogg_to_wav(ogg_path: str | Path) -> Path:
     """
@@ -25,6 +173,8 @@ async def convert_ogg_to_wav(ogg_path: str | Path) -> Path:
     - Optimal latency (Groq recommendation)
     - Standardized format: 16kHz sample rate, mono channel
 
+    Prefer prepare_for_transcription(), which works in memory.
+
     Args:
         ogg_path: Path to input OGG file
 
@@ -41,6 +191,9 @@ async def convert_ogg_to_wav(ogg_path: str | Path) -> Path:
         >>> print(wav_path)
         Path('/tmp/audio.wav')
     """
+    # Imported here: pydub probes for ffmpeg at import time
+    from pydub import AudioSegment
+
     ogg_path = Path(ogg_path)
 
     if not ogg_path.exists():
@@ -108,6 +108,37 @@ class AudioTranscriptionService:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        with open(audio_path, "rb") as audio_file:
+            audio_data = audio_file.read()
+
+        return await self.transcribe_bytes(
+            audio_data, audio_path.name, language=language, prompt=prompt
+        )
+
+    async def transcribe_bytes(
+        self,
+        audio: bytes,
+        filename: str,
+        language: str = "es",
+        prompt: str | None = None,
+    ) -> tuple[str, float]:
+        """
+        Transcribe an in-memory audio payload using Groq Whisper API.
+
+        Args:
+            audio: Encoded audio (uploaded as-is, no copy)
+            filename: File name whose extension tells Whisper the format
+                      (e.g. "audio.ogg")
+            language: ISO-639-1 language code (default: "es" for Spanish)
+            prompt: Optional context to improve transcription accuracy
+
+        Returns:
+            tuple[str, float]: (transcribed_text, confidence_score)
+
+        Raises:
+            RateLimitError: If Groq API rate limit is exceeded
+            APIError: If Groq API returns an error
+        """
         # Default domain-specific prompt for hair salon context
         if prompt is None:
             prompt = (
@@ -118,22 +149,18 @@ class AudioTranscriptionService:
             )
 
         logger.info(
-            f"Transcribing audio: {audio_path.name}",
+            f"Transcribing audio: {filename}",
             extra={
-                "audio_file": str(audio_path),
-                "file_size_mb": audio_path.stat().st_size / (1024 * 1024),
+                "audio_file": filename,
+                "file_size_mb": len(audio) / (1024 * 1024),
                 "language": language,
             },
         )
 
         try:
-            # Read audio file
-            with open(audio_path, "rb") as audio_file:
-                audio_data = audio_file.read()
-
             # Call Groq Whisper API
             transcription = await self.client.audio.transcriptions.create(
-                file=(audio_path.name, audio_data),
+                file=(filename, audio),
                 model="whisper-large-v3-turbo",  # Fastest and most cost-effective
                 language=language,
                 prompt=prompt,
@@ -147,7 +174,7 @@ class AudioTranscriptionService:
             logger.info(
                 f"Transcription successful: {len(transcription)} characters, confidence: {confidence:.2f}",
                 extra={
-                    "audio_file": str(audio_path),
+                    "audio_file": filename,
                     "transcription_length": len(transcription),
                     "transcription_preview": transcription[:100],
                     "confidence_score": confidence,
@@ -159,7 +186,7 @@ class AudioTranscriptionService:
         except RateLimitError as e:
             logger.error(
                 f"Groq rate limit exceeded: {e}",
-                extra={"audio_file": str(audio_path)},
+                extra={"audio_file": filename},
                 exc_info=True,
             )
             raise
@@ -167,7 +194,7 @@ class AudioTranscriptionService:
         except APIError as e:
             logger.error(
                 f"Groq API error during transcription: {e}",
-                extra={"audio_file": str(audio_path)},
+                extra={"audio_file": filename},
                 exc_info=True,
             )
             raise
@@ -175,7 +202,7 @@ class AudioTranscriptionService:
         except Exception as e:
             logger.error(
                 f"Unexpected error during transcription: {e}",
-                extra={"audio_file": str(audio_path)},
+                extra={"audio_file": filename},
                 exc_info=True,
             )
             raise
@@ -5,7 +5,8 @@ This module provides database-driven validation for business hours and closed da
 ALL code checking if a day/date is closed MUST use these functions to ensure consistency.
 
 Design Principles:
-- Database is the single source of truth (no hardcoded logic)
+- Database is the single source of truth (no hardcoded logic), read through
+  the cached salon calendar snapshot (shared/salon_calendar.py)
 - Async-first for integration with availability tools and FSM
 - Fails closed on errors (safer than false availability)
 - Returns Spanish error messages for user-facing contexts
@@ -28,10 +29,7 @@ from datetime import datetime, date, timedelta
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select
-
-from database.connection import get_async_session
-from database.models import BusinessHours
+from shared.salon_calendar import get_salon_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +44,8 @@ async def is_day_closed(day_of_week: int) -> bool:
     Check if a specific day of the week is closed.
 
     This is the SINGLE SOURCE OF TRUTH for closed day checks.
-    Queries the database business_hours table.
+    Reads the business_hours table through the cached salon calendar
+    (shared/salon_calendar.py).
 
     Args:
         day_of_week: Day of week (0=Monday, 1=Tuesday, ..., 6=Sunday)
@@ -68,27 +67,21 @@ async def is_day_closed(day_of_week: int) -> bool:
         return True  # Fail closed for invalid input
 
     try:
-        async with get_async_session() as session:
-            result = await session.execute(
-                select(BusinessHours.is_closed).where(
-                    BusinessHours.day_of_week == day_of_week
-                )
-            )
-            row = result.first()
-
-            if row is None:
-                logger.warning(
-                    f"No business hours found for day_of_week={day_of_week} ({DAY_NAMES_ES[day_of_week]}). "
-                    f"Defaulting to CLOSED for safety."
-                )
-                return True  # Fail closed if no config found
-
-            is_closed = row[0]
-            logger.debug(
-                f"Day {day_of_week} ({DAY_NAMES_ES[day_of_week]}): "
-                f"{'CLOSED' if is_closed else 'OPEN'}"
+        calendar = await get_salon_calendar()
+
+        if day_of_week not in calendar.days:
+            logger.warning(
+                f"No business hours found for day_of_week={day_of_week} ({DAY_NAMES_ES[day_of_week]}). "
+                f"Defaulting to CLOSED for safety."
             )
-            return is_closed
+            return True  # Fail closed if no config found
+
+        is_closed = calendar.is_day_closed(day_of_week)
+        logger.debug(
+            f"Day {day_of_week} ({DAY_NAMES_ES[day_of_week]}): "
+            f"{'CLOSED' if is_closed else 'OPEN'}"
+        )
+        return is_closed
 
     except Exception as e:
         logger.error(
@@ -236,34 +229,26 @@ async def get_business_hours_for_day(day_of_week: int) -> Optional[dict[str, int
         return None
 
     try:
-        async with get_async_session() as session:
-            result = await session.execute(
-                select(BusinessHours).where(
-                    BusinessHours.day_of_week == day_of_week
-                )
+        calendar = await get_salon_calendar()
+        business_hours = calendar.days.get(day_of_week)
+
+        if business_hours is None:
+            logger.warning(
+                f"No business hours found for day_of_week={day_of_week} ({DAY_NAMES_ES[day_of_week]})"
+            )
+            return None
+
+        if business_hours.is_closed:
+            logger.debug(f"Day {day_of_week} ({DAY_NAMES_ES[day_of_week]}) is closed")
+            return None
+
+        if business_hours.start_hour is None or business_hours.end_hour is None:
+            logger.warning(
+                f"Business hours for day_of_week={day_of_week} has NULL hours but is_closed=False"
             )
-            business_hours = result.scalar_one_or_none()
-
-            if business_hours is None:
-                logger.warning(
-                    f"No business hours found for day_of_week={day_of_week} ({DAY_NAMES_ES[day_of_week]})"
-                )
-                return None
-
-            if business_hours.is_closed:
-                logger.debug(f"Day {day_of_week} ({DAY_NAMES_ES[day_of_week]}) is closed")
-                return None
-
-            if business_hours.start_hour is None or business_hours.end_hour is None:
-                logger.warning(
-                    f"Business hours for day_of_week={day_of_week} has NULL hours but is_closed=False"
-                )
-                return None
-
-            return {
-                "start": business_hours.start_hour,
-                "end": business_hours.end_hour,
-            }
+            return None
+
+        return calendar.hours_for_weekday(day_of_week)
 
     except Exception as e:
         logger.error(
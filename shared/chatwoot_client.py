@@ -17,10 +17,143 @@ from tenacity import (
     wait_exponential,
 )
 
+from shared.chatwoot_contact_cache import get_chatwoot_contact_cache
 from shared.config import get_settings
+from shared.http_pool import pool_connection_stats
 
 logger = logging.getLogger(__name__)
 
+# Chatwoot answers requests that reference a deleted contact/conversation, or a
+# conversation that can no longer receive messages, with these status codes
+STALE_REFERENCE_STATUS_CODES = frozenset({404, 410, 422})
+
+# Shared per-process HTTP client (see get_chatwoot_http_client)
+_http_client: httpx.AsyncClient | None = None
+_http_requests_total = 0
+
+
+def _http2_available() -> bool:
+    """Return True if the optional 'h2' package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def _on_request(request: httpx.Request) -> None:
+    """Event hook: count requests sent through the shared client."""
+    global _http_requests_total
+    _http_requests_total += 1
+
+
+def get_chatwoot_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client used for all Chatwoot API calls.
+
+    One client per process keeps TCP/TLS connections alive between calls
+    instead of paying a new handshake for every outgoing message:
+    - Connection limits and keep-alive from CHATWOOT_HTTP_* settings
+    - HTTP/2 if CHATWOOT_HTTP2=true and the 'h2' package is installed
+      (falls back to HTTP/1.1 with a warning otherwise)
+
+    Per-request timeouts are still passed by each ChatwootClient method.
+
+    Returns:
+        httpx.AsyncClient shared by every ChatwootClient in this process
+
+    Note:
+        Created lazily on first use and recreated after
+        close_chatwoot_http_client(). Call close_chatwoot_http_client()
+        during application shutdown.
+    """
+    global _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        return _http_client
+
+    settings = get_settings()
+
+    http2 = settings.CHATWOOT_HTTP2
+    if http2 and not _http2_available():
+        logger.warning(
+            "CHATWOOT_HTTP2 is enabled but the 'h2' package is not installed, "
+            "falling back to HTTP/1.1 (pip install 'httpx[http2]')"
+        )
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.CHATWOOT_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.CHATWOOT_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.CHATWOOT_HTTP_KEEPALIVE_EXPIRY,
+    )
+    _http_client = httpx.AsyncClient(
+        limits=limits,
+        http2=http2,
+        timeout=15.0,
+        event_hooks={"request": [_on_request]},
+    )
+
+    logger.info(
+        f"Chatwoot HTTP client initialized: max_connections={limits.max_connections}, "
+        f"max_keepalive={limits.max_keepalive_connections}, "
+        f"keepalive_expiry={limits.keepalive_expiry}s, http2={http2}"
+    )
+    return _http_client
+
+
+async def close_chatwoot_http_client() -> None:
+    """
+    Close the shared Chatwoot HTTP client and its pooled connections.
+
+    Note:
+        Should be called during application shutdown. Safe to call if the
+        client was never created.
+    """
+    global _http_client
+
+    client, _http_client = _http_client, None
+    if client is None:
+        return
+    try:
+        await client.aclose()
+        logger.info(f"Chatwoot HTTP client closed | stats={_pool_stats(client)}")
+    except Exception as e:
+        logger.warning(f"Error closing Chatwoot HTTP client: {e}")
+
+
+def get_chatwoot_pool_stats() -> dict[str, Any]:
+    """
+    Return usage stats of the shared Chatwoot connection pool.
+
+    Use these to size CHATWOOT_HTTP_MAX_CONNECTIONS: if ``active`` regularly
+    reaches ``max_connections``, requests are queueing for a connection.
+
+    Returns:
+        Dict with pool limits, connection counts and request counters
+    """
+    return _pool_stats(_http_client)
+
+
+def _is_stale_reference(error: Exception) -> bool:
+    """Return True if Chatwoot rejected a (cached) contact or conversation ID."""
+    return (
+        isinstance(error, httpx.HTTPStatusError)
+        and error.response.status_code in STALE_REFERENCE_STATUS_CODES
+    )
+
+
+def _pool_stats(client: httpx.AsyncClient | None) -> dict[str, Any]:
+    """Build pool stats for a client (limits, connection counts, requests)."""
+    settings = get_settings()
+    return {
+        "initialized": client is not None and not client.is_closed,
+        "max_connections": settings.CHATWOOT_HTTP_MAX_CONNECTIONS,
+        "max_keepalive": settings.CHATWOOT_HTTP_MAX_KEEPALIVE,
+        **pool_connection_stats(client),
+        "requests_total": _http_requests_total,
+    }
+
 
 class ChatwootClient:
     """
@@ -63,27 +196,27 @@ class ChatwootClient:
         Returns:
             Contact dict if found, None otherwise
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/search",
-                    params={"q": phone},
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
+        client = get_chatwoot_http_client()
+        try:
+            response = await client.get(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/search",
+                params={"q": phone},
+                headers=self.headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
 
-                payload = response.json().get("payload", [])
-                if payload and len(payload) > 0:
-                    logger.debug(f"Contact found for phone {phone}")
-                    return cast(dict[str, Any], payload[0])
+            payload = response.json().get("payload", [])
+            if payload and len(payload) > 0:
+                logger.debug(f"Contact found for phone {phone}")
+                return cast(dict[str, Any], payload[0])
 
-                logger.debug(f"No contact found for phone {phone}")
-                return None
+            logger.debug(f"No contact found for phone {phone}")
+            return None
 
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error finding contact: {e}")
-                raise
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error finding contact: {e}")
+            raise
 
     @retry(
         stop=stop_after_attempt(3),
@@ -102,30 +235,30 @@ class ChatwootClient:
         Returns:
             Created contact dict
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                payload = {
-                    "inbox_id": self.inbox_id,
-                    "phone_number": phone,
-                }
-                if name:
-                    payload["name"] = name
-
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
+        client = get_chatwoot_http_client()
+        try:
+            payload = {
+                "inbox_id": self.inbox_id,
+                "phone_number": phone,
+            }
+            if name:
+                payload["name"] = name
 
-                contact = response.json().get("payload", {}).get("contact", {})
-                logger.info(f"Created contact for phone {phone}, contact_id={contact.get('id')}")
-                return cast(dict[str, Any], contact)
+            response = await client.post(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts",
+                json=payload,
+                headers=self.headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
 
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error creating contact: {e}")
-                raise
+            contact = response.json().get("payload", {}).get("contact", {})
+            logger.info(f"Created contact for phone {phone}, contact_id={contact.get('id')}")
+            return cast(dict[str, Any], contact)
+
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error creating contact: {e}")
+            raise
 
     @retry(
         stop=stop_after_attempt(3),
@@ -143,49 +276,49 @@ class ChatwootClient:
         Returns:
             Conversation ID
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                # Get contact details with conversations
-                response = await client.get(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/{contact_id}",
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-
-                # Extract contact data - Chatwoot returns data directly in payload, not payload.contact
-                contact = response.json().get("payload", {})
-
-                # Get source_id from first contact_inbox (required for conversation creation)
-                contact_inboxes = contact.get("contact_inboxes", [])
-                if not contact_inboxes:
-                    logger.error(f"No contact_inboxes found for contact {contact_id}")
-                    raise ValueError(f"Contact {contact_id} has no associated inboxes")
-
-                source_id = contact_inboxes[0].get("source_id")
-                logger.debug(f"Using source_id={source_id} from contact {contact_id}")
-
-                # Create new conversation with source_id
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations",
-                    json={
-                        "source_id": source_id,
-                        "inbox_id": self.inbox_id,
-                        "contact_id": contact_id,
-                        "status": "open",
-                    },
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
+        client = get_chatwoot_http_client()
+        try:
+            # Get contact details with conversations
+            response = await client.get(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/contacts/{contact_id}",
+                headers=self.headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
 
-                conversation_id = cast(int, response.json().get("id"))
-                logger.info(f"Created conversation {conversation_id} for contact {contact_id}")
-                return conversation_id
+            # Extract contact data - Chatwoot returns data directly in payload, not payload.contact
+            contact = response.json().get("payload", {})
 
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error managing conversation: {e}")
-                raise
+            # Get source_id from first contact_inbox (required for conversation creation)
+            contact_inboxes = contact.get("contact_inboxes", [])
+            if not contact_inboxes:
+                logger.error(f"No contact_inboxes found for contact {contact_id}")
+                raise ValueError(f"Contact {contact_id} has no associated inboxes")
+
+            source_id = contact_inboxes[0].get("source_id")
+            logger.debug(f"Using source_id={source_id} from contact {contact_id}")
+
+            # Create new conversation with source_id
+            response = await client.post(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations",
+                json={
+                    "source_id": source_id,
+                    "inbox_id": self.inbox_id,
+                    "contact_id": contact_id,
+                    "status": "open",
+                },
+                headers=self.headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+
+            conversation_id = cast(int, response.json().get("id"))
+            logger.info(f"Created conversation {conversation_id} for contact {contact_id}")
+            return conversation_id
+
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error managing conversation: {e}")
+            raise
 
     @retry(
         stop=stop_after_attempt(3),
@@ -221,65 +354,65 @@ class ChatwootClient:
         Returns:
             Tuple of (conversation_id, success)
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                # For WhatsApp, source_id is the phone number without + prefix
-                # Chatwoot will automatically create the contact_inbox relationship
-                # https://github.com/orgs/chatwoot/discussions/2198
-                source_id = phone.lstrip("+")
-
-                payload: dict[str, Any] = {
-                    "source_id": source_id,
-                    "inbox_id": int(self.inbox_id),
-                    "contact_id": contact_id,
-                    "status": "open",
-                    "message": {
-                        "content": fallback_content or f"Template: {template_name}",
-                        "template_params": {
-                            "name": template_name,
-                            "category": category,
-                            "language": language,
-                            "processed_params": {
-                                "body": body_params,
-                            },
+        client = get_chatwoot_http_client()
+        try:
+            # For WhatsApp, source_id is the phone number without + prefix
+            # Chatwoot will automatically create the contact_inbox relationship
+            # https://github.com/orgs/chatwoot/discussions/2198
+            source_id = phone.lstrip("+")
+
+            payload: dict[str, Any] = {
+                "source_id": source_id,
+                "inbox_id": int(self.inbox_id),
+                "contact_id": contact_id,
+                "status": "open",
+                "message": {
+                    "content": fallback_content or f"Template: {template_name}",
+                    "template_params": {
+                        "name": template_name,
+                        "category": category,
+                        "language": language,
+                        "processed_params": {
+                            "body": body_params,
                         },
                     },
-                }
+                },
+            }
 
-                logger.debug(
-                    f"Creating conversation with template for contact {contact_id}: {payload}"
-                )
+            logger.debug(
+                f"Creating conversation with template for contact {contact_id}: {payload}"
+            )
 
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=15.0,
-                )
-                response.raise_for_status()
+            response = await client.post(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations",
+                json=payload,
+                headers=self.headers,
+                timeout=15.0,
+            )
+            response.raise_for_status()
 
-                result = response.json()
-                conversation_id = cast(int, result.get("id"))
+            result = response.json()
+            conversation_id = cast(int, result.get("id"))
 
-                logger.info(
-                    f"Created conversation {conversation_id} with template {template_name} "
-                    f"for contact {contact_id}"
-                )
-                return (conversation_id, True)
+            logger.info(
+                f"Created conversation {conversation_id} with template {template_name} "
+                f"for contact {contact_id}"
+            )
+            return (conversation_id, True)
 
-            except httpx.HTTPError as e:
-                logger.error(
-                    f"HTTP error creating conversation with template: {e}",
-                    extra={
-                        "contact_id": contact_id,
-                        "template_name": template_name,
-                        "response_body": getattr(e.response, "text", None)
-                        if hasattr(e, "response")
-                        else None,
-                    },
-                    exc_info=True,
-                )
-                raise
+        except httpx.HTTPError as e:
+            logger.error(
+                f"HTTP error creating conversation with template: {e}",
+                extra={
+                    "contact_id": contact_id,
+                    "template_name": template_name,
+                    "response_body": getattr(e.response, "text", None)
+                    if hasattr(e, "response")
+                    else None,
+                },
+                exc_info=True,
+            )
+            raise
 
     @retry(
         stop=stop_after_attempt(3),
@@ -311,31 +444,143 @@ class ChatwootClient:
             ...     attributes={"atencion_automatica": True}
             ... )
         """
-        async with httpx.AsyncClient() as client:
+        client = get_chatwoot_http_client()
+        try:
+            logger.info(
+                f"Updating conversation {conversation_id} custom_attributes: {attributes}"
+            )
+
+            response = await client.post(
+                f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/custom_attributes",
+                json={"custom_attributes": attributes},
+                headers=self.headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+
+            logger.info(
+                f"Successfully updated conversation {conversation_id} custom_attributes"
+            )
+            return True
+
+        except httpx.HTTPError as e:
+            logger.error(
+                f"HTTP error updating conversation {conversation_id} attributes: {e}",
+                exc_info=True,
+            )
+            raise
+
+    async def _resolve_contact_id(
+        self, customer_phone: str, customer_name: str | None = None
+    ) -> int | None:
+        """
+        Find or create the contact of a phone and cache its ID.
+
+        Phones whose contact cannot be created (4xx from Chatwoot, or no ID
+        returned) are cached as unresolvable so bulk jobs do not retry them
+        on every message.
+
+        Returns:
+            Contact ID, or None if the phone could not be resolved
+        """
+        cache = get_chatwoot_contact_cache()
+
+        contact = await self._find_contact_by_phone(customer_phone)
+        if not contact:
+            logger.info(f"Creating new contact for {customer_phone}")
             try:
-                logger.info(
-                    f"Updating conversation {conversation_id} custom_attributes: {attributes}"
-                )
+                contact = await self._create_contact(customer_phone, customer_name)
+            except httpx.HTTPStatusError as e:
+                if 400 <= e.response.status_code < 500:
+                    await cache.mark_unresolvable(customer_phone)
+                raise
 
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/custom_attributes",
-                    json={"custom_attributes": attributes},
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
+        contact_id = contact.get("id")
+        if not contact_id:
+            logger.error(f"No contact ID found for {customer_phone}")
+            await cache.mark_unresolvable(customer_phone)
+            return None
 
-                logger.info(
-                    f"Successfully updated conversation {conversation_id} custom_attributes"
-                )
-                return True
+        await cache.remember(customer_phone, contact_id=contact_id)
+        return cast(int, contact_id)
 
+    async def _resolve_conversation(
+        self, customer_phone: str, customer_name: str | None = None
+    ) -> tuple[int | None, bool]:
+        """
+        Return a conversation to send to, using the contact cache.
+
+        Returns:
+            Tuple of (conversation_id or None if unresolvable, from_cache)
+        """
+        cache = get_chatwoot_contact_cache()
+        entry = await cache.get(customer_phone)
+
+        if entry is not None and entry.unresolvable:
+            logger.warning(f"Skipping {customer_phone}: phone cached as unresolvable")
+            return None, False
+        if entry is not None and entry.conversation_id is not None:
+            logger.info(f"Using cached conversation_id={entry.conversation_id}")
+            return entry.conversation_id, True
+
+        contact_id = entry.contact_id if entry is not None else None
+        if contact_id is not None:
+            try:
+                conversation_id = await self._get_or_create_conversation(contact_id)
             except httpx.HTTPError as e:
-                logger.error(
-                    f"HTTP error updating conversation {conversation_id} attributes: {e}",
-                    exc_info=True,
-                )
-                raise
+                if not _is_stale_reference(e):
+                    raise
+                # Cached contact was deleted in Chatwoot: resolve it again
+                await cache.invalidate(customer_phone)
+                contact_id = None
+
+        if contact_id is None:
+            contact_id = await self._resolve_contact_id(customer_phone, customer_name)
+            if contact_id is None:
+                return None, False
+            conversation_id = await self._get_or_create_conversation(contact_id)
+
+        await cache.remember(
+            customer_phone, contact_id=contact_id, conversation_id=conversation_id
+        )
+        return conversation_id, False
+
+    async def _post_message(
+        self, conversation_id: int, customer_phone: str, message: str
+    ) -> None:
+        """Post an outgoing text message to a conversation."""
+        client = get_chatwoot_http_client()
+        api_payload = {
+            "content": message,
+            "message_type": "outgoing",
+            "private": False,
+        }
+
+        # Log API payload for debugging
+        logger.debug(
+            f"Chatwoot API payload: {api_payload}",
+            extra={
+                "conversation_id": conversation_id,
+                "customer_phone": customer_phone,
+            }
+        )
+
+        response = await client.post(
+            f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
+            json=api_payload,
+            headers=self.headers,
+            timeout=10.0,
+        )
+        response.raise_for_status()
+
+        # Log API response for debugging
+        logger.debug(
+            f"Chatwoot API response: status={response.status_code}, body={response.text[:500]}",
+            extra={
+                "conversation_id": conversation_id,
+                "customer_phone": customer_phone,
+            }
+        )
 
     @retry(
         stop=stop_after_attempt(3),
@@ -355,9 +600,11 @@ class ChatwootClient:
 
         This method handles the complete flow:
         1. If conversation_id provided, use it directly
-        2. Otherwise: Find or create contact by phone
-        3. Otherwise: Get or create conversation for contact
-        4. Send message to conversation
+        2. Otherwise: Use the cached conversation of the phone, if any
+        3. Otherwise: Find or create contact by phone (cached)
+        4. Otherwise: Get or create conversation for contact (cached)
+        5. Send message to conversation (a rejected cached conversation is
+           invalidated and replaced once)
 
         Args:
             customer_phone: E.164 formatted phone number
@@ -382,61 +629,38 @@ class ChatwootClient:
             )
 
             # If conversation_id provided, use it directly
+            from_cache = False
             if conversation_id is not None:
                 logger.info(f"Using existing conversation_id={conversation_id}")
             else:
-                # Find or create contact
-                contact = await self._find_contact_by_phone(customer_phone)
-                if not contact:
-                    logger.info(f"Creating new contact for {customer_phone}")
-                    contact = await self._create_contact(customer_phone, customer_name)
-
-                contact_id = contact.get("id")
-                if not contact_id:
-                    logger.error(f"No contact ID found for {customer_phone}")
-                    return False
-
-                # Get or create conversation
-                conversation_id = await self._get_or_create_conversation(contact_id)
-
-            # Send message
-            async with httpx.AsyncClient() as client:
-                api_payload = {
-                    "content": message,
-                    "message_type": "outgoing",
-                    "private": False,
-                }
-
-                # Log API payload for debugging
-                logger.debug(
-                    f"Chatwoot API payload: {api_payload}",
-                    extra={
-                        "conversation_id": conversation_id,
-                        "customer_phone": customer_phone,
-                    }
+                conversation_id, from_cache = await self._resolve_conversation(
+                    customer_phone, customer_name
                 )
+                if conversation_id is None:
+                    return False
 
-                response = await client.post(
-                    f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
-                    json=api_payload,
-                    headers=self.headers,
-                    timeout=10.0,
+            try:
+                await self._post_message(conversation_id, customer_phone, message)
+            except httpx.HTTPError as e:
+                if not (from_cache and _is_stale_reference(e)):
+                    raise
+                # Cached conversation was deleted/closed: drop it and retry once
+                logger.info(
+                    f"Cached conversation {conversation_id} rejected for {customer_phone} "
+                    f"({e}), resolving a new one"
                 )
-                response.raise_for_status()
-
-                # Log API response for debugging
-                logger.debug(
-                    f"Chatwoot API response: status={response.status_code}, body={response.text[:500]}",
-                    extra={
-                        "conversation_id": conversation_id,
-                        "customer_phone": customer_phone,
-                    }
+                await get_chatwoot_contact_cache().forget_conversation(customer_phone)
+                conversation_id, _ = await self._resolve_conversation(
+                    customer_phone, customer_name
                 )
+                if conversation_id is None:
+                    return False
+                await self._post_message(conversation_id, customer_phone, message)
 
-                logger.info(
-                    f"Message sent successfully to {customer_phone}, conversation_id={conversation_id}"
-                )
-                return True
+            logger.info(
+                f"Message sent successfully to {customer_phone}, conversation_id={conversation_id}"
+            )
+            return True
 
         except httpx.HTTPError as e:
             logger.error(
@@ -521,17 +745,43 @@ class ChatwootClient:
                     fallback_content=fallback_content,
                 )
 
-            # No conversation_id - need to find/create contact and create conversation with template
-            contact = await self._find_contact_by_phone(customer_phone)
-            if not contact:
-                logger.info(f"Creating new contact for {customer_phone}")
-                contact = await self._create_contact(customer_phone, customer_name)
-
-            contact_id = contact.get("id")
-            if not contact_id:
-                logger.error(f"No contact ID found for {customer_phone}")
+            # No conversation_id - reuse the cached conversation of the phone if any
+            cache = get_chatwoot_contact_cache()
+            entry = await cache.get(customer_phone)
+            if entry is not None and entry.unresolvable:
+                logger.warning(
+                    f"Skipping template to {customer_phone}: phone cached as unresolvable"
+                )
                 return False
 
+            if entry is not None and entry.conversation_id is not None:
+                logger.info(f"Using cached conversation_id={entry.conversation_id}")
+                try:
+                    return await self._send_template_to_conversation(
+                        conversation_id=entry.conversation_id,
+                        customer_phone=customer_phone,
+                        template_name=template_name,
+                        body_params=body_params,
+                        category=category,
+                        language=language,
+                        fallback_content=fallback_content,
+                    )
+                except httpx.HTTPError as e:
+                    if not _is_stale_reference(e):
+                        raise
+                    logger.info(
+                        f"Cached conversation {entry.conversation_id} rejected for "
+                        f"{customer_phone} ({e}), creating a new one"
+                    )
+                    await cache.forget_conversation(customer_phone)
+
+            # Find/create contact and create conversation with template
+            contact_id = entry.contact_id if entry is not None else None
+            if contact_id is None:
+                contact_id = await self._resolve_contact_id(customer_phone, customer_name)
+                if contact_id is None:
+                    return False
+
             logger.info(
                 f"Creating conversation with template for contact: "
                 f"contact_id={contact_id}, phone={customer_phone}"
@@ -539,15 +789,26 @@ class ChatwootClient:
 
             # Create conversation WITH template message in one API call
             # Phone number is used as source_id for WhatsApp (Chatwoot handles the rest)
-            _, success = await self._create_conversation_with_template(
-                contact_id=contact_id,
-                phone=customer_phone,
-                template_name=template_name,
-                body_params=body_params,
-                category=category,
-                language=language,
-                fallback_content=fallback_content,
-            )
+            try:
+                conversation_id, success = await self._create_conversation_with_template(
+                    contact_id=contact_id,
+                    phone=customer_phone,
+                    template_name=template_name,
+                    body_params=body_params,
+                    category=category,
+                    language=language,
+                    fallback_content=fallback_content,
+                )
+            except httpx.HTTPError as e:
+                # A cached contact may have been deleted in Chatwoot
+                if entry is not None and entry.contact_id is not None and _is_stale_reference(e):
+                    await cache.invalidate(customer_phone)
+                raise
+
+            if success:
+                await cache.remember(
+                    customer_phone, contact_id=contact_id, conversation_id=conversation_id
+                )
             return success
 
         except httpx.HTTPError as e:
@@ -618,17 +879,17 @@ class ChatwootClient:
             }
         )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
-                json=api_payload,
-                headers=self.headers,
-                timeout=15.0,
-            )
-            response.raise_for_status()
+        client = get_chatwoot_http_client()
+        response = await client.post(
+            f"{self.api_url}/api/v1/accounts/{self.account_id}/conversations/{conversation_id}/messages",
+            json=api_payload,
+            headers=self.headers,
+            timeout=15.0,
+        )
+        response.raise_for_status()
 
-            logger.info(
-                f"Template message sent successfully to {customer_phone}, "
-                f"conversation_id={conversation_id}, template={template_name}"
-            )
-            return True
+        logger.info(
+            f"Template message sent successfully to {customer_phone}, "
+            f"conversation_id={conversation_id}, template={template_name}"
+        )
+        return True
@@ -0,0 +1,283 @@
+"""
+Phone -> Chatwoot contact/conversation ID cache - shared between API and workers.
+
+Sending to a customer without a conversation_id (confirmation, reminder and
+escalation jobs) needs a contact search and a conversation lookup/creation
+before the actual message: two or three extra Chatwoot round-trips per
+message. This cache remembers, per E.164 phone:
+- contact_id: the Chatwoot contact of the phone
+- conversation_id: an open conversation to send to
+- unresolvable: the phone could not be resolved to a contact (negative entry)
+
+Two layers:
+- Redis hash (shared by API, agent and workers), expires after
+  CHATWOOT_CONTACT_CACHE_TTL_SECONDS (negative entries after
+  CHATWOOT_CONTACT_CACHE_NEGATIVE_TTL_SECONDS)
+- Small in-process layer in front of it, kept for at most LOCAL_TTL_SECONDS so
+  invalidations by other processes are picked up quickly
+
+All Redis errors are logged and treated as cache misses (best-effort).
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+from redis.asyncio import Redis
+
+from shared.config import get_settings
+from shared.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key pattern: chatwoot:contact:{phone} -> hash(contact_id, conversation_id, unresolvable)
+CONTACT_CACHE_PREFIX = "chatwoot:contact:"
+
+# In-process layer
+LOCAL_TTL_SECONDS = 60
+LOCAL_MAX_ENTRIES = 10000
+
+
+@dataclass(frozen=True)
+class ContactCacheEntry:
+    """Cached Chatwoot IDs of a phone number."""
+
+    contact_id: int | None = None
+    conversation_id: int | None = None
+    unresolvable: bool = False
+
+
+def _normalize_phone(phone: str) -> str:
+    """Cache key form of a phone number (E.164 expected, whitespace ignored)."""
+    return "".join(str(phone).split())
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ChatwootContactCache:
+    """
+    Read-through cache of Chatwoot contact and conversation IDs by phone.
+
+    Example:
+        >>> cache = get_chatwoot_contact_cache()
+        >>> entry = await cache.get("+34612345678")
+        >>> if entry is None:
+        ...     ...search/create contact and conversation in Chatwoot...
+        ...     await cache.remember("+34612345678", contact_id=42, conversation_id=7)
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis | None = None,
+        ttl_seconds: int | None = None,
+        negative_ttl_seconds: int | None = None,
+    ):
+        """
+        Initialize the ChatwootContactCache.
+
+        Args:
+            redis_client: Redis client (defaults to the shared singleton)
+            ttl_seconds: Entry TTL (defaults to CHATWOOT_CONTACT_CACHE_TTL_SECONDS).
+                         0 disables the cache.
+            negative_ttl_seconds: Negative entry TTL
+                         (defaults to CHATWOOT_CONTACT_CACHE_NEGATIVE_TTL_SECONDS)
+        """
+        settings = get_settings()
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else settings.CHATWOOT_CONTACT_CACHE_TTL_SECONDS
+        )
+        self.negative_ttl_seconds = (
+            negative_ttl_seconds if negative_ttl_seconds is not None
+            else settings.CHATWOOT_CONTACT_CACHE_NEGATIVE_TTL_SECONDS
+        )
+        self._redis = redis_client
+        # phone -> (entry, local expiry as time.monotonic())
+        self._local: OrderedDict[str, tuple[ContactCacheEntry, float]] = OrderedDict()
+
+        # Metrics
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return False when the cache is disabled by configuration."""
+        return self.ttl_seconds > 0
+
+    async def get(self, phone: str) -> ContactCacheEntry | None:
+        """
+        Return the cached entry of a phone, or None on a miss.
+
+        Args:
+            phone: E.164 formatted phone number
+        """
+        if not self.enabled:
+            return None
+
+        key = _normalize_phone(phone)
+        cached = self._local.get(key)
+        if cached is not None:
+            entry, expires_at = cached
+            if expires_at > time.monotonic():
+                self.local_hits += 1
+                return entry
+            self._local.pop(key, None)
+
+        try:
+            data = await self._client().hgetall(f"{CONTACT_CACHE_PREFIX}{key}")
+        except Exception as e:
+            logger.warning(f"Contact cache read failed | phone={key} | error={e}")
+            data = None
+
+        if not data:
+            self.misses += 1
+            return None
+
+        entry = ContactCacheEntry(
+            contact_id=_parse_int(data.get("contact_id")),
+            conversation_id=_parse_int(data.get("conversation_id")),
+            unresolvable=data.get("unresolvable") == "1",
+        )
+        self.redis_hits += 1
+        self._store_local(key, entry)
+        return entry
+
+    async def remember(
+        self,
+        phone: str,
+        contact_id: int | None = None,
+        conversation_id: int | None = None,
+    ) -> None:
+        """
+        Cache the contact and/or conversation of a phone (fields not given are kept).
+
+        Clears any negative entry and refreshes the TTL.
+        """
+        if not self.enabled or (contact_id is None and conversation_id is None):
+            return
+
+        key = _normalize_phone(phone)
+        try:
+            contact_id = int(contact_id) if contact_id is not None else None
+            conversation_id = int(conversation_id) if conversation_id is not None else None
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Contact cache ignored invalid IDs | phone={key} | "
+                f"contact_id={contact_id!r} | conversation_id={conversation_id!r}"
+            )
+            return
+
+        mapping: dict[str, int] = {}
+        if contact_id is not None:
+            mapping["contact_id"] = contact_id
+        if conversation_id is not None:
+            mapping["conversation_id"] = conversation_id
+
+        redis_key = f"{CONTACT_CACHE_PREFIX}{key}"
+        try:
+            pipe = self._client().pipeline(transaction=True)
+            pipe.hdel(redis_key, "unresolvable")
+            pipe.hset(redis_key, mapping=mapping)
+            pipe.expire(redis_key, self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Contact cache write failed | phone={key} | error={e}")
+
+        previous = self._local_entry(key) or ContactCacheEntry()
+        self._store_local(
+            key,
+            ContactCacheEntry(
+                contact_id=contact_id if contact_id is not None else previous.contact_id,
+                conversation_id=(
+                    conversation_id if conversation_id is not None
+                    else previous.conversation_id
+                ),
+            ),
+        )
+
+    async def mark_unresolvable(self, phone: str) -> None:
+        """Cache that a phone cannot be resolved to a contact (negative entry)."""
+        if not self.enabled or self.negative_ttl_seconds <= 0:
+            return
+
+        key = _normalize_phone(phone)
+        redis_key = f"{CONTACT_CACHE_PREFIX}{key}"
+        try:
+            pipe = self._client().pipeline(transaction=True)
+            pipe.delete(redis_key)
+            pipe.hset(redis_key, mapping={"unresolvable": "1"})
+            pipe.expire(redis_key, self.negative_ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Contact cache write failed | phone={key} | error={e}")
+
+        self._store_local(key, ContactCacheEntry(unresolvable=True))
+
+    async def forget_conversation(self, phone: str) -> None:
+        """Drop the cached conversation of a phone (deleted or resolved in Chatwoot)."""
+        key = _normalize_phone(phone)
+        try:
+            await self._client().hdel(f"{CONTACT_CACHE_PREFIX}{key}", "conversation_id")
+        except Exception as e:
+            logger.warning(f"Contact cache invalidation failed | phone={key} | error={e}")
+
+        previous = self._local_entry(key)
+        if previous is not None:
+            self._store_local(key, replace(previous, conversation_id=None))
+
+    async def invalidate(self, phone: str) -> None:
+        """Drop everything cached for a phone (e.g. contact deleted in Chatwoot)."""
+        key = _normalize_phone(phone)
+        self._local.pop(key, None)
+        try:
+            await self._client().delete(f"{CONTACT_CACHE_PREFIX}{key}")
+        except Exception as e:
+            logger.warning(f"Contact cache invalidation failed | phone={key} | error={e}")
+
+    def stats(self) -> dict[str, int]:
+        """Return cache metrics for logging and health checks."""
+        return {
+            "local_entries": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+    def _client(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _local_entry(self, key: str) -> ContactCacheEntry | None:
+        cached = self._local.get(key)
+        if cached is None or cached[1] <= time.monotonic():
+            return None
+        return cached[0]
+
+    def _store_local(self, key: str, entry: ContactCacheEntry) -> None:
+        ttl = min(LOCAL_TTL_SECONDS, self.ttl_seconds)
+        if entry.unresolvable:
+            ttl = min(ttl, self.negative_ttl_seconds)
+        self._local[key] = (entry, time.monotonic() + ttl)
+        self._local.move_to_end(key)
+        while len(self._local) > LOCAL_MAX_ENTRIES:
+            self._local.popitem(last=False)
+
+
+@lru_cache
+def get_chatwoot_contact_cache() -> ChatwootContactCache:
+    """
+    Get the process-wide ChatwootContactCache.
+
+    Uses @lru_cache so every ChatwootClient in the process shares the same
+    in-process layer.
+    """
+    return ChatwootContactCache()
@@ -6,6 +6,7 @@ NEVER use os.getenv() directly in application code.
 """
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -22,6 +23,10 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field(default="atrevete_db")
     POSTGRES_USER: str = Field(default="atrevete")
     POSTGRES_PASSWORD: str = Field(default="changeme")
+    AVAILABILITY_INDEX_ENABLED: bool = Field(
+        default=True,
+        description="Serve slot searches in the agent from an in-memory availability index invalidated by PostgreSQL LISTEN/NOTIFY (see agent/services/availability_index.py). Disable to query the database on every search."
+    )
 
     # Redis
     REDIS_URL: str = Field(
@@ -37,6 +42,14 @@ class Settings(BaseSettings):
         description="Use Redis Streams instead of Pub/Sub for message delivery. "
                     "Streams provide persistence and acknowledgment. Set to False to use legacy Pub/Sub."
     )
+    INCOMING_STREAM_PARTITIONS: int = Field(
+        default=1,
+        ge=1,
+        le=64,
+        description="Number of incoming stream partitions. Messages are routed by conversation_id "
+                    "and each partition is leased to one agent replica, so several replicas can "
+                    "share the load without splitting a conversation. Drain streams before changing."
+    )
 
     # Google Calendar API
     GOOGLE_SERVICE_ACCOUNT_JSON: str = Field(
@@ -58,6 +71,37 @@ class Settings(BaseSettings):
         default="chatwoot_webhook_token_placeholder",
         description="Secret token for Chatwoot webhook URL authentication (min 24 chars recommended)"
     )
+    CHATWOOT_HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Max open connections in the shared Chatwoot HTTP pool (per process)"
+    )
+    CHATWOOT_HTTP_MAX_KEEPALIVE: int = Field(
+        default=10,
+        ge=0,
+        le=200,
+        description="Max idle keep-alive connections kept in the shared Chatwoot HTTP pool"
+    )
+    CHATWOOT_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds an idle Chatwoot connection is kept open for reuse"
+    )
+    CHATWOOT_HTTP2: bool = Field(
+        default=False,
+        description="Use HTTP/2 for Chatwoot requests (requires the 'h2' package, falls back to HTTP/1.1)"
+    )
+    CHATWOOT_CONTACT_CACHE_TTL_SECONDS: int = Field(
+        default=21600,
+        ge=0,
+        description="TTL of cached phone -> contact/conversation IDs (0 disables the cache)"
+    )
+    CHATWOOT_CONTACT_CACHE_NEGATIVE_TTL_SECONDS: int = Field(
+        default=600,
+        ge=0,
+        description="TTL of cached 'phone cannot be resolved to a contact' entries"
+    )
 
     # OpenRouter (Unified LLM API)
     OPENROUTER_API_KEY: str = Field(default="sk-or-placeholder")
@@ -65,6 +109,53 @@ class Settings(BaseSettings):
         default="openai/gpt-4o-mini",
         description="AI model for conversations (OpenRouter format). Options: openai/gpt-4o-mini, anthropic/claude-sonnet-3.5, anthropic/claude-haiku-4.5"
     )
+    INTENT_FAST_PATH_ENABLED: bool = Field(
+        default=True,
+        description="Classify unambiguous messages ('1', 'sí', 'cancelar'...) with deterministic rules before calling the intent extraction LLM."
+    )
+    NLU_SINGLE_CALL_STATES: str = Field(
+        default="",
+        description="Comma-separated FSM states (e.g. 'idle,booked') where one LLM call returns the intent and a draft reply for greetings/FAQs. Empty disables single-call mode."
+    )
+    LLM_HEDGE_MODEL: str = Field(
+        default="",
+        description="Backup model (OpenRouter format, e.g. 'google/gemini-2.0-flash-001') raced against LLM_MODEL when a call is slower than its recent p95. Empty disables hedging."
+    )
+    LLM_REPLAY_MODE: Literal["off", "record", "replay"] = Field(
+        default="off",
+        description="LLM record/replay for offline benchmarks: 'record' saves every LLM response to LLM_CASSETTE_PATH, 'replay' serves them without network (see shared/llm_replay.py)"
+    )
+    LLM_CASSETTE_PATH: str = Field(
+        default="data/llm_cassette.jsonl",
+        description="JSON lines file of recorded LLM request/response pairs"
+    )
+    LLM_REPLAY_LATENCY_MS: float = Field(
+        default=0.0,
+        ge=0,
+        description="Synthetic latency of each replayed LLM call"
+    )
+    LLM_REPLAY_JITTER_MS: float = Field(
+        default=0.0,
+        ge=0,
+        description="Uniform jitter (+/-) added to LLM_REPLAY_LATENCY_MS (seeded, reproducible)"
+    )
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Max open connections to OpenRouter in the shared LLM HTTP pool (per process)"
+    )
+    LLM_HTTP_MAX_KEEPALIVE: int = Field(
+        default=10,
+        ge=0,
+        le=200,
+        description="Max idle keep-alive connections kept in the shared LLM HTTP pool"
+    )
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds an idle OpenRouter connection is kept open for reuse"
+    )
     SITE_URL: str = Field(
         default="https://atrevetepeluqueria.com",
         description="Site URL for OpenRouter rankings (optional)"
@@ -107,6 +198,59 @@ class Settings(BaseSettings):
         le=120,
         description="Message batching window in seconds. Collects messages within this window and processes them as one. Set to 0 to disable batching."
     )
+    MESSAGE_BATCH_ADAPTIVE: bool = Field(
+        default=False,
+        description="Adaptive batching: wait MESSAGE_BATCH_WINDOW_SECONDS after the latest message, shrink it for short complete messages and flush expected short answers immediately"
+    )
+    MESSAGE_BATCH_MIN_WINDOW_SECONDS: float = Field(
+        default=2.0,
+        ge=0,
+        le=120,
+        description="Adaptive batching: wait after a short, complete message"
+    )
+    MESSAGE_BATCH_MAX_WINDOW_SECONDS: int = Field(
+        default=60,
+        ge=1,
+        le=240,
+        description="Adaptive batching: maximum age of a batch before it is processed"
+    )
+    MESSAGE_BATCH_SPECULATIVE: bool = Field(
+        default=False,
+        description="Speculative batching: look up the customer, load the checkpoint and extract the intent of the batch so far while its window is open (redone on every new message)"
+    )
+    AGENT_MAX_CONCURRENT_BATCHES: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Maximum number of message batches processed concurrently by the agent (graph invocations in flight). Batches of the same conversation always run in order."
+    )
+    OUTGOING_SENDER_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Maximum number of concurrent Chatwoot sends by the outgoing stream sender. Replies of the same conversation are always sent in order."
+    )
+    AGENT_MAX_QUEUED_BATCHES: int = Field(
+        default=50,
+        ge=1,
+        description="Queue depth at which the agent stops reading new messages from the incoming stream until workers catch up (backpressure)."
+    )
+    AUDIO_TRANSCRIPTION_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum number of voice notes downloaded, converted and transcribed concurrently by the audio transcription worker."
+    )
+    AUDIO_FFMPEG_MAX_PROCESSES: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Maximum number of concurrent ffmpeg conversion processes per service process (caps CPU spikes)."
+    )
+    AUDIO_ALWAYS_CONVERT: bool = Field(
+        default=False,
+        description="Convert every voice note to FLAC 16kHz mono before transcription. When false, formats Whisper accepts (e.g. WhatsApp OGG Opus) are sent as-is."
+    )
 
     # Appointment Confirmation System
     CONFIRMATION_TEMPLATE_NAME: str = Field(
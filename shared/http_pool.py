@@ -0,0 +1,88 @@
+"""
+Connection counts of a pooled httpx.AsyncClient.
+
+httpx does not expose its connection pool, so the counts are read from the
+httpcore pool behind the client's default transport. This is the only place
+that touches those internals, and it degrades instead of raising:
+- httpcore >= 0.17 exposes the pool's connections as `connections`
+- older httpcore keeps them in the private `_pool` list
+- anything else (custom or mock transport, a renamed attribute) reports
+  zero connections with connections_known=False, so health checks and
+  shutdown logs keep working across httpx/httpcore upgrades
+
+Used by get_chatwoot_pool_stats() and get_llm_stats().
+"""
+
+import logging
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_warned_unknown_layout = False
+
+
+def pool_connection_stats(client: httpx.AsyncClient | None) -> dict[str, Any]:
+    """
+    Count the open connections of a client's pool.
+
+    Args:
+        client: Shared httpx client (None before it is created)
+
+    Returns:
+        Dict with connections, active, idle and http2 counts, plus
+        connections_known (False when the pool could not be inspected)
+    """
+    stats: dict[str, Any] = {
+        "connections": 0,
+        "active": 0,
+        "idle": 0,
+        "http2": 0,
+        "connections_known": client is None,
+    }
+    if client is None:
+        return stats
+
+    connections = _pool_connections(client)
+    if connections is None:
+        _warn_unknown_layout(client)
+        return stats
+
+    stats["connections_known"] = True
+    for connection in connections:
+        stats["connections"] += 1
+        try:
+            idle = connection.is_idle()
+            http2 = "HTTP/2" in connection.info()
+        except Exception:
+            continue
+        stats["idle" if idle else "active"] += 1
+        if http2:
+            stats["http2"] += 1
+    return stats
+
+
+def _pool_connections(client: httpx.AsyncClient) -> list[Any] | None:
+    """Connections of the httpcore pool behind the client, None if not found."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is None:
+        return None
+    for attribute in ("connections", "_pool"):
+        connections = getattr(pool, attribute, None)
+        if isinstance(connections, list | tuple):
+            return list(connections)
+    return None
+
+
+def _warn_unknown_layout(client: httpx.AsyncClient) -> None:
+    """Log once that pool counts are unavailable (not per health check)."""
+    global _warned_unknown_layout
+    if _warned_unknown_layout:
+        return
+    _warned_unknown_layout = True
+    transport = getattr(client, "_transport", None)
+    logger.warning(
+        f"Cannot inspect HTTP connection pool (transport={type(transport).__name__}, "
+        f"httpx={httpx.__version__}); connection counts report 0"
+    )
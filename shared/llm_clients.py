@@ -0,0 +1,389 @@
+"""
+Process-wide LLM client registry.
+
+Every LLM call site (intent extraction, response generation, response
+formatting, summarization) used to build a new ChatOpenAI per call, each with
+its own HTTP client, paying object construction and a TLS handshake to
+openrouter.ai on every turn.
+
+This module keeps one long-lived ChatOpenAI per purpose, all sharing a single
+pooled httpx.AsyncClient:
+- get_llm_client(purpose): client tuned for that purpose (temperature, timeout)
+- get_backup_llm_client(purpose): same purpose on LLM_HEDGE_MODEL (see
+  shared/llm_hedging.py)
+- LLM_REPLAY_MODE: record or replay LLM calls for offline benchmarks (see
+  shared/llm_replay.py)
+- close_llm_clients(): close the shared pool on shutdown
+- get_llm_stats(): pool utilization + per-purpose latency histograms and
+  provider prompt-cache hit rate (cached_tokens / prompt_tokens)
+"""
+
+import logging
+import time
+from enum import StrEnum
+from typing import Any
+from uuid import UUID
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_openai import ChatOpenAI
+
+from shared.config import get_settings
+from shared.http_pool import pool_connection_stats
+from shared.llm_replay import RecordingChatModel, ReplayChatModel, get_cassette
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Upper bounds (ms) of the latency histogram buckets; slower calls go to "+Inf"
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 20000, 30000)
+
+
+class LLMPurpose(StrEnum):
+    """What an LLM client is used for (one long-lived client each)."""
+
+    INTENT = "intent"  # NLU: intent + entities (extract_intent)
+    RESPONSE = "response"  # Conversational replies (IntentRouter handlers)
+    FORMATTER = "formatter"  # Creative template rewording (ResponseFormatter)
+    SUMMARY = "summary"  # Conversation summarization
+
+
+# ChatOpenAI parameters per purpose (model/key/headers are common)
+_PURPOSE_CONFIG: dict[LLMPurpose, dict[str, Any]] = {
+    LLMPurpose.INTENT: {
+        "temperature": 0.1,  # Low temperature for deterministic classification
+        "request_timeout": 15.0,
+        "max_retries": 2,
+    },
+    LLMPurpose.RESPONSE: {
+        "temperature": 0.3,  # Creative but controlled
+        "request_timeout": 30.0,
+        "max_retries": 2,
+    },
+    LLMPurpose.FORMATTER: {
+        "temperature": 0.3,
+        "request_timeout": 30.0,
+        "max_retries": 2,
+    },
+    LLMPurpose.SUMMARY: {
+        "temperature": 0.3,
+        "max_tokens": 300,  # 2-3 sentences ~100-200 tokens
+        "request_timeout": 20.0,
+        "max_retries": 2,
+    },
+}
+
+# Shared per-process state (see get_llm_client)
+_http_client: httpx.AsyncClient | None = None
+_clients: dict[LLMPurpose, ChatOpenAI] = {}
+_backup_clients: dict[LLMPurpose, ChatOpenAI] = {}
+_latency_stats: dict[str, dict[str, Any]] = {}
+
+
+class _LatencyRecorder(BaseCallbackHandler):
+    """Callback handler recording latency and prompt token usage of one client."""
+
+    run_inline = True  # Plain bookkeeping, no need for an executor thread
+
+    def __init__(self, purpose: LLMPurpose, stats_key: str | None = None):
+        self.purpose = purpose
+        self.stats_key = stats_key or purpose.value
+        self._started: dict[UUID, float] = {}
+
+    def on_chat_model_start(
+        self, serialized: dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._started[run_id] = time.monotonic()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, cached_tokens = _prompt_token_usage(response)
+        self._finish(run_id, failed=False, prompt_tokens=prompt_tokens, cached_tokens=cached_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, failed=True)
+
+    def _finish(
+        self, run_id: UUID, failed: bool, prompt_tokens: int = 0, cached_tokens: int = 0
+    ) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            _record_latency(
+                self.stats_key,
+                (time.monotonic() - started) * 1000,
+                failed,
+                prompt_tokens=prompt_tokens,
+                cached_tokens=cached_tokens,
+            )
+
+
+def _prompt_token_usage(response: Any) -> tuple[int, int]:
+    """
+    Extract (prompt_tokens, cached_tokens) from an LLMResult.
+
+    langchain-openai maps the provider's usage.prompt_tokens_details.cached_tokens
+    to usage_metadata.input_token_details.cache_read; the raw token_usage of
+    llm_output is used when a generation carries no usage_metadata.
+    """
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if isinstance(usage, dict):
+                details = usage.get("input_token_details") or {}
+                return usage.get("input_tokens") or 0, details.get("cache_read") or 0
+
+    llm_output = getattr(response, "llm_output", None)
+    if not isinstance(llm_output, dict):
+        return 0, 0
+    token_usage = llm_output.get("token_usage") or {}
+    details = token_usage.get("prompt_tokens_details") or {}
+    return token_usage.get("prompt_tokens") or 0, details.get("cached_tokens") or 0
+
+
+def _record_latency(
+    stats_key: str,
+    latency_ms: float,
+    failed: bool = False,
+    prompt_tokens: int = 0,
+    cached_tokens: int = 0,
+) -> None:
+    """Add one call to the latency histogram and prompt-cache counters of a client."""
+    stats = _latency_stats.get(stats_key)
+    if stats is None:
+        stats = _latency_stats[stats_key] = {
+            "calls": 0,
+            "errors": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "buckets": {**{str(b): 0 for b in LATENCY_BUCKETS_MS}, "+Inf": 0},
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "cache_hit_calls": 0,
+            "cache_hit_total_ms": 0.0,
+        }
+
+    stats["calls"] += 1
+    stats["errors"] += int(failed)
+    stats["total_ms"] += latency_ms
+    stats["max_ms"] = max(stats["max_ms"], latency_ms)
+
+    bucket = next((str(b) for b in LATENCY_BUCKETS_MS if latency_ms <= b), "+Inf")
+    stats["buckets"][bucket] += 1
+
+    stats["prompt_tokens"] += prompt_tokens
+    stats["cached_tokens"] += cached_tokens
+    if cached_tokens:
+        stats["cache_hit_calls"] += 1
+        stats["cache_hit_total_ms"] += latency_ms
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client used by every LLM client in this process.
+
+    Connection limits and keep-alive come from LLM_HTTP_* settings. Per-request
+    timeouts are still set by each ChatOpenAI (see _PURPOSE_CONFIG).
+
+    Returns:
+        httpx.AsyncClient shared by all registry clients
+
+    Note:
+        Created lazily on first use and recreated after close_llm_clients().
+    """
+    global _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        return _http_client
+
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+    _http_client = httpx.AsyncClient(limits=limits, timeout=60.0)
+
+    # Clients bound to a closed pool must not be reused
+    _clients.clear()
+    _backup_clients.clear()
+
+    logger.info(
+        f"LLM HTTP client initialized: max_connections={limits.max_connections}, "
+        f"max_keepalive={limits.max_keepalive_connections}, "
+        f"keepalive_expiry={limits.keepalive_expiry}s"
+    )
+    return _http_client
+
+
+def get_llm_client(purpose: LLMPurpose) -> ChatOpenAI:
+    """
+    Get the long-lived LLM client for a purpose.
+
+    Args:
+        purpose: What the client is used for (intent, response, formatter, summary)
+
+    Returns:
+        ChatOpenAI configured for OpenRouter over the shared connection pool
+        (wrapped for recording, or an offline ReplayChatModel, per LLM_REPLAY_MODE)
+    """
+    http_client = get_llm_http_client()
+
+    client = _clients.get(purpose)
+    if client is not None:
+        return client
+
+    settings = get_settings()
+    if settings.LLM_REPLAY_MODE == "replay":
+        client = ReplayChatModel(
+            get_cassette(settings.LLM_CASSETTE_PATH),
+            purpose.value,
+            latency_ms=settings.LLM_REPLAY_LATENCY_MS,
+            jitter_ms=settings.LLM_REPLAY_JITTER_MS,
+        )
+    else:
+        client = _build_client(purpose, settings.LLM_MODEL, http_client, purpose.value)
+        if settings.LLM_REPLAY_MODE == "record":
+            client = RecordingChatModel(
+                client, get_cassette(settings.LLM_CASSETTE_PATH), purpose.value
+            )
+    _clients[purpose] = client
+
+    logger.info(
+        f"LLM client created | purpose={purpose.value} | model={settings.LLM_MODEL} | "
+        f"replay_mode={settings.LLM_REPLAY_MODE}"
+    )
+    return client
+
+
+def get_backup_llm_client(purpose: LLMPurpose) -> ChatOpenAI | None:
+    """
+    Get the long-lived backup client for a purpose (LLM_HEDGE_MODEL).
+
+    Same purpose configuration and connection pool as get_llm_client(); its
+    latency is recorded under "<purpose>:backup".
+
+    Args:
+        purpose: What the client is used for
+
+    Returns:
+        ChatOpenAI for the backup model, or None if LLM_HEDGE_MODEL is not set
+        or LLM calls are recorded/replayed (only the primary model is on tape)
+    """
+    settings = get_settings()
+    if not settings.LLM_HEDGE_MODEL or settings.LLM_REPLAY_MODE != "off":
+        return None
+
+    http_client = get_llm_http_client()
+
+    client = _backup_clients.get(purpose)
+    if client is not None:
+        return client
+
+    client = _build_client(
+        purpose, settings.LLM_HEDGE_MODEL, http_client, f"{purpose.value}:backup"
+    )
+    _backup_clients[purpose] = client
+
+    logger.info(
+        f"Backup LLM client created | purpose={purpose.value} | "
+        f"model={settings.LLM_HEDGE_MODEL}"
+    )
+    return client
+
+
+def _build_client(
+    purpose: LLMPurpose, model: str, http_client: httpx.AsyncClient, stats_key: str
+) -> ChatOpenAI:
+    """Create a ChatOpenAI for OpenRouter with the configuration of a purpose."""
+    settings = get_settings()
+    return ChatOpenAI(
+        model=model,
+        api_key=settings.OPENROUTER_API_KEY,
+        base_url=OPENROUTER_BASE_URL,
+        default_headers={
+            "HTTP-Referer": settings.SITE_URL,
+            "X-Title": settings.SITE_NAME,
+        },
+        http_async_client=http_client,
+        callbacks=[_LatencyRecorder(purpose, stats_key)],
+        **_PURPOSE_CONFIG[purpose],
+    )
+
+
+async def close_llm_clients() -> None:
+    """
+    Drop all registry clients and close the shared connection pool.
+
+    Note:
+        Should be called during application shutdown. Safe to call if no
+        client was ever created.
+    """
+    global _http_client
+
+    stats = get_llm_stats()
+    _clients.clear()
+    _backup_clients.clear()
+    client, _http_client = _http_client, None
+    if client is None:
+        return
+    try:
+        await client.aclose()
+        logger.info(f"LLM HTTP client closed | stats={stats}")
+    except Exception as e:
+        logger.warning(f"Error closing LLM HTTP client: {e}")
+
+
+def get_llm_stats() -> dict[str, Any]:
+    """
+    Return pool utilization and per-purpose latency histograms.
+
+    If ``pool.active`` regularly reaches ``pool.max_connections``, LLM calls are
+    queueing for a connection (raise LLM_HTTP_MAX_CONNECTIONS).
+
+    ``latency.<purpose>.cache_hit_rate`` is the share of prompt tokens served
+    from the provider's prompt cache; ``avg_ms_cache_hit`` vs
+    ``avg_ms_cache_miss`` shows what a cached prefix saves in latency.
+
+    Returns:
+        Dict with "pool" (limits, connection counts) and "latency" (per purpose:
+        calls, errors, avg/max ms, per-bucket counts, prompt/cached tokens and
+        cache hit rate)
+    """
+    settings = get_settings()
+    pool_stats: dict[str, Any] = {
+        "initialized": _http_client is not None and not _http_client.is_closed,
+        "max_connections": settings.LLM_HTTP_MAX_CONNECTIONS,
+        "max_keepalive": settings.LLM_HTTP_MAX_KEEPALIVE,
+        **pool_connection_stats(_http_client),
+        "clients": sorted(p.value for p in _clients),
+        "backup_clients": sorted(p.value for p in _backup_clients),
+    }
+
+    latency = {
+        purpose: {**stats, **_derived_latency_stats(stats), "buckets": dict(stats["buckets"])}
+        for purpose, stats in _latency_stats.items()
+    }
+
+    return {"pool": pool_stats, "latency": latency}
+
+
+def _derived_latency_stats(stats: dict[str, Any]) -> dict[str, float]:
+    """Averages and prompt-cache hit rate of one purpose's counters."""
+    miss_calls = stats["calls"] - stats["cache_hit_calls"]
+    miss_total_ms = stats["total_ms"] - stats["cache_hit_total_ms"]
+    return {
+        "avg_ms": stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0,
+        "cache_hit_rate": (
+            stats["cached_tokens"] / stats["prompt_tokens"] if stats["prompt_tokens"] else 0.0
+        ),
+        "avg_ms_cache_hit": (
+            stats["cache_hit_total_ms"] / stats["cache_hit_calls"]
+            if stats["cache_hit_calls"] else 0.0
+        ),
+        "avg_ms_cache_miss": miss_total_ms / miss_calls if miss_calls else 0.0,
+    }
+
+
+def reset_llm_stats() -> None:
+    """Reset latency histograms and prompt-cache counters (tests)."""
+    _latency_stats.clear()
@@ -0,0 +1,289 @@
+"""
+Latency-hedged LLM calls.
+
+OpenRouter tail latency regularly reaches the request timeouts (15 s intent,
+30 s response), and openrouter_breaker only reacts to repeated failures, not
+to slow answers. A hedged client races a backup model against slow calls:
+1. The primary model is called as usual
+2. If it has not answered after the purpose's hedge delay (p95 of its recent
+   latencies, clamped to per-purpose bounds), the same request is sent to
+   LLM_HEDGE_MODEL
+3. Whichever answers first wins; the other request is cancelled
+
+Extra spend is bounded per purpose by a token bucket: every call earns
+``budget_ratio`` of a hedge, so at most that share of calls is hedged over
+time (plus a small burst). get_hedge_stats() reports hedges, winners,
+budget-limited calls and the tokens the backup model consumed.
+
+Hedging is disabled (get_hedged_llm_client returns the plain registry
+client) when LLM_HEDGE_MODEL is empty or for purposes without a policy.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from shared.llm_clients import LLMPurpose, get_backup_llm_client, get_llm_client
+
+logger = logging.getLogger(__name__)
+
+# Primary latencies kept per purpose for the p95 estimate
+LATENCY_WINDOW = 200
+# Below this many samples the default delay is used
+MIN_LATENCY_SAMPLES = 20
+# Hedges a purpose can save up for bursts (token bucket capacity)
+MAX_HEDGE_BURST = 3.0
+
+# Hedging policy per purpose. Summaries run off-turn (nobody waits on them),
+# so they are not hedged.
+_HEDGE_CONFIG: dict[LLMPurpose, dict[str, float]] = {
+    LLMPurpose.INTENT: {
+        "min_delay_seconds": 1.5,
+        "max_delay_seconds": 8.0,
+        "default_delay_seconds": 4.0,
+        "budget_ratio": 0.10,
+    },
+    LLMPurpose.RESPONSE: {
+        "min_delay_seconds": 3.0,
+        "max_delay_seconds": 15.0,
+        "default_delay_seconds": 8.0,
+        "budget_ratio": 0.10,
+    },
+    LLMPurpose.FORMATTER: {
+        "min_delay_seconds": 3.0,
+        "max_delay_seconds": 15.0,
+        "default_delay_seconds": 8.0,
+        "budget_ratio": 0.05,
+    },
+}
+
+
+class _HedgePolicy:
+    """Hedge delay, budget and counters of one purpose."""
+
+    def __init__(
+        self,
+        min_delay_seconds: float,
+        max_delay_seconds: float,
+        default_delay_seconds: float,
+        budget_ratio: float,
+    ):
+        self.min_delay_seconds = min_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.default_delay_seconds = default_delay_seconds
+        self.budget_ratio = budget_ratio
+
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._budget = MAX_HEDGE_BURST
+        self.stats = {
+            "calls": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "backup_wins": 0,
+            "budget_exhausted": 0,
+            "backup_input_tokens": 0,
+            "backup_output_tokens": 0,
+        }
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary before hedging (recent p95, clamped)."""
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            delay = self.default_delay_seconds
+        else:
+            ordered = sorted(self._latencies)
+            delay = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return min(self.max_delay_seconds, max(self.min_delay_seconds, delay))
+
+    def record_primary(self, seconds: float) -> None:
+        """Add a primary latency sample."""
+        self._latencies.append(seconds)
+
+    def earn(self) -> None:
+        """Credit the budget for one call."""
+        self.stats["calls"] += 1
+        self._budget = min(MAX_HEDGE_BURST, self._budget + self.budget_ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget if available."""
+        if self._budget < 1.0:
+            self.stats["budget_exhausted"] += 1
+            return False
+        self._budget -= 1.0
+        self.stats["hedged"] += 1
+        return True
+
+    def snapshot(self) -> dict[str, Any]:
+        """Counters plus current delay, budget and hedge rate."""
+        calls = self.stats["calls"]
+        return {
+            **self.stats,
+            "hedge_rate": self.stats["hedged"] / calls if calls else 0.0,
+            "delay_ms": round(self.hedge_delay() * 1000),
+            "budget": round(self._budget, 2),
+            "latency_samples": len(self._latencies),
+        }
+
+
+_policies: dict[LLMPurpose, _HedgePolicy] = {}
+
+
+def _get_policy(purpose: LLMPurpose) -> _HedgePolicy:
+    policy = _policies.get(purpose)
+    if policy is None:
+        policy = _policies[purpose] = _HedgePolicy(**_HEDGE_CONFIG[purpose])
+    return policy
+
+
+class HedgedLLM:
+    """
+    Chat model proxy racing a backup model against slow primary calls.
+
+    Supports the parts of the ChatOpenAI interface the handlers use
+    (ainvoke, bind_tools); other attributes are read from the primary.
+
+    Example:
+        >>> llm = get_hedged_llm_client(LLMPurpose.RESPONSE)
+        >>> response = await llm.bind_tools(SAFE_TOOLS).ainvoke(messages)
+    """
+
+    def __init__(self, purpose: LLMPurpose, primary: Any, backup: Any):
+        """
+        Initialize the HedgedLLM.
+
+        Args:
+            purpose: Purpose whose hedging policy applies
+            primary: Primary chat model (or runnable with bound tools)
+            backup: Backup chat model, configured like the primary
+        """
+        self.purpose = purpose
+        self.primary = primary
+        self.backup = backup
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "HedgedLLM":
+        """Bind the same tools to both models."""
+        return HedgedLLM(
+            self.purpose,
+            self.primary.bind_tools(tools, **kwargs),
+            self.backup.bind_tools(tools, **kwargs),
+        )
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        """Invoke the primary, hedging with the backup if it is slow."""
+        return await _hedged_call(
+            _get_policy(self.purpose),
+            lambda model: model.ainvoke(input, config, **kwargs),
+            self.primary,
+            self.backup,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.primary, name)
+
+
+async def _hedged_call(
+    policy: _HedgePolicy,
+    call: Callable[[Any], Coroutine],
+    primary: Any,
+    backup: Any,
+) -> Any:
+    """
+    Run call(primary), racing call(backup) once the hedge delay has passed.
+
+    Raises:
+        Exception: Error of the primary if it failed before the hedge delay,
+                   or if both requests failed
+    """
+    policy.earn()
+    started = time.monotonic()
+    primary_task = asyncio.ensure_future(call(primary))
+    backup_task: asyncio.Future | None = None
+
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=policy.hedge_delay())
+        if done or not policy.try_spend():
+            result = await primary_task
+            policy.record_primary(time.monotonic() - started)
+            return result
+
+        backup_task = asyncio.ensure_future(call(backup))
+        pending = {primary_task, backup_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (primary_task, backup_task):
+                if task in done and task.exception() is None:
+                    return _won(policy, task is backup_task, task.result(), started)
+
+        # Both failed: surface the primary's error, as without hedging
+        raise primary_task.exception()
+
+    finally:
+        for task in (primary_task, backup_task):
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # Mark as retrieved (avoids asyncio warnings)
+
+
+def _won(policy: _HedgePolicy, backup_won: bool, result: Any, started: float) -> Any:
+    """Account for the winner of a hedged race and return its result."""
+    elapsed = time.monotonic() - started
+    if backup_won:
+        policy.stats["backup_wins"] += 1
+        # The primary took at least this long (lower bound for the p95)
+        policy.record_primary(elapsed)
+        usage = getattr(result, "usage_metadata", None)
+        if isinstance(usage, dict):
+            policy.stats["backup_input_tokens"] += usage.get("input_tokens") or 0
+            policy.stats["backup_output_tokens"] += usage.get("output_tokens") or 0
+    else:
+        policy.stats["primary_wins"] += 1
+        policy.record_primary(elapsed)
+
+    logger.info(
+        f"Hedged LLM call | winner={'backup' if backup_won else 'primary'} | "
+        f"latency_ms={elapsed * 1000:.0f}"
+    )
+    return result
+
+
+def get_hedged_llm_client(purpose: LLMPurpose) -> Any:
+    """
+    Get the client for a purpose, hedged with LLM_HEDGE_MODEL if configured.
+
+    Args:
+        purpose: What the client is used for
+
+    Returns:
+        HedgedLLM, or the plain registry ChatOpenAI if hedging is disabled
+        for this purpose
+    """
+    primary = get_llm_client(purpose)
+    if purpose not in _HEDGE_CONFIG:
+        return primary
+
+    backup = get_backup_llm_client(purpose)
+    if backup is None:
+        return primary
+    return HedgedLLM(purpose, primary, backup)
+
+
+def get_hedge_stats() -> dict[str, dict[str, Any]]:
+    """
+    Return hedging counters per purpose.
+
+    ``hedged`` is the number of extra (backup) requests sent; each one's loser
+    was cancelled, but providers may still bill its prompt tokens.
+    ``backup_input_tokens`` / ``backup_output_tokens`` count the tokens of
+    backup answers that were used.
+    """
+    return {purpose.value: policy.snapshot() for purpose, policy in _policies.items()}
+
+
+def reset_hedge_stats() -> None:
+    """Drop latency samples, budgets and counters (tests)."""
+    _policies.clear()
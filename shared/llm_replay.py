@@ -0,0 +1,323 @@
+"""
+Record/replay stand-in for the LLM clients (offline benchmarking).
+
+The conversation graph cannot run end to end without OpenRouter. With
+LLM_REPLAY_MODE the registry (shared/llm_clients.py) swaps its clients:
+- "record": every call goes to OpenRouter as usual and the request/response
+  pair is appended to the cassette (LLM_CASSETTE_PATH, JSON lines)
+- "replay": no network; responses are served from the cassette after a
+  synthetic latency (LLM_REPLAY_LATENCY_MS ± LLM_REPLAY_JITTER_MS)
+
+Requests are keyed by a normalized prompt hash: purpose, bound tool names and
+the messages with whitespace collapsed and dates masked (the current
+date/time line, ISO timestamps, Spanish long-form dates such as "miércoles 12
+de marzo" and weekday names). Masking only hides how a date is written: what
+the prompt says about it (which slots are free, which holidays fall in the
+next 30 days) still depends on the day. scripts/benchmark_graph.py therefore
+pins the clock to the same instant when recording and replaying.
+
+Masking weekday names means two prompts that differ only in a weekday share a
+key; scripted benchmark conversations never rely on that difference.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import AIMessage
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# "Fecha y hora actual: lunes 5 de enero de 2026, 10:30" (prompt turn context)
+_CURRENT_DATETIME = re.compile(r"(Fecha y hora actual\W*)[^\n]*", re.IGNORECASE)
+# 2026-01-05, 2026-01-05T10:30:00+01:00
+_ISO_DATETIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+)
+# "12 de marzo", "12 de marzo de 2026" (slot lists, confirmations, holidays)
+_SPANISH_DATE = re.compile(
+    r"\b\d{1,2} de (?:enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|"
+    r"setiembre|octubre|noviembre|diciembre)(?: de \d{4})?\b",
+    re.IGNORECASE,
+)
+# "miércoles", "Sábado" (alone or in front of a long-form date)
+_SPANISH_WEEKDAY = re.compile(
+    r"\b(?:lunes|martes|mi[ée]rcoles|jueves|viernes|s[áa]bado|domingo)\b", re.IGNORECASE
+)
+
+
+_stats = {"recorded": 0, "hits": 0, "misses": 0}
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when the cassette has no response for a request."""
+
+
+def normalize_text(text: str) -> str:
+    """Mask dates (current date/time, ISO, Spanish long form) and collapse whitespace."""
+    text = _CURRENT_DATETIME.sub(r"\1<now>", text)
+    text = _ISO_DATETIME.sub("<datetime>", text)
+    text = _SPANISH_DATE.sub("<date>", text)
+    text = _SPANISH_WEEKDAY.sub("<weekday>", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _normalize_message(message: Any) -> dict[str, Any]:
+    """Role, content and tool calls of a LangChain message, dict or string."""
+    if isinstance(message, str):
+        return {"role": "human", "content": normalize_text(message)}
+    if isinstance(message, dict):
+        role, content, tool_calls = message.get("role"), message.get("content"), None
+    else:
+        role = getattr(message, "type", type(message).__name__)
+        content = getattr(message, "content", "")
+        tool_calls = getattr(message, "tool_calls", None)
+
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    normalized: dict[str, Any] = {"role": role, "content": normalize_text(content)}
+    if tool_calls:
+        # Tool call ids are random per run; name + args identify the call
+        normalized["tool_calls"] = [
+            {"name": call.get("name"), "args": call.get("args")} for call in tool_calls
+        ]
+    return normalized
+
+
+def prompt_key(purpose: str, messages: Any, tool_names: tuple[str, ...] = ()) -> str:
+    """
+    Normalized hash identifying an LLM request.
+
+    Args:
+        purpose: LLM purpose (intent, response, formatter, summary)
+        messages: ainvoke input (message list or string)
+        tool_names: Names of the tools bound to the model
+
+    Returns:
+        SHA-256 hex digest
+    """
+    if not isinstance(messages, (list, tuple)):
+        messages = [messages]
+    payload = {
+        "purpose": purpose,
+        "tools": sorted(tool_names),
+        "messages": [_normalize_message(message) for message in messages],
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _tool_names(tools: Any) -> tuple[str, ...]:
+    """Names of tools passed to bind_tools (BaseTool, function or dict schema)."""
+    names = []
+    for tool in tools:
+        if isinstance(tool, dict):
+            names.append(tool.get("name") or (tool.get("function") or {}).get("name", ""))
+        else:
+            names.append(getattr(tool, "name", None) or getattr(tool, "__name__", str(tool)))
+    return tuple(names)
+
+
+def _serialize_response(response: Any) -> dict[str, Any]:
+    return {
+        "content": getattr(response, "content", ""),
+        "tool_calls": [
+            {"name": call.get("name"), "args": call.get("args"), "id": call.get("id")}
+            for call in getattr(response, "tool_calls", None) or []
+        ],
+        "usage_metadata": getattr(response, "usage_metadata", None),
+    }
+
+
+def _deserialize_response(data: dict[str, Any]) -> AIMessage:
+    return AIMessage(
+        content=data.get("content", ""),
+        tool_calls=data.get("tool_calls") or [],
+        usage_metadata=data.get("usage_metadata"),
+    )
+
+
+class LLMCassette:
+    """
+    Request/response pairs stored as JSON lines, keyed by prompt_key().
+
+    Recording appends one line per call (the last recording of a key wins on
+    load), so an interrupted recording keeps everything recorded so far.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Initialize the cassette.
+
+        Args:
+            path: JSON lines file (created on first record)
+        """
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+        logger.info(f"LLM cassette loaded | path={self.path} | entries={len(self._entries)}")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the recorded response of a request key, or None."""
+        self._load()
+        entry = self._entries.get(key)
+        return entry["response"] if entry else None
+
+    def record(self, key: str, purpose: str, messages: Any, response: Any) -> None:
+        """Store the response of a request (in memory and appended to the file)."""
+        self._load()
+        if not isinstance(messages, (list, tuple)):
+            messages = [messages]
+        entry = {
+            "key": key,
+            "purpose": purpose,
+            # For humans inspecting the cassette; replay only uses the key
+            "request": [_normalize_message(message) for message in messages],
+            "response": _serialize_response(response),
+        }
+        self._entries[key] = entry
+        _stats["recorded"] += 1
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._entries)
+
+
+class RecordingChatModel:
+    """Chat model proxy recording every response of the wrapped model."""
+
+    def __init__(
+        self,
+        inner: Any,
+        cassette: LLMCassette,
+        purpose: str,
+        tool_names: tuple[str, ...] = (),
+    ):
+        self.inner = inner
+        self.cassette = cassette
+        self.purpose = purpose
+        self.tool_names = tool_names
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "RecordingChatModel":
+        return RecordingChatModel(
+            self.inner.bind_tools(tools, **kwargs),
+            self.cassette,
+            self.purpose,
+            _tool_names(tools),
+        )
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        response = await self.inner.ainvoke(input, config, **kwargs)
+        key = prompt_key(self.purpose, input, self.tool_names)
+        self.cassette.record(key, self.purpose, input, response)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+
+class ReplayChatModel:
+    """
+    Offline chat model serving recorded responses (ChatOpenAI interface subset).
+
+    Supports ainvoke and bind_tools, the parts of ChatOpenAI the graph uses.
+    """
+
+    def __init__(
+        self,
+        cassette: LLMCassette,
+        purpose: str,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+        tool_names: tuple[str, ...] = (),
+        rng: random.Random | None = None,
+    ):
+        """
+        Initialize the ReplayChatModel.
+
+        Args:
+            cassette: Recorded responses
+            purpose: LLM purpose (part of the request key)
+            latency_ms: Synthetic latency per call
+            jitter_ms: Uniform jitter (±) added to the latency
+            seed: Jitter random seed (identical runs get identical latencies)
+        """
+        self.cassette = cassette
+        self.purpose = purpose
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tool_names = tool_names
+        self._rng = rng or random.Random(f"{seed}:{purpose}")
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ReplayChatModel":
+        return ReplayChatModel(
+            self.cassette,
+            self.purpose,
+            self.latency_ms,
+            self.jitter_ms,
+            tool_names=_tool_names(tools),
+            rng=self._rng,
+        )
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> AIMessage:
+        key = prompt_key(self.purpose, input, self.tool_names)
+        response = self.cassette.get(key)
+        if response is None:
+            _stats["misses"] += 1
+            raise ReplayMissError(
+                f"No recorded {self.purpose} response for request {key[:12]} "
+                f"(re-record with LLM_REPLAY_MODE=record)"
+            )
+
+        delay_ms = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        _stats["hits"] += 1
+        return _deserialize_response(response)
+
+
+_cassettes: dict[Path, LLMCassette] = {}
+
+
+def get_cassette(path: Path | str) -> LLMCassette:
+    """Get the process-wide cassette of a file (shared by all purposes)."""
+    resolved = Path(path).resolve()
+    cassette = _cassettes.get(resolved)
+    if cassette is None:
+        cassette = _cassettes[resolved] = LLMCassette(resolved)
+    return cassette
+
+
+def get_replay_stats() -> dict[str, int]:
+    """Return record/replay counters (recorded, hits, misses)."""
+    return dict(_stats)
+
+
+def reset_replay_stats() -> None:
+    """Reset counters and forget loaded cassettes (tests, benchmark runs)."""
+    _cassettes.clear()
+    for key in _stats:
+        _stats[key] = 0
@@ -25,6 +25,7 @@ from shared.config import get_settings
 # Redis Streams constants
 INCOMING_STREAM = "incoming_messages_stream"
 OUTGOING_STREAM = "outgoing_messages_stream"
+AUDIO_STREAM = "audio_transcription_stream"  # Voice notes waiting for transcription
 CONSUMER_GROUP = "agent_workers"
 DEAD_LETTER_STREAM = "dead_letter_stream"
 STREAM_MAX_LEN = 10000  # Approximate trim to keep stream bounded
@@ -289,6 +290,40 @@ async def read_from_stream(
     Raises:
         HTTPException: 503 if Redis connection fails
     """
+    messages = await read_from_streams([stream], group, consumer, count, block_ms)
+    return [(msg_id, data) for _, msg_id, data in messages]
+
+
+async def read_from_streams(
+    streams: list[str],
+    group: str,
+    consumer: str,
+    count: int = 1,
+    block_ms: int = 5000,
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """
+    Read messages from several Redis Streams in a single XREADGROUP call.
+
+    Used by partitioned consumers that own more than one partition stream.
+    All streams must share the same consumer group name.
+
+    Args:
+        streams: Names of the Redis Streams to read from
+        group: Name of the consumer group
+        consumer: Unique consumer identifier (e.g., "agent-{pid}")
+        count: Maximum number of messages to read per stream
+        block_ms: Milliseconds to block waiting for messages (0 = no block)
+
+    Returns:
+        List of tuples: [(stream_name, message_id, message_data), ...]
+        Empty list if no messages available
+
+    Raises:
+        HTTPException: 503 if Redis connection fails
+    """
+    if not streams:
+        return []
+
     client = get_redis_client()
 
     try:
@@ -296,42 +331,30 @@ async def read_from_stream(
         messages = await client.xreadgroup(
             groupname=group,
             consumername=consumer,
-            streams={stream: ">"},
+            streams=dict.fromkeys(streams, ">"),
             count=count,
             block=block_ms,
         )
 
-        result: list[tuple[str, dict[str, Any]]] = []
+        result: list[tuple[str, str, dict[str, Any]]] = []
 
         if messages:
             for stream_name, stream_messages in messages:
+                if isinstance(stream_name, bytes):
+                    stream_name = stream_name.decode("utf-8")
                 for msg_id, msg_data in stream_messages:
-                    # Handle both bytes and string responses
-                    data_key = b"data" if b"data" in msg_data else "data"
-                    raw_data = msg_data.get(data_key, "{}")
-
-                    # Decode if bytes
-                    if isinstance(raw_data, bytes):
-                        raw_data = raw_data.decode("utf-8")
-
-                    try:
-                        parsed_data = json.loads(raw_data)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid JSON in message {msg_id}: {raw_data[:100]}")
-                        parsed_data = {"_raw": raw_data, "_parse_error": True}
-
-                    result.append((msg_id, parsed_data))
+                    result.append((stream_name, msg_id, _parse_stream_entry(msg_id, msg_data)))
 
         if result:
             logger.debug(
-                f"Read {len(result)} messages from stream '{stream}' "
+                f"Read {len(result)} messages from streams {streams} "
                 f"(consumer={consumer})"
             )
 
         return result
 
     except RedisConnectionError as e:
-        logger.error(f"Redis connection error reading from stream '{stream}': {e}")
+        logger.error(f"Redis connection error reading from streams {streams}: {e}")
         raise HTTPException(
             status_code=503,
             detail="Service temporarily unavailable (Redis connection failed)",
@@ -340,19 +363,39 @@ async def read_from_stream(
     except RedisResponseError as e:
         # Handle case where group doesn't exist yet - auto-create it
         if "NOGROUP" in str(e):
-            logger.warning(f"Consumer group '{group}' doesn't exist for stream '{stream}', creating it...")
-            await create_consumer_group(stream, group)
+            logger.warning(
+                f"Consumer group '{group}' missing for streams {streams}, creating it..."
+            )
+            for stream in streams:
+                await create_consumer_group(stream, group)
             return []  # Return empty, next iteration will work
         raise
 
     except Exception as e:
-        logger.error(f"Unexpected error reading from stream '{stream}': {e}")
+        logger.error(f"Unexpected error reading from streams {streams}: {e}")
         raise HTTPException(
             status_code=503,
             detail="Service temporarily unavailable",
         ) from e
 
 
+def _parse_stream_entry(msg_id: str, msg_data: dict) -> dict[str, Any]:
+    """Decode the JSON "data" field of a stream entry written by add_to_stream()."""
+    # Handle both bytes and string responses
+    data_key = b"data" if b"data" in msg_data else "data"
+    raw_data = msg_data.get(data_key, "{}")
+
+    # Decode if bytes
+    if isinstance(raw_data, bytes):
+        raw_data = raw_data.decode("utf-8")
+
+    try:
+        return json.loads(raw_data)
+    except json.JSONDecodeError:
+        logger.warning(f"Invalid JSON in message {msg_id}: {raw_data[:100]}")
+        return {"_raw": raw_data, "_parse_error": True}
+
+
 async def acknowledge_message(
     stream: str,
     group: str,
@@ -521,3 +564,158 @@ async def get_pending_messages(
     except Exception as e:
         logger.error(f"Error getting pending messages: {e}")
         return []
+
+
+async def get_pending_summary(stream: str, group: str) -> dict[str, Any]:
+    """
+    Summarize a consumer group's pending entries list (XPENDING summary form).
+
+    Args:
+        stream: Name of the Redis Stream
+        group: Name of the consumer group
+
+    Returns:
+        Dict with pending (entry count), oldest_age_ms (age of the oldest
+        pending entry, from its ID timestamp) and consumers ({name: count})
+    """
+    client = get_redis_client()
+
+    try:
+        summary = await client.xpending(stream, group)
+    except RedisResponseError as e:
+        if "NOGROUP" not in str(e):
+            logger.error(f"Error getting pending summary for '{stream}': {e}")
+        return {"pending": 0, "oldest_age_ms": 0, "consumers": {}}
+    except Exception as e:
+        logger.error(f"Error getting pending summary for '{stream}': {e}")
+        return {"pending": 0, "oldest_age_ms": 0, "consumers": {}}
+
+    oldest_age_ms = 0
+    oldest_id = summary.get("min")
+    if summary.get("pending") and oldest_id:
+        oldest_ms = int(str(oldest_id).split("-")[0])
+        oldest_age_ms = max(0, int(datetime.now(UTC).timestamp() * 1000) - oldest_ms)
+
+    return {
+        "pending": summary.get("pending", 0),
+        "oldest_age_ms": oldest_age_ms,
+        "consumers": {
+            c.get("name"): c.get("pending", 0) for c in summary.get("consumers") or []
+        },
+    }
+
+
+async def claim_stale_messages(
+    stream: str,
+    group: str,
+    consumer: str,
+    min_idle_ms: int,
+    count: int = 50,
+) -> list[tuple[str, dict[str, Any], int]]:
+    """
+    Claim entries that have been pending longer than min_idle_ms (XAUTOCLAIM).
+
+    Entries delivered to a consumer that crashed before acknowledging them stay
+    in the group's pending entries list (PEL) forever. Claiming transfers them
+    to `consumer` so they can be processed again.
+
+    Args:
+        stream: Name of the Redis Stream
+        group: Name of the consumer group
+        consumer: Consumer that takes ownership of the claimed entries
+        min_idle_ms: Only claim entries idle for at least this many milliseconds
+        count: Maximum number of entries to claim
+
+    Returns:
+        List of tuples: [(message_id, message_data, delivery_count), ...]
+        delivery_count includes the delivery made by this claim.
+    """
+    client = get_redis_client()
+
+    try:
+        result = await client.xautoclaim(
+            stream,
+            group,
+            consumer,
+            min_idle_time=min_idle_ms,
+            start_id="0-0",
+            count=count,
+        )
+        claimed = result[1] if result else []
+
+        entries: list[tuple[str, dict[str, Any] | None]] = []
+        for msg_id, msg_data in claimed:
+            if msg_data is None:
+                # Entry was trimmed from the stream (Redis < 7) - nothing to redeliver
+                await client.xack(stream, group, msg_id)
+                continue
+            entries.append((msg_id, msg_data))
+
+        if not entries:
+            return []
+
+        # Delivery counters live in the PEL, not in XAUTOCLAIM's reply. Look up
+        # each claimed ID: an ID range could also hold this consumer's other
+        # pending entries and crowd claimed ones out of the reply.
+        pipe = client.pipeline(transaction=False)
+        for msg_id, _ in entries:
+            pipe.xpending_range(stream, group, min=msg_id, max=msg_id, count=1)
+        deliveries = {
+            p.get("message_id"): p.get("times_delivered", 1)
+            for pending in await pipe.execute()
+            for p in pending
+        }
+
+        logger.info(
+            f"Claimed {len(entries)} stale messages from stream '{stream}' "
+            f"(consumer={consumer}, min_idle_ms={min_idle_ms})"
+        )
+
+        return [
+            (msg_id, _parse_stream_entry(msg_id, msg_data), deliveries.get(msg_id, 1))
+            for msg_id, msg_data in entries
+        ]
+
+    except RedisResponseError as e:
+        if "NOGROUP" in str(e):
+            return []
+        logger.error(f"Error claiming stale messages from '{stream}': {e}")
+        return []
+
+    except Exception as e:
+        logger.error(f"Error claiming stale messages from '{stream}': {e}")
+        return []
+
+
+async def retain_pending_message(
+    stream: str,
+    group: str,
+    consumer: str,
+    message_id: str,
+) -> None:
+    """
+    Reset the idle time of an entry this consumer is still working on.
+
+    XCLAIM ... JUSTID to the current owner: the delivery counter is not
+    incremented, but the entry stops looking abandoned, so other consumers'
+    claim_stale_messages() leave it alone while it is retried locally.
+
+    Args:
+        stream: Name of the Redis Stream
+        group: Name of the consumer group
+        consumer: Consumer that owns the entry
+        message_id: ID of the pending entry
+    """
+    client = get_redis_client()
+
+    try:
+        await client.xclaim(
+            stream,
+            group,
+            consumer,
+            min_idle_time=0,
+            message_ids=[message_id],
+            justid=True,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to retain pending message {message_id} in '{stream}': {e}")
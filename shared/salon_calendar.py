@@ -0,0 +1,228 @@
+"""
+Process-wide cache of the salon calendar: holidays, business hours, closed days.
+
+is_holiday(), is_day_closed(), get_business_hours_for_day() and friends used
+to open a session and query PostgreSQL on every call, several times per slot
+check. They now read an immutable SalonCalendar snapshot:
+- holidays of [today, today + HORIZON_DAYS)
+- the business_hours row of every weekday
+
+Every question is a dict lookup. The snapshot is rebuilt after TTL_SECONDS or
+when invalidate_salon_calendar() is called: by the admin API after editing
+holidays or business hours, and by the agent's availability index when
+PostgreSQL notifies a change (agent/services/availability_index.py). A
+rebuild swaps the module-level reference, so readers always see either the
+old or the new snapshot, never a mix.
+
+Every reader of holidays or business hours goes through the snapshot (slot
+search, booking validation, the info tool, the prompt's business context and
+the admin calendar view), so an admin edit reaches all of them at once.
+
+Usage:
+    calendar = await get_salon_calendar()
+    if calendar.covers(day):
+        name = calendar.holiday_name(day)
+    hours = calendar.hours_for_weekday(day.weekday())
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import Any
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.connection import get_async_session
+from database.models import BusinessHours, Holiday
+
+logger = logging.getLogger(__name__)
+
+MADRID_TZ = ZoneInfo("Europe/Madrid")
+
+# Days ahead (from today) whose holidays are cached; covers the agent's
+# availability index horizon and every booking search window
+HORIZON_DAYS = 60
+# Safety net for changes made outside the admin API while nothing notifies us
+TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class DayHours:
+    """business_hours row of a weekday."""
+
+    is_closed: bool
+    start_hour: int | None
+    start_minute: int
+    end_hour: int | None
+    end_minute: int
+
+
+@dataclass(frozen=True)
+class SalonCalendar:
+    """Immutable snapshot of holidays in [start_date, end_date) and weekly hours."""
+
+    start_date: date
+    end_date: date
+    holidays: Mapping[date, str]
+    days: Mapping[int, DayHours]
+    holiday_ids: Mapping[date, UUID] = field(default_factory=lambda: MappingProxyType({}))
+    loaded_at: float = field(default=0.0, compare=False)
+
+    def covers(self, start: date, end: date | None = None) -> bool:
+        """True if the holidays of [start, end) (default: the date start) are known."""
+        return self.start_date <= start and (end or start + timedelta(days=1)) <= self.end_date
+
+    def holiday_name(self, day: date) -> str | None:
+        """Return the holiday name of a covered date, or None."""
+        return self.holidays.get(day)
+
+    def holidays_between(self, start: date, end: date) -> list[tuple[date, str]]:
+        """Return the (date, name) holidays of a covered range [start, end), by date."""
+        return sorted((day, name) for day, name in self.holidays.items() if start <= day < end)
+
+    def is_day_closed(self, day_of_week: int) -> bool:
+        """is_day_closed() semantics: closed if marked closed or not configured."""
+        hours = self.days.get(day_of_week)
+        return hours is None or hours.is_closed
+
+    def hours_for_weekday(self, day_of_week: int) -> dict[str, int] | None:
+        """get_business_hours_for_day() format: {"start": 10, "end": 20}, None if closed."""
+        hours = self.days.get(day_of_week)
+        if hours is None or hours.is_closed or hours.start_hour is None or hours.end_hour is None:
+            return None
+        return {"start": hours.start_hour, "end": hours.end_hour}
+
+    def business_hours(self, day: date) -> dict[str, int] | None:
+        """Return the opening hours of a covered date, None on holidays and closed days."""
+        if day in self.holidays:
+            return None
+        return self.hours_for_weekday(day.weekday())
+
+    def summary(self) -> dict[int, dict | None]:
+        """get_business_hours_summary() format: {0: {"open": "10:00", "close": "20:00"} | None}."""
+        summary: dict[int, dict | None] = {}
+        for day_of_week in range(7):
+            hours = self.days.get(day_of_week)
+            if self.hours_for_weekday(day_of_week) is None:
+                summary[day_of_week] = None
+            else:
+                summary[day_of_week] = {
+                    "open": f"{hours.start_hour:02d}:{hours.start_minute:02d}",
+                    "close": f"{hours.end_hour:02d}:{hours.end_minute:02d}",
+                }
+        return summary
+
+
+async def load_salon_calendar(
+    session: AsyncSession,
+    start_date: date,
+    end_date: date,
+) -> SalonCalendar:
+    """
+    Query the holidays of [start_date, end_date) and the weekly business hours.
+
+    Database errors propagate.
+    """
+    holiday_rows = (
+        await session.execute(
+            select(Holiday.id, Holiday.date, Holiday.name).where(
+                Holiday.date >= start_date,
+                Holiday.date < end_date,
+            )
+        )
+    ).all()
+    holidays = {row.date: row.name for row in holiday_rows}
+    holiday_ids = {row.date: row.id for row in holiday_rows}
+
+    hours_rows = await session.execute(select(BusinessHours))
+    days = {
+        row.day_of_week: DayHours(
+            is_closed=row.is_closed,
+            start_hour=row.start_hour,
+            start_minute=row.start_minute or 0,
+            end_hour=row.end_hour,
+            end_minute=row.end_minute or 0,
+        )
+        for row in hours_rows.scalars()
+    }
+
+    return SalonCalendar(
+        start_date=start_date,
+        end_date=end_date,
+        holidays=MappingProxyType(holidays),
+        days=MappingProxyType(days),
+        holiday_ids=MappingProxyType(holiday_ids),
+        loaded_at=time.monotonic(),
+    )
+
+
+# ============================================================================
+# Process-wide snapshot
+# ============================================================================
+
+_snapshot: SalonCalendar | None = None
+_refresh_task: asyncio.Task | None = None
+# Bumped on invalidation: a refresh started before it is not kept
+_generation = 0
+_stats = {"hits": 0, "refreshes": 0, "invalidations": 0}
+
+
+async def _refresh(today: date) -> SalonCalendar:
+    global _snapshot
+    generation = _generation
+    async with get_async_session() as session:
+        snapshot = await load_salon_calendar(session, today, today + timedelta(days=HORIZON_DAYS))
+    _stats["refreshes"] += 1
+    if generation == _generation:
+        _snapshot = snapshot
+    logger.debug(
+        f"Salon calendar refreshed | holidays={len(snapshot.holidays)} | "
+        f"range={snapshot.start_date}..{snapshot.end_date}"
+    )
+    return snapshot
+
+
+async def get_salon_calendar() -> SalonCalendar:
+    """
+    Get the current salon calendar snapshot (refreshed if expired).
+
+    Concurrent callers share one refresh.
+
+    Raises:
+        Exception: Database errors while refreshing
+    """
+    global _refresh_task
+    today = datetime.now(MADRID_TZ).date()
+    snapshot = _snapshot
+    if (
+        snapshot is not None
+        and snapshot.start_date <= today
+        and time.monotonic() - snapshot.loaded_at < TTL_SECONDS
+    ):
+        _stats["hits"] += 1
+        return snapshot
+
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh(today))
+    return await asyncio.shield(_refresh_task)
+
+
+def invalidate_salon_calendar() -> None:
+    """Drop the snapshot after holidays or business hours changed."""
+    global _snapshot, _refresh_task, _generation
+    _generation += 1
+    _snapshot = None
+    _refresh_task = None
+    _stats["invalidations"] += 1
+
+
+def get_salon_calendar_stats() -> dict[str, Any]:
+    """Return snapshot hits, refreshes and invalidations."""
+    return dict(_stats)
@@ -0,0 +1,281 @@
+"""
+Conversation-affinity partitioning for the incoming Redis Stream.
+
+MessageBatcher keeps batches, timers and locks in process memory, so all
+messages of a conversation must be consumed by the same agent replica. With a
+single shared stream and consumer group, Redis hands entries to whichever
+consumer asks first, splitting conversations across replicas.
+
+This module splits the incoming stream into N partition streams:
+- Producers (API webhook) route each message by a stable hash of its
+  conversation_id, so a conversation always lands in the same partition.
+- Consumers (agent replicas) lease partitions through Redis. Each partition is
+  owned by at most one replica at a time; ownership is spread across live
+  replicas with rendezvous hashing and rebalanced when replicas join or leave.
+
+With INCOMING_STREAM_PARTITIONS=1 (default) the single partition is the legacy
+INCOMING_STREAM, owned by one replica at a time (others stay on standby).
+
+NOTE: Changing the partition count re-maps conversations to new streams.
+Drain the incoming streams (stop the API, wait for the agent) before changing it.
+"""
+
+import hashlib
+import logging
+import time
+import zlib
+
+from redis.asyncio import Redis
+
+from shared.config import get_settings
+from shared.redis_client import INCOMING_STREAM, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis key patterns
+PARTITION_LEASE_PREFIX = "stream_partitions:lease:"
+PARTITION_MEMBERS_KEY = "stream_partitions:members"
+
+# Lease timings: leases are renewed every LEASE_RENEW_INTERVAL_SECONDS and
+# expire after LEASE_TTL_MS if the owner stops renewing (crash, network split)
+LEASE_TTL_MS = 15000
+LEASE_RENEW_INTERVAL_SECONDS = 5
+
+# Atomically renew / release a lease only if we still own it
+_RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def get_partition_count() -> int:
+    """Return the configured number of incoming stream partitions."""
+    return get_settings().INCOMING_STREAM_PARTITIONS
+
+
+def partition_for(conversation_id: str, num_partitions: int | None = None) -> int:
+    """
+    Map a conversation to its partition using a stable hash.
+
+    Uses CRC32 rather than hash(), which is randomized per process and would
+    route the same conversation differently in the API and the agent.
+
+    Args:
+        conversation_id: Chatwoot conversation ID
+        num_partitions: Partition count (defaults to INCOMING_STREAM_PARTITIONS)
+
+    Returns:
+        Partition index in [0, num_partitions)
+    """
+    if num_partitions is None:
+        num_partitions = get_partition_count()
+    if num_partitions <= 1:
+        return 0
+    return zlib.crc32(str(conversation_id).encode("utf-8")) % num_partitions
+
+
+def partition_stream(partition: int, num_partitions: int | None = None) -> str:
+    """
+    Return the stream name of a partition.
+
+    A single partition keeps the legacy stream name so existing deployments
+    (and entries already in the stream) are unaffected.
+    """
+    if num_partitions is None:
+        num_partitions = get_partition_count()
+    if num_partitions <= 1:
+        return INCOMING_STREAM
+    return f"{INCOMING_STREAM}:{partition}"
+
+
+def get_incoming_stream(conversation_id: str) -> str:
+    """Return the incoming stream that a conversation's messages are written to."""
+    num_partitions = get_partition_count()
+    return partition_stream(partition_for(conversation_id, num_partitions), num_partitions)
+
+
+def all_incoming_streams(num_partitions: int | None = None) -> list[str]:
+    """Return the names of all incoming partition streams."""
+    if num_partitions is None:
+        num_partitions = get_partition_count()
+    return [partition_stream(p, num_partitions) for p in range(max(num_partitions, 1))]
+
+
+def _rendezvous_score(member: str, partition: int) -> int:
+    """Highest-random-weight score of a member for a partition."""
+    digest = hashlib.sha1(f"{member}:{partition}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class PartitionLeaseManager:
+    """
+    Leases incoming stream partitions to agent replicas.
+
+    Every replica calls rebalance() periodically. It heartbeats the replica into
+    the membership set, computes which partitions this replica *should* own
+    (rendezvous hashing over live members, so all replicas agree and only
+    ~1/N of partitions move on membership changes), renews owned leases and
+    tries to acquire missing ones.
+
+    Partitions that should move to another replica are reported as revoked and
+    stop being read immediately, but their leases are kept (and renewed) until
+    the caller has flushed the in-memory batches of those conversations and
+    calls release(). The new owner can only acquire the lease afterwards, so a
+    conversation is never processed by two replicas at once.
+
+    Example:
+        >>> leases = PartitionLeaseManager("agent-1", num_partitions=8)
+        >>> acquired, revoked = await leases.rebalance()
+        >>> ...flush batches of revoked partitions...
+        >>> await leases.release(revoked)
+        >>> streams = leases.owned_streams
+    """
+
+    def __init__(
+        self,
+        consumer_name: str,
+        num_partitions: int | None = None,
+        redis_client: Redis | None = None,
+        lease_ttl_ms: int = LEASE_TTL_MS,
+    ):
+        """
+        Initialize the PartitionLeaseManager.
+
+        Args:
+            consumer_name: Unique replica identifier (also the stream consumer name)
+            num_partitions: Partition count (defaults to INCOMING_STREAM_PARTITIONS)
+            redis_client: Redis client (defaults to the shared singleton)
+            lease_ttl_ms: Lease / membership expiry in milliseconds
+        """
+        self.consumer_name = consumer_name
+        self.num_partitions = max(
+            num_partitions if num_partitions is not None else get_partition_count(), 1
+        )
+        self.lease_ttl_ms = lease_ttl_ms
+        self.owned: set[int] = set()
+        self.draining: set[int] = set()
+        self._redis: Redis = redis_client or get_redis_client()
+
+    @property
+    def owned_streams(self) -> list[str]:
+        """Streams this replica should currently read from."""
+        return [partition_stream(p, self.num_partitions) for p in sorted(self.owned)]
+
+    def owns_conversation(self, conversation_id: str) -> bool:
+        """Return True if the conversation's partition is owned (not draining)."""
+        return partition_for(conversation_id, self.num_partitions) in self.owned
+
+    async def heartbeat(self) -> list[str]:
+        """
+        Register this replica as alive and return the live member list.
+
+        Returns:
+            Sorted list of live consumer names (always includes this replica)
+        """
+        now_ms = int(time.time() * 1000)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zadd(PARTITION_MEMBERS_KEY, {self.consumer_name: now_ms})
+        pipe.zremrangebyscore(PARTITION_MEMBERS_KEY, 0, now_ms - self.lease_ttl_ms)
+        pipe.zrange(PARTITION_MEMBERS_KEY, 0, -1)
+        _, _, members = await pipe.execute()
+        live = {m.decode() if isinstance(m, bytes) else m for m in members}
+        live.add(self.consumer_name)
+        return sorted(live)
+
+    def desired_partitions(self, members: list[str]) -> set[int]:
+        """Partitions assigned to this replica for the given member list."""
+        return {
+            p
+            for p in range(self.num_partitions)
+            if max(members, key=lambda m: _rendezvous_score(m, p)) == self.consumer_name
+        }
+
+    async def rebalance(self) -> tuple[set[int], set[int]]:
+        """
+        Heartbeat, renew owned leases and converge towards the desired assignment.
+
+        Returns:
+            Tuple of (acquired, revoked) partition sets. Revoked partitions are
+            no longer read; the caller must flush their batches and release().
+        """
+        members = await self.heartbeat()
+        desired = self.desired_partitions(members)
+
+        # Renew everything we hold (including draining partitions)
+        lost: set[int] = set()
+        for partition in self.owned | self.draining:
+            renewed = await self._redis.eval(
+                _RENEW_LEASE_SCRIPT,
+                1,
+                f"{PARTITION_LEASE_PREFIX}{partition}",
+                self.consumer_name,
+                self.lease_ttl_ms,
+            )
+            if not renewed:
+                lost.add(partition)
+
+        if lost:
+            logger.warning(
+                f"Partition leases lost | consumer={self.consumer_name} | "
+                f"partitions={sorted(lost)}"
+            )
+        self.draining -= lost
+
+        revoked = (self.owned - desired) | (self.owned & lost)
+        self.owned -= revoked
+        self.draining |= revoked - lost
+
+        # Try to acquire desired partitions that are free
+        acquired: set[int] = set()
+        for partition in desired - self.owned - self.draining:
+            was_set = await self._redis.set(
+                f"{PARTITION_LEASE_PREFIX}{partition}",
+                self.consumer_name,
+                nx=True,
+                px=self.lease_ttl_ms,
+            )
+            if was_set:
+                acquired.add(partition)
+        self.owned |= acquired
+
+        if acquired or revoked:
+            logger.info(
+                f"Partitions rebalanced | consumer={self.consumer_name} | "
+                f"members={len(members)} | acquired={sorted(acquired)} | "
+                f"revoked={sorted(revoked)} | owned={sorted(self.owned)}"
+            )
+
+        return acquired, revoked
+
+    async def release(self, partitions: set[int]) -> None:
+        """Release leases (only those still held by this replica)."""
+        for partition in partitions:
+            await self._redis.eval(
+                _RELEASE_LEASE_SCRIPT,
+                1,
+                f"{PARTITION_LEASE_PREFIX}{partition}",
+                self.consumer_name,
+            )
+        self.owned -= partitions
+        self.draining -= partitions
+        if partitions:
+            logger.info(
+                f"Partition leases released | consumer={self.consumer_name} | "
+                f"partitions={sorted(partitions)}"
+            )
+
+    async def release_all(self) -> None:
+        """Release every lease and leave the membership set (graceful shutdown)."""
+        await self.release(self.owned | self.draining)
+        try:
+            await self._redis.zrem(PARTITION_MEMBERS_KEY, self.consumer_name)
+        except Exception as e:
+            logger.warning(f"Failed to leave partition membership: {e}")
@@ -0,0 +1,159 @@
+"""
+Process-wide cache of compiled Jinja2 templates and prompt files.
+
+Response and prompt templates used to be rebuilt on every message:
+ResponseFormatter compiled a new jinja2.Template per response, the
+summarization node re-read its prompt from disk, and load_contextual_prompt
+re-read and re-compiled the core/step markdown files each turn.
+
+Templates and prompt files never change while the process runs, so this
+module keeps them in memory:
+- get_template(source): compiled template, keyed by the SHA-256 of its source
+- read_prompt_file(path): file contents, read once per path
+- preload_prompt_files() / precompile_templates(): warm both caches at startup
+- get_template_cache_stats(): hits and misses of both caches
+"""
+
+import hashlib
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+from jinja2 import Template
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on compiled templates kept (oldest evicted first). Templates are
+# static strings, so this is only reached if callers build templates dynamically.
+MAX_COMPILED_TEMPLATES = 512
+
+_templates: dict[str, Template] = {}
+_prompt_files: dict[Path, str] = {}
+_stats = {
+    "template_hits": 0,
+    "template_misses": 0,
+    "prompt_file_hits": 0,
+    "prompt_file_misses": 0,
+}
+
+
+def _content_key(source: str) -> str:
+    """Return the cache key of a template source (SHA-256 of its content)."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def get_template(source: str) -> Template:
+    """
+    Get the compiled Jinja2 template for a template source.
+
+    Args:
+        source: Jinja2 template string
+
+    Returns:
+        Compiled template (shared; Template.render() is safe to call concurrently)
+
+    Raises:
+        jinja2.TemplateSyntaxError: Invalid template (not cached)
+    """
+    key = _content_key(source)
+    template = _templates.get(key)
+    if template is not None:
+        _stats["template_hits"] += 1
+        return template
+
+    _stats["template_misses"] += 1
+    template = Template(source)
+
+    if len(_templates) >= MAX_COMPILED_TEMPLATES:
+        _templates.pop(next(iter(_templates)))
+    _templates[key] = template
+    return template
+
+
+def read_prompt_file(path: Path) -> str:
+    """
+    Read a prompt file, from memory after the first read.
+
+    Args:
+        path: Path of the prompt file (UTF-8)
+
+    Returns:
+        File contents
+
+    Raises:
+        OSError: File could not be read (not cached, so callers keep their
+                 existing fallbacks and a later read can succeed)
+    """
+    path = Path(path).resolve()
+    content = _prompt_files.get(path)
+    if content is not None:
+        _stats["prompt_file_hits"] += 1
+        return content
+
+    _stats["prompt_file_misses"] += 1
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    _prompt_files[path] = content
+    return content
+
+
+def preload_prompt_files(directory: Path, pattern: str = "*.md") -> int:
+    """
+    Read every prompt file of a directory and precompile it as a template.
+
+    Args:
+        directory: Directory containing the prompt files
+        pattern: Glob pattern of the files to load
+
+    Returns:
+        Number of files loaded
+    """
+    loaded = 0
+    for path in sorted(Path(directory).glob(pattern)):
+        try:
+            get_template(read_prompt_file(path))
+            loaded += 1
+        except Exception as e:
+            # Not every prompt is a valid template; it is still cached as text
+            logger.warning(f"Could not precompile prompt file {path.name}: {e}")
+
+    logger.info(f"Prompt files preloaded | directory={directory} | files={loaded}")
+    return loaded
+
+
+def precompile_templates(sources: Iterable[str]) -> int:
+    """
+    Compile template sources ahead of their first use.
+
+    Args:
+        sources: Jinja2 template strings
+
+    Returns:
+        Number of templates compiled or already cached
+
+    Raises:
+        jinja2.TemplateSyntaxError: A template is invalid (fail at startup,
+                                    not on the first message that needs it)
+    """
+    count = 0
+    for source in sources:
+        get_template(source)
+        count += 1
+    return count
+
+
+def get_template_cache_stats() -> dict[str, int]:
+    """Return cache sizes and hit/miss counters of templates and prompt files."""
+    return {
+        **_stats,
+        "templates": len(_templates),
+        "prompt_files": len(_prompt_files),
+    }
+
+
+def clear_template_cache() -> None:
+    """Drop cached templates and prompt files and reset counters (tests, reloads)."""
+    _templates.clear()
+    _prompt_files.clear()
+    for key in _stats:
+        _stats[key] = 0
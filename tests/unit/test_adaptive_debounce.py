@@ -0,0 +1,143 @@
+"""
+Tests for adaptive batching (AdaptiveDebounce + MessageBatcher adaptive mode).
+
+Coverage:
+- Message classification (terminal / short / default)
+- Deadline cap since the first message
+- Early flush of expected short answers
+- Window extension on new messages
+- Arrival-gap metrics
+"""
+
+import asyncio
+
+import pytest
+
+from agent.batching.debounce import AdaptiveDebounce, is_short_answer, looks_complete
+from agent.batching.message_batcher import MessageBatcher
+
+
+class TestMessageClassification:
+    """Tests for the text heuristics."""
+
+    @pytest.mark.parametrize("text", ["sí", "Si!", "vale 👍", "2", "La primera", "de acuerdo."])
+    def test_short_answers(self, text):
+        assert is_short_answer(text)
+
+    @pytest.mark.parametrize("text", ["¿Tenéis hueco el martes?", "Mañana a las 10.", "ok"])
+    def test_complete_messages(self, text):
+        assert looks_complete(text)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Hola, quería pedir cita para",
+            "quiero corte y",
+            "Buenas,",
+            "Te cuento...",
+            "Hola quería saber si tenéis disponibilidad esta semana para mechas y corte.",
+        ],
+    )
+    def test_incomplete_or_long_messages(self, text):
+        assert not looks_complete(text)
+
+
+class TestAdaptiveDebounce:
+    """Tests for AdaptiveDebounce decisions."""
+
+    def test_decisions(self):
+        debounce = AdaptiveDebounce(window_seconds=10, min_window_seconds=2, max_window_seconds=30)
+
+        assert debounce.decide("sí", expects_short_answer=True).delay_seconds == 0
+        assert debounce.decide("sí").delay_seconds == 2
+        assert debounce.decide("quiero pedir cita para").delay_seconds == 10
+        assert debounce.stats()["decisions_terminal"] == 1
+
+    def test_deadline_is_capped(self):
+        debounce = AdaptiveDebounce(window_seconds=10, min_window_seconds=2, max_window_seconds=30)
+        decision = debounce.decide("y también")
+
+        assert debounce.deadline(now=25.0, first_arrival=0.0, decision=decision) == 30.0
+        assert debounce.stats()["capped"] == 1
+
+
+class TestMessageBatcherAdaptive:
+    """Tests for MessageBatcher with an AdaptiveDebounce policy."""
+
+    @staticmethod
+    def _batcher(processed: list) -> MessageBatcher:
+        async def callback(conversation_id, messages):
+            processed.append((asyncio.get_running_loop().time(), messages))
+
+        batcher = MessageBatcher(
+            window_seconds=1,
+            debounce=AdaptiveDebounce(
+                window_seconds=0.3, min_window_seconds=0.1, max_window_seconds=0.6
+            ),
+        )
+        batcher.set_callback(callback)
+        return batcher
+
+    @pytest.mark.asyncio
+    async def test_expected_short_answer_flushes_immediately(self):
+        """A lone "sí" in CONFIRMATION does not wait for the window."""
+        processed: list = []
+        batcher = self._batcher(processed)
+        batcher.set_reply_expectation("conv-1", "confirmation")
+
+        start = asyncio.get_running_loop().time()
+        await batcher.add_message("conv-1", {"message_text": "sí"})
+        await asyncio.sleep(0.05)
+
+        assert len(processed) == 1
+        assert processed[0][0] - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_new_message_extends_window(self):
+        """A follow-up message moves the deadline past the first window."""
+        processed: list = []
+        batcher = self._batcher(processed)
+
+        start = asyncio.get_running_loop().time()
+        await batcher.add_message("conv-1", {"message_text": "Hola, quería cita para"})
+        await asyncio.sleep(0.2)
+        await batcher.add_message("conv-1", {"message_text": "un corte el martes por la tarde y"})
+        await asyncio.sleep(0.2)
+        assert processed == []  # 0.4s > first window (0.3s), but extended
+
+        await asyncio.sleep(0.25)
+        assert len(processed) == 1
+        assert len(processed[0][1]) == 2
+        assert processed[0][0] - start >= 0.45
+        assert batcher.debounce_stats()["gaps"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_age_is_capped(self):
+        """A customer who keeps typing is processed after max_window_seconds."""
+        processed: list = []
+        batcher = self._batcher(processed)
+
+        start = asyncio.get_running_loop().time()
+        for i in range(8):
+            await batcher.add_message("conv-1", {"message_text": f"parte {i} y"})
+            await asyncio.sleep(0.1)
+            if processed:
+                break
+
+        assert processed
+        assert processed[0][0] - start == pytest.approx(0.6, abs=0.1)
+        assert batcher.debounce_stats()["capped"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_message_after_flush_counts_as_late_fragment(self):
+        """Messages right after a processed batch are recorded for tuning."""
+        processed: list = []
+        batcher = self._batcher(processed)
+
+        await batcher.add_message("conv-1", {"message_text": "ok"})
+        await asyncio.sleep(0.15)
+        assert len(processed) == 1
+
+        await batcher.add_message("conv-1", {"message_text": "y otra cosa"})
+        assert batcher.debounce_stats()["late_fragments"] == 1
+        await batcher.flush_all()
@@ -0,0 +1,145 @@
+"""
+Tests for the in-memory audio conversion pipeline.
+
+Coverage:
+- Container detection from magic bytes
+- Formats accepted by Whisper are passed through without a copy
+- Other formats are piped through ffmpeg (stdin → stdout)
+- ffmpeg failures surface as AudioConversionError
+- Concurrent ffmpeg processes are bounded
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from shared import audio_conversion
+from shared.audio_conversion import (
+    AudioConversionError,
+    convert_audio_bytes,
+    detect_audio_format,
+    prepare_for_transcription,
+)
+
+OGG_OPUS = b"OggS\x00\x02" + b"\x00" * 64
+AMR = b"#!AMR\n" + b"\x00" * 64
+
+
+def _process(stdout: bytes = b"fLaC-converted", returncode: int = 0, stderr: bytes = b""):
+    process = MagicMock()
+    process.communicate = AsyncMock(return_value=(stdout, stderr))
+    process.returncode = returncode
+    return process
+
+
+@pytest.fixture(autouse=True)
+def reset_semaphore():
+    """Each test gets a fresh process-wide ffmpeg semaphore."""
+    audio_conversion._ffmpeg_semaphore = None
+    yield
+    audio_conversion._ffmpeg_semaphore = None
+
+
+class TestDetectAudioFormat:
+    """Tests for detect_audio_format."""
+
+    @pytest.mark.parametrize(
+        "head,expected",
+        [
+            (b"OggS\x00\x02", "ogg"),
+            (b"ID3\x04\x00", "mp3"),
+            (b"RIFF\x24\x00\x00\x00WAVE", "wav"),
+            (b"fLaC\x00\x00", "flac"),
+            (b"\x00\x00\x00\x20ftypM4A ", "m4a"),
+            (b"#!AMR\n", None),
+        ],
+    )
+    def test_magic_bytes(self, head, expected):
+        assert detect_audio_format(head) == expected
+
+
+class TestPrepareForTranscription:
+    """Tests for prepare_for_transcription."""
+
+    @pytest.mark.asyncio
+    async def test_whisper_format_is_not_converted(self):
+        """WhatsApp OGG Opus is uploaded as-is: same object, no ffmpeg."""
+        with patch("asyncio.create_subprocess_exec", new=AsyncMock()) as spawn:
+            filename, payload = await prepare_for_transcription(OGG_OPUS, "https://x/voice.oga")
+
+        assert filename == "audio.ogg"
+        assert payload is OGG_OPUS
+        spawn.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_format_is_piped_through_ffmpeg(self):
+        """Formats Whisper rejects are converted in memory to FLAC 16kHz mono."""
+        process = _process()
+        with patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=process)) as spawn:
+            filename, payload = await prepare_for_transcription(AMR, "https://x/voice.amr")
+
+        assert filename == "audio.flac"
+        assert payload == b"fLaC-converted"
+        args = spawn.call_args.args
+        assert args[0] == "ffmpeg"
+        assert args[args.index("-i") + 1] == "pipe:0"
+        assert args[-1] == "pipe:1"
+        assert args[args.index("-ar") + 1] == "16000"
+        process.communicate.assert_awaited_once_with(input=AMR)
+
+    @pytest.mark.asyncio
+    async def test_filename_hint_used_when_magic_bytes_unknown(self):
+        """A known extension in the URL avoids a needless conversion."""
+        audio = b"\x00" * 16
+        with patch("asyncio.create_subprocess_exec", new=AsyncMock()) as spawn:
+            filename, payload = await prepare_for_transcription(audio, "https://x/a.mp3?sig=1")
+
+        assert filename == "audio.mp3"
+        assert payload is audio
+        spawn.assert_not_awaited()
+
+
+class TestConvertAudioBytes:
+    """Tests for convert_audio_bytes."""
+
+    @pytest.mark.asyncio
+    async def test_ffmpeg_error_raises(self):
+        process = _process(stdout=b"", returncode=1, stderr=b"Invalid data found")
+        with patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=process)):
+            with pytest.raises(AudioConversionError, match="Invalid data found"):
+                await convert_audio_bytes(AMR)
+
+    @pytest.mark.asyncio
+    async def test_missing_ffmpeg_raises(self):
+        with patch("asyncio.create_subprocess_exec", new=AsyncMock(side_effect=FileNotFoundError)):
+            with pytest.raises(AudioConversionError, match="not installed"):
+                await convert_audio_bytes(AMR)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_processes_are_bounded(self):
+        """No more than AUDIO_FFMPEG_MAX_PROCESSES ffmpeg processes run at once."""
+        running = 0
+        peak = 0
+
+        async def communicate(input):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return b"out", b""
+
+        def spawn(*args, **kwargs):
+            process = _process()
+            process.communicate = communicate
+            return process
+
+        settings = MagicMock(AUDIO_FFMPEG_MAX_PROCESSES=2)
+        with patch("shared.audio_conversion.get_settings", return_value=settings), patch(
+            "asyncio.create_subprocess_exec", new=AsyncMock(side_effect=spawn)
+        ):
+            results = await asyncio.gather(*(convert_audio_bytes(AMR) for _ in range(5)))
+
+        assert results == [b"out"] * 5
+        assert peak == 2
@@ -0,0 +1,150 @@
+"""
+Tests for AudioTranscriptionWorker - Voice note transcription off the webhook path.
+
+Coverage:
+- Transcripts are injected into the incoming stream and the job is acked
+- Fallback texts are injected when transcription fails
+- A failed injection leaves the job pending
+- Invalid jobs and jobs over the attempt limit go to the DLQ
+- Concurrency is bounded by the semaphore
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agent.workers.audio_transcription_worker import (
+    ERROR_MESSAGE,
+    AudioTranscriptionWorker,
+)
+from shared.redis_client import AUDIO_STREAM, CONSUMER_GROUP
+
+MODULE = "agent.workers.audio_transcription_worker"
+
+
+def _job(conversation_id: str = "10") -> dict:
+    return {
+        "conversation_id": conversation_id,
+        "customer_phone": "+34612345678",
+        "message_text": "",
+        "customer_name": "Ana",
+        "is_audio_transcription": False,
+        "audio_url": "https://chatwoot.example/audio.ogg",
+        "message_id": 99,
+    }
+
+
+async def _wait_idle(worker: AudioTranscriptionWorker) -> None:
+    await asyncio.gather(*list(worker._tasks.values()))
+
+
+@pytest.fixture
+def mock_redis():
+    """Patch the stream helpers used by the worker."""
+    with patch(f"{MODULE}.publish_incoming_message", new=AsyncMock()) as publish, patch(
+        f"{MODULE}.acknowledge_message", new=AsyncMock()
+    ) as ack, patch(f"{MODULE}.move_to_dead_letter", new=AsyncMock()) as dlq:
+        yield publish, ack, dlq
+
+
+class TestAudioTranscriptionWorker:
+    """Tests for AudioTranscriptionWorker."""
+
+    @pytest.mark.asyncio
+    async def test_injects_transcript_and_acks(self, mock_redis):
+        """The transcript replaces the message text and the job is acked afterwards."""
+        publish, ack, _ = mock_redis
+        worker = AudioTranscriptionWorker("audio-1")
+
+        with patch(
+            f"{MODULE}.transcribe_voice_note",
+            new=AsyncMock(return_value=("Quiero cita mañana", True)),
+        ):
+            worker.dispatch("1-0", _job())
+            await _wait_idle(worker)
+
+        message = publish.call_args.args[0]
+        assert message["message_text"] == "Quiero cita mañana"
+        assert message["is_audio_transcription"] is True
+        assert message["conversation_id"] == "10"
+        assert "message_id" not in message
+        ack.assert_awaited_once_with(AUDIO_STREAM, CONSUMER_GROUP, "1-0")
+        assert worker.stats()["transcribed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_text_is_injected(self, mock_redis):
+        """A failed transcription still reaches the agent as a fallback text."""
+        publish, ack, _ = mock_redis
+        worker = AudioTranscriptionWorker("audio-1")
+
+        with patch(
+            f"{MODULE}.transcribe_voice_note", new=AsyncMock(return_value=(ERROR_MESSAGE, False))
+        ):
+            worker.dispatch("1-0", _job())
+            await _wait_idle(worker)
+
+        assert publish.call_args.args[0]["message_text"] == ERROR_MESSAGE
+        assert publish.call_args.args[0]["is_audio_transcription"] is False
+        ack.assert_awaited_once()
+        assert worker.stats()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_injection_is_not_acked(self, mock_redis):
+        """A job whose transcript could not be injected stays pending."""
+        publish, ack, _ = mock_redis
+        publish.side_effect = ConnectionError("redis down")
+        worker = AudioTranscriptionWorker("audio-1")
+
+        with patch(
+            f"{MODULE}.transcribe_voice_note", new=AsyncMock(return_value=("Hola", True))
+        ):
+            worker.dispatch("1-0", _job())
+            await _wait_idle(worker)
+
+        ack.assert_not_awaited()
+        assert worker.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_and_exhausted_jobs_are_dead_lettered(self, mock_redis):
+        """Jobs without an audio URL or over the attempt limit go to the DLQ."""
+        publish, _, dlq = mock_redis
+        worker = AudioTranscriptionWorker("audio-1", max_deliveries=3)
+        claimed = [
+            ("1-0", {**_job(), "audio_url": None}, 1),
+            ("2-0", _job(), 4),
+        ]
+
+        with patch(
+            f"{MODULE}.claim_stale_messages", new=AsyncMock(return_value=claimed)
+        ), patch(f"{MODULE}.transcribe_voice_note", new=AsyncMock()) as transcribe:
+            assert await worker.reclaim() == 1
+            await _wait_idle(worker)
+
+        transcribe.assert_not_awaited()
+        publish.assert_not_awaited()
+        assert sorted(c.args[2] for c in dlq.call_args_list) == ["1-0", "2-0"]
+        assert worker.stats()["dead_lettered"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, mock_redis):
+        """No more than max_concurrency voice notes are transcribed at once."""
+        worker = AudioTranscriptionWorker("audio-1", max_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def slow_transcription(audio_url, conversation_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return "Hola", True
+
+        with patch(f"{MODULE}.transcribe_voice_note", new=slow_transcription):
+            for i in range(5):
+                worker.dispatch(f"{i}-0", _job(str(i)))
+            await _wait_idle(worker)
+
+        assert peak == 2
+        assert worker.stats()["transcribed"] == 5
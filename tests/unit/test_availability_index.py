@@ -0,0 +1,299 @@
+"""
+Tests for the in-memory availability index.
+
+Coverage:
+- Interval lookups (bisect with long periods)
+- Bypass when not listening, outside the horizon or the salon calendar
+- Multi-stylist range lookups
+- Lazy loading shared by lookups, holidays and closed days
+- Invalidation from NOTIFY payloads (stylist, salon calendar, reset)
+- Results of loads overtaken by a change are not cached
+"""
+
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from agent.services import availability_index
+from agent.services.availability_index import MADRID_TZ, AvailabilityIndex, _StylistIntervals
+from shared.salon_calendar import DayHours, SalonCalendar
+
+TODAY = datetime.now(MADRID_TZ).date()
+# A day within the horizon that is not today (no day rollover surprises)
+DAY = TODAY + timedelta(days=2)
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=MADRID_TZ)
+
+
+def _period(start: datetime, minutes: int) -> dict:
+    return {"start": start, "end": start + timedelta(minutes=minutes), "type": "appointment"}
+
+
+def _calendar(
+    holidays: dict | None = None,
+    closed_weekdays: tuple = (),
+    days: int = 60,
+) -> SalonCalendar:
+    return SalonCalendar(
+        start_date=TODAY,
+        end_date=TODAY + timedelta(days=days),
+        holidays=holidays or {},
+        days={dow: DayHours(dow in closed_weekdays, 10, 0, 20, 0) for dow in range(7)},
+    )
+
+
+def _intervals(periods: list[dict]) -> _StylistIntervals:
+    return _StylistIntervals(day=TODAY, loaded_at=time.monotonic(), periods=periods)
+
+
+def _notify(index: AvailabilityIndex, payload: dict | str) -> None:
+    if isinstance(payload, dict):
+        payload = json.dumps(payload)
+    index._on_notification(None, 1, "availability_changes", payload)
+
+
+@pytest.fixture
+def salon_calendar():
+    """Cached salon calendar replaced by a fixed snapshot (no database)."""
+    with patch.object(
+        availability_index, "get_salon_calendar", new=AsyncMock(return_value=_calendar())
+    ) as get, patch.object(availability_index, "invalidate_salon_calendar") as invalidate:
+        yield SimpleNamespace(get=get, invalidate=invalidate)
+
+
+@pytest.fixture
+def index(salon_calendar):
+    """Listening index whose loaders are mocks (no database)."""
+    index = AvailabilityIndex("postgresql://test")
+    index._listening = True
+    index._load_stylist = AsyncMock(side_effect=lambda stylist_id, today: _intervals([]))
+    return index
+
+
+class TestStylistIntervals:
+    """Tests for _StylistIntervals.overlapping."""
+
+    def test_returns_overlapping_periods_in_order(self):
+        periods = [
+            _period(_at(DAY, 9), 60),
+            _period(_at(DAY, 11), 30),
+            _period(_at(DAY, 12), 60),
+            _period(_at(DAY, 20), 60),
+        ]
+        intervals = _intervals(periods)
+
+        result = intervals.overlapping(_at(DAY, 10), _at(DAY, 20))
+
+        assert result == periods[1:3]
+
+    def test_long_period_starting_earlier_is_found(self):
+        vacation = _period(_at(DAY - timedelta(days=1), 9), 3 * 24 * 60)
+        short = _period(_at(DAY, 8), 30)
+        intervals = _intervals([vacation, short])
+
+        assert intervals.overlapping(_at(DAY, 10), _at(DAY, 20)) == [vacation]
+
+    def test_touching_periods_do_not_overlap(self):
+        intervals = _intervals([_period(_at(DAY, 9), 60), _period(_at(DAY, 20), 60)])
+
+        assert intervals.overlapping(_at(DAY, 10), _at(DAY, 20)) == []
+
+
+class TestGetDay:
+    """Tests for AvailabilityIndex.get_day."""
+
+    @pytest.mark.asyncio
+    async def test_not_listening_bypasses(self, index):
+        index._listening = False
+
+        assert await index.get_day(uuid4(), DAY) is None
+        index._load_stylist.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_outside_horizon_bypasses(self, index):
+        assert await index.get_day(uuid4(), TODAY - timedelta(days=1)) is None
+        assert await index.get_day(uuid4(), TODAY + timedelta(days=index.horizon_days)) is None
+        assert index.stats()["bypassed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_busy_periods_of_the_day(self, index):
+        stylist_id = uuid4()
+        morning = _period(_at(DAY, 10), 60)
+        tomorrow = _period(_at(DAY + timedelta(days=1), 10), 60)
+        index._load_stylist.side_effect = lambda sid, today: _intervals([morning, tomorrow])
+
+        day = await index.get_day(stylist_id, DAY)
+
+        assert day.holiday_name is None
+        assert day.business_hours == {"start": 10, "end": 20}
+        assert day.busy_periods == [morning]
+
+    @pytest.mark.asyncio
+    async def test_loaded_once_for_concurrent_lookups(self, index):
+        stylist_id = uuid4()
+
+        async def slow_load(sid, today):
+            await asyncio.sleep(0.01)
+            return _intervals([])
+
+        index._load_stylist.side_effect = slow_load
+
+        await asyncio.gather(*(index.get_day(stylist_id, DAY) for _ in range(5)))
+        await index.get_day(stylist_id, DAY + timedelta(days=1))
+
+        assert index._load_stylist.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_holiday_and_closed_day_skip_stylist_load(self, index, salon_calendar):
+        closed_weekday = (DAY + timedelta(days=1)).weekday()
+        salon_calendar.get.return_value = _calendar({DAY: "Fiesta local"}, (closed_weekday,))
+
+        holiday = await index.get_day(uuid4(), DAY)
+        closed = await index.get_day(uuid4(), DAY + timedelta(days=1))
+
+        assert holiday.holiday_name == "Fiesta local"
+        assert closed.business_hours is None
+        index._load_stylist.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_date_beyond_salon_calendar_bypasses(self, index, salon_calendar):
+        salon_calendar.get.return_value = _calendar(days=2)
+
+        assert await index.get_day(uuid4(), DAY) is None
+        index._load_stylist.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_calendar_error_falls_back_to_database(self, index, salon_calendar):
+        salon_calendar.get.side_effect = RuntimeError("connection refused")
+
+        assert await index.get_day(uuid4(), DAY) is None
+        assert index.stats()["load_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_load_error_falls_back_to_database(self, index):
+        index._load_stylist.side_effect = RuntimeError("connection refused")
+
+        assert await index.get_day(uuid4(), DAY) is None
+        assert index.stats()["load_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self, index):
+        stylist_id = uuid4()
+        await index.get_day(stylist_id, DAY)
+
+        index.max_age_seconds = 0
+        await index.get_day(stylist_id, DAY)
+
+        assert index._load_stylist.await_count == 2
+
+
+class TestGetRange:
+    """Tests for AvailabilityIndex.get_range."""
+
+    @pytest.mark.asyncio
+    async def test_busy_periods_of_several_stylists(self, index):
+        first, second = uuid4(), uuid4()
+        inside = _period(_at(DAY, 10), 60)
+        after = _period(_at(DAY + timedelta(days=5), 10), 60)
+        index._load_stylist.side_effect = lambda sid, today: _intervals(
+            [inside, after] if sid == first else []
+        )
+
+        calendar, busy = await index.get_range([first, second], DAY, DAY + timedelta(days=3))
+
+        assert calendar.business_hours(DAY) == {"start": 10, "end": 20}
+        assert busy == {first: [inside], second: []}
+
+    @pytest.mark.asyncio
+    async def test_range_beyond_horizon_bypasses(self, index, salon_calendar):
+        end = TODAY + timedelta(days=index.horizon_days + 1)
+
+        assert await index.get_range([uuid4()], DAY, end) is None
+        salon_calendar.get.assert_not_awaited()
+
+
+class TestInvalidation:
+    """Tests for NOTIFY-driven invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_stylist_notification_reloads_only_that_stylist(self, index, salon_calendar):
+        changed, other = uuid4(), uuid4()
+        await index.get_day(changed, DAY)
+        await index.get_day(other, DAY)
+
+        _notify(index, {"table": "appointments", "stylist_ids": [str(changed)]})
+        await index.get_day(changed, DAY)
+        await index.get_day(other, DAY)
+
+        loaded = [call.args[0] for call in index._load_stylist.await_args_list]
+        assert loaded == [changed, other, changed]
+        salon_calendar.invalidate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_calendar_notification_invalidates_salon_calendar(self, index, salon_calendar):
+        stylist_id = uuid4()
+        await index.get_day(stylist_id, DAY)
+
+        _notify(index, {"table": "holidays"})
+        await index.get_day(stylist_id, DAY)
+
+        salon_calendar.invalidate.assert_called_once_with()
+        assert index._load_stylist.await_count == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("payload", ["not json", {"table": "appointments"}])
+    async def test_unknown_change_resets_everything(self, index, salon_calendar, payload):
+        stylist_id = uuid4()
+        await index.get_day(stylist_id, DAY)
+
+        _notify(index, payload)
+        await index.get_day(stylist_id, DAY)
+
+        salon_calendar.invalidate.assert_called_once_with()
+        assert index._load_stylist.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_change_during_load_is_not_cached(self, index):
+        stylist_id = uuid4()
+
+        async def load_overtaken_by_booking(sid, today):
+            _notify(index, {"table": "appointments", "stylist_ids": [str(sid)]})
+            return _intervals([])
+
+        index._load_stylist.side_effect = load_overtaken_by_booking
+        await index.get_day(stylist_id, DAY)
+
+        index._load_stylist.side_effect = lambda sid, today: _intervals([])
+        await index.get_day(stylist_id, DAY)
+
+        assert index._load_stylist.await_count == 2
+        assert index.stats()["stale_loads"] == 1
+
+
+class TestGetAvailableSlotsIntegration:
+    """get_available_slots() uses the index when it can answer."""
+
+    @pytest.mark.asyncio
+    async def test_slots_from_index_without_database(self, index):
+        from agent.services import availability_service
+
+        stylist_id = uuid4()
+        index._load_stylist.side_effect = lambda sid, today: _intervals(
+            [_period(_at(DAY, 10), 600 - 60)]
+        )
+
+        with patch(
+            "agent.services.availability_index.get_availability_index", return_value=index
+        ), patch.object(availability_service, "get_busy_periods", new=AsyncMock()) as db:
+            slots = await availability_service.get_available_slots(stylist_id, DAY, 60)
+
+        assert [slot["time"] for slot in slots] == ["19:00"]
+        db.assert_not_awaited()
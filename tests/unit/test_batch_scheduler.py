@@ -0,0 +1,160 @@
+"""
+Tests for BatchScheduler - Bounded-concurrency batch execution.
+
+Coverage:
+- Global concurrency limit (max_workers)
+- Strict per-conversation ordering
+- Parallelism across conversations
+- Backpressure via wait_for_capacity()
+- Error propagation to submit_and_wait()
+- Queue metrics
+"""
+
+import asyncio
+
+import pytest
+
+from agent.batching.batch_scheduler import BatchScheduler
+
+
+class TestBatchScheduler:
+    """Tests for BatchScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_to_max_workers(self):
+        """No more than max_workers batches run at the same time."""
+        running = 0
+        peak = 0
+
+        async def handler(conversation_id, messages):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        scheduler = BatchScheduler(handler, max_workers=2, max_queued=100)
+        await scheduler.start()
+        try:
+            await asyncio.gather(*[
+                scheduler.submit_and_wait(f"conv-{i}", [{"message_text": "hola"}])
+                for i in range(8)
+            ])
+        finally:
+            await scheduler.stop()
+
+        assert peak == 2
+        assert scheduler.stats()["processed"] == 8
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_within_conversation(self):
+        """Batches of one conversation never overlap and keep submission order."""
+        order: list[str] = []
+        active: set[str] = set()
+
+        async def handler(conversation_id, messages):
+            assert conversation_id not in active
+            active.add(conversation_id)
+            await asyncio.sleep(0.005)
+            order.append(messages[0]["message_text"])
+            active.discard(conversation_id)
+
+        scheduler = BatchScheduler(handler, max_workers=4, max_queued=100)
+        await scheduler.start()
+        try:
+            futures = [
+                scheduler.submit("conv-1", [{"message_text": str(i)}]) for i in range(5)
+            ]
+            await asyncio.gather(*futures)
+        finally:
+            await scheduler.stop()
+
+        assert order == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_runs_different_conversations_in_parallel(self):
+        """Different conversations are processed concurrently."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+        seen: list[str] = []
+
+        async def handler(conversation_id, messages):
+            seen.append(conversation_id)
+            if conversation_id == "conv-slow":
+                started.set()
+                await release.wait()
+
+        scheduler = BatchScheduler(handler, max_workers=2, max_queued=100)
+        await scheduler.start()
+        try:
+            slow = scheduler.submit("conv-slow", [{}])
+            await started.wait()
+            await asyncio.wait_for(scheduler.submit_and_wait("conv-fast", [{}]), timeout=1)
+            assert not slow.done()
+            release.set()
+            await slow
+        finally:
+            await scheduler.stop()
+
+        assert seen == ["conv-slow", "conv-fast"]
+
+    @pytest.mark.asyncio
+    async def test_wait_for_capacity_blocks_when_queue_full(self):
+        """wait_for_capacity() blocks at max_queued and resumes once drained."""
+        release = asyncio.Event()
+
+        async def handler(conversation_id, messages):
+            await release.wait()
+
+        scheduler = BatchScheduler(handler, max_workers=1, max_queued=2)
+        await scheduler.start()
+        try:
+            futures = [scheduler.submit(f"conv-{i}", [{}]) for i in range(3)]
+            await asyncio.sleep(0)  # Let the worker pick the first batch
+
+            assert scheduler.in_flight == 1
+            assert scheduler.queue_depth == 2
+
+            waiter = asyncio.create_task(scheduler.wait_for_capacity())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+
+            release.set()
+            await asyncio.wait_for(waiter, timeout=1)
+            await asyncio.gather(*futures)
+        finally:
+            await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_handler_error_propagates_and_is_counted(self):
+        """Handler exceptions reach the caller and do not stop the worker."""
+
+        async def handler(conversation_id, messages):
+            if conversation_id == "conv-bad":
+                raise RuntimeError("graph failed")
+
+        scheduler = BatchScheduler(handler, max_workers=1, max_queued=10)
+        await scheduler.start()
+        try:
+            with pytest.raises(RuntimeError, match="graph failed"):
+                await scheduler.submit_and_wait("conv-bad", [{}])
+            await scheduler.submit_and_wait("conv-good", [{}])
+        finally:
+            await scheduler.stop()
+
+        stats = scheduler.stats()
+        assert stats["failed"] == 1
+        assert stats["processed"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["conversations"] == 0
+
+    def test_rejects_invalid_limits(self):
+        """max_workers and max_queued must be positive."""
+
+        async def handler(conversation_id, messages):
+            return None
+
+        with pytest.raises(ValueError):
+            BatchScheduler(handler, max_workers=0)
+        with pytest.raises(ValueError):
+            BatchScheduler(handler, max_queued=0)
@@ -8,6 +8,7 @@ Tests cover:
 - Data accumulation in collected_data
 - Redis persistence (persist/load)
 - Logging behavior
+- BOOKED action (book runs without a timeout)
 """
 
 import json
@@ -1674,3 +1675,23 @@ class TestSlotSelectionSubPhases:
 
         # Verify flag was set
         assert fsm.collected_data.get("date_preference_requested") is True
+
+
+class TestBookedAction:
+    """Tests for the action prescribed in BOOKED state."""
+
+    def test_book_has_no_timeout(self):
+        """Verify the FSM never puts a timeout on book (DB transaction + calendar sync)."""
+        fsm = BookingFSM("conv-123")
+        fsm._state = BookingState.BOOKED
+        fsm._collected_data = {
+            "services": ["Corte"],
+            "stylist_id": "stylist-uuid",
+            "slot": {"start_time": "2026-03-03T10:00:00+01:00"},
+            "first_name": "Ana",
+        }
+
+        action = fsm.get_required_action()
+
+        assert [tc.name for tc in action.tool_calls] == ["book"]
+        assert action.tool_calls[0].timeout_seconds is None
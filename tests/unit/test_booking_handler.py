@@ -8,6 +8,7 @@ formats responses using Jinja2 templates with optional LLM enhancement.
 Coverage:
 - Tool execution (_execute_tools method)
 - Required vs optional tool handling
+- Concurrent waves, skipped dependents and per-tool timeouts
 - Template rendering with Jinja2
 - LLM creative enhancement
 - Fallback response generation
@@ -131,6 +132,96 @@ class TestBookingHandlerToolExecution:
         assert "error" in results["nonexistent_tool"]
 
 
+    @pytest.mark.asyncio
+    async def test_independent_tools_run_concurrently(self, booking_handler):
+        """Verify tools without dependencies run in the same wave."""
+        import asyncio
+
+        tool_calls = [
+            ToolCall(name="search_services", args={}, required=True),
+            ToolCall(name="list_stylists", args={}, required=True),
+        ]
+        both_started = asyncio.Event()
+        running = 0
+
+        async def slow_tool(args):
+            nonlocal running
+            running += 1
+            if running == 2:
+                both_started.set()
+            # Deadlocks (and times out) if the tools ran one after another
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            return {"ok": True}
+
+        with patch("agent.tools.search_services") as mock_search, \
+             patch("agent.tools.list_stylists") as mock_stylists:
+            mock_search.ainvoke = AsyncMock(side_effect=slow_tool)
+            mock_stylists.ainvoke = AsyncMock(side_effect=slow_tool)
+
+            results = await booking_handler._execute_tools(tool_calls)
+
+        assert results["search_services"] == {"ok": True}
+        assert results["list_stylists"] == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_skips_dependents_of_failed_tool(self, booking_handler):
+        """Verify a tool whose dependency failed is not invoked."""
+        tool_calls = [
+            ToolCall(name="check_availability", args={}, required=False),
+            ToolCall(
+                name="book", args={}, required=False, depends_on=("check_availability",)
+            ),
+        ]
+
+        with patch("agent.tools.check_availability") as mock_check, \
+             patch("agent.tools.book") as mock_book:
+            mock_check.ainvoke = AsyncMock(side_effect=Exception("Calendar down"))
+            mock_book.ainvoke = AsyncMock(return_value={"success": True})
+
+            results = await booking_handler._execute_tools(tool_calls)
+
+        mock_book.ainvoke.assert_not_called()
+        assert "dependencies failed" in results["book"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_tool_timeout(self, booking_handler):
+        """Verify a tool exceeding its timeout fails like any other error."""
+        import asyncio
+
+        tool_calls = [
+            ToolCall(name="find_next_available", args={}, required=True, timeout_seconds=0.01)
+        ]
+
+        async def hang(args):
+            await asyncio.sleep(1)
+
+        with patch("agent.tools.find_next_available") as mock_find:
+            mock_find.ainvoke = AsyncMock(side_effect=hang)
+
+            with pytest.raises(TimeoutError, match="timed out"):
+                await booking_handler._execute_tools(tool_calls)
+
+    @pytest.mark.asyncio
+    async def test_tool_without_timeout_is_not_cancelled(self, booking_handler):
+        """Verify a tool with timeout_seconds=None (book) runs to completion."""
+        import asyncio
+
+        tool_calls = [ToolCall(name="book", args={}, required=True, timeout_seconds=None)]
+
+        async def slow_book(args):
+            await asyncio.sleep(0.05)
+            return {"success": True, "appointment_id": "apt-1"}
+
+        with patch("agent.tools.book") as mock_book, \
+                patch("agent.routing.booking_handler.asyncio.wait_for") as mock_wait_for:
+            mock_book.ainvoke = AsyncMock(side_effect=slow_book)
+
+            results = await booking_handler._execute_tools(tool_calls)
+
+        mock_wait_for.assert_not_called()
+        assert results["book"]["appointment_id"] == "apt-1"
+
+
 class TestResponseFormatterTemplateRendering:
     """Test ResponseFormatter template rendering."""
 
@@ -0,0 +1,202 @@
+"""
+Tests for ChatwootContactCache - phone -> contact/conversation ID cache.
+
+Coverage:
+- Redis layer shared between cache instances, in-process layer hits
+- Negative entries and their replacement
+- Conversation invalidation
+- Redis errors degrade to cache misses
+- ChatwootClient.send_message reads through the cache and replaces a
+  rejected cached conversation
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+import shared.chatwoot_client as chatwoot_module
+from shared.chatwoot_client import ChatwootClient, close_chatwoot_http_client
+from shared.chatwoot_contact_cache import ChatwootContactCache
+
+PHONE = "+34612345678"
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the hash commands used by the cache."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self._redis, n)(*a, **kw) for n, a, kw in self._calls]
+
+
+def _cache(redis=None, ttl=3600, negative_ttl=60) -> ChatwootContactCache:
+    return ChatwootContactCache(
+        redis_client=redis or FakeRedis(), ttl_seconds=ttl, negative_ttl_seconds=negative_ttl
+    )
+
+
+class TestChatwootContactCache:
+    """Tests for ChatwootContactCache."""
+
+    @pytest.mark.asyncio
+    async def test_remember_is_shared_through_redis(self):
+        """Entries written by one process are read by another."""
+        redis = FakeRedis()
+        writer = _cache(redis)
+        await writer.remember(PHONE, contact_id=42, conversation_id=7)
+
+        reader = _cache(redis)
+        entry = await reader.get(PHONE)
+
+        assert entry.contact_id == 42
+        assert entry.conversation_id == 7
+        assert not entry.unresolvable
+        assert reader.stats()["redis_hits"] == 1
+        assert redis.ttls[f"chatwoot:contact:{PHONE}"] == 3600
+
+        await reader.get(PHONE)
+        assert reader.stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_negative_entry_is_replaced_by_remember(self):
+        """Unresolvable phones are cached with the negative TTL until resolved."""
+        redis = FakeRedis()
+        cache = _cache(redis)
+
+        await cache.mark_unresolvable(PHONE)
+        assert (await _cache(redis).get(PHONE)).unresolvable
+        assert redis.ttls[f"chatwoot:contact:{PHONE}"] == 60
+
+        await cache.remember(PHONE, contact_id=42)
+        entry = await _cache(redis).get(PHONE)
+        assert not entry.unresolvable
+        assert entry.contact_id == 42
+
+    @pytest.mark.asyncio
+    async def test_forget_conversation_keeps_contact(self):
+        """Invalidating a conversation keeps the contact ID."""
+        redis = FakeRedis()
+        cache = _cache(redis)
+        await cache.remember(PHONE, contact_id=42, conversation_id=7)
+
+        await cache.forget_conversation(PHONE)
+
+        for reader in (cache, _cache(redis)):
+            entry = await reader.get(PHONE)
+            assert entry.contact_id == 42
+            assert entry.conversation_id is None
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_misses(self):
+        """A Redis outage never breaks sending."""
+        redis = AsyncMock()
+        redis.hgetall.side_effect = ConnectionError("redis down")
+        cache = _cache(redis)
+
+        assert await cache.get(PHONE) is None
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_ttl(self):
+        """CHATWOOT_CONTACT_CACHE_TTL_SECONDS=0 disables the cache."""
+        cache = _cache(ttl=0)
+        await cache.remember(PHONE, contact_id=42, conversation_id=7)
+        assert await cache.get(PHONE) is None
+
+
+class TestSendMessageReadThrough:
+    """ChatwootClient.send_message uses the contact cache."""
+
+    @pytest.fixture
+    async def chatwoot(self):
+        """ChatwootClient with in-process Chatwoot responses and a fresh cache."""
+        calls: list[tuple[str, str]] = []
+        rejected_conversations: set[int] = set()
+        next_conversation = iter(range(100, 200))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            calls.append((request.method, path))
+            if path.endswith("/contacts/search"):
+                return httpx.Response(200, json={"payload": [{"id": 42}]})
+            if path.endswith("/contacts/42"):
+                return httpx.Response(
+                    200, json={"payload": {"contact_inboxes": [{"source_id": "src"}]}}
+                )
+            if path.endswith("/conversations"):
+                return httpx.Response(200, json={"id": next(next_conversation)})
+            if path.endswith("/messages"):
+                conversation_id = int(path.split("/")[-2])
+                if conversation_id in rejected_conversations:
+                    return httpx.Response(404, json={"error": "not found"})
+                return httpx.Response(200, json={"id": 1})
+            return httpx.Response(500)
+
+        chatwoot_module._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache = _cache()
+        with patch("shared.chatwoot_client.get_chatwoot_contact_cache", return_value=cache):
+            yield ChatwootClient(), calls, rejected_conversations, cache
+        await close_chatwoot_http_client()
+
+    @pytest.mark.asyncio
+    async def test_second_message_skips_lookups(self, chatwoot):
+        """Only the first message to a phone resolves contact and conversation."""
+        client, calls, _, _ = chatwoot
+
+        assert await client.send_message(PHONE, "Recordatorio 1")
+        assert len(calls) == 4  # search, contact, create conversation, message
+
+        calls.clear()
+        assert await client.send_message(PHONE, "Recordatorio 2")
+        assert len(calls) == 1
+        assert calls[0][1].endswith("/conversations/100/messages")
+
+    @pytest.mark.asyncio
+    async def test_rejected_cached_conversation_is_replaced(self, chatwoot):
+        """A 404 on a cached conversation invalidates it and uses a new one."""
+        client, calls, rejected, cache = chatwoot
+        await cache.remember(PHONE, contact_id=42, conversation_id=55)
+        rejected.add(55)
+
+        assert await client.send_message(PHONE, "Hola")
+
+        assert calls[-1][1].endswith("/conversations/100/messages")
+        entry = await cache.get(PHONE)
+        assert entry.conversation_id == 100
+        assert entry.contact_id == 42
+        # Contact came from the cache: no contact search
+        assert not any(path.endswith("/contacts/search") for _, path in calls)
@@ -0,0 +1,123 @@
+"""
+Tests for the shared Chatwoot HTTP client (connection pooling).
+
+Coverage:
+- One client per process, recreated after close
+- Pool limits and HTTP/2 settings (with fallback when 'h2' is missing)
+- ChatwootClient methods reuse the shared client instead of closing it
+- Pool usage stats
+"""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+import shared.chatwoot_client as chatwoot_module
+from shared.chatwoot_client import (
+    ChatwootClient,
+    close_chatwoot_http_client,
+    get_chatwoot_http_client,
+    get_chatwoot_pool_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_shared_client():
+    """Start and end every test without a shared client."""
+    await close_chatwoot_http_client()
+    yield
+    await close_chatwoot_http_client()
+
+
+def _mock_settings(http2: bool = False) -> MagicMock:
+    settings = MagicMock()
+    settings.CHATWOOT_HTTP_MAX_CONNECTIONS = 7
+    settings.CHATWOOT_HTTP_MAX_KEEPALIVE = 3
+    settings.CHATWOOT_HTTP_KEEPALIVE_EXPIRY = 12.0
+    settings.CHATWOOT_HTTP2 = http2
+    return settings
+
+
+def _mock_transport_client(seen: list[httpx.Request]) -> httpx.AsyncClient:
+    """Shared-style client whose requests are answered in-process."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"payload": {}})
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        event_hooks={"request": [chatwoot_module._on_request]},
+    )
+
+
+class TestSharedHttpClient:
+    """Tests for get_chatwoot_http_client / close_chatwoot_http_client."""
+
+    @pytest.mark.asyncio
+    async def test_returns_same_client_until_closed(self):
+        """The client is shared and recreated after close."""
+        first = get_chatwoot_http_client()
+        assert get_chatwoot_http_client() is first
+
+        await close_chatwoot_http_client()
+
+        assert first.is_closed
+        second = get_chatwoot_http_client()
+        assert second is not first
+        assert not second.is_closed
+
+    @pytest.mark.asyncio
+    async def test_uses_configured_limits(self):
+        """Pool limits come from CHATWOOT_HTTP_* settings."""
+        with patch("shared.chatwoot_client.get_settings", return_value=_mock_settings()), \
+             patch("shared.chatwoot_client.httpx.AsyncClient") as mock_client_cls:
+            get_chatwoot_http_client()
+
+        kwargs = mock_client_cls.call_args.kwargs
+        assert kwargs["limits"].max_connections == 7
+        assert kwargs["limits"].max_keepalive_connections == 3
+        assert kwargs["limits"].keepalive_expiry == 12.0
+        assert kwargs["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self):
+        """HTTP/2 is disabled (not an error) when 'h2' is not installed."""
+        with patch("shared.chatwoot_client.get_settings", return_value=_mock_settings(http2=True)), \
+             patch("shared.chatwoot_client._http2_available", return_value=False), \
+             patch("shared.chatwoot_client.httpx.AsyncClient") as mock_client_cls:
+            get_chatwoot_http_client()
+
+        assert mock_client_cls.call_args.kwargs["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_close_without_client_is_noop(self):
+        """Closing before first use does not fail."""
+        await close_chatwoot_http_client()
+        assert get_chatwoot_pool_stats()["initialized"] is False
+
+
+class TestChatwootClientPooling:
+    """ChatwootClient requests go through the shared client."""
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_shared_client(self):
+        """Consecutive calls reuse one open client and are counted in stats."""
+        seen: list[httpx.Request] = []
+        shared_client = _mock_transport_client(seen)
+        chatwoot_module._http_client = shared_client
+        requests_before = get_chatwoot_pool_stats()["requests_total"]
+
+        client = ChatwootClient()
+        assert await client.update_conversation_attributes(1, {"atencion_automatica": True})
+        assert await client.update_conversation_attributes(2, {"atencion_automatica": False})
+
+        assert len(seen) == 2
+        assert seen[0].headers["api_access_token"] == client.api_token
+        assert not shared_client.is_closed
+        assert get_chatwoot_http_client() is shared_client
+
+        stats = get_chatwoot_pool_stats()
+        assert stats["initialized"] is True
+        assert stats["requests_total"] == requests_before + 2
@@ -7,17 +7,20 @@ Tests cover:
 - Summary combination logic
 - Token estimation and overflow protection
 - Message count tracking
+- Background trigger (summary_due) and incremental summaries
 """
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from agent.nodes.summarization import summarize_conversation
+from agent.nodes.summarization import build_summary_update, summarize_conversation
 from agent.state.helpers import (
     add_message,
     should_summarize,
     estimate_token_count,
     check_token_overflow,
+    messages_since_summary,
+    summary_due,
 )
 from agent.state.schemas import ConversationState
 
@@ -184,7 +187,7 @@ class TestSummarizeConversation:
         mock_response = MagicMock()
         mock_response.content = "Cliente solicita cita para corte de pelo."
 
-        with patch("agent.nodes.summarization.ChatOpenAI") as mock_llm:
+        with patch("agent.nodes.summarization.get_llm_client") as mock_llm:
             mock_instance = AsyncMock()
             mock_instance.ainvoke = AsyncMock(return_value=mock_response)
             mock_llm.return_value = mock_instance
@@ -211,7 +214,7 @@ class TestSummarizeConversation:
         mock_response = MagicMock()
         mock_response.content = "Cliente confirma cita para mañana 10am."
 
-        with patch("agent.nodes.summarization.ChatOpenAI") as mock_llm:
+        with patch("agent.nodes.summarization.get_llm_client") as mock_llm:
             mock_instance = AsyncMock()
             mock_instance.ainvoke = AsyncMock(return_value=mock_response)
             mock_llm.return_value = mock_instance
@@ -235,7 +238,7 @@ class TestSummarizeConversation:
         }
 
         # Mock Claude API to raise exception
-        with patch("agent.nodes.summarization.ChatOpenAI") as mock_llm:
+        with patch("agent.nodes.summarization.get_llm_client") as mock_llm:
             mock_instance = AsyncMock()
             mock_instance.ainvoke = AsyncMock(side_effect=Exception("API error"))
             mock_llm.return_value = mock_instance
@@ -324,3 +327,76 @@ class TestTokenEstimation:
 
         assert result["overflow"] is True
         assert result["action"] == "escalate"
+
+
+class TestIncrementalSummary:
+    """Tests for summary_due / messages_since_summary / build_summary_update."""
+
+    def test_summary_due_counts_messages_since_last_summary(self):
+        """Fires once 8 messages were added after the last summary."""
+        assert summary_due({"total_message_count": 7}) is False
+        assert summary_due({"total_message_count": 8}) is True
+        assert summary_due({"total_message_count": 15, "summarized_message_count": 8}) is False
+        assert summary_due({"total_message_count": 16, "summarized_message_count": 8}) is True
+
+    def test_messages_since_summary_skips_summarized_messages(self):
+        """Only window messages past the watermark are returned."""
+        messages = [{"role": "user", "content": f"msg {i}"} for i in range(3, 13)]
+        state: ConversationState = {
+            "conversation_id": "test-incremental",
+            "messages": messages,
+            "total_message_count": 12,
+            "summarized_message_count": 8,
+        }
+
+        result = messages_since_summary(state)
+
+        assert [msg["content"] for msg in result] == ["msg 9", "msg 10", "msg 11", "msg 12"]
+
+    def test_messages_since_summary_without_previous_summary(self):
+        """With no summary yet every window message is new."""
+        messages = [{"role": "user", "content": f"msg {i}"} for i in range(1, 9)]
+
+        result = messages_since_summary({"messages": messages, "total_message_count": 8})
+
+        assert result == messages
+
+    @pytest.mark.asyncio
+    async def test_build_summary_update_summarizes_new_messages_only(self):
+        """The prompt holds only unsummarized messages and the watermark advances."""
+        messages = [{"role": "user", "content": f"msg {i}"} for i in range(7, 17)]
+        state: ConversationState = {
+            "conversation_id": "test-update",
+            "messages": messages,
+            "total_message_count": 16,
+            "summarized_message_count": 8,
+            "conversation_summary": "Resumen previo.",
+        }
+
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="Resumen nuevo."))
+
+        with patch("agent.nodes.summarization.get_llm_client", return_value=mock_llm):
+            update = await build_summary_update(state)
+
+        prompt = mock_llm.ainvoke.call_args[0][0][0]["content"]
+        assert "msg 9" in prompt and "msg 16" in prompt
+        assert "msg 8" not in prompt
+        assert update == {
+            "conversation_summary": "Resumen previo.\n\nResumen nuevo.",
+            "summarized_message_count": 16,
+        }
+
+    @pytest.mark.asyncio
+    async def test_build_summary_update_nothing_new(self):
+        """No LLM call when every message is already summarized."""
+        state: ConversationState = {
+            "messages": [{"role": "user", "content": "hola"}],
+            "total_message_count": 8,
+            "summarized_message_count": 8,
+        }
+
+        with patch("agent.nodes.summarization.get_llm_client") as mock_get_llm:
+            assert await build_summary_update(state) == {}
+
+        mock_get_llm.assert_not_called()
@@ -0,0 +1,148 @@
+"""
+Tests for background conversation summarization (ConversationSummarizer).
+
+Coverage:
+- Nothing is scheduled until a summary is due
+- Summaries are written when the checkpoint did not change
+- A changed checkpoint discards the summary and retries on the new one
+- Failed summaries are counted, not raised
+- Writes wait for a running turn (conversation lock)
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.workers.conversation_summarizer import ConversationSummarizer
+
+
+def _snapshot(checkpoint_id: str, total_message_count: int = 8) -> SimpleNamespace:
+    return SimpleNamespace(
+        values={"conversation_id": "conv-1", "total_message_count": total_message_count},
+        config={"configurable": {"thread_id": "conv-1", "checkpoint_id": checkpoint_id}},
+    )
+
+
+def _graph(*snapshots: SimpleNamespace) -> MagicMock:
+    graph = MagicMock()
+    graph.aget_state = AsyncMock(side_effect=list(snapshots))
+    graph.aupdate_state = AsyncMock()
+    return graph
+
+
+async def _wait_idle(summarizer: ConversationSummarizer) -> None:
+    while summarizer.stats()["running"]:
+        await asyncio.sleep(0)
+
+
+class TestConversationSummarizer:
+    """Tests for ConversationSummarizer."""
+
+    @pytest.mark.asyncio
+    async def test_not_due_does_nothing(self):
+        graph = _graph()
+        summarizer = ConversationSummarizer(graph)
+
+        summarizer.schedule("conv-1", {"total_message_count": 5})
+
+        assert summarizer.stats()["scheduled"] == 0
+        graph.aget_state.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_writes_when_checkpoint_unchanged(self):
+        graph = _graph(_snapshot("cp-1"), _snapshot("cp-1"))
+        summarizer = ConversationSummarizer(graph)
+        update = {"conversation_summary": "Resumen", "summarized_message_count": 8}
+
+        with patch(
+            "agent.workers.conversation_summarizer.build_summary_update",
+            AsyncMock(return_value=update),
+        ):
+            summarizer.schedule("conv-1", {"total_message_count": 8})
+            await _wait_idle(summarizer)
+
+        graph.aupdate_state.assert_awaited_once_with(
+            {"configurable": {"thread_id": "conv-1"}},
+            update,
+            as_node="conversational_agent",
+        )
+        assert summarizer.stats()["written"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_checkpoint_retries_on_new_state(self):
+        """A turn that finished during the LLM call invalidates the summary."""
+        graph = _graph(
+            _snapshot("cp-1"),
+            _snapshot("cp-2", total_message_count=10),
+            _snapshot("cp-2", total_message_count=10),
+            _snapshot("cp-2", total_message_count=10),
+        )
+        summarizer = ConversationSummarizer(graph)
+        build = AsyncMock(
+            side_effect=[
+                {"conversation_summary": "viejo", "summarized_message_count": 8},
+                {"conversation_summary": "nuevo", "summarized_message_count": 10},
+            ]
+        )
+
+        with patch("agent.workers.conversation_summarizer.build_summary_update", build):
+            summarizer.schedule("conv-1", {"total_message_count": 8})
+            await _wait_idle(summarizer)
+
+        assert build.await_args_list[1].args[0]["total_message_count"] == 10
+        written = graph.aupdate_state.await_args.args[1]
+        assert written["conversation_summary"] == "nuevo"
+        stats = summarizer.stats()
+        assert stats["conflicts"] == 1
+        assert stats["written"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        graph = _graph(_snapshot("cp-1"), _snapshot("cp-2"), _snapshot("cp-2"), _snapshot("cp-3"))
+        summarizer = ConversationSummarizer(graph, max_attempts=2)
+
+        with patch(
+            "agent.workers.conversation_summarizer.build_summary_update",
+            AsyncMock(return_value={"conversation_summary": "x", "summarized_message_count": 8}),
+        ):
+            summarizer.schedule("conv-1", {"total_message_count": 8})
+            await _wait_idle(summarizer)
+
+        graph.aupdate_state.assert_not_called()
+        assert summarizer.stats()["conflicts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_counted(self):
+        graph = _graph(_snapshot("cp-1"))
+        summarizer = ConversationSummarizer(graph)
+
+        with patch(
+            "agent.workers.conversation_summarizer.build_summary_update",
+            AsyncMock(side_effect=RuntimeError("LLM down")),
+        ):
+            summarizer.schedule("conv-1", {"total_message_count": 8})
+            await _wait_idle(summarizer)
+
+        graph.aupdate_state.assert_not_called()
+        assert summarizer.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_waits_for_running_turn(self):
+        graph = _graph(_snapshot("cp-1"), _snapshot("cp-1"))
+        summarizer = ConversationSummarizer(graph)
+
+        with patch(
+            "agent.workers.conversation_summarizer.build_summary_update",
+            AsyncMock(return_value={"conversation_summary": "x", "summarized_message_count": 8}),
+        ):
+            async with summarizer.conversation_lock("conv-1"):
+                summarizer.schedule("conv-1", {"total_message_count": 8})
+                for _ in range(10):
+                    await asyncio.sleep(0)
+                graph.aupdate_state.assert_not_called()
+
+            await _wait_idle(summarizer)
+
+        graph.aupdate_state.assert_awaited_once()
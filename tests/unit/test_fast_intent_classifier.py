@@ -0,0 +1,238 @@
+"""
+Tests for the fast-path intent classifier (deterministic NLU before the LLM).
+
+Coverage:
+- Regression table of real WhatsApp turns: messages the fast path must
+  classify, with the expected intent and entities
+- Regression table of ambiguous turns that must still go to the LLM
+- extract_intent() skips the LLM on a fast-path hit and can be disabled
+- Hit-rate metrics
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.fsm import BookingState, IntentType, extract_intent, fast_intent_classifier
+from agent.fsm.fast_intent_classifier import (
+    FAST_PATH_CONFIDENCE,
+    classify_fast_path,
+    get_fast_path_stats,
+    normalize_message,
+    reset_fast_path_stats,
+)
+
+MODULE = "agent.fsm.fast_intent_classifier"
+
+PILAR_ID = "11111111-1111-1111-1111-111111111111"
+MARTA_ID = "22222222-2222-2222-2222-222222222222"
+ANA_ID = "33333333-3333-3333-3333-333333333333"
+STYLIST_CACHE = {"pilar": PILAR_ID, "marta": MARTA_ID, "ana": ANA_ID}
+
+STYLIST_LIST = (
+    "Nuestros estilistas disponibles son:\n\n"
+    "1. Pilar\n2. Marta\n3. Ana\n\n"
+    "¿Con quién te gustaría la cita? Si no tienes preferencia, "
+    "puedo buscar disponibilidad con cualquiera de ellos."
+)
+
+SOONEST_ANY = {
+    "time": "10:00", "date": "12 de marzo", "day_name": "miércoles",
+    "full_datetime": "2026-03-12T10:00:00+01:00", "stylist_name": "Ana",
+    "stylist_id": ANA_ID, "is_soonest_any": True, "is_different_stylist": True,
+}
+PILAR_SLOTS = [
+    {"time": "11:00", "date": "12 de marzo", "day_name": "miércoles",
+     "full_datetime": "2026-03-12T11:00:00+01:00", "stylist": "Pilar", "stylist_id": PILAR_ID},
+    {"time": "16:30", "date": "12 de marzo", "day_name": "miércoles",
+     "full_datetime": "2026-03-12T16:30:00+01:00", "stylist": "Pilar", "stylist_id": PILAR_ID},
+    {"time": "11:00", "date": "13 de marzo", "day_name": "jueves",
+     "full_datetime": "2026-03-13T11:00:00+01:00", "stylist": "Pilar", "stylist_id": PILAR_ID},
+]
+SLOT_DATA = {
+    "services": ["Corte de Caballero"],
+    "stylist_id": PILAR_ID,
+    "slots_shown": [SOONEST_ANY, *PILAR_SLOTS],
+}
+
+SERVICES = {"services": ["Corte de Caballero"]}
+CONFIRMATION_DATA = {
+    "services": ["Corte de Caballero"], "stylist_id": PILAR_ID,
+    "slot": {"start_time": "2026-03-12T11:00:00+01:00", "duration_minutes": 40},
+    "first_name": "Lucía",
+}
+STYLIST_HISTORY = [
+    {"role": "user", "content": "Corte de caballero"},
+    {"role": "assistant", "content": STYLIST_LIST},
+]
+
+# (state, collected_data, history, message, expected intent, expected entities subset)
+FAST_PATH_CASES = [
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "Sí", IntentType.CONFIRM_BOOKING, {}),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "siii perfecto 👍", IntentType.CONFIRM_BOOKING, {}),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "Vale, confirmo", IntentType.CONFIRM_BOOKING, {}),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "de acuerdo gracias", IntentType.CONFIRM_BOOKING, {}),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "Ok!", IntentType.CONFIRM_BOOKING, {}),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "no", IntentType.CANCEL_BOOKING, {}),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "Mejor no", IntentType.CANCEL_BOOKING, {}),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "Cancelar", IntentType.CANCEL_BOOKING, {}),
+    (BookingState.CUSTOMER_DATA, CONFIRMATION_DATA, [], "olvídalo", IntentType.CANCEL_BOOKING, {}),
+    (BookingState.SERVICE_SELECTION, SERVICES, [], "Eso es todo", IntentType.CONFIRM_SERVICES, {}),
+    (BookingState.SERVICE_SELECTION, SERVICES, [], "nada más, gracias", IntentType.CONFIRM_SERVICES, {}),
+    (BookingState.SERVICE_SELECTION, SERVICES, [], "Continúa", IntentType.CONFIRM_SERVICES, {}),
+    (BookingState.STYLIST_SELECTION, SERVICES, STYLIST_HISTORY, "2", IntentType.SELECT_STYLIST,
+     {"selection_number": 2, "stylist_name": "Marta", "stylist_id": MARTA_ID}),
+    (BookingState.STYLIST_SELECTION, SERVICES, STYLIST_HISTORY, "el primero", IntentType.SELECT_STYLIST,
+     {"selection_number": 1, "stylist_id": PILAR_ID}),
+    (BookingState.STYLIST_SELECTION, SERVICES, STYLIST_HISTORY, "Con Pilar", IntentType.SELECT_STYLIST,
+     {"stylist_name": "Pilar", "stylist_id": PILAR_ID}),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "3", IntentType.SELECT_SLOT,
+     {"selection_number": 3, "slot": {
+         "start_time": "2026-03-12T16:30:00+01:00", "duration_minutes": 0,
+         "stylist_id": PILAR_ID, "stylist_name": "Pilar"}}),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "la 1", IntentType.SELECT_SLOT,
+     {"selection_number": 1, "slot": {
+         "start_time": "2026-03-12T10:00:00+01:00", "duration_minutes": 0,
+         "stylist_id": ANA_ID, "stylist_name": "Ana", "is_soonest_any": True}}),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "A las 16:30", IntentType.SELECT_SLOT,
+     {"slot": {"start_time": "2026-03-12T16:30:00+01:00", "duration_minutes": 0,
+               "stylist_id": PILAR_ID, "stylist_name": "Pilar"}}),
+    (BookingState.SLOT_SELECTION, {**SLOT_DATA, "pending_stylist_change": True}, [], "sí, me parece bien",
+     IntentType.CONFIRM_STYLIST_CHANGE, {}),
+    (BookingState.IDLE, {}, [], "Holaaa", IntentType.GREETING, {}),
+    (BookingState.IDLE, {}, [], "Buenos días!", IntentType.GREETING, {}),
+    (BookingState.BOOKED, CONFIRMATION_DATA, [], "Muchas gracias, hasta luego", IntentType.GREETING, {}),
+    (BookingState.SERVICE_SELECTION, {}, [], "Quiero hablar con una persona real", IntentType.ESCALATE, {}),
+]
+
+# (state, collected_data, history, message) that must go to the LLM
+LLM_CASES = [
+    # "sí" in IDLE may confirm an appointment or a pending decline
+    (BookingState.IDLE, {}, [], "Sí"),
+    (BookingState.IDLE, {}, [], "Quiero una cita"),
+    (BookingState.IDLE, {}, [], "cancelar mi cita"),
+    (BookingState.IDLE, {}, [], "Hola, quiero pedir cita para mañana"),
+    # Numbers in SERVICE_SELECTION may refer to services or stylists
+    (BookingState.SERVICE_SELECTION, SERVICES, [], "1"),
+    (BookingState.SERVICE_SELECTION, {}, [], "Eso es todo"),
+    (BookingState.SERVICE_SELECTION, SERVICES, [], "sí"),
+    (BookingState.STYLIST_SELECTION, SERVICES, [], "2"),
+    (BookingState.STYLIST_SELECTION, SERVICES, STYLIST_HISTORY, "7"),
+    (BookingState.STYLIST_SELECTION, SERVICES, STYLIST_HISTORY, "con quien sea"),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "el viernes por la tarde"),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "2 por la tarde"),
+    # 11:00 is shown on two different days
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "a las 11:00"),
+    (BookingState.SLOT_SELECTION, SLOT_DATA, [], "sí"),
+    # Without the soonest-any option the list starts at 2
+    (BookingState.SLOT_SELECTION, {**SLOT_DATA, "slots_shown": PILAR_SLOTS}, [], "1"),
+    (BookingState.SLOT_SELECTION, {"services": ["Corte"]}, [], "1"),
+    (BookingState.CUSTOMER_DATA, CONFIRMATION_DATA, [], "sí"),
+    (BookingState.CUSTOMER_DATA, CONFIRMATION_DATA, [], "no"),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "Sí, pero cambia la hora"),
+    (BookingState.CONFIRMATION, CONFIRMATION_DATA, [], "no cancela"),
+    (BookingState.BOOKED, CONFIRMATION_DATA, [], "¿A qué hora era mi cita?"),
+    (BookingState.SERVICE_SELECTION, {}, [], "no quiero hablar con una persona"),
+]
+
+
+@pytest.fixture(autouse=True)
+def stylists():
+    """Stylist lookups served from a fixed cache instead of the database."""
+    reset_fast_path_stats()
+
+    async def lookup(name):
+        return STYLIST_CACHE.get(normalize_message(name))
+
+    with patch(f"{MODULE}._load_stylist_cache", new=AsyncMock(return_value=STYLIST_CACHE)), patch(
+        f"{MODULE}.get_stylist_id_by_name", new=lookup
+    ):
+        yield
+    reset_fast_path_stats()
+
+
+class TestFastPathRegression:
+    """Regression suite built from real conversation turns."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("state,data,history,message,expected,entities", FAST_PATH_CASES)
+    async def test_classified_without_llm(self, state, data, history, message, expected, entities):
+        intent = await classify_fast_path(message, state, data, history)
+
+        assert intent is not None, f"{message!r} in {state.value} should use the fast path"
+        assert intent.type == expected
+        assert intent.confidence == FAST_PATH_CONFIDENCE
+        assert intent.raw_message == message
+        for key, value in entities.items():
+            assert intent.entities[key] == value
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("state,data,history,message", LLM_CASES)
+    async def test_ambiguous_goes_to_llm(self, state, data, history, message):
+        assert await classify_fast_path(message, state, data, history) is None
+
+
+class TestExtractIntentIntegration:
+    """Tests for the fast path inside extract_intent()."""
+
+    @pytest.mark.asyncio
+    @patch("agent.fsm.intent_extractor._get_llm_client")
+    async def test_hit_skips_llm(self, mock_get_llm):
+        intent = await extract_intent("Sí", BookingState.CONFIRMATION, CONFIRMATION_DATA, [])
+
+        assert intent.type == IntentType.CONFIRM_BOOKING
+        mock_get_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("agent.fsm.intent_extractor._get_llm_client")
+    async def test_disabled_uses_llm(self, mock_get_llm):
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(
+                content='{"intent_type": "confirm_booking", "entities": {}, "confidence": 0.9}'
+            )
+        )
+        mock_get_llm.return_value = mock_llm
+        settings = MagicMock(INTENT_FAST_PATH_ENABLED=False)
+
+        with patch("agent.fsm.intent_extractor.get_settings", return_value=settings):
+            intent = await extract_intent("Sí", BookingState.CONFIRMATION, CONFIRMATION_DATA, [])
+
+        assert intent.type == IntentType.CONFIRM_BOOKING
+        mock_llm.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("agent.fsm.intent_extractor._get_llm_client")
+    async def test_classifier_error_falls_back_to_llm(self, mock_get_llm):
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(
+                content='{"intent_type": "select_stylist", "entities": {}, "confidence": 0.9}'
+            )
+        )
+        mock_get_llm.return_value = mock_llm
+
+        with patch.object(
+            fast_intent_classifier, "_load_stylist_cache", new=AsyncMock(side_effect=RuntimeError)
+        ):
+            intent = await extract_intent("Pilar", BookingState.STYLIST_SELECTION, SERVICES, [])
+
+        assert intent.type == IntentType.SELECT_STYLIST
+        mock_llm.ainvoke.assert_awaited_once()
+
+
+class TestFastPathStats:
+    """Tests for hit-rate metrics."""
+
+    @pytest.mark.asyncio
+    async def test_hit_rate(self):
+        await classify_fast_path("sí", BookingState.CONFIRMATION, CONFIRMATION_DATA, [])
+        await classify_fast_path("hola", BookingState.IDLE, {}, [])
+        await classify_fast_path("Quiero una cita", BookingState.IDLE, {}, [])
+        await classify_fast_path("Quiero mechas", BookingState.SERVICE_SELECTION, {}, [])
+
+        stats = get_fast_path_stats()
+        assert stats["attempts"] == 4
+        assert stats["hits"] == 2
+        assert stats["hit_rate"] == 0.5
+        assert stats["hits_by_intent"] == {"confirm_booking": 1, "greeting": 1}
@@ -7,11 +7,18 @@ Tests:
 - ActionType enum
 - Serialization/deserialization
 - Validation rules
+- Execution waves (tool call dependencies)
 """
 
 import pytest
 
-from agent.fsm.fsm_action import ActionType, FSMAction, ToolCall
+from agent.fsm.fsm_action import (
+    DEFAULT_TOOL_TIMEOUT_SECONDS,
+    ActionType,
+    FSMAction,
+    ToolCall,
+    execution_waves,
+)
 
 
 class TestToolCall:
@@ -240,3 +247,66 @@ class TestFSMActionSerialization:
         assert restored.response_template == original.response_template
         assert restored.template_vars == original.template_vars
         assert restored.allow_llm_creativity == original.allow_llm_creativity
+
+
+class TestExecutionWaves:
+    """Test grouping of tool calls into concurrent waves."""
+
+    def test_independent_calls_share_one_wave(self):
+        calls = [
+            ToolCall(name="search_services", args={}),
+            ToolCall(name="list_stylists", args={}),
+        ]
+
+        waves = execution_waves(calls)
+
+        assert [[tc.name for tc in wave] for wave in waves] == [
+            ["search_services", "list_stylists"]
+        ]
+
+    def test_dependencies_start_a_later_wave(self):
+        calls = [
+            ToolCall(name="search_services", args={}),
+            ToolCall(name="list_stylists", args={}),
+            ToolCall(name="check_availability", args={}, depends_on=("list_stylists",)),
+            ToolCall(name="book", args={}, depends_on=("check_availability",)),
+        ]
+
+        waves = execution_waves(calls)
+
+        assert [[tc.name for tc in wave] for wave in waves] == [
+            ["search_services", "list_stylists"],
+            ["check_availability"],
+            ["book"],
+        ]
+
+    def test_dependency_must_be_prescribed_before(self):
+        """Unknown or later dependencies are rejected when the action is built."""
+        with pytest.raises(ValueError, match="not prescribed before it"):
+            FSMAction(
+                action_type=ActionType.CALL_TOOLS_SEQUENCE,
+                tool_calls=[
+                    ToolCall(name="book", args={}, depends_on=("check_availability",)),
+                    ToolCall(name="check_availability", args={}),
+                ],
+            )
+
+    def test_roundtrip_keeps_dependencies_and_timeout(self):
+        original = FSMAction(
+            action_type=ActionType.CALL_TOOLS_SEQUENCE,
+            tool_calls=[
+                ToolCall(name="check_availability", args={}),
+                ToolCall(
+                    name="book",
+                    args={},
+                    depends_on=("check_availability",),
+                    timeout_seconds=None,
+                ),
+            ],
+        )
+
+        restored = FSMAction.from_dict(original.to_dict())
+
+        assert restored.tool_calls[1].depends_on == ("check_availability",)
+        assert restored.tool_calls[1].timeout_seconds is None
+        assert restored.tool_calls[0].timeout_seconds == DEFAULT_TOOL_TIMEOUT_SECONDS
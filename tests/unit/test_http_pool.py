@@ -0,0 +1,95 @@
+"""
+Tests for pool_connection_stats (connection counts of a shared httpx client).
+
+Coverage:
+- Counts read from the httpcore pool of a real client
+- Active/idle/HTTP/2 classification of connections
+- Older httpcore layout (connections in `_pool`)
+- Unknown layouts and broken connections degrade instead of raising
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from shared.http_pool import pool_connection_stats
+
+
+def _connection(idle: bool, info: str = "'https://openrouter.ai:443', HTTP/1.1") -> MagicMock:
+    connection = MagicMock()
+    connection.is_idle.return_value = idle
+    connection.info.return_value = info
+    return connection
+
+
+def _client_with_pool(pool) -> SimpleNamespace:
+    return SimpleNamespace(_transport=SimpleNamespace(_pool=pool))
+
+
+class TestPoolConnectionStats:
+    """Tests for pool_connection_stats."""
+
+    def test_no_client(self):
+        assert pool_connection_stats(None) == {
+            "connections": 0,
+            "active": 0,
+            "idle": 0,
+            "http2": 0,
+            "connections_known": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_real_client_pool_is_found(self):
+        """The installed httpx/httpcore layout is understood."""
+        async with httpx.AsyncClient() as client:
+            stats = pool_connection_stats(client)
+
+        assert stats["connections_known"] is True
+        assert stats["connections"] == 0
+
+    def test_counts_active_idle_and_http2(self):
+        pool = SimpleNamespace(connections=[
+            _connection(idle=True),
+            _connection(idle=False, info="'https://openrouter.ai:443', HTTP/2, ACTIVE"),
+            _connection(idle=False),
+        ])
+
+        stats = pool_connection_stats(_client_with_pool(pool))
+
+        assert stats == {
+            "connections": 3,
+            "active": 2,
+            "idle": 1,
+            "http2": 1,
+            "connections_known": True,
+        }
+
+    def test_older_httpcore_layout(self):
+        pool = SimpleNamespace(_pool=[_connection(idle=True), _connection(idle=False)])
+
+        stats = pool_connection_stats(_client_with_pool(pool))
+
+        assert stats["connections"] == 2
+        assert stats["idle"] == 1
+
+    def test_unknown_transport_reports_zero(self):
+        """A transport without an httpcore pool (e.g. MockTransport) is not an error."""
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: None))
+
+        stats = pool_connection_stats(client)
+
+        assert stats["connections_known"] is False
+        assert stats["connections"] == 0
+
+    def test_broken_connection_is_counted_but_not_classified(self):
+        broken = MagicMock()
+        broken.is_idle.side_effect = AttributeError("renamed")
+        pool = SimpleNamespace(connections=[broken, _connection(idle=True)])
+
+        stats = pool_connection_stats(_client_with_pool(pool))
+
+        assert stats["connections"] == 2
+        assert stats["idle"] == 1
+        assert stats["active"] == 0
@@ -300,7 +300,7 @@ class TestV5ArchitectureImports:
         from agent.fsm import ToolCall
 
         fields = ToolCall.__dataclass_fields__
-        expected_fields = {"name", "args", "required"}
+        expected_fields = {"name", "args", "required", "depends_on", "timeout_seconds"}
 
         actual_fields = set(fields.keys())
         assert actual_fields == expected_fields, (
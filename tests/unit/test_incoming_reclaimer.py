@@ -0,0 +1,187 @@
+"""
+Tests for IncomingReclaimer - Recovery of orphaned incoming stream entries.
+
+Coverage:
+- Reclaimed entries are redelivered to the batcher
+- Entries over the delivery limit and invalid entries go to the DLQ
+- Entries held by this process are left alone
+- Claim rounds continue while full pages are returned
+- Batches answered with the fallback reply are dead-lettered, not replayed
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agent.workers.incoming_reclaimer import (
+    CLAIM_BATCH_SIZE,
+    IncomingReclaimer,
+    dead_letter_batch,
+)
+from shared.redis_client import CONSUMER_GROUP, INCOMING_STREAM
+
+
+def _data(conversation_id: str, text: str) -> dict:
+    return {"conversation_id": conversation_id, "customer_phone": "+34612345678", "message_text": text}
+
+
+class TestIncomingReclaimer:
+    """Tests for IncomingReclaimer."""
+
+    @pytest.mark.asyncio
+    async def test_redelivers_and_dead_letters(self):
+        """Abandoned entries are redelivered; poison and invalid entries go to the DLQ."""
+        redeliver = AsyncMock()
+        reclaimer = IncomingReclaimer(
+            "consumer-1", redeliver=redeliver, is_local=lambda _: False, max_deliveries=3
+        )
+        claimed = [
+            ("1-0", _data("10", "Hola"), 2),
+            ("2-0", _data("20", "sin remedio"), 4),
+            ("3-0", {"_raw": "???", "_parse_error": True}, 1),
+        ]
+
+        with patch(
+            "agent.workers.incoming_reclaimer.claim_stale_messages",
+            new=AsyncMock(return_value=claimed),
+        ) as mock_claim, patch(
+            "agent.workers.incoming_reclaimer.move_to_dead_letter", new=AsyncMock()
+        ) as mock_dlq:
+            redelivered = await reclaimer.reclaim([INCOMING_STREAM])
+
+        assert redelivered == 1
+        redeliver.assert_awaited_once_with(INCOMING_STREAM, "1-0", _data("10", "Hola"))
+        assert [c.args[2] for c in mock_dlq.call_args_list] == ["2-0", "3-0"]
+        assert mock_claim.call_args.args[:3] == (INCOMING_STREAM, CONSUMER_GROUP, "consumer-1")
+        assert reclaimer.stats() == {"claimed": 3, "redelivered": 1, "dead_lettered": 2}
+
+    @pytest.mark.asyncio
+    async def test_local_entries_are_skipped(self):
+        """Entries still batched or processed by this process are not redelivered."""
+        redeliver = AsyncMock()
+        reclaimer = IncomingReclaimer("consumer-1", redeliver=redeliver, is_local={"1-0"}.__contains__)
+
+        with patch(
+            "agent.workers.incoming_reclaimer.claim_stale_messages",
+            new=AsyncMock(return_value=[("1-0", _data("10", "Hola"), 9)]),
+        ), patch(
+            "agent.workers.incoming_reclaimer.move_to_dead_letter", new=AsyncMock()
+        ) as mock_dlq:
+            assert await reclaimer.reclaim([INCOMING_STREAM]) == 0
+
+        redeliver.assert_not_awaited()
+        mock_dlq.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_claims_until_backlog_is_empty(self):
+        """Full claim pages are followed by another round; the idle override is used."""
+        redeliver = AsyncMock()
+        reclaimer = IncomingReclaimer("consumer-1", redeliver=redeliver, is_local=lambda _: False)
+        full_page = [(f"{i}-0", _data("10", f"m{i}"), 2) for i in range(CLAIM_BATCH_SIZE)]
+
+        with patch(
+            "agent.workers.incoming_reclaimer.claim_stale_messages",
+            new=AsyncMock(side_effect=[full_page, []]),
+        ) as mock_claim:
+            redelivered = await reclaimer.reclaim([INCOMING_STREAM], min_idle_ms=15000)
+
+        assert redelivered == CLAIM_BATCH_SIZE
+        assert mock_claim.await_count == 2
+        assert mock_claim.call_args.kwargs["min_idle_ms"] == 15000
+
+    @pytest.mark.asyncio
+    async def test_failed_redelivery_stays_pending(self):
+        """An entry that cannot be batched is left pending for the next pass."""
+        reclaimer = IncomingReclaimer(
+            "consumer-1", redeliver=AsyncMock(side_effect=RuntimeError("boom")), is_local=lambda _: False
+        )
+
+        with patch(
+            "agent.workers.incoming_reclaimer.claim_stale_messages",
+            new=AsyncMock(return_value=[("1-0", _data("10", "Hola"), 2)]),
+        ), patch(
+            "agent.workers.incoming_reclaimer.move_to_dead_letter", new=AsyncMock()
+        ) as mock_dlq:
+            assert await reclaimer.reclaim([INCOMING_STREAM]) == 0
+
+        mock_dlq.assert_not_awaited()
+        assert reclaimer.stats()["redelivered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_pel_stats(self):
+        """PEL size and age are reported per stream."""
+        reclaimer = IncomingReclaimer("consumer-1", redeliver=AsyncMock(), is_local=lambda _: False)
+        summary = {"pending": 4, "oldest_age_ms": 90000, "consumers": {"consumer-0": 4}}
+
+        with patch(
+            "agent.workers.incoming_reclaimer.get_pending_summary",
+            new=AsyncMock(return_value=summary),
+        ):
+            assert await reclaimer.pel_stats([INCOMING_STREAM]) == {INCOMING_STREAM: summary}
+
+
+class TestDeadLetterBatch:
+    """Tests for dead_letter_batch (failed turns answered with the fallback)."""
+
+    @pytest.mark.asyncio
+    async def test_moves_batch_entries_to_dlq(self):
+        """Each stream entry goes to the DLQ with its original data."""
+        messages = [
+            {**_data("10", "Hola"), "_stream": "incoming:3", "_stream_msg_id": "1-0"},
+            {**_data("10", "¿hay hueco?"), "_stream": "incoming:3", "_stream_msg_id": "2-0"},
+            _data("10", "sin entrada"),  # Legacy pub/sub message: nothing to move
+        ]
+
+        with patch(
+            "agent.workers.incoming_reclaimer.move_to_dead_letter", new=AsyncMock()
+        ) as mock_dlq:
+            assert await dead_letter_batch(messages, "Graph invocation failed") == 2
+
+        assert [c.args for c in mock_dlq.call_args_list] == [
+            ("incoming:3", CONSUMER_GROUP, "1-0", _data("10", "Hola"), "Graph invocation failed"),
+            (
+                "incoming:3", CONSUMER_GROUP, "2-0", _data("10", "¿hay hueco?"),
+                "Graph invocation failed",
+            ),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_dlq_error_leaves_entry_pending(self):
+        """An entry that cannot be moved is skipped (the reclaimer still has it)."""
+        messages = [{**_data("10", "Hola"), "_stream_msg_id": "1-0"}]
+
+        with patch(
+            "agent.workers.incoming_reclaimer.move_to_dead_letter",
+            new=AsyncMock(side_effect=RuntimeError("Redis down")),
+        ):
+            assert await dead_letter_batch(messages, "Graph invocation failed") == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_not_replayed_by_reclaimer(self):
+        """Once dead-lettered, a failed batch is no longer pending, so it is never redelivered."""
+        # In-memory PEL: move_to_dead_letter acks (removes), claims return what is left
+        pel = {"1-0": _data("10", "Hola"), "2-0": _data("10", "¿hay hueco?")}
+
+        async def move_to_dead_letter(stream, group, message_id, data, error):
+            pel.pop(message_id)
+
+        async def claim_stale_messages(stream, group, consumer, min_idle_ms, count):
+            return [(msg_id, data, 2) for msg_id, data in pel.items()]
+
+        redeliver = AsyncMock()
+        reclaimer = IncomingReclaimer("consumer-1", redeliver=redeliver, is_local=lambda _: False)
+        batch = [
+            {**data, "_stream": INCOMING_STREAM, "_stream_msg_id": msg_id}
+            for msg_id, data in pel.items()
+        ]
+
+        with patch(
+            "agent.workers.incoming_reclaimer.move_to_dead_letter", new=move_to_dead_letter
+        ), patch(
+            "agent.workers.incoming_reclaimer.claim_stale_messages", new=claim_stale_messages
+        ):
+            await dead_letter_batch(batch, "Graph invocation failed")
+            assert await reclaimer.reclaim([INCOMING_STREAM]) == 0
+
+        redeliver.assert_not_awaited()
+        assert pel == {}
@@ -27,10 +27,15 @@ from agent.fsm import (
 )
 from agent.fsm.intent_extractor import (
     INTENT_SYNONYMS,
+    NLU_MODE_INTENT,
+    NLU_MODE_INTENT_AND_REPLY,
     _build_extraction_prompt,
     _build_state_context,
     _normalize_start_time_timezone,
     _parse_llm_response,
+    get_nlu_stats,
+    record_draft_reply_outcome,
+    reset_nlu_stats,
 )
 
 
@@ -371,6 +376,25 @@ class TestPromptContext:
 
         assert "JSON" in prompt or "json" in prompt
 
+    def test_build_extraction_prompt_has_stable_prefix(self):
+        """Static instructions come first; state and message come last (prompt caching)."""
+        first = _build_extraction_prompt(
+            message="Hola",
+            current_state=BookingState.IDLE,
+            collected_data={},
+            conversation_history=[],
+        )
+        second = _build_extraction_prompt(
+            message="El 2",
+            current_state=BookingState.SLOT_SELECTION,
+            collected_data={"services": ["Corte"]},
+            conversation_history=[{"role": "assistant", "content": "1. 10:00\n2. 11:00"}],
+        )
+
+        instructions_end = first.index("EXTRACCIÓN DE service_query")
+        assert first[:instructions_end] == second[:instructions_end]
+        assert second.index('MENSAJE DEL USUARIO: "El 2"') > instructions_end
+
 
 class TestFAQIntentHandling:
     """Tests for FAQ intent handling mid-booking (AC #7)."""
@@ -1246,3 +1270,104 @@ class TestCheckAvailabilityVagueTerms:
         assert result.entities.get("time_range") == "afternoon"
         assert "slot" not in result.entities
 
+
+class TestSingleCallMode:
+    """Tests for single-call NLU mode (intent + draft reply in one LLM call)."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_stats(self):
+        reset_nlu_stats()
+        yield
+        reset_nlu_stats()
+
+    def test_prompt_requests_draft_reply_only_in_single_call_mode(self):
+        """draft_reply field is only requested when single-call mode is on."""
+        args = ("¿A qué hora abrís?", BookingState.IDLE, {}, [])
+
+        assert "draft_reply" not in _build_extraction_prompt(*args)
+        assert "draft_reply" in _build_extraction_prompt(*args, with_draft_reply=True)
+
+    @pytest.mark.asyncio
+    async def test_parse_draft_reply(self):
+        """draft_reply is parsed; empty drafts become None."""
+        response = '{"intent_type": "faq", "entities": {}, "confidence": 0.9, "draft_reply": "Abrimos a las 10:00"}'
+        result = await _parse_llm_response(response, "¿A qué hora abrís?")
+        assert result.draft_reply == "Abrimos a las 10:00"
+
+        response = '{"intent_type": "faq", "entities": {}, "confidence": 0.9, "draft_reply": "  "}'
+        result = await _parse_llm_response(response, "¿A qué hora abrís?")
+        assert result.draft_reply is None
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_discards_draft_reply(self):
+        """A draft for an uncertain classification is not kept."""
+        response = '{"intent_type": "faq", "entities": {}, "confidence": 0.4, "draft_reply": "Abrimos a las 10:00"}'
+        result = await _parse_llm_response(response, "eh")
+
+        assert result.type == IntentType.UNKNOWN
+        assert result.draft_reply is None
+
+    @pytest.mark.asyncio
+    @patch("agent.fsm.intent_extractor._get_llm_client")
+    async def test_single_call_uses_reply_system_prompt(self, mock_get_llm):
+        """The reply system prompt is sent in the extraction call and the draft returned."""
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(
+                content='{"intent_type": "greeting", "entities": {}, "confidence": 0.95, "draft_reply": "¡Hola! Soy Maite"}',
+                usage_metadata={"input_tokens": 1200, "output_tokens": 40},
+            )
+        )
+        mock_get_llm.return_value = mock_llm
+
+        result = await extract_intent(
+            message="Buenas tardes, qué tal",
+            current_state=BookingState.IDLE,
+            collected_data={},
+            conversation_history=[],
+            reply_system_prompt="Eres Maite, asistente de Atrévete",
+        )
+
+        assert result.type == IntentType.GREETING
+        assert result.draft_reply == "¡Hola! Soy Maite"
+        system_message = mock_llm.ainvoke.call_args[0][0][0]
+        assert system_message.content.startswith("Eres Maite, asistente de Atrévete")
+
+        stats = get_nlu_stats()[NLU_MODE_INTENT_AND_REPLY]
+        assert stats["calls"] == 1
+        assert stats["avg_input_tokens"] == 1200
+        assert stats["avg_output_tokens"] == 40
+
+    @pytest.mark.asyncio
+    @patch("agent.fsm.intent_extractor._get_llm_client")
+    async def test_intent_only_mode_ignores_draft_reply(self, mock_get_llm):
+        """Without a reply system prompt, a stray draft_reply is dropped."""
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(
+                content='{"intent_type": "greeting", "entities": {}, "confidence": 0.95, "draft_reply": "¡Hola!"}',
+                usage_metadata=None,
+            )
+        )
+        mock_get_llm.return_value = mock_llm
+
+        result = await extract_intent(
+            message="Buenas tardes, qué tal",
+            current_state=BookingState.IDLE,
+            collected_data={},
+            conversation_history=[],
+        )
+
+        assert result.draft_reply is None
+        assert get_nlu_stats()[NLU_MODE_INTENT]["calls"] == 1
+        assert NLU_MODE_INTENT_AND_REPLY not in get_nlu_stats()
+
+    def test_draft_reply_outcomes_are_counted(self):
+        """Used and discarded drafts are reported separately."""
+        record_draft_reply_outcome(True)
+        record_draft_reply_outcome(False)
+        record_draft_reply_outcome(False)
+
+        stats = get_nlu_stats()[NLU_MODE_INTENT_AND_REPLY]
+        assert stats["drafts_used"] == 1
+        assert stats["drafts_discarded"] == 2
@@ -0,0 +1,236 @@
+"""
+Tests for the process-wide LLM client registry.
+
+Coverage:
+- One long-lived client per purpose, all over one shared HTTP pool
+- Per-purpose ChatOpenAI configuration
+- Clients and pool recreated after close
+- Backup clients for hedging (LLM_HEDGE_MODEL)
+- Latency histograms and pool stats
+- Provider prompt-cache hit rate from response token usage
+"""
+
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+import shared.llm_clients as llm_module
+from shared.llm_clients import (
+    LLMPurpose,
+    close_llm_clients,
+    get_backup_llm_client,
+    get_llm_client,
+    get_llm_http_client,
+    get_llm_stats,
+    reset_llm_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_registry():
+    """Start and end every test without clients or stats."""
+    await close_llm_clients()
+    reset_llm_stats()
+    yield
+    await close_llm_clients()
+    reset_llm_stats()
+
+
+def _mock_settings() -> MagicMock:
+    settings = MagicMock()
+    settings.LLM_MODEL = "openai/gpt-4o-mini"
+    settings.OPENROUTER_API_KEY = "sk-or-test"
+    settings.SITE_URL = "https://example.com"
+    settings.SITE_NAME = "Test"
+    settings.LLM_HTTP_MAX_CONNECTIONS = 7
+    settings.LLM_HTTP_MAX_KEEPALIVE = 3
+    settings.LLM_HTTP_KEEPALIVE_EXPIRY = 12.0
+    settings.LLM_HEDGE_MODEL = ""
+    settings.LLM_REPLAY_MODE = "off"
+    return settings
+
+
+class TestRegistry:
+    """Tests for get_llm_client / close_llm_clients."""
+
+    @pytest.mark.asyncio
+    async def test_same_client_per_purpose(self):
+        """Each purpose gets one long-lived client."""
+        with patch.object(llm_module, "get_settings", return_value=_mock_settings()):
+            intent_llm = get_llm_client(LLMPurpose.INTENT)
+
+            assert get_llm_client(LLMPurpose.INTENT) is intent_llm
+            assert get_llm_client(LLMPurpose.SUMMARY) is not intent_llm
+
+    @pytest.mark.asyncio
+    async def test_clients_share_http_pool(self):
+        """All purposes use the same pooled httpx client."""
+        with patch.object(llm_module, "get_settings", return_value=_mock_settings()), \
+                patch.object(llm_module, "ChatOpenAI") as mock_chat:
+            get_llm_client(LLMPurpose.INTENT)
+            get_llm_client(LLMPurpose.RESPONSE)
+
+            http_clients = {
+                id(call.kwargs["http_async_client"]) for call in mock_chat.call_args_list
+            }
+            assert http_clients == {id(get_llm_http_client())}
+
+    @pytest.mark.asyncio
+    async def test_purpose_configuration(self):
+        """Purpose-specific parameters are applied."""
+        with patch.object(llm_module, "get_settings", return_value=_mock_settings()), \
+                patch.object(llm_module, "ChatOpenAI") as mock_chat:
+            get_llm_client(LLMPurpose.INTENT)
+            get_llm_client(LLMPurpose.SUMMARY)
+
+            intent_kwargs = mock_chat.call_args_list[0].kwargs
+            summary_kwargs = mock_chat.call_args_list[1].kwargs
+            assert intent_kwargs["temperature"] == 0.1
+            assert intent_kwargs["request_timeout"] == 15.0
+            assert summary_kwargs["max_tokens"] == 300
+            assert intent_kwargs["base_url"] == "https://openrouter.ai/api/v1"
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_from_settings(self):
+        """Connection limits come from LLM_HTTP_* settings."""
+        with patch.object(llm_module, "get_settings", return_value=_mock_settings()):
+            get_llm_http_client()
+            stats = get_llm_stats()["pool"]
+
+            assert stats["initialized"] is True
+            assert stats["max_connections"] == 7
+            assert stats["max_keepalive"] == 3
+
+    @pytest.mark.asyncio
+    async def test_recreated_after_close(self):
+        """Closing drops clients and the pool; next use creates new ones."""
+        with patch.object(llm_module, "get_settings", return_value=_mock_settings()):
+            http_client = get_llm_http_client()
+            llm = get_llm_client(LLMPurpose.RESPONSE)
+
+            await close_llm_clients()
+
+            assert http_client.is_closed
+            assert get_llm_client(LLMPurpose.RESPONSE) is not llm
+            assert get_llm_http_client() is not http_client
+
+    @pytest.mark.asyncio
+    async def test_backup_client_uses_hedge_model(self):
+        """Backup clients exist only with LLM_HEDGE_MODEL and keep purpose config."""
+        settings = _mock_settings()
+        with patch.object(llm_module, "get_settings", return_value=settings), \
+                patch.object(llm_module, "ChatOpenAI", side_effect=lambda **_: MagicMock()) \
+                as mock_chat:
+            assert get_backup_llm_client(LLMPurpose.INTENT) is None
+
+            settings.LLM_HEDGE_MODEL = "google/gemini-2.0-flash-001"
+            backup = get_backup_llm_client(LLMPurpose.INTENT)
+
+            assert get_backup_llm_client(LLMPurpose.INTENT) is backup
+            assert backup is not get_llm_client(LLMPurpose.INTENT)
+            backup_kwargs = mock_chat.call_args_list[0].kwargs
+            assert backup_kwargs["model"] == "google/gemini-2.0-flash-001"
+            assert backup_kwargs["request_timeout"] == 15.0
+            assert backup_kwargs["callbacks"][0].stats_key == "intent:backup"
+
+    @pytest.mark.asyncio
+    async def test_close_without_clients_is_noop(self):
+        """close_llm_clients() is safe when nothing was created."""
+        await close_llm_clients()
+
+
+class TestLatencyStats:
+    """Tests for per-purpose latency histograms."""
+
+    def test_recorder_buckets_latency(self):
+        """Calls are counted in the matching histogram bucket."""
+        recorder = llm_module._LatencyRecorder(LLMPurpose.INTENT)
+        run_id = uuid4()
+
+        with patch.object(llm_module.time, "monotonic", side_effect=[10.0, 10.8]):
+            recorder.on_chat_model_start({}, [], run_id=run_id)
+            recorder.on_llm_end(MagicMock(), run_id=run_id)
+
+        stats = get_llm_stats()["latency"]["intent"]
+        assert stats["calls"] == 1
+        assert stats["errors"] == 0
+        assert stats["buckets"]["1000"] == 1
+        assert stats["avg_ms"] == pytest.approx(800.0)
+
+    def test_errors_and_slow_calls(self):
+        """Failed calls count as errors; calls over the last bucket go to +Inf."""
+        recorder = llm_module._LatencyRecorder(LLMPurpose.SUMMARY)
+        run_id = uuid4()
+
+        with patch.object(llm_module.time, "monotonic", side_effect=[0.0, 45.0]):
+            recorder.on_chat_model_start({}, [], run_id=run_id)
+            recorder.on_llm_error(TimeoutError(), run_id=run_id)
+
+        stats = get_llm_stats()["latency"]["summary"]
+        assert stats["errors"] == 1
+        assert stats["buckets"]["+Inf"] == 1
+        assert stats["max_ms"] == pytest.approx(45000.0)
+
+    def test_end_without_start_is_ignored(self):
+        """An unknown run_id does not record anything."""
+        recorder = llm_module._LatencyRecorder(LLMPurpose.RESPONSE)
+        recorder.on_llm_end(MagicMock(), run_id=uuid4())
+
+        assert get_llm_stats()["latency"] == {}
+
+
+class TestPromptCacheStats:
+    """Tests for prompt-cache telemetry (cached_tokens / prompt_tokens)."""
+
+    def test_usage_metadata_cache_read(self):
+        """cache_read of usage_metadata counts as cached prompt tokens."""
+        recorder = llm_module._LatencyRecorder(LLMPurpose.INTENT)
+        hit, miss = uuid4(), uuid4()
+        message = MagicMock(
+            usage_metadata={
+                "input_tokens": 2000,
+                "output_tokens": 30,
+                "input_token_details": {"cache_read": 1536},
+            }
+        )
+        cached_response = MagicMock(generations=[[MagicMock(message=message)]])
+        uncached_response = MagicMock(
+            generations=[],
+            llm_output={"token_usage": {"prompt_tokens": 2000}},
+        )
+
+        with patch.object(llm_module.time, "monotonic", side_effect=[0.0, 0.4, 1.0, 2.0]):
+            recorder.on_chat_model_start({}, [], run_id=hit)
+            recorder.on_llm_end(cached_response, run_id=hit)
+            recorder.on_chat_model_start({}, [], run_id=miss)
+            recorder.on_llm_end(uncached_response, run_id=miss)
+
+        stats = get_llm_stats()["latency"]["intent"]
+        assert stats["prompt_tokens"] == 4000
+        assert stats["cached_tokens"] == 1536
+        assert stats["cache_hit_rate"] == pytest.approx(1536 / 4000)
+        assert stats["avg_ms_cache_hit"] == pytest.approx(400.0)
+        assert stats["avg_ms_cache_miss"] == pytest.approx(1000.0)
+
+    def test_raw_token_usage_fallback(self):
+        """prompt_tokens_details.cached_tokens of llm_output is used without usage_metadata."""
+        recorder = llm_module._LatencyRecorder(LLMPurpose.RESPONSE)
+        run_id = uuid4()
+        response = MagicMock(
+            generations=[],
+            llm_output={
+                "token_usage": {
+                    "prompt_tokens": 1200,
+                    "prompt_tokens_details": {"cached_tokens": 1024},
+                }
+            },
+        )
+
+        with patch.object(llm_module.time, "monotonic", side_effect=[0.0, 0.5]):
+            recorder.on_chat_model_start({}, [], run_id=run_id)
+            recorder.on_llm_end(response, run_id=run_id)
+
+        stats = get_llm_stats()["latency"]["response"]
+        assert stats["cached_tokens"] == 1024
+        assert stats["cache_hit_calls"] == 1
@@ -0,0 +1,194 @@
+"""
+Tests for latency-hedged LLM calls.
+
+Coverage:
+- Fast primaries are never hedged
+- Slow primaries race the backup; the first answer wins, the other is cancelled
+- Failures fall through to the other request, or the primary's error
+- Hedge budget per purpose and p95-derived hedge delay
+- Hedging disabled without LLM_HEDGE_MODEL
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import shared.llm_hedging as hedging_module
+from shared.llm_clients import LLMPurpose
+from shared.llm_hedging import (
+    HedgedLLM,
+    get_hedge_stats,
+    get_hedged_llm_client,
+    reset_hedge_stats,
+)
+
+FAST_POLICY = {
+    "min_delay_seconds": 0.01,
+    "max_delay_seconds": 0.05,
+    "default_delay_seconds": 0.02,
+    "budget_ratio": 0.25,
+}
+
+
+@pytest.fixture(autouse=True)
+def fast_policies():
+    """Millisecond hedge delays and fresh counters for every test."""
+    reset_hedge_stats()
+    with patch.dict(hedging_module._HEDGE_CONFIG, {LLMPurpose.INTENT: FAST_POLICY}):
+        yield
+    reset_hedge_stats()
+
+
+class _Model:
+    """Chat model stand-in answering after a delay."""
+
+    def __init__(self, name: str, delay: float, error: Exception | None = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        response = MagicMock(content=self.name)
+        response.usage_metadata = {"input_tokens": 100, "output_tokens": 20}
+        return response
+
+
+def _hedged(primary: _Model, backup: _Model) -> HedgedLLM:
+    return HedgedLLM(LLMPurpose.INTENT, primary, backup)
+
+
+class TestHedgedCalls:
+    """Tests for HedgedLLM.ainvoke."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_not_hedged(self):
+        backup = _Model("backup", 0)
+
+        response = await _hedged(_Model("primary", 0), backup).ainvoke("hola")
+
+        assert response.content == "primary"
+        stats = get_hedge_stats()["intent"]
+        assert stats["calls"] == 1
+        assert stats["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_backup(self):
+        primary = _Model("primary", 5)
+
+        response = await _hedged(primary, _Model("backup", 0)).ainvoke("hola")
+        await asyncio.sleep(0)  # Let the cancelled loser run its cancellation
+
+        assert response.content == "backup"
+        assert primary.cancelled
+        stats = get_hedge_stats()["intent"]
+        assert stats["hedged"] == 1
+        assert stats["backup_wins"] == 1
+        assert stats["backup_input_tokens"] == 100
+        assert stats["backup_output_tokens"] == 20
+
+    @pytest.mark.asyncio
+    async def test_primary_can_still_win_after_hedge(self):
+        backup = _Model("backup", 5)
+
+        response = await _hedged(_Model("primary", 0.1), backup).ainvoke("hola")
+        await asyncio.sleep(0)
+
+        assert response.content == "primary"
+        assert backup.cancelled
+        assert get_hedge_stats()["intent"]["primary_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_backup_falls_back_to_primary(self):
+        backup = _Model("backup", 0, error=RuntimeError("provider error"))
+
+        response = await _hedged(_Model("primary", 0.1), backup).ainvoke("hola")
+
+        assert response.content == "primary"
+
+    @pytest.mark.asyncio
+    async def test_both_failed_raises_primary_error(self):
+        primary = _Model("primary", 0.1, error=TimeoutError("primary timeout"))
+        backup = _Model("backup", 0, error=RuntimeError("provider error"))
+
+        with pytest.raises(TimeoutError):
+            await _hedged(primary, backup).ainvoke("hola")
+
+    @pytest.mark.asyncio
+    async def test_bind_tools_binds_both_models(self):
+        primary, backup = MagicMock(), MagicMock()
+
+        bound = HedgedLLM(LLMPurpose.INTENT, primary, backup).bind_tools(["tool"])
+
+        assert bound.primary is primary.bind_tools.return_value
+        assert bound.backup is backup.bind_tools.return_value
+        primary.bind_tools.assert_called_once_with(["tool"])
+
+
+class TestHedgePolicy:
+    """Tests for the hedge budget and delay."""
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self):
+        """Once the burst is spent, slow calls wait for the primary."""
+        llm = _hedged(_Model("primary", 0.06), _Model("backup", 5))
+
+        for _ in range(5):
+            await llm.ainvoke("hola")
+
+        stats = get_hedge_stats()["intent"]
+        assert stats["hedged"] == 4  # Burst of 3, plus 0.25 earned per call
+        assert stats["budget_exhausted"] == 1
+        assert stats["hedged"] == stats["primary_wins"]
+
+    def test_delay_follows_recent_p95(self):
+        policy = hedging_module._HedgePolicy(
+            min_delay_seconds=1.0,
+            max_delay_seconds=10.0,
+            default_delay_seconds=4.0,
+            budget_ratio=0.1,
+        )
+        assert policy.hedge_delay() == 4.0
+
+        for i in range(100):
+            policy.record_primary(2.0 if i < 95 else 9.0)
+        assert policy.hedge_delay() == 9.0
+
+        for _ in range(200):
+            policy.record_primary(0.2)
+        assert policy.hedge_delay() == 1.0  # Clamped to the minimum
+
+
+class TestGetHedgedClient:
+    """Tests for get_hedged_llm_client."""
+
+    def test_without_backup_model_returns_primary(self):
+        primary = MagicMock()
+        with patch.object(hedging_module, "get_llm_client", return_value=primary), \
+                patch.object(hedging_module, "get_backup_llm_client", return_value=None):
+            assert get_hedged_llm_client(LLMPurpose.INTENT) is primary
+
+    def test_summary_not_hedged(self):
+        primary = MagicMock()
+        with patch.object(hedging_module, "get_llm_client", return_value=primary), \
+                patch.object(hedging_module, "get_backup_llm_client") as mock_backup:
+            assert get_hedged_llm_client(LLMPurpose.SUMMARY) is primary
+            mock_backup.assert_not_called()
+
+    def test_with_backup_model_returns_hedged_client(self):
+        primary, backup = MagicMock(), MagicMock()
+        with patch.object(hedging_module, "get_llm_client", return_value=primary), \
+                patch.object(hedging_module, "get_backup_llm_client", return_value=backup):
+            llm = get_hedged_llm_client(LLMPurpose.INTENT)
+
+        assert isinstance(llm, HedgedLLM)
+        assert llm.primary is primary
+        assert llm.backup is backup
@@ -0,0 +1,183 @@
+"""
+Tests for the LLM record/replay stand-in.
+
+Coverage:
+- Normalized prompt keys (whitespace, current date/time, Spanish dates, tool ids)
+- Recording appends to the cassette, replay serves it back
+- A slot-list prompt generated on another day replays
+- Replay misses raise ReplayMissError
+- Seeded synthetic latency
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from agent.services.confirmation_service import format_date_spanish
+from shared.llm_replay import (
+    LLMCassette,
+    RecordingChatModel,
+    ReplayChatModel,
+    ReplayMissError,
+    get_replay_stats,
+    prompt_key,
+    reset_replay_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    reset_replay_stats()
+    yield
+    reset_replay_stats()
+
+
+def _tool(name: str) -> MagicMock:
+    tool = MagicMock()
+    tool.name = name
+    return tool
+
+
+def _slot_prompt(now: datetime) -> list:
+    """Booking prompt as generated on `now`: current time plus the next 3 days of slots."""
+    slots = "\n".join(
+        f"{index}. {format_date_spanish(now + timedelta(days=index))} a las 10:00"
+        for index in range(1, 4)
+    )
+    return [
+        SystemMessage(
+            content=f"Eres Maite.\n- Fecha y hora actual: {format_date_spanish(now)}, "
+            f"{now:%H:%M}\n- Hoy: {now:%Y-%m-%d}"
+        ),
+        HumanMessage(content=f"Horarios disponibles:\n{slots}\n¿Cuál prefieres?"),
+    ]
+
+
+class TestPromptKey:
+    """Tests for prompt_key normalization."""
+
+    def test_whitespace_and_current_time_ignored(self):
+        first = [
+            SystemMessage(content="Eres Maite.\n\n- Fecha y hora actual: lunes 5 de enero, 10:30"),
+            HumanMessage(content="Hola  "),
+        ]
+        second = [
+            SystemMessage(content="Eres Maite.\n- Fecha y hora actual: martes 6 de enero, 18:05"),
+            HumanMessage(content="Hola"),
+        ]
+
+        assert prompt_key("response", first) == prompt_key("response", second)
+
+    def test_iso_dates_masked(self):
+        assert prompt_key("intent", "Hoy es 2026-01-05T10:30:00+01:00") == prompt_key(
+            "intent", "Hoy es 2026-02-11T09:00:00+01:00"
+        )
+
+    def test_spanish_dates_and_weekdays_masked(self):
+        assert prompt_key("response", "El miércoles 12 de marzo a las 10:00") == prompt_key(
+            "response", "El Sábado 4 de octubre de 2026 a las 10:00"
+        )
+        assert prompt_key("response", "Cerrado el 25 de diciembre") == prompt_key(
+            "response", "Cerrado el 1 de enero"
+        )
+
+    def test_purpose_tools_and_content_distinguish_requests(self):
+        base = prompt_key("response", "Hola")
+
+        assert prompt_key("intent", "Hola") != base
+        assert prompt_key("response", "Hola", ("query_info",)) != base
+        assert prompt_key("response", "Adiós") != base
+
+    def test_tool_call_ids_ignored(self):
+        def history(call_id: str) -> list:
+            return [
+                AIMessage(
+                    content="",
+                    tool_calls=[{"name": "query_info", "args": {"type": "hours"}, "id": call_id}],
+                )
+            ]
+
+        assert prompt_key("response", history("call_1")) == prompt_key(
+            "response", history("call_2")
+        )
+
+
+class TestRecordReplay:
+    """Tests for RecordingChatModel / ReplayChatModel."""
+
+    @pytest.mark.asyncio
+    async def test_recorded_response_is_replayed(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        inner = MagicMock()
+        bound = inner.bind_tools.return_value
+        bound.ainvoke = AsyncMock(
+            return_value=AIMessage(
+                content="",
+                tool_calls=[{"name": "query_info", "args": {"type": "hours"}, "id": "call_1"}],
+            )
+        )
+        messages = [HumanMessage(content="¿Qué horario tenéis?")]
+
+        recorder = RecordingChatModel(inner, LLMCassette(path), "response")
+        await recorder.bind_tools([_tool("query_info")]).ainvoke(messages)
+
+        replay = ReplayChatModel(LLMCassette(path), "response")
+        response = await replay.bind_tools([_tool("query_info")]).ainvoke(messages)
+
+        assert response.tool_calls[0]["name"] == "query_info"
+        assert response.tool_calls[0]["args"] == {"type": "hours"}
+        assert get_replay_stats() == {"recorded": 1, "hits": 1, "misses": 0}
+
+    @pytest.mark.asyncio
+    async def test_slot_list_from_another_day_is_replayed(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        inner = MagicMock()
+        inner.ainvoke = AsyncMock(return_value=AIMessage(content="Te reservo la primera."))
+        recorded_on = datetime(2026, 3, 11, 10, 0)
+
+        recorder = RecordingChatModel(inner, LLMCassette(path), "response")
+        await recorder.ainvoke(_slot_prompt(recorded_on))
+
+        replay = ReplayChatModel(LLMCassette(path), "response")
+        response = await replay.ainvoke(_slot_prompt(recorded_on + timedelta(days=1, hours=7)))
+
+        assert response.content == "Te reservo la primera."
+        assert get_replay_stats() == {"recorded": 1, "hits": 1, "misses": 0}
+
+    @pytest.mark.asyncio
+    async def test_last_recording_wins(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        cassette = LLMCassette(path)
+        key = prompt_key("intent", "Hola")
+        cassette.record(key, "intent", "Hola", AIMessage(content="uno"))
+        cassette.record(key, "intent", "Hola", AIMessage(content="dos"))
+
+        response = await ReplayChatModel(LLMCassette(path), "intent").ainvoke("Hola")
+
+        assert response.content == "dos"
+
+    @pytest.mark.asyncio
+    async def test_missing_request_raises(self, tmp_path):
+        replay = ReplayChatModel(LLMCassette(tmp_path / "empty.jsonl"), "intent")
+
+        with pytest.raises(ReplayMissError):
+            await replay.ainvoke("Hola")
+        assert get_replay_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_synthetic_latency_is_seeded(self, tmp_path):
+        cassette = LLMCassette(tmp_path / "cassette.jsonl")
+        cassette.record(prompt_key("intent", "Hola"), "intent", "Hola", AIMessage(content="ok"))
+
+        delays = []
+        for _ in range(2):
+            replay = ReplayChatModel(cassette, "intent", latency_ms=100, jitter_ms=50, seed=7)
+            with patch("shared.llm_replay.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+                await replay.ainvoke("Hola")
+                await replay.ainvoke("Hola")
+            delays.append([call.args[0] for call in mock_sleep.await_args_list])
+
+        assert delays[0] == delays[1]
+        assert all(0.05 <= delay <= 0.15 for delay in delays[0])
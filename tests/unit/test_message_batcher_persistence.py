@@ -0,0 +1,218 @@
+"""
+Tests for MessageBatcher Redis persistence and memory bounds.
+
+Coverage:
+- Append-only persistence (RPUSH + EXPIRE pipeline per message)
+- In-flight key deleted after success, kept after a failed callback
+- Locks and timers pruned after processing
+- Batch size limit
+- Recovery of pending, in-flight and legacy (JSON string) batches
+"""
+
+import asyncio
+import json
+
+import pytest
+from redis.exceptions import ResponseError
+
+from agent.batching.message_batcher import (
+    BATCH_INFLIGHT_PREFIX,
+    BATCH_KEY_PREFIX,
+    BATCH_TTL_SECONDS,
+    MessageBatcher,
+)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the list commands used by the batcher."""
+
+    def __init__(self):
+        self.data: dict[str, list[str] | str] = {}
+        self.ttls: dict[str, int] = {}
+        self.pipelines = 0
+
+    async def rpush(self, key, value):
+        self.data.setdefault(key, []).append(value)
+        return len(self.data[key])
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    async def lrange(self, key, start, end):
+        value = self.data.get(key, [])
+        if isinstance(value, str):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return list(value[start:] if end == -1 else value[start:end + 1])
+
+    async def ltrim(self, key, start, end):
+        self.data[key] = self.data[key][start:] if end == -1 else self.data[key][start:end + 1]
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def rename(self, src, dst):
+        if src not in self.data:
+            raise ResponseError("ERR no such key")
+        self.data[dst] = self.data.pop(src)
+        self.ttls[dst] = self.ttls.pop(src, None)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def scan(self, cursor=0, match="*", count=100):
+        prefix = match.rstrip("*")
+        return 0, [key for key in self.data if key.startswith(prefix)]
+
+    def pipeline(self, transaction=True):
+        self.pipelines += 1
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self._redis, n)(*a, **kw) for n, a, kw in self._calls]
+
+
+def _batcher(redis, processed, window_seconds=0.1, fail=False, **kwargs) -> MessageBatcher:
+    async def callback(conversation_id, messages):
+        processed.append((conversation_id, [m["message_text"] for m in messages]))
+        if fail:
+            raise RuntimeError("graph failed")
+
+    batcher = MessageBatcher(window_seconds=window_seconds, redis_client=redis, **kwargs)
+    batcher.set_callback(callback)
+    return batcher
+
+
+class TestBatchPersistence:
+    """Tests for persistence while batching."""
+
+    @pytest.mark.asyncio
+    async def test_messages_are_appended(self):
+        """Each message is one RPUSH of that message only, with the TTL refreshed."""
+        redis, processed = FakeRedis(), []
+        batcher = _batcher(redis, processed, window_seconds=10)
+
+        for text in ("Hola", "quiero cita", "mañana"):
+            await batcher.add_message("conv-1", {"message_text": text})
+
+        stored = redis.data[f"{BATCH_KEY_PREFIX}conv-1"]
+        assert [json.loads(item)["message_text"] for item in stored] == [
+            "Hola", "quiero cita", "mañana"
+        ]
+        assert redis.pipelines == 3
+        assert redis.ttls[f"{BATCH_KEY_PREFIX}conv-1"] == BATCH_TTL_SECONDS
+        await batcher.flush_all()
+
+    @pytest.mark.asyncio
+    async def test_processed_batch_is_deleted_and_state_pruned(self):
+        """After a successful callback nothing is left in Redis or in memory."""
+        redis, processed = FakeRedis(), []
+        batcher = _batcher(redis, processed)
+
+        await batcher.add_message("conv-1", {"message_text": "Hola"})
+        await asyncio.sleep(0.2)
+
+        assert processed == [("conv-1", ["Hola"])]
+        assert redis.data == {}
+        assert batcher.locks == {}
+        assert batcher.timers == {}
+        assert batcher.deadlines == {}
+        assert batcher.batches == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_stays_in_flight(self):
+        """A failed callback keeps the batch under an in-flight key for recovery."""
+        redis, processed = FakeRedis(), []
+        batcher = _batcher(redis, processed, fail=True)
+
+        await batcher.add_message("conv-1", {"message_text": "Hola"})
+        await asyncio.sleep(0.2)
+
+        assert len(processed) == 1
+        keys = list(redis.data)
+        assert len(keys) == 1
+        assert keys[0].startswith(f"{BATCH_INFLIGHT_PREFIX}conv-1:")
+
+    @pytest.mark.asyncio
+    async def test_flush_all_clears_persisted_batches(self):
+        """Batches processed on shutdown are not recovered again on startup."""
+        redis, processed = FakeRedis(), []
+        batcher = _batcher(redis, processed, window_seconds=10)
+
+        await batcher.add_message("conv-1", {"message_text": "Hola"})
+        await batcher.flush_all()
+
+        assert processed == [("conv-1", ["Hola"])]
+        assert redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit_flushes(self):
+        """A batch reaching max_batch_messages does not wait for its window."""
+        redis, processed = FakeRedis(), []
+        batcher = _batcher(redis, processed, window_seconds=10, max_batch_messages=3)
+
+        for i in range(3):
+            await batcher.add_message("conv-1", {"message_text": f"m{i}"})
+        await asyncio.sleep(0.05)
+
+        assert processed == [("conv-1", ["m0", "m1", "m2"])]
+        assert batcher.pending_count == 0
+
+
+class TestBatchRecovery:
+    """Tests for recover_pending_batches."""
+
+    @pytest.mark.asyncio
+    async def test_recovers_in_flight_then_pending(self):
+        """Unfinished and open batches of a conversation are processed together, in order."""
+        redis, processed = FakeRedis(), []
+        redis.data[f"{BATCH_INFLIGHT_PREFIX}conv-1:100"] = [json.dumps({"message_text": "a"})]
+        redis.data[f"{BATCH_KEY_PREFIX}conv-1"] = [json.dumps({"message_text": "b"})]
+        redis.data[f"{BATCH_KEY_PREFIX}conv-2"] = [json.dumps({"message_text": "c"})]
+        batcher = _batcher(redis, processed)
+
+        recovered = await batcher.recover_pending_batches(
+            conversation_filter=lambda cid: cid == "conv-1"
+        )
+
+        assert recovered == 1
+        assert processed == [("conv-1", ["a", "b"])]
+        assert list(redis.data) == [f"{BATCH_KEY_PREFIX}conv-2"]
+
+    @pytest.mark.asyncio
+    async def test_recovers_legacy_string_batches(self):
+        """Batches persisted as one JSON string by older versions are still recovered."""
+        redis, processed = FakeRedis(), []
+        redis.data[f"{BATCH_KEY_PREFIX}conv-1"] = json.dumps([{"message_text": "Hola"}])
+        batcher = _batcher(redis, processed)
+
+        assert await batcher.recover_pending_batches() == 1
+        assert processed == [("conv-1", ["Hola"])]
+        assert redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_recovery_keeps_open_batch(self):
+        """Messages of a batch already open in this process are not recovered."""
+        redis, processed = FakeRedis(), []
+        redis.data[f"{BATCH_KEY_PREFIX}conv-1"] = [json.dumps({"message_text": "old"})]
+        batcher = _batcher(redis, processed, window_seconds=10)
+        await batcher.add_message("conv-1", {"message_text": "new"})
+
+        assert await batcher.recover_pending_batches() == 1
+        assert processed == [("conv-1", ["old"])]
+        stored = redis.data[f"{BATCH_KEY_PREFIX}conv-1"]
+        assert [json.loads(item)["message_text"] for item in stored] == ["new"]
+
+        await batcher.flush_all()
+        assert processed[-1] == ("conv-1", ["new"])
+        assert redis.data == {}
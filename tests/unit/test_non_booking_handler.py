@@ -5,8 +5,9 @@ This module tests the NonBookingHandler that processes non-booking intents
 (GREETING, FAQ, ESCALATE, UNKNOWN) using LLM with safe tools only.
 
 Coverage:
-- _build_messages method (FSM context inclusion)
-- _execute_tool method (safe tool execution)
+- _build_messages method (FSM context inclusion, conversation summary)
+- System prompt segment order (stable prefix for prompt caching)
+- _execute_tool method (safe tool execution, per-tool timeouts)
 - Safe tool binding (3 tools only)
 - No booking tools available
 - LLM conversational handling
@@ -154,6 +155,42 @@ class TestNonBookingHandlerSafeTools:
             assert "error" in result_dict
             assert "Database error" in result_dict["error"]
 
+    @pytest.mark.asyncio
+    async def test_read_tool_timeout_is_reported_as_error(self, non_booking_handler):
+        """Verify a read tool exceeding its timeout returns an error result."""
+        import asyncio
+
+        async def hang(args):
+            await asyncio.sleep(1)
+
+        tool_call = {"name": "query_info", "args": {}, "id": "call_1"}
+
+        with patch("agent.tools.query_info") as mock_tool, \
+                patch.dict(
+                    "agent.routing.non_booking_handler.TOOL_TIMEOUT_SECONDS",
+                    {"query_info": 0.01},
+                ):
+            mock_tool.ainvoke = AsyncMock(side_effect=hang)
+
+            result = await non_booking_handler._execute_tool(tool_call)
+
+        assert "timed out" in json.loads(result)["error"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tool_name", ["manage_customer", "escalate_to_human"])
+    async def test_write_tools_are_not_cancelled(self, non_booking_handler, tool_name):
+        """Verify write tools run to completion (no wait_for around them)."""
+        tool_call = {"name": tool_name, "args": {}, "id": "call_2"}
+
+        with patch(f"agent.tools.{tool_name}") as mock_tool, \
+                patch("agent.routing.non_booking_handler.asyncio.wait_for") as mock_wait_for:
+            mock_tool.ainvoke = AsyncMock(return_value={"success": True})
+
+            result = await non_booking_handler._execute_tool(tool_call)
+
+        mock_wait_for.assert_not_called()
+        assert json.loads(result) == {"success": True}
+
 
 class TestNonBookingHandlerMessageBuilding:
     """Test _build_messages method."""
@@ -223,6 +260,20 @@ class TestNonBookingHandlerMessageBuilding:
             f"Expected max 6 non-system messages, got {len(non_system_messages)}"
         )
 
+    def test_build_messages_includes_conversation_summary(
+        self, mock_state_with_history, mock_llm, mock_fsm_idle
+    ):
+        """Verify the summary follows the system prompt, before the history."""
+        state = {**mock_state_with_history, "conversation_summary": "Cliente pidió mechas."}
+        handler = NonBookingHandler(state, mock_llm, mock_fsm_idle)
+
+        intent = Intent(type=IntentType.FAQ, raw_message="¿Cuánto cuesta?")
+        messages = handler._build_messages(intent)
+
+        assert messages[1].type == "system"
+        assert "Cliente pidió mechas." in messages[1].content
+        assert messages[2].content == "Hola"
+
     def test_build_messages_adds_current_user_message(self, non_booking_handler):
         """Verify current user message is added at the end."""
         intent = Intent(
@@ -237,6 +288,25 @@ class TestNonBookingHandlerMessageBuilding:
         assert last_message.type == "human"
         assert last_message.content == "¿Dónde están ubicados?"
 
+    def test_system_prompt_orders_segments_by_stability(
+        self, non_booking_handler_with_active_booking
+    ):
+        """Verify time and booking state come after persona, business and customer context."""
+        handler, _ = non_booking_handler_with_active_booking
+
+        prompt = handler.build_system_prompt(
+            {"current_datetime": "lunes 10 de noviembre 10:42", "salon_address": "Calle Mayor 1"}
+        )
+
+        positions = [
+            prompt.index("RESPONSABILIDADES"),
+            prompt.index("CONTEXTO DEL NEGOCIO"),
+            prompt.index("DATOS DEL CLIENTE"),
+            prompt.index("lunes 10 de noviembre 10:42"),
+            prompt.index("CONTEXTO DE RESERVA ACTUAL"),
+        ]
+        assert positions == sorted(positions)
+
 
 class TestNonBookingHandlerHandleMethod:
     """Test handle method integration."""
@@ -0,0 +1,211 @@
+"""
+Tests for OutgoingSender - Reliable delivery over OUTGOING_STREAM.
+
+Coverage:
+- ACK only after a successful Chatwoot send
+- Per-conversation ordering and cross-conversation concurrency
+- Failed sends are retried in place, ahead of later replies of the conversation,
+  and dead-lettered after too many attempts; shutdown leaves them pending
+- Reclaim of abandoned entries and dead-lettering after too many deliveries
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agent.workers.outgoing_sender import OutgoingSender
+from shared.redis_client import CONSUMER_GROUP, OUTGOING_STREAM
+
+
+def _payload(conversation_id: str, text: str) -> dict:
+    return {"conversation_id": conversation_id, "customer_phone": "+34612345678", "message": text}
+
+
+async def _wait_idle(sender: OutgoingSender) -> None:
+    await asyncio.gather(*list(sender._tasks.values()))
+
+
+@pytest.fixture
+def mock_ack():
+    with patch("agent.workers.outgoing_sender.acknowledge_message", new=AsyncMock()) as ack:
+        yield ack
+
+
+@pytest.fixture
+def mock_retain():
+    with patch(
+        "agent.workers.outgoing_sender.retain_pending_message", new=AsyncMock()
+    ) as retain:
+        yield retain
+
+
+class TestOutgoingSender:
+    """Tests for OutgoingSender."""
+
+    @pytest.mark.asyncio
+    async def test_acks_after_successful_send(self, mock_ack):
+        """A successfully sent reply is acknowledged."""
+        chatwoot = MagicMock()
+        chatwoot.send_message = AsyncMock(return_value=True)
+        sender = OutgoingSender(chatwoot, "consumer-1")
+
+        sender.dispatch("1-0", _payload("10", "Hola"))
+        await _wait_idle(sender)
+
+        chatwoot.send_message.assert_called_once_with("+34612345678", "Hola", conversation_id="10")
+        mock_ack.assert_called_once_with(OUTGOING_STREAM, CONSUMER_GROUP, "1-0")
+        assert sender.stats()["sent"] == 1
+        assert sender.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_send_is_retried_before_later_replies(self, mock_ack, mock_retain):
+        """A reply dispatched after a failure waits until the failed one is resent."""
+        sent: list[str] = []
+        first_failed = asyncio.Event()
+        retry = asyncio.Event()
+
+        async def send_message(phone, text, conversation_id=None):
+            if text == "primero" and not first_failed.is_set():
+                first_failed.set()
+                return False
+            sent.append(text)
+            return True
+
+        chatwoot = MagicMock()
+        chatwoot.send_message = send_message
+        sender = OutgoingSender(chatwoot, "consumer-1")
+
+        async def backoff(attempts):
+            await retry.wait()
+            return True
+
+        sender._backoff = backoff
+
+        sender.dispatch("1-0", _payload("10", "primero"))
+        await first_failed.wait()
+        sender.dispatch("2-0", _payload("10", "segundo"))
+        await asyncio.sleep(0.01)
+
+        assert sent == []
+        mock_ack.assert_not_called()
+
+        retry.set()
+        await _wait_idle(sender)
+
+        assert sent == ["primero", "segundo"]
+        assert [c.args[2] for c in mock_ack.call_args_list] == ["1-0", "2-0"]
+        mock_retain.assert_called_once_with(OUTGOING_STREAM, CONSUMER_GROUP, "consumer-1", "1-0")
+        assert sender.stats()["failed"] == 1
+        assert sender.stats()["retried"] == 1
+        assert sender.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_send_failing_every_attempt_is_dead_lettered(self, mock_ack, mock_retain):
+        """After max_deliveries failed attempts the reply is dead-lettered; the queue moves on."""
+        chatwoot = MagicMock()
+        chatwoot.send_message = AsyncMock(
+            side_effect=lambda phone, text, conversation_id=None: text != "roto"
+        )
+        sender = OutgoingSender(chatwoot, "consumer-1", max_deliveries=3, retry_base_seconds=0)
+
+        with patch(
+            "agent.workers.outgoing_sender.move_to_dead_letter", new=AsyncMock()
+        ) as mock_dlq:
+            sender.dispatch("1-0", _payload("10", "roto"))
+            sender.dispatch("2-0", _payload("10", "siguiente"))
+            await _wait_idle(sender)
+
+        assert [c.args[1] for c in chatwoot.send_message.call_args_list] == [
+            "roto", "roto", "roto", "siguiente",
+        ]
+        mock_dlq.assert_called_once()
+        assert mock_dlq.call_args[0][2] == "1-0"
+        mock_ack.assert_called_once_with(OUTGOING_STREAM, CONSUMER_GROUP, "2-0")
+        assert sender.stats()["dead_lettered"] == 1
+        assert sender.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_shutdown_leaves_failed_replies_pending(self, mock_ack, mock_retain):
+        """Shutdown interrupts the retry backoff; unsent replies stay pending."""
+        chatwoot = MagicMock()
+        chatwoot.send_message = AsyncMock(return_value=False)
+        sender = OutgoingSender(chatwoot, "consumer-1")
+
+        sender.dispatch("1-0", _payload("10", "primero"))
+        sender.dispatch("2-0", _payload("10", "segundo"))
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(sender._drain(), timeout=1)
+
+        assert chatwoot.send_message.call_count == 1
+        mock_ack.assert_not_called()
+        assert sender.stats()["retried"] == 0
+        assert sender.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_orders_per_conversation_and_runs_conversations_concurrently(self, mock_ack):
+        """Replies of one conversation are sequential; a slow one does not block others."""
+        release = asyncio.Event()
+        sent: list[str] = []
+
+        async def send_message(phone, text, conversation_id=None):
+            if text == "lento":
+                await release.wait()
+            sent.append(text)
+            return True
+
+        chatwoot = MagicMock()
+        chatwoot.send_message = send_message
+        sender = OutgoingSender(chatwoot, "consumer-1", max_concurrency=4)
+
+        sender.dispatch("1-0", _payload("10", "lento"))
+        sender.dispatch("2-0", _payload("10", "después"))
+        sender.dispatch("3-0", _payload("20", "otro cliente"))
+        await asyncio.sleep(0.01)
+
+        assert sent == ["otro cliente"]
+        release.set()
+        await _wait_idle(sender)
+
+        assert sent == ["otro cliente", "lento", "después"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_dispatch_is_ignored(self, mock_ack):
+        """An entry already in flight is not dispatched twice."""
+        chatwoot = MagicMock()
+        chatwoot.send_message = AsyncMock(return_value=True)
+        sender = OutgoingSender(chatwoot, "consumer-1")
+
+        sender.dispatch("1-0", _payload("10", "Hola"))
+        sender.dispatch("1-0", _payload("10", "Hola"))
+        await _wait_idle(sender)
+
+        assert chatwoot.send_message.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reclaim_redispatches_and_dead_letters(self, mock_ack):
+        """Reclaimed entries are resent; entries over the delivery limit go to the DLQ."""
+        chatwoot = MagicMock()
+        chatwoot.send_message = AsyncMock(return_value=True)
+        sender = OutgoingSender(chatwoot, "consumer-1", max_deliveries=3)
+
+        claimed = [
+            ("1-0", _payload("10", "reintento"), 2),
+            ("2-0", _payload("20", "sin remedio"), 4),
+        ]
+        with patch(
+            "agent.workers.outgoing_sender.claim_stale_messages",
+            new=AsyncMock(return_value=claimed),
+        ), patch(
+            "agent.workers.outgoing_sender.move_to_dead_letter", new=AsyncMock()
+        ) as mock_dlq:
+            redispatched = await sender.reclaim()
+            await _wait_idle(sender)
+
+        assert redispatched == 1
+        chatwoot.send_message.assert_called_once_with(
+            "+34612345678", "reintento", conversation_id="10"
+        )
+        mock_dlq.assert_called_once()
+        assert mock_dlq.call_args[0][2] == "2-0"
+        assert sender.stats()["dead_lettered"] == 1
@@ -12,6 +12,15 @@ from unittest.mock import mock_open, patch
 import pytest
 
 from agent.prompts import load_maite_system_prompt
+from shared.template_cache import clear_template_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_prompt_cache():
+    """Read the prompt from disk in every test (it is cached per process)."""
+    clear_template_cache()
+    yield
+    clear_template_cache()
 
 
 class TestPromptLoading:
@@ -14,8 +14,12 @@ from shared.redis_client import (
     add_to_stream,
     create_consumer_group,
     read_from_stream,
+    read_from_streams,
     acknowledge_message,
     move_to_dead_letter,
+    claim_stale_messages,
+    get_pending_summary,
+    retain_pending_message,
     INCOMING_STREAM,
     CONSUMER_GROUP,
     DEAD_LETTER_STREAM,
@@ -343,6 +347,51 @@ class TestReadFromStream:
             assert exc_info.value.status_code == 503
 
 
+class TestReadFromStreams:
+    """Tests for read_from_streams function."""
+
+    @pytest.mark.asyncio
+    async def test_read_from_multiple_streams(self):
+        """Test that entries keep the name of the stream they came from."""
+        mock_client = AsyncMock()
+        mock_client.xreadgroup = AsyncMock(return_value=[
+            (f"{INCOMING_STREAM}:0", [
+                ("1-0", {"data": '{"conversation_id": "1"}'}),
+            ]),
+            (f"{INCOMING_STREAM}:1", [
+                ("2-0", {"data": '{"conversation_id": "2"}'}),
+            ]),
+        ])
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await read_from_streams(
+                [f"{INCOMING_STREAM}:0", f"{INCOMING_STREAM}:1"],
+                CONSUMER_GROUP,
+                "consumer-1",
+            )
+
+            assert result == [
+                (f"{INCOMING_STREAM}:0", "1-0", {"conversation_id": "1"}),
+                (f"{INCOMING_STREAM}:1", "2-0", {"conversation_id": "2"}),
+            ]
+            call_kwargs = mock_client.xreadgroup.call_args.kwargs
+            assert call_kwargs["streams"] == {
+                f"{INCOMING_STREAM}:0": ">",
+                f"{INCOMING_STREAM}:1": ">",
+            }
+
+    @pytest.mark.asyncio
+    async def test_read_no_streams_returns_empty(self):
+        """Test that an empty stream list does not call Redis."""
+        mock_client = AsyncMock()
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await read_from_streams([], CONSUMER_GROUP, "consumer-1")
+
+            assert result == []
+            mock_client.xreadgroup.assert_not_called()
+
+
 class TestAcknowledgeMessage:
     """Tests for acknowledge_message function."""
 
@@ -476,6 +525,143 @@ class TestMoveToDeadLetter:
 # =============================================================================
 
 
+class TestClaimStaleMessages:
+    """Tests for claim_stale_messages function."""
+
+    @pytest.mark.asyncio
+    async def test_claims_entries_with_delivery_counts(self):
+        """Test that claimed entries are parsed and carry their delivery count."""
+        mock_client = AsyncMock()
+        mock_client.xautoclaim = AsyncMock(return_value=[
+            "0-0",
+            [("1-0", {"data": '{"conversation_id": "1"}'})],
+            [],
+        ])
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[
+            [{"message_id": "1-0", "consumer": "consumer-1", "times_delivered": 3}],
+        ])
+        mock_client.pipeline = MagicMock(return_value=pipe)
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await claim_stale_messages(
+                INCOMING_STREAM, CONSUMER_GROUP, "consumer-1", min_idle_ms=60000
+            )
+
+            assert result == [("1-0", {"conversation_id": "1"}, 3)]
+            mock_client.xautoclaim.assert_called_once_with(
+                INCOMING_STREAM,
+                CONSUMER_GROUP,
+                "consumer-1",
+                min_idle_time=60000,
+                start_id="0-0",
+                count=50,
+            )
+
+    @pytest.mark.asyncio
+    async def test_delivery_count_looked_up_per_claimed_entry(self):
+        """Test that each claimed ID gets its own PEL lookup (no ID range)."""
+        mock_client = AsyncMock()
+        mock_client.xautoclaim = AsyncMock(return_value=[
+            "0-0",
+            [
+                ("1-0", {"data": '{"conversation_id": "1"}'}),
+                ("9-0", {"data": '{"conversation_id": "2"}'}),
+            ],
+            [],
+        ])
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[
+            [{"message_id": "1-0", "consumer": "consumer-1", "times_delivered": 2}],
+            [{"message_id": "9-0", "consumer": "consumer-1", "times_delivered": 6}],
+        ])
+        mock_client.pipeline = MagicMock(return_value=pipe)
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await claim_stale_messages(
+                INCOMING_STREAM, CONSUMER_GROUP, "consumer-1", min_idle_ms=60000
+            )
+
+        assert [(msg_id, deliveries) for msg_id, _, deliveries in result] == [("1-0", 2), ("9-0", 6)]
+        assert [c.kwargs for c in pipe.xpending_range.call_args_list] == [
+            {"min": "1-0", "max": "1-0", "count": 1},
+            {"min": "9-0", "max": "9-0", "count": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_trimmed_entries_are_acked(self):
+        """Test that entries deleted from the stream are acked, not returned."""
+        mock_client = AsyncMock()
+        mock_client.xautoclaim = AsyncMock(return_value=["0-0", [("1-0", None)]])
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await claim_stale_messages(
+                INCOMING_STREAM, CONSUMER_GROUP, "consumer-1", min_idle_ms=60000
+            )
+
+            assert result == []
+            mock_client.xack.assert_called_once_with(INCOMING_STREAM, CONSUMER_GROUP, "1-0")
+
+
+class TestGetPendingSummary:
+    """Tests for get_pending_summary function."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_pending_entries(self):
+        """Test that the PEL summary carries counts per consumer and the oldest entry age."""
+        mock_client = AsyncMock()
+        mock_client.xpending = AsyncMock(return_value={
+            "pending": 3,
+            "min": "1000-0",
+            "max": "2000-0",
+            "consumers": [{"name": "consumer-1", "pending": 2}, {"name": "consumer-2", "pending": 1}],
+        })
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await get_pending_summary(INCOMING_STREAM, CONSUMER_GROUP)
+
+            assert result["pending"] == 3
+            assert result["consumers"] == {"consumer-1": 2, "consumer-2": 1}
+            assert result["oldest_age_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_missing_group_is_empty(self):
+        """Test that a stream without the consumer group reports nothing pending."""
+        mock_client = AsyncMock()
+        mock_client.xpending = AsyncMock(side_effect=RedisResponseError("NOGROUP No such key"))
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            result = await get_pending_summary(INCOMING_STREAM, CONSUMER_GROUP)
+
+            assert result == {"pending": 0, "oldest_age_ms": 0, "consumers": {}}
+
+
+class TestRetainPendingMessage:
+    """Tests for retain_pending_message function."""
+
+    @pytest.mark.asyncio
+    async def test_resets_idle_time_without_counting_a_delivery(self):
+        """Test that the entry is re-claimed by the same consumer with JUSTID."""
+        mock_client = AsyncMock()
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            await retain_pending_message(INCOMING_STREAM, CONSUMER_GROUP, "consumer-1", "1-0")
+
+            mock_client.xclaim.assert_called_once_with(
+                INCOMING_STREAM, CONSUMER_GROUP, "consumer-1",
+                min_idle_time=0, message_ids=["1-0"], justid=True,
+            )
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_raised(self):
+        """Test that a Redis error is logged, not raised (the entry just stays pending)."""
+        mock_client = AsyncMock()
+        mock_client.xclaim = AsyncMock(side_effect=RedisConnectionError("Connection refused"))
+
+        with patch("shared.redis_client.get_redis_client", return_value=mock_client):
+            await retain_pending_message(INCOMING_STREAM, CONSUMER_GROUP, "consumer-1", "1-0")
+
+
 class TestIdempotency:
     """Tests for webhook idempotency function."""
 
@@ -0,0 +1,303 @@
+"""
+Tests for the cached salon calendar.
+
+Coverage:
+- Snapshot lookups (coverage, holidays, closed and unconfigured days, summary)
+- Served from memory until the TTL expires
+- One refresh shared by concurrent callers
+- Invalidation (a refresh started before it is not kept)
+- Refresh errors propagate and are retried
+- business_hours_validator reads the snapshot
+- query_info hours, the prompt's business context and the admin calendar view
+  read the snapshot (an invalidation reaches them all at once)
+"""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from agent.prompts import dynamic_context
+from agent.services import availability_service
+from agent.tools import info_tools
+from shared import business_hours_validator, salon_calendar
+from shared.salon_calendar import (
+    DayHours,
+    SalonCalendar,
+    get_salon_calendar,
+    get_salon_calendar_stats,
+    invalidate_salon_calendar,
+)
+
+MONDAY = date(2026, 3, 2)
+
+
+def _calendar(start_date: date = MONDAY, holidays: dict | None = None) -> SalonCalendar:
+    return SalonCalendar(
+        start_date=start_date,
+        end_date=start_date + timedelta(days=60),
+        holidays=holidays or {},
+        days={
+            0: DayHours(True, None, 0, None, 0),  # Monday closed
+            1: DayHours(False, 10, 0, 20, 0),
+            5: DayHours(False, 9, 30, 14, 0),
+        },
+        loaded_at=time.monotonic(),
+    )
+
+
+@pytest.fixture
+def load_calendar():
+    """Empty process-wide snapshot; refreshes load _calendar() (no database)."""
+    invalidate_salon_calendar()
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value="session")
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    with patch.object(salon_calendar, "get_async_session", return_value=session), \
+            patch.object(
+                salon_calendar,
+                "load_salon_calendar",
+                new=AsyncMock(side_effect=lambda session, start, end: _calendar(start)),
+            ) as load:
+        yield load
+    invalidate_salon_calendar()
+
+
+class TestSalonCalendar:
+    """Tests for SalonCalendar lookups."""
+
+    def test_covers(self):
+        calendar = _calendar()
+
+        assert calendar.covers(MONDAY)
+        assert calendar.covers(MONDAY, MONDAY + timedelta(days=60))
+        assert not calendar.covers(MONDAY - timedelta(days=1))
+        assert not calendar.covers(MONDAY + timedelta(days=60))
+        assert not calendar.covers(MONDAY, MONDAY + timedelta(days=61))
+
+    def test_business_hours_of_holidays_and_closed_days(self):
+        tuesday = MONDAY + timedelta(days=1)
+        calendar = _calendar(holidays={tuesday + timedelta(days=7): "Fiesta local"})
+
+        assert calendar.business_hours(tuesday) == {"start": 10, "end": 20}
+        assert calendar.business_hours(tuesday + timedelta(days=7)) is None
+        assert calendar.business_hours(MONDAY) is None
+        assert calendar.holiday_name(tuesday + timedelta(days=7)) == "Fiesta local"
+
+    def test_holidays_between(self):
+        later = MONDAY + timedelta(days=20)
+        calendar = _calendar(holidays={later: "Fiesta local", MONDAY: "Reyes"})
+
+        assert calendar.holidays_between(MONDAY, later + timedelta(days=1)) == [
+            (MONDAY, "Reyes"),
+            (later, "Fiesta local"),
+        ]
+        assert calendar.holidays_between(MONDAY + timedelta(days=1), later) == []
+
+    def test_unconfigured_day_is_closed(self):
+        calendar = _calendar()
+
+        assert calendar.is_day_closed(0) is True
+        assert calendar.is_day_closed(1) is False
+        assert calendar.is_day_closed(6) is True  # No row: fail closed
+        assert calendar.hours_for_weekday(6) is None
+
+    def test_summary(self):
+        summary = _calendar().summary()
+
+        assert summary[1] == {"open": "10:00", "close": "20:00"}
+        assert summary[5] == {"open": "09:30", "close": "14:00"}
+        assert summary[0] is None
+        assert summary[6] is None
+        assert list(summary) == list(range(7))
+
+
+class TestGetSalonCalendar:
+    """Tests for the process-wide snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_served_from_memory_until_ttl(self, load_calendar):
+        first = await get_salon_calendar()
+        second = await get_salon_calendar()
+
+        assert second is first
+        assert load_calendar.await_count == 1
+
+        with patch.object(salon_calendar, "TTL_SECONDS", 0):
+            third = await get_salon_calendar()
+
+        assert third is not first
+        assert load_calendar.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_refresh(self, load_calendar):
+        async def slow_load(session, start, end):
+            await asyncio.sleep(0.01)
+            return _calendar(start)
+
+        load_calendar.side_effect = slow_load
+
+        calendars = await asyncio.gather(*(get_salon_calendar() for _ in range(5)))
+
+        assert load_calendar.await_count == 1
+        assert all(calendar is calendars[0] for calendar in calendars)
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_snapshot(self, load_calendar):
+        refreshes = get_salon_calendar_stats()["refreshes"]
+        await get_salon_calendar()
+
+        invalidate_salon_calendar()
+        await get_salon_calendar()
+
+        assert load_calendar.await_count == 2
+        assert get_salon_calendar_stats()["refreshes"] == refreshes + 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_overtaken_by_invalidation_is_not_kept(self, load_calendar):
+        async def load_overtaken_by_admin_edit(session, start, end):
+            invalidate_salon_calendar()
+            return _calendar(start)
+
+        load_calendar.side_effect = load_overtaken_by_admin_edit
+        await get_salon_calendar()
+
+        load_calendar.side_effect = lambda session, start, end: _calendar(start)
+        await get_salon_calendar()
+
+        assert load_calendar.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_error_propagates_and_is_retried(self, load_calendar):
+        load_calendar.side_effect = RuntimeError("connection refused")
+
+        with pytest.raises(RuntimeError):
+            await get_salon_calendar()
+
+        load_calendar.side_effect = lambda session, start, end: _calendar(start)
+        assert await get_salon_calendar() is not None
+        assert load_calendar.await_count == 2
+
+
+class TestBusinessHoursValidator:
+    """business_hours_validator answers from the snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_is_day_closed(self):
+        with patch.object(
+            business_hours_validator, "get_salon_calendar", new=AsyncMock(return_value=_calendar())
+        ):
+            assert await business_hours_validator.is_day_closed(0) is True
+            assert await business_hours_validator.is_day_closed(1) is False
+            assert await business_hours_validator.is_day_closed(6) is True
+
+    @pytest.mark.asyncio
+    async def test_get_business_hours_for_day(self):
+        with patch.object(
+            business_hours_validator, "get_salon_calendar", new=AsyncMock(return_value=_calendar())
+        ):
+            assert await business_hours_validator.get_business_hours_for_day(1) == {
+                "start": 10,
+                "end": 20,
+            }
+            assert await business_hours_validator.get_business_hours_for_day(0) is None
+
+    @pytest.mark.asyncio
+    async def test_calendar_error_fails_closed(self):
+        with patch.object(
+            business_hours_validator,
+            "get_salon_calendar",
+            new=AsyncMock(side_effect=RuntimeError("connection refused")),
+        ):
+            assert await business_hours_validator.is_day_closed(1) is True
+            assert await business_hours_validator.get_business_hours_for_day(1) is None
+
+
+class TestSnapshotReaders:
+    """Other readers of hours and holidays go through the snapshot, not the tables."""
+
+    @pytest.mark.asyncio
+    async def test_query_info_hours(self):
+        with patch.object(
+            info_tools, "get_salon_calendar", new=AsyncMock(return_value=_calendar())
+        ):
+            result = await info_tools._get_business_hours()
+
+        assert [day["day_of_week"] for day in result["schedule"]] == [0, 1, 5]
+        assert result["schedule"][0]["is_closed"] is True
+        assert result["schedule"][1]["hours"] == "10:00-20:00"
+        assert result["schedule"][2]["hours"] == "09:30-14:00"
+
+    @pytest.mark.asyncio
+    async def test_dynamic_context_follows_calendar_on_cache_hit(self):
+        """The prompt's hours and holidays change with the snapshot, not after the context TTL."""
+        today = date.today()
+        before = _calendar(start_date=today)
+        after = _calendar(start_date=today, holidays={today + timedelta(days=3): "Fiesta local"})
+        calendar = AsyncMock(side_effect=[before, after])
+
+        dynamic_context.clear_dynamic_context_cache()
+        with patch.object(dynamic_context, "get_salon_calendar", new=calendar), \
+                patch.object(
+                    dynamic_context,
+                    "_load_context_from_db",
+                    new=AsyncMock(return_value=dynamic_context._get_fallback_context()),
+                ) as load_settings:
+            first = await dynamic_context.load_dynamic_context()
+            second = await dynamic_context.load_dynamic_context()
+        dynamic_context.clear_dynamic_context_cache()
+
+        assert load_settings.await_count == 1  # Settings still cached
+        assert first["upcoming_holidays"] == []
+        assert [h["name"] for h in second["upcoming_holidays"]] == ["Fiesta local"]
+        assert second["business_hours"][1] == {
+            "day_name": "Martes",
+            "is_closed": False,
+            "start": "10:00",
+            "end": "20:00",
+        }
+
+    @pytest.mark.asyncio
+    async def test_admin_calendar_holidays_from_snapshot(self):
+        holiday_day = MONDAY + timedelta(days=2)
+        holiday_id = uuid4()
+        calendar = SalonCalendar(
+            start_date=MONDAY,
+            end_date=MONDAY + timedelta(days=60),
+            holidays={holiday_day: "Fiesta local"},
+            days={},
+            holiday_ids=MappingProxyType({holiday_day: holiday_id}),
+        )
+        empty = MagicMock()
+        empty.scalars.return_value.all.return_value = []
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=empty)
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+
+        start = datetime(2026, 3, 2, tzinfo=salon_calendar.MADRID_TZ)
+        with patch.object(availability_service, "get_async_session", return_value=session_cm), \
+                patch.object(
+                    availability_service, "get_salon_calendar", new=AsyncMock(return_value=calendar)
+                ):
+            events = await availability_service.get_calendar_events_for_range(
+                [uuid4()], start, start + timedelta(days=7)
+            )
+
+        assert session.execute.await_count == 2  # Appointments and blocking events only
+        assert events == [{
+            "id": f"holiday-{holiday_id}",
+            "title": "FESTIVO: Fiesta local",
+            "start": holiday_day.isoformat(),
+            "end": holiday_day.isoformat(),
+            "allDay": True,
+            "backgroundColor": "#991B1B",
+            "borderColor": "#7F1D1D",
+            "extendedProps": {"holiday_id": str(holiday_id), "type": "holiday"},
+        }]
@@ -0,0 +1,110 @@
+"""
+Tests for the bitset slot grid.
+
+Coverage:
+- Same slots as build_slots() on random calendars (aligned and odd boundaries)
+- Buffer after the service
+- Periods spanning several days
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from agent.services.availability_service import MADRID_TZ, build_slots, business_day_bounds
+from agent.services.slot_grid import StylistDay, _window_starts, compute_slot_grid
+
+MONDAY = date(2026, 3, 2)
+HOURS = {"start": 10, "end": 20}
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=MADRID_TZ)
+
+
+def _period(start: datetime, minutes: int) -> dict:
+    return {"start": start, "end": start + timedelta(minutes=minutes), "type": "appointment"}
+
+
+def _random_rows(rng: random.Random, minute_step: int) -> list[StylistDay]:
+    rows = []
+    for offset in range(5):
+        day = MONDAY + timedelta(days=offset)
+        hours = rng.choice([HOURS, {"start": 9, "end": 14}])
+        for _ in range(3):
+            periods = sorted(
+                (
+                    _period(
+                        _at(day, rng.randint(9, 19), rng.randrange(0, 60, minute_step)),
+                        rng.choice([15, 30, 45, 60, 90, 95]),
+                    )
+                    for _ in range(rng.randint(0, 5))
+                ),
+                key=lambda p: p["start"],
+            )
+            rows.append(StylistDay(uuid4(), day, hours, periods))
+    return rows
+
+
+def _reference(row: StylistDay, duration: int, interval: int) -> list[dict]:
+    day_start, day_end = business_day_bounds(row.date, row.business_hours)
+    return build_slots(row.stylist_id, day_start, day_end, row.busy_periods, duration, interval)
+
+
+class TestComputeSlotGrid:
+    """Tests for compute_slot_grid."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("minute_step", [15, 5, 1])
+    @pytest.mark.parametrize("duration,interval", [(90, 15), (60, 60), (45, 15), (70, 10)])
+    def test_matches_build_slots(self, seed, minute_step, duration, interval):
+        rows = _random_rows(random.Random(seed), minute_step)
+
+        grid = compute_slot_grid(rows, duration, interval)
+
+        assert grid == [_reference(row, duration, interval) for row in rows]
+
+    def test_buffer_must_be_free_after_service(self):
+        row = StylistDay(uuid4(), MONDAY, HOURS, [_period(_at(MONDAY, 11), 60)])
+
+        without_buffer, with_buffer = (
+            compute_slot_grid([row], 60, 60, buffer_minutes=buffer, pack_slots=False)[0]
+            for buffer in (0, 15)
+        )
+
+        assert "10:00" in [slot["time"] for slot in without_buffer]
+        assert "10:00" not in [slot["time"] for slot in with_buffer]
+        assert "19:00" not in [slot["time"] for slot in with_buffer]  # Buffer past closing
+        assert with_buffer[0]["end_time"] == "13:00"
+
+    def test_multi_day_block_covers_whole_day(self):
+        vacation = _period(_at(MONDAY - timedelta(days=1), 12), 3 * 24 * 60)
+        rows = [
+            StylistDay(uuid4(), MONDAY, HOURS, [vacation]),
+            StylistDay(uuid4(), MONDAY, HOURS, []),
+        ]
+
+        blocked, free = compute_slot_grid(rows, 60, 60)
+
+        assert blocked == []
+        assert len(free) == 10
+
+    def test_no_rows(self):
+        assert compute_slot_grid([], 60, 15) == []
+
+
+class TestWindowStarts:
+    """Tests for _window_starts."""
+
+    @pytest.mark.parametrize("window", [1, 2, 3, 5, 8, 13])
+    def test_matches_naive_window(self, window):
+        free = random.Random(window).getrandbits(64)
+
+        expected = sum(
+            1 << i for i in range(64)
+            if all(free >> j & 1 for j in range(i, i + window))
+        )
+
+        assert _window_starts(free, window) == expected
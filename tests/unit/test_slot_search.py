@@ -0,0 +1,180 @@
+"""
+Tests for the multi-stylist, multi-day slot search.
+
+Coverage:
+- Busy periods bucketed by day (including periods crossing midnight)
+- Holidays and closed days skipped from the preloaded calendar
+- Date order, per-stylist limit and early stop
+- Slot filters (rejected slots do not count)
+- Range loading: availability index first, then the cached salon calendar
+  (database past its horizon) and one busy-periods query
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from agent.services import slot_search
+from agent.services.availability_service import MADRID_TZ
+from agent.services.slot_search import load_search_range, periods_by_day, search_free_slots
+from shared.salon_calendar import DayHours, SalonCalendar
+
+MONDAY = date(2026, 3, 2)
+
+
+def _calendar(holidays: dict | None = None, closed_weekdays: tuple = ()) -> SalonCalendar:
+    return SalonCalendar(
+        start_date=MONDAY,
+        end_date=MONDAY + timedelta(days=60),
+        holidays=holidays or {},
+        days={dow: DayHours(dow in closed_weekdays, 10, 0, 14, 0) for dow in range(7)},
+    )
+
+
+def _at(day: date, hour: int) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, tzinfo=MADRID_TZ)
+
+
+def _period(start: datetime, minutes: int) -> dict:
+    return {"start": start, "end": start + timedelta(minutes=minutes), "type": "appointment"}
+
+
+def _stylist(name: str) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid4(), name=name)
+
+
+async def _collect(*args, **kwargs) -> list:
+    return [found async for found in search_free_slots(*args, **kwargs)]
+
+
+def _loaded(calendar: SalonCalendar, busy: dict):
+    return patch.object(
+        slot_search, "load_search_range", new=AsyncMock(return_value=(calendar, busy))
+    )
+
+
+class TestPeriodsByDay:
+    """Tests for periods_by_day."""
+
+    def test_period_crossing_midnight_belongs_to_both_days(self):
+        overnight = _period(_at(MONDAY, 22), 4 * 60)
+        morning = _period(_at(MONDAY + timedelta(days=1), 10), 60)
+
+        by_day = periods_by_day([overnight, morning])
+
+        assert by_day[MONDAY] == [overnight]
+        assert by_day[MONDAY + timedelta(days=1)] == [overnight, morning]
+
+
+class TestSearchFreeSlots:
+    """Tests for search_free_slots."""
+
+    @pytest.mark.asyncio
+    async def test_skips_holidays_and_closed_days(self):
+        ana = _stylist("Ana")
+        calendar = _calendar({MONDAY + timedelta(days=1): "Fiesta"}, (MONDAY.weekday(),))
+
+        with _loaded(calendar, {ana.id: []}):
+            found = await _collect([ana], MONDAY, 3, 120)
+
+        assert {f.date for f in found} == {MONDAY + timedelta(days=2)}
+        assert [f.slot["time"] for f in found] == ["10:00", "12:00"]
+
+    @pytest.mark.asyncio
+    async def test_dates_in_order_with_busy_periods(self):
+        ana, pilar = _stylist("Ana"), _stylist("Pilar")
+        busy = {
+            ana.id: [_period(_at(MONDAY, 10), 4 * 60)],  # Full day
+            pilar.id: [_period(_at(MONDAY, 10), 60)],
+        }
+
+        with _loaded(_calendar(), busy):
+            found = await _collect([ana, pilar], MONDAY, 2, 60)
+
+        assert [(f.date, f.stylist.name, f.slot["time"]) for f in found[:4]] == [
+            (MONDAY, "Pilar", "11:00"),
+            (MONDAY, "Pilar", "12:00"),
+            (MONDAY, "Pilar", "13:00"),
+            (MONDAY + timedelta(days=1), "Ana", "10:00"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stops_when_every_stylist_has_enough(self):
+        ana, pilar = _stylist("Ana"), _stylist("Pilar")
+        calendar = MagicMock(wraps=_calendar())
+
+        with _loaded(calendar, {ana.id: [], pilar.id: []}):
+            found = await _collect([ana, pilar], MONDAY, 10, 60, max_slots_per_stylist=3)
+
+        assert [f.stylist.name for f in found] == ["Ana"] * 3 + ["Pilar"] * 3
+        assert calendar.business_hours.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_filtered_slots_do_not_count(self):
+        ana = _stylist("Ana")
+
+        with _loaded(_calendar(), {ana.id: []}):
+            found = await _collect(
+                [ana], MONDAY, 3, 60,
+                max_slots_per_stylist=2,
+                slot_filter=lambda slot: slot["time"] >= "13:00",
+            )
+
+        assert [(f.date, f.slot["time"]) for f in found] == [
+            (MONDAY, "13:00"),
+            (MONDAY + timedelta(days=1), "13:00"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_no_stylists_does_not_load(self):
+        with _loaded(_calendar(), {}) as load:
+            assert await _collect([], MONDAY, 10, 60) == []
+        load.assert_not_awaited()
+
+
+class TestLoadSearchRange:
+    """Tests for load_search_range."""
+
+    @pytest.mark.asyncio
+    async def test_served_by_index(self):
+        index = MagicMock()
+        index.get_range = AsyncMock(return_value=("calendar", {"id": []}))
+
+        with patch(
+            "agent.services.availability_index.get_availability_index", return_value=index
+        ), patch.object(slot_search, "get_async_session") as session:
+            result = await load_search_range(["id"], MONDAY, MONDAY + timedelta(days=3))
+
+        assert result == ("calendar", {"id": []})
+        session.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("days,calendar_queried", [(3, False), (90, True)])
+    async def test_database_fallback(self, days, calendar_queried):
+        index = MagicMock()
+        index.get_range = AsyncMock(return_value=None)
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value="session")
+        session.__aexit__ = AsyncMock(return_value=False)
+        cached = _calendar()
+
+        with patch(
+            "agent.services.availability_index.get_availability_index", return_value=index
+        ), patch.object(slot_search, "get_async_session", return_value=session), \
+                patch.object(slot_search, "get_salon_calendar", new=AsyncMock(return_value=cached)), \
+                patch.object(
+                    slot_search, "load_salon_calendar", new=AsyncMock(return_value="loaded")
+                ) as load_calendar, \
+                patch.object(
+                    slot_search, "fetch_busy_periods_by_stylist", new=AsyncMock(return_value={})
+                ) as fetch_busy:
+            result = await load_search_range(["id"], MONDAY, MONDAY + timedelta(days=days))
+
+        assert result == ("loaded" if calendar_queried else cached, {})
+        assert load_calendar.await_count == int(calendar_queried)
+        args = fetch_busy.await_args.args
+        assert args[2] == _at(MONDAY, 0)
+        assert args[3] == _at(MONDAY + timedelta(days=days), 0)
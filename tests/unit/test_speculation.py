@@ -0,0 +1,173 @@
+"""
+Tests for speculative batching (SpeculativeRunner + MessageBatcher integration).
+
+Coverage:
+- A new message cancels and restarts the running prefetch
+- take() returns the result only for the exact combined text
+- Failed prefetches fall back to None
+- PrefetchedTurn.matches() rejects stale checkpoints
+- MessageBatcher restarts speculation on every message
+"""
+
+import asyncio
+
+import pytest
+
+from agent.batching.message_batcher import MessageBatcher
+from agent.batching.speculation import (
+    PREFETCHED_TURN_KEY,
+    PrefetchedTurn,
+    SpeculativeRunner,
+    combine_batch_text,
+    get_prefetched_turn,
+)
+
+
+def _msgs(*texts: str) -> list[dict]:
+    return [{"message_text": text} for text in texts]
+
+
+class TestSpeculativeRunner:
+    """Tests for SpeculativeRunner."""
+
+    @pytest.mark.asyncio
+    async def test_take_returns_result_for_same_text(self):
+        """The prefetch result is reused when the batch did not change."""
+
+        async def prefetch(conversation_id, messages):
+            return combine_batch_text(messages).upper()
+
+        runner = SpeculativeRunner(prefetch)
+        runner.start("conv-1", _msgs("hola", "quiero cita"))
+
+        result = await runner.take("conv-1", "hola\n\nquiero cita")
+
+        assert result == "HOLA\n\nQUIERO CITA"
+        assert runner.stats()["hits"] == 1
+        assert runner.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_new_message_cancels_previous_prefetch(self):
+        """Starting again for a grown batch cancels the running prefetch."""
+        cancelled: list[str] = []
+        release = asyncio.Event()
+
+        async def prefetch(conversation_id, messages):
+            text = combine_batch_text(messages)
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled.append(text)
+                raise
+            return text
+
+        runner = SpeculativeRunner(prefetch)
+        runner.start("conv-1", _msgs("hola"))
+        await asyncio.sleep(0)
+        runner.start("conv-1", _msgs("hola", "para mañana"))
+        await asyncio.sleep(0)
+        release.set()
+
+        result = await runner.take("conv-1", "hola\n\npara mañana")
+
+        assert cancelled == ["hola"]
+        assert result == "hola\n\npara mañana"
+        assert runner.stats()["superseded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_take_with_different_text_is_a_miss(self):
+        """A prefetch for another text is cancelled and not returned."""
+        started = asyncio.Event()
+
+        async def prefetch(conversation_id, messages):
+            started.set()
+            await asyncio.sleep(10)
+
+        runner = SpeculativeRunner(prefetch)
+        runner.start("conv-1", _msgs("hola"))
+        await started.wait()
+
+        assert await runner.take("conv-1", "otra cosa") is None
+        assert await runner.take("conv-2", "hola") is None
+        assert runner.stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_returns_none(self):
+        """Errors in the prefetch are reported as no result."""
+
+        async def prefetch(conversation_id, messages):
+            raise RuntimeError("checkpoint unavailable")
+
+        runner = SpeculativeRunner(prefetch)
+        runner.start("conv-1", _msgs("hola"))
+
+        assert await runner.take("conv-1", "hola") is None
+        assert runner.stats()["failed"] == 1
+
+
+class TestPrefetchedTurn:
+    """Tests for PrefetchedTurn validity checks."""
+
+    def test_matches_same_turn_and_checkpoint(self):
+        turn = PrefetchedTurn(
+            message="sí",
+            fsm_state={"state": "confirmation"},
+            last_message={"role": "assistant", "content": "¿Confirmo?", "timestamp": "t1"},
+        )
+        history = [{"role": "assistant", "content": "¿Confirmo?", "timestamp": "t2"}]
+
+        assert turn.matches("sí", {"state": "confirmation"}, history)
+
+    def test_rejects_changed_checkpoint(self):
+        """A batch that finished after the prefetch makes it stale."""
+        turn = PrefetchedTurn(
+            message="sí",
+            fsm_state={"state": "slot_selection"},
+            last_message={"role": "assistant", "content": "¿A qué hora?"},
+        )
+
+        assert not turn.matches("sí", {"state": "confirmation"}, [])
+        assert not turn.matches(
+            "sí",
+            {"state": "slot_selection"},
+            [{"role": "assistant", "content": "¿Confirmo?"}],
+        )
+        assert not turn.matches("no", {"state": "slot_selection"}, [])
+
+    def test_get_prefetched_turn_from_config(self):
+        turn = PrefetchedTurn(message="hola", fsm_state=None, last_message=None)
+
+        assert get_prefetched_turn({"configurable": {PREFETCHED_TURN_KEY: turn}}) is turn
+        assert get_prefetched_turn({"configurable": {"thread_id": "conv-1"}}) is None
+        assert get_prefetched_turn(None) is None
+
+
+class TestBatcherSpeculation:
+    """Tests for MessageBatcher with a SpeculativeRunner."""
+
+    @pytest.mark.asyncio
+    async def test_batch_reuses_prefetch_of_full_batch(self):
+        """Each message restarts speculation; the callback gets the final result."""
+        prefetched_texts: list[str] = []
+        results: list[str | None] = []
+
+        async def prefetch(conversation_id, messages):
+            text = combine_batch_text(messages)
+            prefetched_texts.append(text)
+            return f"intent:{text}"
+
+        runner = SpeculativeRunner(prefetch)
+
+        async def callback(conversation_id, messages):
+            results.append(await runner.take(conversation_id, combine_batch_text(messages)))
+
+        batcher = MessageBatcher(window_seconds=1, speculation=runner)
+        batcher.set_callback(callback)
+
+        await batcher.add_message("conv-1", {"message_text": "hola"})
+        await asyncio.sleep(0)
+        await batcher.add_message("conv-1", {"message_text": "quiero cita"})
+        await batcher.flush("conv-1")
+
+        assert results == ["intent:hola\n\nquiero cita"]
+        assert runner.stats()["started"] == 2
@@ -0,0 +1,141 @@
+"""Unit tests for conversation-affinity partitioning of the incoming stream."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from shared.redis_client import INCOMING_STREAM
+from shared.stream_partitions import (
+    PARTITION_LEASE_PREFIX,
+    PartitionLeaseManager,
+    all_incoming_streams,
+    partition_for,
+    partition_stream,
+)
+
+
+def _mock_redis(members: list[str]) -> MagicMock:
+    """Build a Redis mock whose membership set contains the given members."""
+    client = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, 0, members])
+    client.pipeline.return_value = pipe
+    client.eval = AsyncMock(return_value=1)
+    client.set = AsyncMock(return_value=True)
+    client.zrem = AsyncMock(return_value=1)
+    return client
+
+
+class TestPartitionRouting:
+    """Tests for conversation → partition → stream mapping."""
+
+    def test_partition_is_stable_and_in_range(self):
+        """The same conversation always maps to the same partition."""
+        for conversation_id in ["1", "42", "wa-msg-123", "99999"]:
+            partition = partition_for(conversation_id, 8)
+            assert 0 <= partition < 8
+            assert partition_for(conversation_id, 8) == partition
+
+    def test_single_partition_uses_legacy_stream(self):
+        """With one partition, messages keep going to INCOMING_STREAM."""
+        assert partition_for("123", 1) == 0
+        assert partition_stream(0, 1) == INCOMING_STREAM
+        assert all_incoming_streams(1) == [INCOMING_STREAM]
+
+    def test_multiple_partitions_use_suffixed_streams(self):
+        """Each partition gets its own stream name."""
+        assert all_incoming_streams(3) == [
+            f"{INCOMING_STREAM}:0",
+            f"{INCOMING_STREAM}:1",
+            f"{INCOMING_STREAM}:2",
+        ]
+
+    def test_conversations_spread_across_partitions(self):
+        """Hashing spreads conversations over all partitions."""
+        partitions = {partition_for(str(i), 4) for i in range(200)}
+        assert partitions == {0, 1, 2, 3}
+
+
+class TestPartitionLeaseManager:
+    """Tests for partition leasing and rebalancing."""
+
+    def test_desired_partitions_are_disjoint_and_complete(self):
+        """Every partition is assigned to exactly one live member."""
+        members = ["agent-a", "agent-b", "agent-c"]
+        assignments = [
+            PartitionLeaseManager(m, num_partitions=16, redis_client=MagicMock())
+            .desired_partitions(members)
+            for m in members
+        ]
+
+        all_assigned = [p for assigned in assignments for p in assigned]
+        assert sorted(all_assigned) == list(range(16))
+
+    def test_member_leaving_only_moves_its_partitions(self):
+        """Rendezvous hashing keeps surviving members' partitions in place."""
+        manager = PartitionLeaseManager("agent-a", num_partitions=16, redis_client=MagicMock())
+        before = manager.desired_partitions(["agent-a", "agent-b", "agent-c"])
+        after = manager.desired_partitions(["agent-a", "agent-b"])
+        assert before <= after
+
+    @pytest.mark.asyncio
+    async def test_rebalance_acquires_free_partitions(self):
+        """A lone replica acquires every partition."""
+        client = _mock_redis(["agent-a"])
+        manager = PartitionLeaseManager("agent-a", num_partitions=4, redis_client=client)
+
+        acquired, revoked = await manager.rebalance()
+
+        assert acquired == {0, 1, 2, 3}
+        assert revoked == set()
+        assert len(manager.owned_streams) == 4
+        client.set.assert_any_call(
+            f"{PARTITION_LEASE_PREFIX}0", "agent-a", nx=True, px=manager.lease_ttl_ms
+        )
+
+    @pytest.mark.asyncio
+    async def test_rebalance_skips_partitions_leased_elsewhere(self):
+        """Partitions still leased by another replica are not taken over."""
+        client = _mock_redis(["agent-a"])
+        client.set = AsyncMock(return_value=None)
+        manager = PartitionLeaseManager("agent-a", num_partitions=2, redis_client=client)
+
+        acquired, _ = await manager.rebalance()
+
+        assert acquired == set()
+        assert manager.owned == set()
+
+    @pytest.mark.asyncio
+    async def test_new_member_revokes_partitions_until_released(self):
+        """Partitions moving to a new replica drain before their lease is released."""
+        client = _mock_redis(["agent-a"])
+        manager = PartitionLeaseManager("agent-a", num_partitions=8, redis_client=client)
+        await manager.rebalance()
+
+        client.pipeline.return_value.execute = AsyncMock(
+            return_value=[1, 0, ["agent-a", "agent-b"]]
+        )
+        _, revoked = await manager.rebalance()
+
+        expected = set(range(8)) - manager.desired_partitions(["agent-a", "agent-b"])
+        assert revoked == expected
+        assert manager.owned.isdisjoint(revoked)
+        assert manager.draining == revoked
+
+        await manager.release(revoked)
+        assert manager.draining == set()
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_is_revoked(self):
+        """A lease that could not be renewed is dropped from ownership."""
+        client = _mock_redis(["agent-a"])
+        manager = PartitionLeaseManager("agent-a", num_partitions=1, redis_client=client)
+        await manager.rebalance()
+
+        client.eval = AsyncMock(return_value=0)  # renewal fails
+        client.set = AsyncMock(return_value=None)  # someone else holds it now
+        _, revoked = await manager.rebalance()
+
+        assert revoked == {0}
+        assert manager.owned == set()
+        assert manager.draining == set()
@@ -0,0 +1,112 @@
+"""
+Tests for the compiled template and prompt file cache.
+
+Coverage:
+- Templates compiled once per content (hits/misses)
+- Prompt files read once, missing files not cached
+- Startup preloading of prompt files and FSM response templates
+"""
+
+import pytest
+from jinja2 import TemplateSyntaxError
+
+from agent.fsm.booking_fsm import BookingFSM
+from shared.template_cache import (
+    clear_template_cache,
+    get_template,
+    get_template_cache_stats,
+    precompile_templates,
+    preload_prompt_files,
+    read_prompt_file,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start and end every test with an empty cache."""
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+class TestGetTemplate:
+    """Tests for get_template."""
+
+    def test_same_source_compiled_once(self):
+        """Equal template content returns the same compiled template."""
+        first = get_template("Hola {{ name }}")
+        second = get_template("Hola " + "{{ name }}")
+
+        assert first is second
+        assert second.render(name="Ana") == "Hola Ana"
+        stats = get_template_cache_stats()
+        assert stats["template_misses"] == 1
+        assert stats["template_hits"] == 1
+        assert stats["templates"] == 1
+
+    def test_invalid_template_not_cached(self):
+        """Syntax errors propagate and leave nothing in the cache."""
+        with pytest.raises(TemplateSyntaxError):
+            get_template("{% for x in %}")
+
+        assert get_template_cache_stats()["templates"] == 0
+
+
+class TestPromptFiles:
+    """Tests for read_prompt_file / preload_prompt_files."""
+
+    def test_file_read_once(self, tmp_path):
+        """The second read is served from memory."""
+        path = tmp_path / "core.md"
+        path.write_text("Eres Maite", encoding="utf-8")
+
+        assert read_prompt_file(path) == "Eres Maite"
+        path.write_text("changed", encoding="utf-8")
+        assert read_prompt_file(path) == "Eres Maite"
+
+        stats = get_template_cache_stats()
+        assert stats["prompt_file_misses"] == 1
+        assert stats["prompt_file_hits"] == 1
+
+    def test_missing_file_raises_and_is_not_cached(self, tmp_path):
+        """Callers keep their FileNotFoundError fallbacks."""
+        path = tmp_path / "missing.md"
+
+        with pytest.raises(FileNotFoundError):
+            read_prompt_file(path)
+
+        path.write_text("now here", encoding="utf-8")
+        assert read_prompt_file(path) == "now here"
+
+    def test_preload_reads_and_compiles(self, tmp_path):
+        """Preloaded files need no disk read or compilation afterwards."""
+        (tmp_path / "core.md").write_text("Hoy es {{ current_datetime }}", encoding="utf-8")
+        (tmp_path / "general.md").write_text("FAQs", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+        assert preload_prompt_files(tmp_path) == 2
+
+        get_template(read_prompt_file(tmp_path / "core.md"))
+        stats = get_template_cache_stats()
+        assert stats["prompt_file_hits"] == 1
+        assert stats["template_hits"] == 1
+
+
+class TestFSMTemplates:
+    """Tests for precompiling the BookingFSM response templates."""
+
+    def test_all_fsm_templates_compile(self):
+        """Every response template of the FSM is valid Jinja2."""
+        templates = BookingFSM.RESPONSE_TEMPLATES
+
+        assert precompile_templates(templates.values()) == len(templates)
+        assert get_template_cache_stats()["templates"] == len(templates)
+
+    def test_actions_use_precompiled_templates(self):
+        """Action templates are served from the cache after precompilation."""
+        precompile_templates(BookingFSM.RESPONSE_TEMPLATES.values())
+
+        action = BookingFSM("conv-123").get_required_action()
+        get_template(action.response_template)
+
+        assert get_template_cache_stats()["template_hits"] == 1
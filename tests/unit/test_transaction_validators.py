@@ -16,6 +16,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 from zoneinfo import ZoneInfo
 
+from sqlalchemy.dialects import postgresql
+
 from agent.validators.transaction_validators import (
     validate_category_consistency,
     validate_slot_availability,
@@ -352,6 +354,25 @@ class TestValidateSlotAvailability:
         # The query should include with_for_update() for locking
         # We can't easily test the exact SQL, but we verified it's called
 
+    @pytest.mark.asyncio
+    async def test_slot_overlap_uses_indexed_time_range(
+        self, mock_session, stylist_id, start_time
+    ):
+        """Test that overlap is a time_range && query (GiST index), not per-row arithmetic."""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        await validate_slot_availability(
+            stylist_id, start_time, duration_minutes=60, session=mock_session
+        )
+
+        stmt = mock_session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "appointments.time_range && tstzrange(" in sql
+        assert "interval" not in sql
+        assert "FOR UPDATE" in sql
+
     @pytest.mark.asyncio
     async def test_slot_includes_buffer_time(
         self, mock_session, stylist_id, start_time